@@ -226,7 +226,7 @@ async def generate_flow_events(
             components_count = len(graph.vertices)
             vertices_to_run = list(graph.vertices_to_run.union(get_top_level_vertices(graph, graph.vertices_to_run)))
 
-            await chat_service.set_cache(flow_id_str, graph)
+            await chat_service.set_graph(flow_id_str, graph)
             await log_telemetry(start_time, components_count, success=True)
 
         except Exception as exc:
@@ -343,7 +343,7 @@ async def generate_flow_events(
                     artifacts=artifacts,
                 )
             else:
-                await chat_service.set_cache(flow_id_str, graph)
+                await chat_service.update_graph(flow_id_str, graph, vertex_id=vertex_id)
 
             timedelta = time.perf_counter() - start_time
             duration = format_elapsed_time(timedelta)
@@ -7,6 +7,7 @@ from enum import Enum
 from typing import TYPE_CHECKING, Annotated, Any
 
 from fastapi import Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from fastapi_pagination import Params
 from loguru import logger
 from sqlalchemy import delete
@@ -20,10 +21,13 @@ from aiexec.services.database.models.message import MessageTable
 from aiexec.services.database.models.transactions.model import TransactionTable
 from aiexec.services.database.models.vertex_builds.model import VertexBuildTable
 from aiexec.services.deps import get_session, session_scope
+from aiexec.services.storage.utils import parse_range_header
 from aiexec.services.store.utils import get_lf_version_from_pypi
+from aiexec.services.task.build_log_writer import build_log_writer
 
 if TYPE_CHECKING:
     from aiexec.services.chat.service import ChatService
+    from aiexec.services.storage.service import StorageService
     from aiexec.services.store.schema import StoreComponentCreate
 
 
@@ -193,7 +197,7 @@ async def build_graph_from_db_no_cache(flow_id: uuid.UUID, session: AsyncSession
 
 async def build_graph_from_db(flow_id: uuid.UUID, session: AsyncSession, chat_service: ChatService, **kwargs):
     graph = await build_graph_from_db_no_cache(flow_id=flow_id, session=session, **kwargs)
-    await chat_service.set_cache(str(flow_id), graph)
+    await chat_service.set_graph(str(flow_id), graph)
     return graph
 
 
@@ -206,7 +210,7 @@ async def build_and_cache_graph_from_data(
     # Convert flow_id to str if it's UUID
     str_flow_id = str(flow_id) if isinstance(flow_id, uuid.UUID) else flow_id
     graph = Graph.from_payload(graph_data, str_flow_id)
-    await chat_service.set_cache(str_flow_id, graph)
+    await chat_service.set_graph(str_flow_id, graph)
     return graph
 
 
@@ -297,6 +301,8 @@ def parse_value(value: Any, input_type: str) -> Any:
 
 
 async def cascade_delete_flow(session: AsyncSession, flow_id: uuid.UUID) -> None:
+    # Records of the flow still queued by the build log writer would be written after it is deleted
+    build_log_writer.forget_flows([flow_id])
     try:
         # TODO: Verify if deleting messages is safe in terms of session id relevance
         # If we delete messages directly, rather than setting flow_id to null,
@@ -378,3 +384,43 @@ async def verify_public_flow_and_get_user(flow_id: uuid.UUID, client_id: str | N
         raise HTTPException(status_code=403, detail=msg)
 
     return user, new_flow_id
+
+
+async def build_file_stream_response(
+    storage_service: StorageService,
+    flow_id: str,
+    file_name: str,
+    *,
+    media_type: str,
+    headers: dict[str, str] | None = None,
+    range_header: str | None = None,
+) -> StreamingResponse:
+    """Stream a file from the storage, or the byte range the Range header asks for.
+
+    The size is looked up before the response starts so a missing file fails the request
+    instead of the stream.
+    """
+    file_size = await storage_service.get_file_size(flow_id=flow_id, file_name=file_name)
+    headers = {**(headers or {}), "Accept-Ranges": "bytes"}
+    try:
+        byte_range = parse_range_header(range_header, file_size)
+    except ValueError as e:
+        raise HTTPException(status_code=416, detail=str(e), headers={"Content-Range": f"bytes */{file_size}"}) from e
+
+    if byte_range is None:
+        headers["Content-Length"] = str(file_size)
+        return StreamingResponse(
+            storage_service.get_file_stream(flow_id=flow_id, file_name=file_name),
+            media_type=media_type,
+            headers=headers,
+        )
+
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start)
+    headers["Content-Range"] = f"bytes {start}-{end - 1}/{file_size}"
+    return StreamingResponse(
+        storage_service.get_file_stream(flow_id=flow_id, file_name=file_name, start=start, end=end),
+        status_code=206,
+        media_type=media_type,
+        headers=headers,
+    )
@@ -46,7 +46,6 @@ from aiexec.api.v1.schemas import (
     VerticesOrderResponse,
 )
 from aiexec.exceptions.component import ComponentBuildError
-from aiexec.graph.graph.base import Graph
 from aiexec.graph.utils import log_vertex_build
 from aiexec.schema.schema import OutputValue
 from aiexec.services.cache.utils import CacheMiss
@@ -113,7 +112,7 @@ async def retrieve_vertices_order(
         # and return the same structure but only with the ids
         components_count = len(graph.vertices)
         vertices_to_run = list(graph.vertices_to_run.union(get_top_level_vertices(graph, graph.vertices_to_run)))
-        await chat_service.set_cache(str(flow_id), graph)
+        await chat_service.set_graph(str(flow_id), graph)
         background_tasks.add_task(
             telemetry_service.log_package_playground,
             PlaygroundPayload(
@@ -289,13 +288,8 @@ async def build_vertex(
     start_time = time.perf_counter()
     error_message = None
     try:
-        graph: Graph = await chat_service.get_cache(flow_id_str)
-    except KeyError as exc:
-        raise HTTPException(status_code=404, detail="Graph not found") from exc
-
-    try:
-        cache = await chat_service.get_cache(flow_id_str)
-        if isinstance(cache, CacheMiss):
+        cached_graph = await chat_service.get_graph(flow_id_str)
+        if isinstance(cached_graph, CacheMiss):
             # If there's no cache
             logger.warning(f"No cache found for {flow_id_str}. Building graph starting at {vertex_id}")
             graph = await build_graph_from_db(
@@ -304,7 +298,7 @@ async def build_vertex(
                 chat_service=chat_service,
             )
         else:
-            graph = cache.get("result")
+            graph = cached_graph
             await graph.initialize_run()
         vertex = graph.get_vertex(vertex_id)
 
@@ -368,7 +362,7 @@ async def build_vertex(
         graph.reset_inactivated_vertices()
         graph.reset_activated_vertices()
 
-        await chat_service.set_cache(flow_id_str, graph)
+        await chat_service.update_graph(flow_id_str, graph, vertex_id=vertex_id)
 
         # graph.stop_vertex tells us if the user asked
         # to stop the build of the graph at a certain vertex
@@ -419,20 +413,20 @@ async def _stream_vertex(flow_id: str, vertex_id: str, chat_service: ChatService
     graph = None
     try:
         try:
-            cache = await chat_service.get_cache(flow_id)
+            cached_graph = await chat_service.get_graph(flow_id)
         except Exception as exc:  # noqa: BLE001
             logger.exception("Error building Component")
             yield str(StreamData(event="error", data={"error": str(exc)}))
             return
 
-        if isinstance(cache, CacheMiss):
+        if isinstance(cached_graph, CacheMiss):
             # If there's no cache
             msg = f"No cache found for {flow_id}."
             logger.error(msg)
             yield str(StreamData(event="error", data={"error": msg}))
             return
         else:
-            graph = cache.get("result")
+            graph = cached_graph
 
         try:
             vertex: InterfaceVertex = graph.get_vertex(vertex_id)
@@ -493,7 +487,7 @@ async def _stream_vertex(flow_id: str, vertex_id: str, chat_service: ChatService
     finally:
         logger.debug("Closing stream")
         if graph:
-            await chat_service.set_cache(flow_id, graph)
+            await chat_service.update_graph(flow_id, graph, vertex_id=vertex_id)
         yield str(StreamData(event="close", data={"message": "Stream closed"}))
 
 
@@ -280,6 +280,7 @@ def migrate_knowledge_vector_database():
         VectorType.ELASTICSEARCH,
         VectorType.OPENGAUSS,
         VectorType.TABLESTORE,
+        VectorType.LOCAL,
     }
     lower_collection_vector_types = {
         VectorType.ANALYTICDB,
@@ -57,6 +57,10 @@ class AppExecutionConfig(BaseSettings):
         description="Maximum allowed execution time for the application in seconds",
         default=1200,
     )
+    APP_STOP_CHECK_INTERVAL: PositiveFloat = Field(
+        description="Minimum interval in seconds between checks of whether a running generation was stopped",
+        default=0.5,
+    )
     APP_MAX_ACTIVE_REQUESTS: NonNegativeInt = Field(
         description="Maximum number of concurrent active requests per app (0 for unlimited)",
         default=0,
@@ -153,6 +157,16 @@ class PluginConfig(BaseSettings):
         default="plugin-api-key",
     )
 
+    PLUGIN_DAEMON_POOL_MAXSIZE: PositiveInt = Field(
+        description="Maximum number of connections per process kept open to the plugin daemon",
+        default=100,
+    )
+
+    PLUGIN_DAEMON_POOL_KEEPALIVE_EXPIRY: PositiveFloat = Field(
+        description="Time in seconds an idle connection to the plugin daemon is kept open by the async client",
+        default=30.0,
+    )
+
     INNER_API_KEY_FOR_PLUGIN: str = Field(description="Inner api key for plugin", default="inner-api-key")
 
     PLUGIN_REMOTE_INSTALL_HOST: str = Field(
@@ -175,6 +189,17 @@ class PluginConfig(BaseSettings):
         default=15728640 * 12,
     )
 
+    PLUGIN_TOOL_PROVIDER_CACHE_TTL: NonNegativeInt = Field(
+        description="Time in seconds the plugin tool providers of a workspace are cached in each process."
+        " Set to 0 to disable the cache.",
+        default=300,
+    )
+
+    PLUGIN_TOOL_PROVIDER_CACHE_SIZE: PositiveInt = Field(
+        description="Maximum number of workspaces whose plugin tool providers are cached in each process",
+        default=1024,
+    )
+
 
 class MarketplaceConfig(BaseSettings):
     """
@@ -381,6 +406,26 @@ class HttpConfig(BaseSettings):
         default=5,
     )
 
+    SSRF_POOL_MAX_CONNECTIONS: PositiveInt = Field(
+        description="Maximum number of concurrent connections per process for network requests (SSRF)",
+        default=100,
+    )
+
+    SSRF_POOL_MAX_KEEPALIVE_CONNECTIONS: NonNegativeInt = Field(
+        description="Maximum number of idle keep-alive connections per process for network requests (SSRF)",
+        default=20,
+    )
+
+    SSRF_POOL_KEEPALIVE_EXPIRY: PositiveFloat = Field(
+        description="Time in seconds an idle keep-alive connection is kept open for network requests (SSRF)",
+        default=5.0,
+    )
+
+    SSRF_POOL_HTTP2_ENABLED: bool = Field(
+        description="Negotiate HTTP/2 for network requests (SSRF) when the 'h2' package is installed",
+        default=False,
+    )
+
     RESPECT_XFORWARD_HEADERS_ENABLED: bool = Field(
         description="Enable handling of X-Forwarded-For, X-Forwarded-Proto, and X-Forwarded-Port headers"
         " when the app is behind a single trusted reverse proxy.",
@@ -460,6 +505,17 @@ class ModelLoadBalanceConfig(BaseSettings):
         default=False,
     )
 
+    PROVIDER_CONFIGURATIONS_CACHE_TTL: NonNegativeInt = Field(
+        description="Time in seconds the model provider configurations of a workspace are cached in each process."
+        " Set to 0 to disable the cache.",
+        default=300,
+    )
+
+    PROVIDER_CONFIGURATIONS_CACHE_SIZE: PositiveInt = Field(
+        description="Maximum number of workspaces whose model provider configurations are cached in each process",
+        default=1024,
+    )
+
 
 class BillingConfig(BaseSettings):
     """
@@ -529,6 +585,18 @@ class WorkflowNodeExecutionConfig(BaseSettings):
         description="Storage backend for WorkflowNodeExecution. Options: 'rdbms', 'hybrid'",
     )
 
+    WORKFLOW_NODE_EXECUTION_BUFFER_ENABLED: bool = Field(
+        description="Keep the node executions of a running workflow in memory and write them to the database"
+        " in batches instead of committing every node start, retry, success and failure",
+        default=False,
+    )
+
+    WORKFLOW_NODE_EXECUTION_BUFFER_FLUSH_SIZE: PositiveInt = Field(
+        description="Number of finished node executions buffered before they are written in one batch,"
+        " the rest are written when the workflow run ends",
+        default=20,
+    )
+
 
 class AuthConfig(BaseSettings):
     """
@@ -677,10 +745,20 @@ class RagEtlConfig(BaseSettings):
 
     KEYWORD_DATA_SOURCE_TYPE: str = Field(
         description="Data source type for keyword extraction"
-        " ('database' or other supported types), default to 'database'",
+        " ('database', 'segmented' or other supported types), default to 'database'",
         default="database",
     )
 
+    KEYWORD_TABLE_MAX_SEGMENTS: PositiveInt = Field(
+        description="Maximum number of segments of a 'segmented' keyword table before the newest ones are merged",
+        default=16,
+    )
+
+    KEYWORD_TABLE_CACHE_SIZE: PositiveInt = Field(
+        description="Maximum number of 'segmented' keyword tables kept in memory per process",
+        default=128,
+    )
+
     UNSTRUCTURED_API_URL: Optional[str] = Field(
         description="API URL for Unstructured.io service",
         default=None,
@@ -696,6 +774,27 @@ class RagEtlConfig(BaseSettings):
         default="false",
     )
 
+    EXTRACTED_TEXT_CACHE_LOCAL_MAX_SIZE: NonNegativeInt = Field(
+        description="Maximum size in bytes of the text extracted from files kept in memory per process."
+        " Set to 0 to disable the in-memory tier.",
+        default=64 * 1024 * 1024,
+    )
+
+    EXTRACTED_TEXT_CACHE_STORAGE_ENABLED: bool = Field(
+        description="Whether to keep the text extracted from files in the storage, so it is reused across processes",
+        default=True,
+    )
+
+    PDF_EXTRACT_PARALLEL_MIN_PAGES: PositiveInt = Field(
+        description="Minimum number of pages of a PDF to extract its text in parallel processes",
+        default=64,
+    )
+
+    PDF_EXTRACT_MAX_WORKERS: NonNegativeInt = Field(
+        description="Maximum number of processes extracting the text of a large PDF. Set to 0 or 1 to disable.",
+        default=4,
+    )
+
 
 class DataSetConfig(BaseSettings):
     """
@@ -759,6 +858,36 @@ class IndexingConfig(BaseSettings):
         default=50,
     )
 
+    INDEXING_PIPELINE_BATCH_SIZE: PositiveInt = Field(
+        description="Number of extracted pages or parts of a document transformed, saved and indexed as one batch",
+        default=20,
+    )
+
+    INDEXING_PIPELINE_TRANSFORM_WORKERS: PositiveInt = Field(
+        description="Number of threads cleaning and splitting batches of a document during indexing",
+        default=2,
+    )
+
+    INDEXING_PIPELINE_EMBED_WORKERS: PositiveInt = Field(
+        description="Number of threads embedding and writing the segments of a document to the vector store",
+        default=10,
+    )
+
+    INDEXING_PIPELINE_MAX_PENDING_BATCHES: PositiveInt = Field(
+        description="Maximum number of batches of a document waiting between two indexing stages",
+        default=4,
+    )
+
+    EMBEDDING_CACHE_BATCH_SIZE: PositiveInt = Field(
+        description="Maximum number of text hashes looked up or inserted per query in the document embedding cache",
+        default=500,
+    )
+
+    EMBEDDING_CACHE_MEMORY_SIZE: NonNegativeInt = Field(
+        description="Maximum number of document embeddings kept in an in-process LRU cache, 0 to disable",
+        default=10000,
+    )
+
 
 class MultiModalTransferConfig(BaseSettings):
     MULTIMODAL_SEND_FORMAT: Literal["base64", "url"] = Field(
@@ -24,6 +24,7 @@ from .vdb.couchbase_config import CouchbaseConfig
 from .vdb.elasticsearch_config import ElasticsearchConfig
 from .vdb.huawei_cloud_config import HuaweiCloudConfig
 from .vdb.lindorm_config import LindormConfig
+from .vdb.local_vector_config import LocalVectorConfig
 from .vdb.milvus_config import MilvusConfig
 from .vdb.myscale_config import MyScaleConfig
 from .vdb.oceanbase_config import OceanBaseVectorConfig
@@ -71,6 +72,33 @@ class StorageConfig(BaseSettings):
         deprecated=True,
     )
 
+    STORAGE_CACHE_ENABLED: bool = Field(
+        description="Enable a read-through cache of the storage on local disk",
+        default=False,
+    )
+
+    STORAGE_CACHE_PATH: str = Field(
+        description="Directory of the local disk cache of the storage, shared by the processes of a host",
+        default="storage_cache",
+    )
+
+    STORAGE_CACHE_MAX_SIZE: NonNegativeInt = Field(
+        description="Maximum size in bytes of the local disk cache of the storage",
+        default=1024 * 1024 * 1024,
+    )
+
+    STORAGE_CACHE_MAX_FILE_SIZE: NonNegativeInt = Field(
+        description="Maximum size in bytes of a single file kept in the local disk cache of the storage",
+        default=64 * 1024 * 1024,
+    )
+
+    STORAGE_CACHE_KEY_PREFIXES: str = Field(
+        description="Comma-separated prefixes of the files kept in the local disk cache of the storage."
+        " Only files that are never overwritten should be cached, as files overwritten or deleted"
+        " by another host are not invalidated. Leave empty to cache every file.",
+        default="upload_files/,image_files/,tools/,extracted_text/",
+    )
+
 
 class VectorStoreConfig(BaseSettings):
     VECTOR_STORE: Optional[str] = Field(
@@ -318,6 +346,7 @@ class MiddlewareConfig(
     UpstashConfig,
     TidbOnQdrantConfig,
     LindormConfig,
+    LocalVectorConfig,
     OceanBaseVectorConfig,
     BaiduVectorDBConfig,
     OpenGaussConfig,
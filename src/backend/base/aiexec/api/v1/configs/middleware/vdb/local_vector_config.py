@@ -0,0 +1,25 @@
+from pydantic import Field, PositiveInt
+from pydantic_settings import BaseSettings
+
+
+class LocalVectorConfig(BaseSettings):
+    """
+    Configuration settings for the local vector store, embedded in the API and worker processes
+    """
+
+    LOCAL_VECTOR_PATH: str = Field(
+        description="Directory where the local vector store keeps its collections,"
+        " it must be shared by the API and worker processes of the node",
+        default="storage/vector",
+    )
+
+    LOCAL_VECTOR_IVF_THRESHOLD: PositiveInt = Field(
+        description="Number of vectors from which a collection gets an IVF index,"
+        " smaller collections are fully scanned",
+        default=10000,
+    )
+
+    LOCAL_VECTOR_NPROBE: PositiveInt = Field(
+        description="Number of IVF lists scanned per search, higher values trade speed for recall",
+        default=8,
+    )
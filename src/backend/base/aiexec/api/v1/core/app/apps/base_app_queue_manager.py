@@ -1,5 +1,6 @@
 import queue
 import time
+import weakref
 from abc import abstractmethod
 from enum import Enum
 from typing import Any, Optional
@@ -25,6 +26,9 @@ class PublishFrom(Enum):
 
 
 class AppQueueManager:
+    # queue managers of the tasks running in this process, so a stop requested here is seen immediately
+    _running: "weakref.WeakValueDictionary[str, AppQueueManager]" = weakref.WeakValueDictionary()
+
     def __init__(self, task_id: str, user_id: str, invoke_from: InvokeFrom) -> None:
         if not user_id:
             raise ValueError("user is required")
@@ -41,6 +45,9 @@ class AppQueueManager:
         q: queue.Queue[WorkflowQueueMessage | MessageQueueMessage | None] = queue.Queue()
 
         self._q = q
+        self._stopped = False
+        self._last_stop_check: float = 0.0
+        AppQueueManager._running[task_id] = self
 
     def listen(self):
         """
@@ -126,14 +133,29 @@ class AppQueueManager:
         stopped_cache_key = cls._generate_stopped_cache_key(task_id)
         redis_client.setex(stopped_cache_key, 600, 1)
 
+        queue_manager = AppQueueManager._running.get(task_id)
+        if queue_manager is not None:
+            queue_manager._stopped = True
+
     def _is_stopped(self) -> bool:
         """
-        Check if task is stopped
+        Check if task is stopped.
+        Stops requested in this process are seen immediately, stops requested elsewhere are
+        read from redis at most once every APP_STOP_CHECK_INTERVAL seconds.
         :return:
         """
+        if self._stopped:
+            return True
+
+        now = time.monotonic()
+        if now - self._last_stop_check < aiexec_config.APP_STOP_CHECK_INTERVAL:
+            return False
+        self._last_stop_check = now
+
         stopped_cache_key = AppQueueManager._generate_stopped_cache_key(self._task_id)
         result = redis_client.get(stopped_cache_key)
         if result is not None:
+            self._stopped = True
             return True
 
         return False
@@ -18,6 +18,7 @@ from core.entities.provider_entities import (
 )
 from core.helper import encrypter
 from core.helper.model_provider_cache import ProviderCredentialsCache, ProviderCredentialsCacheType
+from core.helper.provider_configurations_cache import provider_configurations_cache
 from core.model_runtime.entities.model_entities import AIModelEntity, FetchFrom, ModelType
 from core.model_runtime.entities.provider_entities import (
     ConfigurateMethod,
@@ -279,6 +280,7 @@ class ProviderConfiguration(BaseModel):
         )
 
         provider_model_credentials_cache.delete()
+        provider_configurations_cache.invalidate(self.tenant_id)
 
         self.switch_preferred_provider_type(ProviderType.CUSTOM)
 
@@ -304,6 +306,7 @@ class ProviderConfiguration(BaseModel):
             )
 
             provider_model_credentials_cache.delete()
+            provider_configurations_cache.invalidate(self.tenant_id)
 
     def get_custom_model_credentials(
         self, model_type: ModelType, model: str, obfuscated: bool = False
@@ -446,6 +449,7 @@ class ProviderConfiguration(BaseModel):
         )
 
         provider_model_credentials_cache.delete()
+        provider_configurations_cache.invalidate(self.tenant_id)
 
     def delete_custom_model_credentials(self, model_type: ModelType, model: str) -> None:
         """
@@ -469,6 +473,7 @@ class ProviderConfiguration(BaseModel):
             )
 
             provider_model_credentials_cache.delete()
+            provider_configurations_cache.invalidate(self.tenant_id)
 
     def _get_provider_model_setting(self, model_type: ModelType, model: str) -> ProviderModelSetting | None:
         """
@@ -513,6 +518,8 @@ class ProviderConfiguration(BaseModel):
             db.session.add(model_setting)
             db.session.commit()
 
+        provider_configurations_cache.invalidate(self.tenant_id)
+
         return model_setting
 
     def disable_model(self, model_type: ModelType, model: str) -> ProviderModelSetting:
@@ -538,6 +545,8 @@ class ProviderConfiguration(BaseModel):
             db.session.add(model_setting)
             db.session.commit()
 
+        provider_configurations_cache.invalidate(self.tenant_id)
+
         return model_setting
 
     def get_provider_model_setting(self, model_type: ModelType, model: str) -> Optional[ProviderModelSetting]:
@@ -611,6 +620,8 @@ class ProviderConfiguration(BaseModel):
             db.session.add(model_setting)
             db.session.commit()
 
+        provider_configurations_cache.invalidate(self.tenant_id)
+
         return model_setting
 
     def disable_model_load_balancing(self, model_type: ModelType, model: str) -> ProviderModelSetting:
@@ -650,6 +661,8 @@ class ProviderConfiguration(BaseModel):
             db.session.add(model_setting)
             db.session.commit()
 
+        provider_configurations_cache.invalidate(self.tenant_id)
+
         return model_setting
 
     def get_model_type_instance(self, model_type: ModelType) -> AIModel:
@@ -710,6 +723,7 @@ class ProviderConfiguration(BaseModel):
             db.session.add(preferred_model_provider)
 
         db.session.commit()
+        provider_configurations_cache.invalidate(self.tenant_id)
 
     def extract_secret_variables(self, credential_form_schemas: list[CredentialFormSchema]) -> list[str]:
         """
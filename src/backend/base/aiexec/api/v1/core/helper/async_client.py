@@ -0,0 +1,33 @@
+"""
+Lifetime of the async HTTP clients cached per event loop
+"""
+
+import contextlib
+from collections.abc import AsyncGenerator
+
+import httpx
+
+
+async def _close_with_loop(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+def close_on_loop_shutdown(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    """
+    Close a client when the running event loop shuts down, e.g. at the end of `asyncio.run`.
+
+    The client is closed by an async generator suspended until the loop finalizes its async
+    generators in `shutdown_asyncgens`. The loop only keeps a weak reference to it, so the
+    caller must keep the returned generator as long as the client is cached.
+
+    :param client: client created on the running event loop
+    :return: the generator closing the client
+    """
+    closer = _close_with_loop(client)
+    # run up to the yield, which registers the generator with the hooks of the running loop
+    with contextlib.suppress(StopIteration):
+        closer.asend(None).send(None)
+    return closer
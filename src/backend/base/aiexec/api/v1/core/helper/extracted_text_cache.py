@@ -0,0 +1,186 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Optional, cast
+
+from cachetools import LRUCache
+
+from configs import aiexec_config
+from extensions.ext_storage import storage
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractedTextCache:
+    """
+    Content-addressed cache of the text extracted from files.
+
+    Entries are keyed by the hash of the file content and the extractor that produced them,
+    including its version and options, so the same file is parsed once no matter how many
+    workflow runs or datasets use it. Values are JSON serializable and stored in two tiers:
+    an in-memory LRU bounded by `EXTRACTED_TEXT_CACHE_LOCAL_MAX_SIZE` bytes in every process,
+    and the storage when `EXTRACTED_TEXT_CACHE_STORAGE_ENABLED` is set, shared by all processes.
+    The storage keeps one file per key, which is never overwritten with a different value,
+    under a directory per file content that is deleted with `delete` when the upload files of
+    the content are deleted.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._local: LRUCache = LRUCache(maxsize=max(max_size, 1), getsizeof=len)
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.storage_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_content(content: bytes) -> str:
+        return hashlib.sha3_256(content).hexdigest()
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        with open(file_path, "rb") as f:
+            return hashlib.file_digest(f, "sha3_256").hexdigest()
+
+    @staticmethod
+    def make_key(content_hash: str, *extractor: str) -> str:
+        """
+        Make the key of the text extracted from a file.
+
+        :param content_hash: `hash_content` of the file content
+        :param extractor: the name, version and options of the extractor
+        :return:
+        """
+        extractor_hash = hashlib.sha256("\0".join(extractor).encode("utf-8")).hexdigest()[:16]
+        return f"{content_hash}-{extractor_hash}"
+
+    @staticmethod
+    def _storage_dir(content_hash: str) -> str:
+        return f"extracted_text/{content_hash}"
+
+    def _storage_key(self, key: str) -> str:
+        content_hash, _, _ = key.partition("-")
+        return f"{self._storage_dir(content_hash)}/{key}.json"
+
+    def _load_stored(self, key: str) -> Optional[bytes]:
+        storage_key = self._storage_key(key)
+        try:
+            # not every storage raises FileNotFoundError for a missing file
+            if not storage.exists(storage_key):
+                return None
+            return cast(bytes, storage.load_once(storage_key))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning(f"Failed to load extracted text {key} from storage", exc_info=True)
+            return None
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get the cached extracted text.
+
+        :param key: the `make_key` of the file and extractor
+        :return: the cached value, None on a miss
+        """
+        with self._lock:
+            data = self._local.get(key)
+            if data is not None:
+                self.local_hits += 1
+                return json.loads(data)
+
+        data = None
+        if aiexec_config.EXTRACTED_TEXT_CACHE_STORAGE_ENABLED:
+            data = self._load_stored(key)
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.storage_hits += 1
+            self._set_local(key, data)
+        return json.loads(data)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Cache extracted text.
+
+        :param key: the `make_key` of the file and extractor
+        :param value: JSON serializable extracted text
+        :return:
+        """
+        try:
+            data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        except (TypeError, ValueError):
+            logger.warning(f"Extracted text {key} is not JSON serializable, not caching it")
+            return
+
+        with self._lock:
+            self._set_local(key, data)
+
+        if aiexec_config.EXTRACTED_TEXT_CACHE_STORAGE_ENABLED:
+            try:
+                storage.save(self._storage_key(key), data)
+            except Exception:
+                logger.warning(f"Failed to save extracted text {key} to storage", exc_info=True)
+
+    def delete(self, content_hash: str) -> None:
+        """
+        Delete the texts extracted from a file content, once the files with the content are deleted.
+
+        Other processes keep their in-memory entries until they are evicted. On storages that
+        cannot be scanned, only the files of the keys cached in this process are deleted.
+
+        :param content_hash: `hash_content` of the file content, the `hash` of its upload file
+        :return:
+        """
+        with self._lock:
+            keys = [key for key in self._local if key.startswith(f"{content_hash}-")]
+            for key in keys:
+                del self._local[key]
+
+        if not aiexec_config.EXTRACTED_TEXT_CACHE_STORAGE_ENABLED:
+            return
+        try:
+            storage_keys = storage.scan(f"{self._storage_dir(content_hash)}/", files=True, directories=False)
+        except FileNotFoundError:
+            return
+        except NotImplementedError:
+            storage_keys = [self._storage_key(key) for key in keys]
+        except Exception:
+            logger.warning(f"Failed to list extracted text {content_hash} in storage", exc_info=True)
+            storage_keys = [self._storage_key(key) for key in keys]
+        for storage_key in storage_keys:
+            try:
+                if storage.exists(storage_key):
+                    storage.delete(storage_key)
+            except Exception:
+                logger.warning(f"Failed to delete extracted text {storage_key} from storage", exc_info=True)
+
+    def _set_local(self, key: str, data: bytes) -> None:
+        # Entries larger than the whole in-memory tier only live in the storage
+        if len(data) <= self._max_size:
+            self._local[key] = data
+
+    def info(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "local_hits": self.local_hits,
+                "storage_hits": self.storage_hits,
+                "misses": self.misses,
+                "local_size": int(self._local.currsize),
+                "local_max_size": self._max_size,
+            }
+
+    def clear(self) -> None:
+        """
+        Clear the in-memory tier of this process.
+        """
+        with self._lock:
+            self._local.clear()
+            self.local_hits = 0
+            self.storage_hits = 0
+            self.misses = 0
+
+
+extracted_text_cache = ExtractedTextCache(max_size=aiexec_config.EXTRACTED_TEXT_CACHE_LOCAL_MAX_SIZE)
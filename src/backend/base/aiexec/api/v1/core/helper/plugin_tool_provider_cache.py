@@ -0,0 +1,232 @@
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+from cachetools import TTLCache
+
+from configs import aiexec_config
+from extensions.ext_redis import redis_client
+
+if TYPE_CHECKING:
+    from core.plugin.entities.plugin_daemon import PluginToolProviderEntity
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "plugin_tool_providers:invalidate"
+
+
+class _TenantPluginToolProviders:
+    def __init__(self) -> None:
+        # Key: provider id, Value: the provider of the installed plugin
+        self.providers: dict[str, "PluginToolProviderEntity"] = {}
+        # all the providers of the workspace, once they are listed
+        self.all: Optional[list["PluginToolProviderEntity"]] = None
+
+
+class PluginToolProviderCache:
+    """
+    Per-process cache of the plugin tool providers installed in workspaces, as fetched from the plugin daemon.
+
+    Entries expire after `PLUGIN_TOOL_PROVIDER_CACHE_TTL` seconds. Installing, upgrading and
+    uninstalling plugins call `invalidate`, which drops the providers of the workspace locally
+    and publishes the workspace id on a Redis channel, so every other process drops them too.
+    Each process subscribes lazily on its first lookup and clears the whole cache whenever it
+    (re)subscribes, as invalidations published while it was disconnected are lost.
+
+    Callers get deep copies of the providers, as tool runtimes can modify their declarations.
+    Providers that are not found are not cached, so plugins are usable as soon as they are installed.
+    Plugins being debugged remotely change without going through the plugin service, so callers
+    must not cache their providers.
+    """
+
+    def __init__(self) -> None:
+        self._cache: TTLCache = TTLCache(
+            maxsize=aiexec_config.PLUGIN_TOOL_PROVIDER_CACHE_SIZE,
+            ttl=aiexec_config.PLUGIN_TOOL_PROVIDER_CACHE_TTL or 1,
+        )
+        self._lock = threading.Lock()
+        # Bumped by every invalidation of a workspace, and the epoch by every clear of the whole cache,
+        # so providers fetched before one are not cached after it
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self._listener_pid: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return aiexec_config.PLUGIN_TOOL_PROVIDER_CACHE_TTL > 0
+
+    def generation(self, tenant_id: str) -> tuple[int, int]:
+        """
+        Get the generation of the cached plugin tool providers of a workspace.
+
+        :param tenant_id: workspace id
+        :return: the generation to pass when caching providers fetched after reading it
+        """
+        with self._lock:
+            return self._epoch, self._generations.get(tenant_id, 0)
+
+    def get_provider(self, tenant_id: str, provider: str) -> Optional["PluginToolProviderEntity"]:
+        """
+        Get a cached plugin tool provider of a workspace.
+
+        :param tenant_id: workspace id
+        :param provider: provider id
+        :return:
+        """
+        if not self.enabled:
+            return None
+
+        self._ensure_listener()
+        with self._lock:
+            tenant_providers = self._cache.get(tenant_id)
+            provider_entity = tenant_providers.providers.get(provider) if tenant_providers else None
+            if provider_entity is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return provider_entity.model_copy(deep=True)
+
+    def set_provider(
+        self, tenant_id: str, provider: str, provider_entity: "PluginToolProviderEntity", generation: tuple[int, int]
+    ) -> None:
+        """
+        Cache a plugin tool provider of a workspace.
+
+        :param tenant_id: workspace id
+        :param provider: provider id
+        :param provider_entity: provider fetched from the plugin daemon
+        :param generation: the `generation` read before the provider was fetched
+        :return:
+        """
+        if not self.enabled:
+            return
+
+        provider_entity = provider_entity.model_copy(deep=True)
+        with self._lock:
+            if generation == (self._epoch, self._generations.get(tenant_id, 0)):
+                self._tenant_providers(tenant_id).providers[provider] = provider_entity
+
+    def get_providers(self, tenant_id: str) -> Optional[list["PluginToolProviderEntity"]]:
+        """
+        Get all the cached plugin tool providers of a workspace.
+
+        :param tenant_id: workspace id
+        :return:
+        """
+        if not self.enabled:
+            return None
+
+        self._ensure_listener()
+        with self._lock:
+            tenant_providers = self._cache.get(tenant_id)
+            provider_entities = tenant_providers.all if tenant_providers else None
+            if provider_entities is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return [provider_entity.model_copy(deep=True) for provider_entity in provider_entities]
+
+    def set_providers(
+        self, tenant_id: str, provider_entities: list["PluginToolProviderEntity"], generation: tuple[int, int]
+    ) -> None:
+        """
+        Cache all the plugin tool providers of a workspace.
+
+        :param tenant_id: workspace id
+        :param provider_entities: providers fetched from the plugin daemon
+        :param generation: the `generation` read before the providers were fetched
+        :return:
+        """
+        if not self.enabled:
+            return
+
+        provider_entities = [provider_entity.model_copy(deep=True) for provider_entity in provider_entities]
+        with self._lock:
+            if generation == (self._epoch, self._generations.get(tenant_id, 0)):
+                tenant_providers = self._tenant_providers(tenant_id)
+                tenant_providers.all = provider_entities
+                for provider_entity in provider_entities:
+                    tenant_providers.providers[provider_entity.declaration.identity.name] = provider_entity
+
+    def invalidate(self, tenant_id: str) -> None:
+        """
+        Drop the cached plugin tool providers of a workspace in every process.
+
+        :param tenant_id: workspace id
+        :return:
+        """
+        self._evict(tenant_id)
+        try:
+            redis_client.publish(INVALIDATION_CHANNEL, tenant_id)
+        except Exception:
+            logger.exception("Failed to publish plugin tool providers invalidation of tenant %s", tenant_id)
+
+    def clear(self) -> None:
+        self._evict_all()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._cache),
+                "maxsize": int(self._cache.maxsize),
+            }
+
+    def _tenant_providers(self, tenant_id: str) -> _TenantPluginToolProviders:
+        tenant_providers = self._cache.get(tenant_id)
+        if tenant_providers is None:
+            tenant_providers = _TenantPluginToolProviders()
+            self._cache[tenant_id] = tenant_providers
+        return tenant_providers
+
+    def _evict(self, tenant_id: str) -> None:
+        with self._lock:
+            self._cache.pop(tenant_id, None)
+            self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+
+    def _evict_all(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def _ensure_listener(self) -> None:
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            # A forked process inherits the entries but not the listener thread of its parent
+            self._cache.clear()
+            self._generations.clear()
+            self._epoch += 1
+            self._listener_pid = pid
+        threading.Thread(target=self._listen, name="plugin-tool-providers-invalidation", daemon=True).start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                self._evict_all()
+                for message in pubsub.listen():
+                    if message and message.get("type") == "message":
+                        data = message["data"]
+                        self._evict(data.decode("utf-8") if isinstance(data, bytes) else str(data))
+            except Exception:
+                logger.exception("Plugin tool providers invalidation listener failed, resubscribing")
+                self._evict_all()
+                time.sleep(1)
+
+
+plugin_tool_provider_cache = PluginToolProviderCache()
@@ -0,0 +1,154 @@
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+from cachetools import TTLCache
+
+from configs import aiexec_config
+from extensions.ext_redis import redis_client
+
+if TYPE_CHECKING:
+    from core.entities.provider_configuration import ProviderConfigurations
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "provider_configurations:invalidate"
+
+
+class ProviderConfigurationsCache:
+    """
+    Per-process cache of the provider configurations of workspaces.
+
+    Entries expire after `PROVIDER_CONFIGURATIONS_CACHE_TTL` seconds. Writes to providers,
+    credentials and model settings call `invalidate`, which drops the entry of the workspace
+    locally and publishes the workspace id on a Redis channel, so every other process drops it too.
+    Each process subscribes lazily on its first lookup and clears the whole cache whenever it
+    (re)subscribes, as invalidations published while it was disconnected are lost.
+    """
+
+    def __init__(self) -> None:
+        self._cache: TTLCache = TTLCache(
+            maxsize=aiexec_config.PROVIDER_CONFIGURATIONS_CACHE_SIZE,
+            ttl=aiexec_config.PROVIDER_CONFIGURATIONS_CACHE_TTL or 1,
+        )
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, so configurations built before one are not cached after it
+        self._generation = 0
+        self._listener_pid: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return aiexec_config.PROVIDER_CONFIGURATIONS_CACHE_TTL > 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, tenant_id: str) -> Optional["ProviderConfigurations"]:
+        """
+        Get the cached provider configurations of a workspace.
+
+        :param tenant_id: workspace id
+        :return:
+        """
+        if not self.enabled:
+            return None
+
+        self._ensure_listener()
+        with self._lock:
+            provider_configurations = self._cache.get(tenant_id)
+            if provider_configurations is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return provider_configurations
+
+    def set(self, tenant_id: str, provider_configurations: "ProviderConfigurations", generation: int) -> None:
+        """
+        Cache the provider configurations of a workspace.
+
+        :param tenant_id: workspace id
+        :param provider_configurations: provider configurations
+        :param generation: the `generation` read before the configurations were built
+        :return:
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if generation == self._generation:
+                self._cache[tenant_id] = provider_configurations
+
+    def invalidate(self, tenant_id: str) -> None:
+        """
+        Drop the cached provider configurations of a workspace in every process.
+
+        :param tenant_id: workspace id
+        :return:
+        """
+        self._evict(tenant_id)
+        try:
+            redis_client.publish(INVALIDATION_CHANNEL, tenant_id)
+        except Exception:
+            logger.exception("Failed to publish provider configurations invalidation of tenant %s", tenant_id)
+
+    def clear(self) -> None:
+        self._evict_all()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._cache),
+                "maxsize": int(self._cache.maxsize),
+            }
+
+    def _evict(self, tenant_id: str) -> None:
+        with self._lock:
+            self._cache.pop(tenant_id, None)
+            self._generation += 1
+
+    def _evict_all(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._generation += 1
+
+    def _ensure_listener(self) -> None:
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            # A forked process inherits the entries but not the listener thread of its parent
+            self._cache.clear()
+            self._generation += 1
+            self._listener_pid = pid
+        threading.Thread(target=self._listen, name="provider-configurations-invalidation", daemon=True).start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                self._evict_all()
+                for message in pubsub.listen():
+                    if message and message.get("type") == "message":
+                        data = message["data"]
+                        self._evict(data.decode("utf-8") if isinstance(data, bytes) else str(data))
+            except Exception:
+                logger.exception("Provider configurations invalidation listener failed, resubscribing")
+                self._evict_all()
+                time.sleep(1)
+
+
+provider_configurations_cache = ProviderConfigurationsCache()
@@ -2,12 +2,21 @@
 Proxy requests to avoid SSRF
 """
 
+import asyncio
 import logging
+import os
+import threading
 import time
+import weakref
+from collections.abc import AsyncGenerator
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from importlib.util import find_spec
+from typing import Any
 
 import httpx
 
 from configs import aiexec_config
+from core.helper.async_client import close_on_loop_shutdown
 
 SSRF_DEFAULT_MAX_RETRIES = aiexec_config.SSRF_DEFAULT_MAX_RETRIES
 
@@ -27,6 +36,9 @@ except NameError:
 BACKOFF_FACTOR = 0.5
 STATUS_FORCELIST = [429, 500, 502, 503, 504]
 
+# HTTP/2 needs the optional 'h2' package, fall back to HTTP/1.1 without it
+SSRF_HTTP2_ENABLED = aiexec_config.SSRF_POOL_HTTP2_ENABLED and find_spec("h2") is not None
+
 
 class MaxRetriesExceededError(ValueError):
     """Raised when the maximum number of retries is exceeded."""
@@ -34,7 +46,144 @@ class MaxRetriesExceededError(ValueError):
     pass
 
 
-def make_request(method, url, max_retries=SSRF_DEFAULT_MAX_RETRIES, **kwargs):
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=aiexec_config.SSRF_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=aiexec_config.SSRF_POOL_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=aiexec_config.SSRF_POOL_KEEPALIVE_EXPIRY,
+    )
+
+
+def _cookieless_jar() -> CookieJar:
+    """A cookie jar that never stores cookies, as the pooled clients are shared by every tenant."""
+    # No domain is allowed, so the cookies set by responses are dropped and none is sent back
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def _client_kwargs(ssl_verify: bool, transport_cls: type) -> dict[str, Any]:
+    """Build the keyword arguments of a pooled client going through the configured SSRF proxy."""
+    kwargs: dict[str, Any] = {
+        "verify": ssl_verify,
+        "limits": _pool_limits(),
+        "http2": SSRF_HTTP2_ENABLED,
+        "cookies": _cookieless_jar(),
+    }
+    if aiexec_config.SSRF_PROXY_ALL_URL:
+        kwargs["proxy"] = aiexec_config.SSRF_PROXY_ALL_URL
+    elif aiexec_config.SSRF_PROXY_HTTP_URL and aiexec_config.SSRF_PROXY_HTTPS_URL:
+        kwargs["mounts"] = {
+            "http://": transport_cls(
+                proxy=aiexec_config.SSRF_PROXY_HTTP_URL,
+                verify=ssl_verify,
+                limits=kwargs["limits"],
+                http2=SSRF_HTTP2_ENABLED,
+            ),
+            "https://": transport_cls(
+                proxy=aiexec_config.SSRF_PROXY_HTTPS_URL,
+                verify=ssl_verify,
+                limits=kwargs["limits"],
+                http2=SSRF_HTTP2_ENABLED,
+            ),
+        }
+    return kwargs
+
+
+class _ClientPool:
+    """Long-lived pooled clients of the current process, one per SSL verification mode.
+
+    Connections are kept alive between requests instead of opening a new client (and
+    proxy transports) for every request. The clients are shared by every tenant, so they
+    never keep the cookies set by responses. A forked worker must not share the sockets
+    of its parent, so the clients are dropped, without closing them, in the child.
+    Async clients are bound to the event loop they were created on, and closed when it shuts down.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._clients: dict[bool, httpx.Client] = {}
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[bool, httpx.AsyncClient]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._async_closers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, list[AsyncGenerator]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.requests = 0
+        self.clients_created = 0
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            self._reset()
+
+    def get_client(self, ssl_verify: bool) -> httpx.Client:
+        self._check_pid()
+        client = self._clients.get(ssl_verify)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(ssl_verify)
+                if client is None:
+                    client = httpx.Client(**_client_kwargs(ssl_verify, httpx.HTTPTransport))
+                    self._clients[ssl_verify] = client
+                    self.clients_created += 1
+        self.requests += 1
+        return client
+
+    def get_async_client(self, ssl_verify: bool) -> httpx.AsyncClient:
+        self._check_pid()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(ssl_verify)
+            if client is None:
+                client = httpx.AsyncClient(**_client_kwargs(ssl_verify, httpx.AsyncHTTPTransport))
+                clients[ssl_verify] = client
+                self._async_closers.setdefault(loop, []).append(close_on_loop_shutdown(client))
+                self.clients_created += 1
+        self.requests += 1
+        return client
+
+    def stats(self) -> dict[str, Any]:
+        self._check_pid()
+        with self._lock:
+            clients: list[httpx.Client | httpx.AsyncClient] = list(self._clients.values())
+            for async_clients in self._async_clients.values():
+                clients.extend(async_clients.values())
+        # httpx does not expose its pools, read them from the underlying httpcore transports
+        pools = [
+            pool
+            for client in clients
+            for transport in [client._transport, *client._mounts.values()]
+            if (pool := getattr(transport, "_pool", None)) is not None
+        ]
+        connections = [connection for pool in pools for connection in pool.connections]
+        return {
+            "pid": self._pid,
+            "http2": SSRF_HTTP2_ENABLED,
+            "max_connections": aiexec_config.SSRF_POOL_MAX_CONNECTIONS,
+            "max_keepalive_connections": aiexec_config.SSRF_POOL_MAX_KEEPALIVE_CONNECTIONS,
+            "keepalive_expiry": aiexec_config.SSRF_POOL_KEEPALIVE_EXPIRY,
+            "clients": self.clients_created,
+            "requests": self.requests,
+            "connections": len(connections),
+            "idle_connections": sum(1 for connection in connections if connection.is_idle()),
+        }
+
+
+_client_pool = _ClientPool()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_client_pool._reset)
+
+
+def get_pool_stats() -> dict[str, Any]:
+    """Connection pool statistics of the current process."""
+    return _client_pool.stats()
+
+
+def _prepare_kwargs(kwargs: dict[str, Any]) -> bool:
+    """Apply the default request options in place and return whether to verify SSL."""
     if "allow_redirects" in kwargs:
         allow_redirects = kwargs.pop("allow_redirects")
         if "follow_redirects" not in kwargs:
@@ -48,27 +197,17 @@ def make_request(method, url, max_retries=SSRF_DEFAULT_MAX_RETRIES, **kwargs):
             write=aiexec_config.SSRF_DEFAULT_WRITE_TIME_OUT,
         )
 
-    if "ssl_verify" not in kwargs:
-        kwargs["ssl_verify"] = HTTP_REQUEST_NODE_SSL_VERIFY
+    return kwargs.pop("ssl_verify", HTTP_REQUEST_NODE_SSL_VERIFY)
 
-    ssl_verify = kwargs.pop("ssl_verify")
+
+def make_request(method, url, max_retries=SSRF_DEFAULT_MAX_RETRIES, **kwargs):
+    ssl_verify = _prepare_kwargs(kwargs)
 
     retries = 0
     while retries <= max_retries:
         try:
-            if aiexec_config.SSRF_PROXY_ALL_URL:
-                with httpx.Client(proxy=aiexec_config.SSRF_PROXY_ALL_URL, verify=ssl_verify) as client:
-                    response = client.request(method=method, url=url, **kwargs)
-            elif aiexec_config.SSRF_PROXY_HTTP_URL and aiexec_config.SSRF_PROXY_HTTPS_URL:
-                proxy_mounts = {
-                    "http://": httpx.HTTPTransport(proxy=aiexec_config.SSRF_PROXY_HTTP_URL, verify=ssl_verify),
-                    "https://": httpx.HTTPTransport(proxy=aiexec_config.SSRF_PROXY_HTTPS_URL, verify=ssl_verify),
-                }
-                with httpx.Client(mounts=proxy_mounts, verify=ssl_verify) as client:
-                    response = client.request(method=method, url=url, **kwargs)
-            else:
-                with httpx.Client(verify=ssl_verify) as client:
-                    response = client.request(method=method, url=url, **kwargs)
+            client = _client_pool.get_client(ssl_verify)
+            response = client.request(method=method, url=url, **kwargs)
 
             if response.status_code not in STATUS_FORCELIST:
                 return response
@@ -86,6 +225,31 @@ def make_request(method, url, max_retries=SSRF_DEFAULT_MAX_RETRIES, **kwargs):
     raise MaxRetriesExceededError(f"Reached maximum retries ({max_retries}) for URL {url}")
 
 
+async def make_request_async(method, url, max_retries=SSRF_DEFAULT_MAX_RETRIES, **kwargs):
+    ssl_verify = _prepare_kwargs(kwargs)
+
+    retries = 0
+    while retries <= max_retries:
+        try:
+            client = _client_pool.get_async_client(ssl_verify)
+            response = await client.request(method=method, url=url, **kwargs)
+
+            if response.status_code not in STATUS_FORCELIST:
+                return response
+            else:
+                logging.warning(f"Received status code {response.status_code} for URL {url} which is in the force list")
+
+        except httpx.RequestError as e:
+            logging.warning(f"Request to URL {url} failed on attempt {retries + 1}: {e}")
+            if max_retries == 0:
+                raise
+
+        retries += 1
+        if retries <= max_retries:
+            await asyncio.sleep(BACKOFF_FACTOR * (2 ** (retries - 1)))
+    raise MaxRetriesExceededError(f"Reached maximum retries ({max_retries}) for URL {url}")
+
+
 def get(url, max_retries=SSRF_DEFAULT_MAX_RETRIES, **kwargs):
     return make_request("GET", url, max_retries=max_retries, **kwargs)
 
@@ -6,15 +6,19 @@ import re
 import threading
 import time
 import uuid
-from typing import Any, Optional, cast
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, Optional, TypeVar, cast
 
 from flask import current_app
 from flask_login import current_user
+from sqlalchemy import func
 from sqlalchemy.orm.exc import ObjectDeletedError
 
 from configs import aiexec_config
 from core.entities.knowledge_entities import IndexingEstimate, PreviewDetail, QAPreviewDetail
 from core.errors.error import ProviderTokenNotInitError
+from core.helper.extracted_text_cache import extracted_text_cache
 from core.model_manager import ModelInstance, ModelManager
 from core.model_runtime.entities.model_entities import ModelType
 from core.rag.cleaner.clean_processor import CleanProcessor
@@ -38,8 +42,15 @@ from libs import helper
 from models.dataset import ChildChunk, Dataset, DatasetProcessRule, DocumentSegment
 from models.dataset import Document as DatasetDocument
 from models.model import UploadFile
+from services.entities.knowledge_entities.knowledge_entities import ParentMode
 from services.feature_service import FeatureService
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# seconds a progress checkpoint of an interrupted indexing job is kept
+INDEXING_CHECKPOINT_EXPIRY = 7 * 24 * 60 * 60
+
 
 class IndexingRunner:
     def __init__(self):
@@ -66,22 +77,17 @@ class IndexingRunner:
                     raise ValueError("no process rule found")
                 index_type = dataset_document.doc_form
                 index_processor = IndexProcessorFactory(index_type).init_index_processor()
+                self._delete_checkpoint(dataset_document.id)
                 # extract
                 text_docs = self._extract(index_processor, dataset_document, processing_rule.to_dict())
 
-                # transform
-                documents = self._transform(
-                    index_processor, dataset, text_docs, dataset_document.doc_language, processing_rule.to_dict()
-                )
-                # save segment
-                self._load_segments(dataset, dataset_document, documents)
-
-                # load
-                self._load(
+                # transform, save segment and load
+                self._run_pipeline(
                     index_processor=index_processor,
                     dataset=dataset,
                     dataset_document=dataset_document,
-                    documents=documents,
+                    text_docs=text_docs,
+                    process_rule=processing_rule.to_dict(),
                 )
             except DocumentIsPausedError:
                 raise DocumentIsPausedError("Document paused, document id: {}".format(dataset_document.id))
@@ -108,13 +114,31 @@ class IndexingRunner:
             if not dataset:
                 raise ValueError("no dataset found")
 
-            # get exist document_segment list and delete
-            document_segments = (
-                db.session.query(DocumentSegment)
-                .filter_by(dataset_id=dataset.id, document_id=dataset_document.id)
-                .all()
+            index_type = dataset_document.doc_form
+            index_processor = IndexProcessorFactory(index_type).init_index_processor()
+
+            # resume after the batches committed before the job was interrupted
+            checkpoint = self._get_checkpoint(dataset_document.id)
+
+            # get exist document_segment list and delete, keeping the segments of committed batches
+            document_segments_query = db.session.query(DocumentSegment).filter_by(
+                dataset_id=dataset.id, document_id=dataset_document.id
             )
+            if checkpoint:
+                # later batches may have completed, but were not committed in order before the interruption
+                document_segments_query = document_segments_query.filter(
+                    DocumentSegment.position > checkpoint["position"]
+                )
+            document_segments = document_segments_query.all()
 
+            if document_segments:
+                # batches that were not committed may already be partly indexed
+                index_processor.clean(
+                    dataset,
+                    [document_segment.index_node_id for document_segment in document_segments],
+                    with_keywords=True,
+                    delete_child_chunks=True,
+                )
             for document_segment in document_segments:
                 db.session.delete(document_segment)
                 if dataset_document.doc_form == IndexType.PARENT_CHILD_INDEX:
@@ -130,21 +154,17 @@ class IndexingRunner:
             if not processing_rule:
                 raise ValueError("no process rule found")
 
-            index_type = dataset_document.doc_form
-            index_processor = IndexProcessorFactory(index_type).init_index_processor()
             # extract
             text_docs = self._extract(index_processor, dataset_document, processing_rule.to_dict())
 
-            # transform
-            documents = self._transform(
-                index_processor, dataset, text_docs, dataset_document.doc_language, processing_rule.to_dict()
-            )
-            # save segment
-            self._load_segments(dataset, dataset_document, documents)
-
-            # load
-            self._load(
-                index_processor=index_processor, dataset=dataset, dataset_document=dataset_document, documents=documents
+            # transform, save segment and load
+            self._run_pipeline(
+                index_processor=index_processor,
+                dataset=dataset,
+                dataset_document=dataset_document,
+                text_docs=text_docs,
+                process_rule=processing_rule.to_dict(),
+                checkpoint=checkpoint,
             )
         except DocumentIsPausedError:
             raise DocumentIsPausedError("Document paused, document id: {}".format(dataset_document.id))
@@ -325,6 +345,8 @@ class IndexingRunner:
                             "Delete image_files failed while indexing_estimate, \
                                           image_upload_file_is: {}".format(upload_file_id)
                         )
+                    if image_file and image_file.hash:
+                        extracted_text_cache.delete(image_file.hash)
                     db.session.delete(image_file)
 
         if doc_form and doc_form == "qa_model":
@@ -511,6 +533,227 @@ class IndexingRunner:
 
         return [QAPreviewDetail(question=q, answer=re.sub(r"\n\s*", "\n", a.strip())) for q, a in matches if q and a]
 
+    def _run_pipeline(
+        self,
+        index_processor: BaseIndexProcessor,
+        dataset: Dataset,
+        dataset_document: DatasetDocument,
+        text_docs: list[Document],
+        process_rule: dict,
+        checkpoint: Optional[dict] = None,
+    ) -> None:
+        """
+        Transform, save and index the extracted documents as a pipeline of batches.
+
+        The extracted documents are split into batches of `INDEXING_PIPELINE_BATCH_SIZE`, which flow
+        through the transform workers, the segment writer and the embedding workers, with at most
+        `INDEXING_PIPELINE_MAX_PENDING_BATCHES` batches waiting between two stages, so embedding starts
+        with the first batch and only a few batches are held in memory.
+        After every batch is indexed, in order, the number of extracted documents done so far and the
+        last segment position of the batch are saved as a checkpoint, which `run_in_splitting_status`
+        resumes from.
+        """
+        max_pending = aiexec_config.INDEXING_PIPELINE_MAX_PENDING_BATCHES
+        flask_app = current_app._get_current_object()  # type: ignore
+        transform_embedding_model_instance = self._get_transform_embedding_model_instance(dataset)
+        embedding_model_instance = None
+        if dataset.indexing_technique == "high_quality":
+            embedding_model_instance = self.model_manager.get_model_instance(
+                tenant_id=dataset.tenant_id,
+                provider=dataset.embedding_model_provider,
+                model_type=ModelType.TEXT_EMBEDDING,
+                model=dataset.embedding_model,
+            )
+
+        done = checkpoint["text_docs"] if checkpoint else 0
+        tokens = checkpoint["tokens"] if checkpoint else 0
+        remaining_text_docs = deque(text_docs[done:])
+        del text_docs
+
+        # a full document parent is built from all the extracted documents at once
+        batch_size = aiexec_config.INDEXING_PIPELINE_BATCH_SIZE
+        rules = process_rule.get("rules") or {}
+        is_parent_child = dataset_document.doc_form == IndexType.PARENT_CHILD_INDEX
+        if is_parent_child and rules.get("parent_mode") == ParentMode.FULL_DOC:
+            batch_size = max(len(remaining_text_docs), 1)
+
+        def batches() -> Iterator[tuple[int, list[Document]]]:
+            end = done
+            while remaining_text_docs:
+                batch = [remaining_text_docs.popleft() for _ in range(min(batch_size, len(remaining_text_docs)))]
+                end += len(batch)
+                yield end, batch
+
+        def transform(batch: tuple[int, list[Document]]) -> tuple[int, list[Document]]:
+            end, batch_text_docs = batch
+            with flask_app.app_context():
+                return end, index_processor.transform(
+                    batch_text_docs,
+                    embedding_model_instance=transform_embedding_model_instance,
+                    process_rule=process_rule,
+                    tenant_id=dataset.tenant_id,
+                    doc_language=dataset_document.doc_language,
+                )
+
+        indexing_start_at = time.perf_counter()
+        transform_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=aiexec_config.INDEXING_PIPELINE_TRANSFORM_WORKERS
+        )
+        # keyword indexing of a dataset is serialized by its indexing lock
+        keyword_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        # Distribute documents to the embedding workers based on the hash values of page_content
+        # This is done to prevent multiple threads from processing the same document,
+        # Thereby avoiding potential database insertion deadlocks
+        embed_executors = [
+            concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            for _ in range(aiexec_config.INDEXING_PIPELINE_EMBED_WORKERS)
+        ]
+        pending: deque[tuple[int, int, list[concurrent.futures.Future]]] = deque()
+        try:
+            for end, documents in self._ordered_map(transform_executor, transform, batches(), max_pending):
+                self._check_document_paused_status(dataset_document.id)
+                # save segment
+                position = self._save_segment_batch(dataset, dataset_document, documents)
+
+                # load
+                futures = []
+                if dataset_document.doc_form != IndexType.PARENT_CHILD_INDEX:
+                    futures.append(
+                        keyword_executor.submit(
+                            self._process_keyword_index, flask_app, dataset.id, dataset_document.id, documents
+                        )
+                    )
+                if embedding_model_instance:
+                    document_groups: list[list[Document]] = [[] for _ in embed_executors]
+                    for document in documents:
+                        hash = helper.generate_text_hash(document.page_content)
+                        document_groups[int(hash, 16) % len(embed_executors)].append(document)
+                    for executor, chunk_documents in zip(embed_executors, document_groups):
+                        if chunk_documents:
+                            futures.append(
+                                executor.submit(
+                                    self._process_chunk,
+                                    flask_app,
+                                    index_processor,
+                                    chunk_documents,
+                                    dataset,
+                                    dataset_document,
+                                    embedding_model_instance,
+                                )
+                            )
+                pending.append((end, position, futures))
+
+                while pending and (len(pending) > max_pending or all(future.done() for future in pending[0][2])):
+                    tokens = self._commit_batch(dataset_document.id, *pending.popleft(), tokens=tokens)
+
+            # update document status to indexing
+            cur_time = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+            self._update_document_index_status(
+                document_id=dataset_document.id,
+                after_indexing_status="indexing",
+                extra_update_params={
+                    DatasetDocument.cleaning_completed_at: cur_time,
+                    DatasetDocument.splitting_completed_at: cur_time,
+                },
+            )
+
+            while pending:
+                tokens = self._commit_batch(dataset_document.id, *pending.popleft(), tokens=tokens)
+        finally:
+            for executor in [transform_executor, keyword_executor, *embed_executors]:
+                executor.shutdown(wait=True, cancel_futures=True)
+        indexing_end_at = time.perf_counter()
+
+        # update document status to completed
+        self._update_document_index_status(
+            document_id=dataset_document.id,
+            after_indexing_status="completed",
+            extra_update_params={
+                DatasetDocument.tokens: tokens,
+                DatasetDocument.completed_at: datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
+                DatasetDocument.indexing_latency: indexing_end_at - indexing_start_at,
+                DatasetDocument.error: None,
+            },
+        )
+        self._delete_checkpoint(dataset_document.id)
+
+    @staticmethod
+    def _ordered_map(
+        executor: concurrent.futures.Executor, fn: Callable[[T], R], items: Iterable[T], max_pending: int
+    ) -> Iterator[R]:
+        """
+        Map items with an executor, yielding results in order with at most `max_pending` items in flight.
+        """
+        pending: deque[concurrent.futures.Future] = deque()
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def _commit_batch(
+        self, document_id: str, end: int, position: int, futures: list[concurrent.futures.Future], tokens: int
+    ) -> int:
+        """
+        Wait until a batch is indexed and save the progress of the document as a checkpoint.
+        """
+        for future in futures:
+            tokens += future.result() or 0
+        redis_client.setex(
+            "document_{}_indexing_checkpoint".format(document_id),
+            INDEXING_CHECKPOINT_EXPIRY,
+            json.dumps({"text_docs": end, "position": position, "tokens": tokens}),
+        )
+        return tokens
+
+    @staticmethod
+    def _get_checkpoint(document_id: str) -> Optional[dict]:
+        checkpoint = redis_client.get("document_{}_indexing_checkpoint".format(document_id))
+        if not checkpoint:
+            return None
+        return cast(dict, json.loads(checkpoint))
+
+    @staticmethod
+    def _delete_checkpoint(document_id: str) -> None:
+        redis_client.delete("document_{}_indexing_checkpoint".format(document_id))
+
+    def _save_segment_batch(
+        self, dataset: Dataset, dataset_document: DatasetDocument, documents: list[Document]
+    ) -> int:
+        """
+        Save the segments of a batch and return the last position of the segments of the document.
+        """
+        # save node to document segment
+        doc_store = DatasetDocumentStore(
+            dataset=dataset, user_id=dataset_document.created_by, document_id=dataset_document.id
+        )
+
+        # add document segments
+        doc_store.add_documents(docs=documents, save_child=dataset_document.doc_form == IndexType.PARENT_CHILD_INDEX)
+
+        # update segment status to indexing
+        document_ids = [document.metadata["doc_id"] for document in documents]
+        db.session.query(DocumentSegment).filter(
+            DocumentSegment.document_id == dataset_document.id,
+            DocumentSegment.dataset_id == dataset.id,
+            DocumentSegment.index_node_id.in_(document_ids),
+        ).update(
+            {
+                DocumentSegment.status: "indexing",
+                DocumentSegment.indexing_at: datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
+            }
+        )
+        db.session.commit()
+
+        # batches are saved one after the other, so the segments of this batch are the last ones
+        max_position = (
+            db.session.query(func.max(DocumentSegment.position))
+            .filter(DocumentSegment.document_id == dataset_document.id)
+            .scalar()
+        )
+        return max_position or 0
+
     def _load(
         self,
         index_processor: BaseIndexProcessor,
@@ -691,6 +934,17 @@ class IndexingRunner:
         doc_language: str,
         process_rule: dict,
     ) -> list[Document]:
+        documents = index_processor.transform(
+            text_docs,
+            embedding_model_instance=self._get_transform_embedding_model_instance(dataset),
+            process_rule=process_rule,
+            tenant_id=dataset.tenant_id,
+            doc_language=doc_language,
+        )
+
+        return documents
+
+    def _get_transform_embedding_model_instance(self, dataset: Dataset) -> Optional[ModelInstance]:
         # get embedding model instance
         embedding_model_instance = None
         if dataset.indexing_technique == "high_quality":
@@ -706,16 +960,7 @@ class IndexingRunner:
                     tenant_id=dataset.tenant_id,
                     model_type=ModelType.TEXT_EMBEDDING,
                 )
-
-        documents = index_processor.transform(
-            text_docs,
-            embedding_model_instance=embedding_model_instance,
-            process_rule=process_rule,
-            tenant_id=dataset.tenant_id,
-            doc_language=doc_language,
-        )
-
-        return documents
+        return embedding_model_instance
 
     def _load_segments(self, dataset, dataset_document, documents):
         # save node to document segment
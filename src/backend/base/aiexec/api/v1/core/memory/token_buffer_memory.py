@@ -1,8 +1,12 @@
+import threading
+from collections import defaultdict
 from collections.abc import Sequence
 from typing import Optional
 
+from cachetools import LRUCache
+
 from core.app.app_config.features.file_upload.manager import FileUploadConfigManager
-from core.file import file_manager
+from core.file import FileUploadConfig, file_manager
 from core.model_manager import ModelInstance
 from core.model_runtime.entities import (
     AssistantPromptMessage,
@@ -17,7 +21,13 @@ from core.prompt.utils.extract_thread_messages import extract_thread_messages
 from extensions.ext_database import db
 from factories import file_factory
 from models.model import AppMode, Conversation, Message, MessageFile
-from models.workflow import WorkflowRun
+from models.workflow import Workflow, WorkflowRun
+
+# Token counts of history messages, keyed by message id, prompt message index, provider and model.
+# The query and answer of a message do not change once it is in the history.
+MESSAGE_TOKENS_CACHE_MAXSIZE = 10000
+_message_tokens_cache: LRUCache = LRUCache(maxsize=MESSAGE_TOKENS_CACHE_MAXSIZE)
+_message_tokens_cache_lock = threading.Lock()
 
 
 class TokenBufferMemory:
@@ -69,23 +79,47 @@ class TokenBufferMemory:
 
         messages = list(reversed(thread_messages))
 
+        message_files: dict[str, list[MessageFile]] = defaultdict(list)
+        if messages:
+            files = db.session.query(MessageFile).filter(MessageFile.message_id.in_([m.id for m in messages])).all()
+            for file in files:
+                message_files[file.message_id].append(file)
+
+        app_file_extra_config = None
+        # file upload config of each workflow run, converted once per workflow
+        workflow_run_file_extra_configs: dict[str, Optional[FileUploadConfig]] = {}
+        if message_files:
+            if self.conversation.mode not in {AppMode.ADVANCED_CHAT, AppMode.WORKFLOW}:
+                app_file_extra_config = FileUploadConfigManager.convert(self.conversation.model_config)
+            else:
+                workflow_run_ids = {m.workflow_run_id for m in messages if m.id in message_files and m.workflow_run_id}
+                if workflow_run_ids:
+                    workflow_ids = dict(
+                        db.session.query(WorkflowRun.id, WorkflowRun.workflow_id)
+                        .filter(WorkflowRun.id.in_(workflow_run_ids))
+                        .all()
+                    )
+                    workflow_file_extra_configs = {
+                        workflow.id: FileUploadConfigManager.convert(workflow.features_dict, is_vision=False)
+                        for workflow in db.session.query(Workflow)
+                        .filter(Workflow.id.in_(set(workflow_ids.values())))
+                        .all()
+                    }
+                    workflow_run_file_extra_configs = {
+                        workflow_run_id: workflow_file_extra_configs.get(workflow_id)
+                        for workflow_run_id, workflow_id in workflow_ids.items()
+                    }
+
         prompt_messages: list[PromptMessage] = []
+        prompt_message_keys: list[tuple[str, int]] = []
         for message in messages:
-            files = db.session.query(MessageFile).filter(MessageFile.message_id == message.id).all()
+            files = message_files.get(message.id)
             if files:
                 file_extra_config = None
                 if self.conversation.mode not in {AppMode.ADVANCED_CHAT, AppMode.WORKFLOW}:
-                    file_extra_config = FileUploadConfigManager.convert(self.conversation.model_config)
-                else:
-                    if message.workflow_run_id:
-                        workflow_run = (
-                            db.session.query(WorkflowRun).filter(WorkflowRun.id == message.workflow_run_id).first()
-                        )
-
-                        if workflow_run and workflow_run.workflow:
-                            file_extra_config = FileUploadConfigManager.convert(
-                                workflow_run.workflow.features_dict, is_vision=False
-                            )
+                    file_extra_config = app_file_extra_config
+                elif message.workflow_run_id:
+                    file_extra_config = workflow_run_file_extra_configs.get(message.workflow_run_id)
 
                 detail = ImagePromptMessageContent.DETAIL.LOW
                 if file_extra_config and app_record:
@@ -115,6 +149,7 @@ class TokenBufferMemory:
                 prompt_messages.append(UserPromptMessage(content=message.query))
 
             prompt_messages.append(AssistantPromptMessage(content=message.answer))
+            prompt_message_keys.extend([(message.id, 0), (message.id, 1)])
 
         if not prompt_messages:
             return []
@@ -123,13 +158,55 @@ class TokenBufferMemory:
         curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages)
 
         if curr_message_tokens > max_token_limit:
-            pruned_memory = []
-            while curr_message_tokens > max_token_limit and len(prompt_messages) > 1:
-                pruned_memory.append(prompt_messages.pop(0))
-                curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages)
+            start = self._get_prune_index(prompt_messages, prompt_message_keys, max_token_limit)
+            prompt_messages = prompt_messages[start:]
 
         return prompt_messages
 
+    def _get_prune_index(
+        self, prompt_messages: list[PromptMessage], prompt_message_keys: list[tuple[str, int]], max_token_limit: int
+    ) -> int:
+        """
+        Get the index of the first prompt message to keep so the history fits in the token limit.
+
+        Walks back from the newest message summing cached per-message token counts, so only the kept
+        messages are counted, then corrects the estimate with exact counts of the kept messages as
+        the tokens of a list are not always the sum of the tokens of its messages.
+        At least the last prompt message is always kept.
+        :param prompt_messages: prompt messages, oldest first
+        :param prompt_message_keys: (message id, index) of each prompt message
+        :param max_token_limit: max token limit
+        """
+        last = len(prompt_messages) - 1
+        start = last
+        total = 0
+        while start >= 0:
+            total += self._get_message_tokens(prompt_messages[start], prompt_message_keys[start])
+            if total > max_token_limit:
+                break
+            start -= 1
+        start = min(start + 1, last)
+
+        if start < last and self.model_instance.get_llm_num_tokens(prompt_messages[start:]) > max_token_limit:
+            start += 1
+            while start < last and self.model_instance.get_llm_num_tokens(prompt_messages[start:]) > max_token_limit:
+                start += 1
+        else:
+            while start > 0 and self.model_instance.get_llm_num_tokens(prompt_messages[start - 1 :]) <= max_token_limit:
+                start -= 1
+
+        return start
+
+    def _get_message_tokens(self, prompt_message: PromptMessage, key: tuple[str, int]) -> int:
+        cache_key = (*key, self.model_instance.provider, self.model_instance.model)
+        with _message_tokens_cache_lock:
+            tokens = _message_tokens_cache.get(cache_key)
+        if tokens is None:
+            tokens = self.model_instance.get_llm_num_tokens([prompt_message])
+            with _message_tokens_cache_lock:
+                _message_tokens_cache[cache_key] = tokens
+        return tokens
+
     def get_history_prompt_text(
         self,
         human_prefix: str = "Human",
@@ -1,15 +1,23 @@
+import asyncio
 import inspect
 import json
 import logging
-from collections.abc import Callable, Generator
-from typing import TypeVar
+import os
+import threading
+import weakref
+from collections.abc import AsyncGenerator, Callable, Generator
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, AnyStr, TypeVar
 
+import httpx
 import requests
 from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 from yarl import URL
 
 from configs import aiexec_config
+from core.helper.async_client import close_on_loop_shutdown
 from core.model_runtime.errors.invoke import (
     InvokeAuthorizationError,
     InvokeBadRequestError,
@@ -38,7 +46,93 @@ T = TypeVar("T", bound=(BaseModel | dict | list | bool | str))
 logger = logging.getLogger(__name__)
 
 
+class _PluginDaemonClients:
+    """Connection pools to the plugin daemon shared by every plugin client of a process.
+
+    The pools are shared by every tenant, so they never keep the cookies set by
+    responses. A forked worker must not share the sockets of its parent, so the
+    pools are dropped, without closing them, in the child. Async clients are bound
+    to the event loop they were created on, and closed when it shuts down.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._session: requests.Session | None = None
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, AsyncGenerator]
+        ] = weakref.WeakKeyDictionary()
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            self._reset()
+
+    def get_session(self) -> requests.Session:
+        self._check_pid()
+        session = self._session
+        if session is None:
+            with self._lock:
+                if self._session is None:
+                    adapter = HTTPAdapter(pool_maxsize=aiexec_config.PLUGIN_DAEMON_POOL_MAXSIZE)
+                    session = requests.Session()
+                    # No domain is allowed, so the cookies set by responses are dropped and none is sent back
+                    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+                session = self._session
+        return session
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        self._check_pid()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._async_clients.get(loop)
+            if entry is None:
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=aiexec_config.PLUGIN_DAEMON_POOL_MAXSIZE,
+                        max_keepalive_connections=aiexec_config.PLUGIN_DAEMON_POOL_MAXSIZE,
+                        keepalive_expiry=aiexec_config.PLUGIN_DAEMON_POOL_KEEPALIVE_EXPIRY,
+                    ),
+                    timeout=None,
+                    cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+                )
+                entry = (client, close_on_loop_shutdown(client))
+                self._async_clients[loop] = entry
+        return entry[0]
+
+
+_clients = _PluginDaemonClients()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_clients._reset)
+
+
+def _strip_stream_line(line: AnyStr) -> AnyStr:
+    """Strip a line of a plugin daemon stream and its optional server-sent event prefix."""
+    line = line.strip()
+    if line[:5] in (b"data:", "data:"):
+        line = line[5:].lstrip()
+    return line
+
+
 class BasePluginClient:
+    def _prepare_request(
+        self, path: str, headers: dict | None, data: bytes | dict | str | None
+    ) -> tuple[str, dict, bytes | dict | str | None]:
+        url = plugin_daemon_inner_api_baseurl / path
+        headers = headers or {}
+        headers["X-Api-Key"] = aiexec_config.PLUGIN_DAEMON_KEY
+        headers["Accept-Encoding"] = "gzip, deflate, br"
+
+        if headers.get("Content-Type") == "application/json" and isinstance(data, dict):
+            data = json.dumps(data)
+
+        return str(url), headers, data
+
     def _request(
         self,
         method: str,
@@ -52,17 +146,11 @@ class BasePluginClient:
         """
         Make a request to the plugin daemon inner API.
         """
-        url = plugin_daemon_inner_api_baseurl / path
-        headers = headers or {}
-        headers["X-Api-Key"] = aiexec_config.PLUGIN_DAEMON_KEY
-        headers["Accept-Encoding"] = "gzip, deflate, br"
-
-        if headers.get("Content-Type") == "application/json" and isinstance(data, dict):
-            data = json.dumps(data)
+        url, headers, data = self._prepare_request(path, headers, data)
 
         try:
-            response = requests.request(
-                method=method, url=str(url), headers=headers, data=data, params=params, stream=stream, files=files
+            response = _clients.get_session().request(
+                method=method, url=url, headers=headers, data=data, params=params, stream=stream, files=files
             )
         except requests.exceptions.ConnectionError:
             logger.exception("Request to Plugin Daemon Service failed")
@@ -84,12 +172,35 @@ class BasePluginClient:
         """
         response = self._request(method, path, headers, data, params, files, stream=True)
         for line in response.iter_lines(chunk_size=1024 * 8):
-            line = line.decode("utf-8").strip()
-            if line.startswith("data:"):
-                line = line[5:].strip()
+            line = _strip_stream_line(line)
             if line:
                 yield line
 
+    async def _astream_request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        data: bytes | dict | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Make a stream request to the plugin daemon inner API without blocking the event loop
+        """
+        url, headers, data = self._prepare_request(path, headers, data)
+        body: dict[str, Any] = {"data": data} if isinstance(data, dict) else {"content": data}
+
+        try:
+            client = _clients.get_async_client()
+            async with client.stream(method, url, headers=headers, params=params, **body) as response:
+                async for line in response.aiter_lines():
+                    line = _strip_stream_line(line)
+                    if line:
+                        yield line
+        except httpx.TransportError:
+            logger.exception("Request to Plugin Daemon Service failed")
+            raise PluginDaemonInnerError(code=-500, message="Request to Plugin Daemon Service failed")
+
     def _stream_request_with_model(
         self,
         method: str,
@@ -187,33 +298,58 @@ class BasePluginClient:
         """
         Make a stream request to the plugin daemon inner API and yield the response as a model.
         """
+        response_type = PluginDaemonBasicResponse[type]  # type: ignore
         for line in self._stream_request(method, path, params, headers, data, files):
+            yield self._parse_plugin_daemon_stream_line(response_type, line)
+
+    async def _arequest_with_plugin_daemon_response_stream(
+        self,
+        method: str,
+        path: str,
+        type: type[T],
+        headers: dict | None = None,
+        data: bytes | dict | None = None,
+        params: dict | None = None,
+    ) -> AsyncGenerator[T, None]:
+        """
+        Make an async stream request to the plugin daemon inner API and yield the response as a model.
+        """
+        response_type = PluginDaemonBasicResponse[type]  # type: ignore
+        async for line in self._astream_request(method, path, params, headers, data):
+            yield self._parse_plugin_daemon_stream_line(response_type, line)
+
+    def _parse_plugin_daemon_stream_line(self, response_type: type[PluginDaemonBasicResponse], line: bytes | str):
+        """
+        Parse a line of a plugin daemon stream and return its data.
+        """
+        try:
+            rep = response_type.model_validate_json(line)
+        except (ValueError, TypeError):
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", errors="replace")
+            # TODO modify this when line_data has code and message
             try:
-                rep = PluginDaemonBasicResponse[type].model_validate_json(line)  # type: ignore
+                line_data = json.loads(line)
             except (ValueError, TypeError):
-                # TODO modify this when line_data has code and message
+                raise ValueError(line)
+            # If the dictionary contains the `error` key, use its value as the argument
+            # for `ValueError`.
+            # Otherwise, use the `line` to provide better contextual information about the error.
+            raise ValueError(line_data.get("error", line))
+
+        if rep.code != 0:
+            if rep.code == -500:
                 try:
-                    line_data = json.loads(line)
-                except (ValueError, TypeError):
-                    raise ValueError(line)
-                # If the dictionary contains the `error` key, use its value as the argument
-                # for `ValueError`.
-                # Otherwise, use the `line` to provide better contextual information about the error.
-                raise ValueError(line_data.get("error", line))
-
-            if rep.code != 0:
-                if rep.code == -500:
-                    try:
-                        error = PluginDaemonError(**json.loads(rep.message))
-                    except Exception:
-                        raise PluginDaemonInnerError(code=rep.code, message=rep.message)
-
-                    self._handle_plugin_daemon_error(error.error_type, error.message)
-                raise ValueError(f"plugin daemon: {rep.message}, code: {rep.code}")
-            if rep.data is None:
-                frame = inspect.currentframe()
-                raise ValueError(f"got empty data from plugin daemon: {frame.f_lineno if frame else 'unknown'}")
-            yield rep.data
+                    error = PluginDaemonError(**json.loads(rep.message))
+                except Exception:
+                    raise PluginDaemonInnerError(code=rep.code, message=rep.message)
+
+                self._handle_plugin_daemon_error(error.error_type, error.message)
+            raise ValueError(f"plugin daemon: {rep.message}, code: {rep.code}")
+        if rep.data is None:
+            frame = inspect.currentframe()
+            raise ValueError(f"got empty data from plugin daemon: {frame.f_lineno if frame else 'unknown'}")
+        return rep.data
 
     def _handle_plugin_daemon_error(self, error_type: str, message: str):
         """
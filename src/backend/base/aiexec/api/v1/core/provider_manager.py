@@ -24,6 +24,7 @@ from core.entities.provider_entities import (
 from core.helper import encrypter
 from core.helper.model_provider_cache import ProviderCredentialsCache, ProviderCredentialsCacheType
 from core.helper.position_helper import is_filtered
+from core.helper.provider_configurations_cache import provider_configurations_cache
 from core.model_runtime.entities.model_entities import ModelType
 from core.model_runtime.entities.provider_entities import (
     ConfigurateMethod,
@@ -91,6 +92,25 @@ class ProviderManager:
         - Get provider instance
         - Switch selection priority
 
+        The configurations are cached per process until a provider, credential or model setting
+        of the workspace changes, see `ProviderConfigurationsCache`.
+
+        :param tenant_id:
+        :return:
+        """
+        provider_configurations = provider_configurations_cache.get(tenant_id)
+        if provider_configurations is not None:
+            return provider_configurations
+
+        generation = provider_configurations_cache.generation
+        provider_configurations = self._build_configurations(tenant_id)
+        provider_configurations_cache.set(tenant_id, provider_configurations, generation)
+        return provider_configurations
+
+    def _build_configurations(self, tenant_id: str) -> ProviderConfigurations:
+        """
+        Build the model provider configurations of a workspace from its records.
+
         :param tenant_id:
         :return:
         """
@@ -6,6 +6,10 @@ from pydantic import BaseModel
 
 from configs import aiexec_config
 from core.rag.datasource.keyword.jieba.jieba_keyword_table_handler import JiebaKeywordTableHandler
+from core.rag.datasource.keyword.jieba.segmented_keyword_table import (
+    SEGMENTED_DATA_SOURCE_TYPE,
+    SegmentedKeywordTable,
+)
 from core.rag.datasource.keyword.keyword_base import BaseKeyword
 from core.rag.models.document import Document
 from extensions.ext_database import db
@@ -27,18 +31,16 @@ class Jieba(BaseKeyword):
         lock_name = "keyword_indexing_lock_{}".format(self.dataset.id)
         with redis_client.lock(lock_name, timeout=600):
             keyword_table_handler = JiebaKeywordTableHandler()
-            keyword_table = self._get_dataset_keyword_table()
+            doc_keywords: dict[str, set[str]] = {}
             for text in texts:
                 keywords = keyword_table_handler.extract_keywords(
                     text.page_content, self._config.max_keywords_per_chunk
                 )
                 if text.metadata is not None:
                     self._update_segment_keywords(self.dataset.id, text.metadata["doc_id"], list(keywords))
-                    keyword_table = self._add_text_to_keyword_table(
-                        keyword_table or {}, text.metadata["doc_id"], list(keywords)
-                    )
+                    doc_keywords.setdefault(text.metadata["doc_id"], set()).update(keywords)
 
-            self._save_dataset_keyword_table(keyword_table)
+            self._add_keywords(doc_keywords)
 
             return self
 
@@ -47,7 +49,7 @@ class Jieba(BaseKeyword):
         with redis_client.lock(lock_name, timeout=600):
             keyword_table_handler = JiebaKeywordTableHandler()
 
-            keyword_table = self._get_dataset_keyword_table()
+            doc_keywords: dict[str, set[str]] = {}
             keywords_list = kwargs.get("keywords_list")
             for i in range(len(texts)):
                 text = texts[i]
@@ -63,21 +65,26 @@ class Jieba(BaseKeyword):
                     )
                 if text.metadata is not None:
                     self._update_segment_keywords(self.dataset.id, text.metadata["doc_id"], list(keywords))
-                    keyword_table = self._add_text_to_keyword_table(
-                        keyword_table or {}, text.metadata["doc_id"], list(keywords)
-                    )
+                    doc_keywords.setdefault(text.metadata["doc_id"], set()).update(keywords)
 
-            self._save_dataset_keyword_table(keyword_table)
+            self._add_keywords(doc_keywords)
 
     def text_exists(self, id: str) -> bool:
+        segmented_keyword_table = self._get_segmented_keyword_table()
+        if segmented_keyword_table is not None:
+            return segmented_keyword_table.contains(id)
         keyword_table = self._get_dataset_keyword_table()
-        if keyword_table is None:
+        if not keyword_table:
             return False
         return id in set.union(*keyword_table.values())
 
     def delete_by_ids(self, ids: list[str]) -> None:
         lock_name = "keyword_indexing_lock_{}".format(self.dataset.id)
         with redis_client.lock(lock_name, timeout=600):
+            segmented_keyword_table = self._get_segmented_keyword_table()
+            if segmented_keyword_table is not None:
+                segmented_keyword_table.delete(ids)
+                return
             keyword_table = self._get_dataset_keyword_table()
             if keyword_table is not None:
                 keyword_table = self._delete_ids_from_keyword_table(keyword_table, ids)
@@ -85,11 +92,14 @@ class Jieba(BaseKeyword):
             self._save_dataset_keyword_table(keyword_table)
 
     def search(self, query: str, **kwargs: Any) -> list[Document]:
-        keyword_table = self._get_dataset_keyword_table()
+        segmented_keyword_table = self._get_segmented_keyword_table()
+        keyword_table = None if segmented_keyword_table is not None else self._get_dataset_keyword_table()
 
         k = kwargs.get("top_k", 4)
         document_ids_filter = kwargs.get("document_ids_filter")
-        sorted_chunk_indices = self._retrieve_ids_by_query(keyword_table or {}, query, k)
+        sorted_chunk_indices = self._retrieve_ids_by_query(
+            keyword_table or {}, query, k, segmented_keyword_table=segmented_keyword_table
+        )
 
         documents = []
         for chunk_index in sorted_chunk_indices:
@@ -122,7 +132,9 @@ class Jieba(BaseKeyword):
             if dataset_keyword_table:
                 db.session.delete(dataset_keyword_table)
                 db.session.commit()
-                if dataset_keyword_table.data_source_type != "database":
+                if dataset_keyword_table.data_source_type == SEGMENTED_DATA_SOURCE_TYPE:
+                    SegmentedKeywordTable(self.dataset.tenant_id, self.dataset.id).drop()
+                elif dataset_keyword_table.data_source_type != "database":
                     file_key = "keyword_files/" + self.dataset.tenant_id + "/" + self.dataset.id + ".txt"
                     storage.delete(file_key)
 
@@ -142,6 +154,29 @@ class Jieba(BaseKeyword):
                 storage.delete(file_key)
             storage.save(file_key, json.dumps(keyword_table_dict, cls=SetEncoder).encode("utf-8"))
 
+    def _get_segmented_keyword_table(self) -> Optional[SegmentedKeywordTable]:
+        """Returns the segmented keyword table of the dataset, or None if it uses a single keyword table."""
+        dataset_keyword_table = self.dataset.dataset_keyword_table
+        if dataset_keyword_table:
+            data_source_type = dataset_keyword_table.data_source_type
+        else:
+            data_source_type = aiexec_config.KEYWORD_DATA_SOURCE_TYPE
+        if data_source_type != SEGMENTED_DATA_SOURCE_TYPE:
+            return None
+        if not dataset_keyword_table:
+            self._get_dataset_keyword_table()
+        return SegmentedKeywordTable(self.dataset.tenant_id, self.dataset.id)
+
+    def _add_keywords(self, doc_keywords: dict[str, set[str]]) -> None:
+        segmented_keyword_table = self._get_segmented_keyword_table()
+        if segmented_keyword_table is not None:
+            segmented_keyword_table.add(doc_keywords)
+            return
+        keyword_table = self._get_dataset_keyword_table() or {}
+        for doc_id, keywords in doc_keywords.items():
+            keyword_table = self._add_text_to_keyword_table(keyword_table, doc_id, list(keywords))
+        self._save_dataset_keyword_table(keyword_table)
+
     def _get_dataset_keyword_table(self) -> Optional[dict]:
         dataset_keyword_table = self.dataset.dataset_keyword_table
         if dataset_keyword_table:
@@ -192,13 +227,21 @@ class Jieba(BaseKeyword):
 
         return keyword_table
 
-    def _retrieve_ids_by_query(self, keyword_table: dict, query: str, k: int = 4):
+    def _retrieve_ids_by_query(
+        self,
+        keyword_table: dict,
+        query: str,
+        k: int = 4,
+        segmented_keyword_table: Optional[SegmentedKeywordTable] = None,
+    ):
         keyword_table_handler = JiebaKeywordTableHandler()
         keywords = keyword_table_handler.extract_keywords(query)
+        if segmented_keyword_table is not None:
+            keyword_table = segmented_keyword_table.get(list(keywords))
 
         # go through text chunks in order of most matching keywords
         chunk_indices_count: dict[str, int] = defaultdict(int)
-        keywords_list = [keyword for keyword in keywords if keyword in set(keyword_table.keys())]
+        keywords_list = [keyword for keyword in keywords if keyword in keyword_table]
         for keyword in keywords_list:
             for node_id in keyword_table[keyword]:
                 chunk_indices_count[node_id] += 1
@@ -223,33 +266,25 @@ class Jieba(BaseKeyword):
             db.session.commit()
 
     def create_segment_keywords(self, node_id: str, keywords: list[str]):
-        keyword_table = self._get_dataset_keyword_table()
         self._update_segment_keywords(self.dataset.id, node_id, keywords)
-        keyword_table = self._add_text_to_keyword_table(keyword_table or {}, node_id, keywords)
-        self._save_dataset_keyword_table(keyword_table)
+        self._add_keywords({node_id: set(keywords)})
 
     def multi_create_segment_keywords(self, pre_segment_data_list: list):
         keyword_table_handler = JiebaKeywordTableHandler()
-        keyword_table = self._get_dataset_keyword_table()
+        doc_keywords: dict[str, set[str]] = {}
         for pre_segment_data in pre_segment_data_list:
             segment = pre_segment_data["segment"]
             if pre_segment_data["keywords"]:
                 segment.keywords = pre_segment_data["keywords"]
-                keyword_table = self._add_text_to_keyword_table(
-                    keyword_table or {}, segment.index_node_id, pre_segment_data["keywords"]
-                )
+                doc_keywords.setdefault(segment.index_node_id, set()).update(pre_segment_data["keywords"])
             else:
                 keywords = keyword_table_handler.extract_keywords(segment.content, self._config.max_keywords_per_chunk)
                 segment.keywords = list(keywords)
-                keyword_table = self._add_text_to_keyword_table(
-                    keyword_table or {}, segment.index_node_id, list(keywords)
-                )
-        self._save_dataset_keyword_table(keyword_table)
+                doc_keywords.setdefault(segment.index_node_id, set()).update(keywords)
+        self._add_keywords(doc_keywords)
 
     def update_segment_keywords_index(self, node_id: str, keywords: list[str]):
-        keyword_table = self._get_dataset_keyword_table()
-        keyword_table = self._add_text_to_keyword_table(keyword_table or {}, node_id, keywords)
-        self._save_dataset_keyword_table(keyword_table)
+        self._add_keywords({node_id: set(keywords)})
 
 
 class SetEncoder(json.JSONEncoder):
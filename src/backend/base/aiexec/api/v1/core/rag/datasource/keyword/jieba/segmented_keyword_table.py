@@ -0,0 +1,223 @@
+import json
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+from cachetools import LRUCache
+
+from configs import aiexec_config
+from extensions.ext_redis import redis_client
+from extensions.ext_storage import storage
+
+SEGMENTED_DATA_SOURCE_TYPE = "segmented"
+
+
+@dataclass
+class KeywordSegment:
+    """An immutable batch of changes to a keyword table.
+
+    The deleted ids of a segment are applied before its postings, so consecutive
+    segments can be merged into one without changing what they describe.
+    """
+
+    postings: dict[str, set[str]] = field(default_factory=dict)
+    deleted: set[str] = field(default_factory=set)
+
+    @property
+    def size(self) -> int:
+        return sum(len(ids) for ids in self.postings.values()) + len(self.deleted)
+
+    def dumps(self) -> bytes:
+        data = {
+            "postings": {keyword: sorted(ids) for keyword, ids in self.postings.items()},
+            "deleted": sorted(self.deleted),
+        }
+        return json.dumps(data).encode("utf-8")
+
+    @classmethod
+    def loads(cls, data: bytes) -> "KeywordSegment":
+        segment = json.loads(data.decode("utf-8"))
+        return cls(
+            postings={keyword: set(ids) for keyword, ids in segment["postings"].items()},
+            deleted=set(segment["deleted"]),
+        )
+
+    @classmethod
+    def merge(cls, segments: list["KeywordSegment"], *, full: bool = False) -> "KeywordSegment":
+        """Merge consecutive segments, oldest first.
+
+        A full merge starts at the first segment of the table, so there is nothing
+        left for its deleted ids to remove and they are dropped.
+        """
+        state = KeywordTableState()
+        deleted: set[str] = set()
+        for segment in segments:
+            state.apply(segment)
+            deleted.update(segment.deleted)
+        return cls(postings=state.postings, deleted=set() if full else deleted)
+
+
+@dataclass
+class KeywordTableState:
+    """The keyword table of a dataset as built from its segments."""
+
+    version: int = 0
+    segments: list[str] = field(default_factory=list)
+    postings: dict[str, set[str]] = field(default_factory=dict)
+    doc_keywords: dict[str, set[str]] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def apply(self, segment: KeywordSegment) -> None:
+        for doc_id in segment.deleted:
+            for keyword in self.doc_keywords.pop(doc_id, ()):
+                ids = self.postings[keyword]
+                ids.discard(doc_id)
+                if not ids:
+                    del self.postings[keyword]
+        for keyword, ids in segment.postings.items():
+            self.postings.setdefault(keyword, set()).update(ids)
+            for doc_id in ids:
+                self.doc_keywords.setdefault(doc_id, set()).add(keyword)
+
+
+_states: LRUCache = LRUCache(maxsize=aiexec_config.KEYWORD_TABLE_CACHE_SIZE)
+_states_lock = threading.Lock()
+
+
+class SegmentedKeywordTable:
+    """Keyword table of a dataset stored as an inverted index in append-only segments.
+
+    Every write stores only the postings of the new or deleted documents as a new
+    segment and bumps the table version, and segments are merged in size tiers once
+    there are more than `KEYWORD_TABLE_MAX_SEGMENTS`. Each process keeps the table
+    built from the segments it has read and, when the version changes, only reads
+    the segments added since, so lookups cost O(query terms).
+
+    Writes must hold the dataset's keyword indexing lock.
+    """
+
+    def __init__(self, tenant_id: str, dataset_id: str):
+        self._dataset_id = dataset_id
+        self._prefix = f"keyword_files/{tenant_id}/{dataset_id}/"
+        self._version_key = f"keyword_table_version:{dataset_id}"
+
+    def get(self, keywords: list[str]) -> dict[str, set[str]]:
+        state = self._load()
+        with state.lock:
+            return {keyword: set(state.postings[keyword]) for keyword in keywords if keyword in state.postings}
+
+    def contains(self, doc_id: str) -> bool:
+        state = self._load()
+        with state.lock:
+            return doc_id in state.doc_keywords
+
+    def table(self) -> dict[str, set[str]]:
+        state = self._load()
+        with state.lock:
+            return {keyword: set(ids) for keyword, ids in state.postings.items()}
+
+    def add(self, doc_keywords: dict[str, set[str]]) -> None:
+        postings: dict[str, set[str]] = {}
+        for doc_id, keywords in doc_keywords.items():
+            for keyword in keywords:
+                postings.setdefault(keyword, set()).add(doc_id)
+        if postings:
+            self._append(KeywordSegment(postings=postings))
+
+    def delete(self, ids: list[str]) -> None:
+        if ids:
+            self._append(KeywordSegment(deleted=set(ids)))
+
+    def drop(self) -> None:
+        manifest = self._read_manifest()
+        for segment in manifest["segments"]:
+            storage.delete(self._prefix + segment["name"])
+        if storage.exists(self._manifest_key):
+            storage.delete(self._manifest_key)
+        redis_client.delete(self._version_key)
+        with _states_lock:
+            _states.pop(self._dataset_id, None)
+
+    @property
+    def _manifest_key(self) -> str:
+        return self._prefix + "manifest.json"
+
+    def _read_manifest(self) -> dict[str, Any]:
+        if not storage.exists(self._manifest_key):
+            return {"version": 0, "segments": []}
+        return json.loads(storage.load_once(self._manifest_key).decode("utf-8"))
+
+    def _read_segment(self, name: str) -> KeywordSegment:
+        return KeywordSegment.loads(storage.load_once(self._prefix + name))
+
+    def _write_segment(self, segment: KeywordSegment) -> dict[str, Any]:
+        name = f"{uuid.uuid4().hex}.json"
+        storage.save(self._prefix + name, segment.dumps())
+        return {"name": name, "size": segment.size}
+
+    def _append(self, segment: KeywordSegment) -> None:
+        manifest = self._read_manifest()
+        manifest["segments"].append(self._write_segment(segment))
+        obsolete = []
+        if len(manifest["segments"]) > aiexec_config.KEYWORD_TABLE_MAX_SEGMENTS:
+            obsolete = self._merge_tail(manifest)
+        manifest["version"] += 1
+        storage.save(self._manifest_key, json.dumps(manifest).encode("utf-8"))
+        redis_client.set(self._version_key, manifest["version"])
+        # Readers that still hold the previous manifest fall back to a full reload
+        for name in obsolete:
+            storage.delete(self._prefix + name)
+
+    def _merge_tail(self, manifest: dict[str, Any]) -> list[str]:
+        """Merge the newest segments until the merged segment is smaller than the one before it."""
+        segments = manifest["segments"]
+        start = len(segments) - 2
+        merged_size = segments[-1]["size"] + segments[-2]["size"]
+        while start > 0 and segments[start - 1]["size"] <= merged_size:
+            start -= 1
+            merged_size += segments[start]["size"]
+        merged = KeywordSegment.merge([self._read_segment(s["name"]) for s in segments[start:]], full=start == 0)
+        manifest["segments"] = segments[:start] + [self._write_segment(merged)]
+        return [s["name"] for s in segments[start:]]
+
+    def _load(self) -> KeywordTableState:
+        with _states_lock:
+            state = _states.get(self._dataset_id)
+        version = redis_client.get(self._version_key)
+        if state is not None and version is not None and int(version) == state.version:
+            return state
+
+        manifest = self._read_manifest()
+        names = [segment["name"] for segment in manifest["segments"]]
+        if state is not None:
+            with state.lock:
+                if state.version == manifest["version"]:
+                    return state
+                if names[: len(state.segments)] == state.segments:
+                    try:
+                        new_segments = [self._read_segment(name) for name in names[len(state.segments) :]]
+                    except Exception:
+                        # merged away concurrently, rebuild from the latest manifest
+                        new_segments = None
+                    if new_segments is not None:
+                        for segment in new_segments:
+                            state.apply(segment)
+                        state.segments = names
+                        state.version = manifest["version"]
+                        return state
+
+        try:
+            state = self._build_state(manifest)
+        except Exception:
+            state = self._build_state(self._read_manifest())
+        with _states_lock:
+            _states[self._dataset_id] = state
+        return state
+
+    def _build_state(self, manifest: dict[str, Any]) -> KeywordTableState:
+        state = KeywordTableState(version=manifest["version"])
+        for segment in manifest["segments"]:
+            state.apply(self._read_segment(segment["name"]))
+            state.segments.append(segment["name"])
+        return state
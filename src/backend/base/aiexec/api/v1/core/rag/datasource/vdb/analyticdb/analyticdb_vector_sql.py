@@ -4,9 +4,9 @@ from contextlib import contextmanager
 from typing import Any
 
 import psycopg2.extras  # type: ignore
-import psycopg2.pool  # type: ignore
 from pydantic import BaseModel, model_validator
 
+from core.rag.datasource.vdb.vector_client_pool import get_connection_pool
 from core.rag.models.document import Document
 from extensions.ext_redis import redis_client
 
@@ -63,9 +63,10 @@ class AnalyticdbVectorBySql:
             redis_client.set(database_exist_cache_key, 1, ex=3600)
 
     def _create_connection_pool(self):
-        return psycopg2.pool.SimpleConnectionPool(
-            self.config.min_connection,
-            self.config.max_connection,
+        return get_connection_pool(
+            "analyticdb",
+            minconn=self.config.min_connection,
+            maxconn=self.config.max_connection,
             host=self.config.host,
             port=self.config.port,
             user=self.config.account,
@@ -81,9 +82,11 @@ class AnalyticdbVectorBySql:
         try:
             yield cur
         finally:
-            cur.close()
-            conn.commit()
-            self.pool.putconn(conn)
+            try:
+                cur.close()
+                conn.commit()
+            finally:
+                self.pool.putconn(conn)
 
     def _initialize_vector_database(self) -> None:
         conn = psycopg2.connect(
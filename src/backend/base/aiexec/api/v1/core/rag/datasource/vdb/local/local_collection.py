@@ -0,0 +1,568 @@
+import fcntl
+import functools
+import json
+import math
+import os
+import re
+import shutil
+import threading
+import uuid
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional, TypeVar
+
+import numpy as np
+
+STATE_FILE = "state.json"
+LOCK_FILE = ".lock"
+# files of a generation of a collection
+VECTORS_FILE = "vectors.f32"
+DOCUMENTS_FILE = "documents.i32"
+OFFSETS_FILE = "offsets.i64"
+LISTS_FILE = "lists.i32"
+CENTROIDS_FILE = "centroids.f32"
+ROWS_FILE = "rows.jsonl"
+IDS_FILE = "ids.txt"
+
+# rows read from the vectors file at a time when scoring or rewriting a collection
+BLOCK_SIZE = 65536
+# the IVF index has about sqrt(rows) lists, up to this number
+MAX_LISTS = 1024
+# vectors sampled per list to train the centroids of the IVF index
+TRAINING_SAMPLES_PER_LIST = 32
+KMEANS_ITERATIONS = 10
+BM25_K1 = 1.2
+BM25_B = 0.75
+# attempts of a read, which starts again with a fresh snapshot when the files it reads were deleted
+READ_ATTEMPTS = 3
+
+T = TypeVar("T")
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff"
+# words, and every CJK character on its own as those scripts do not separate words with spaces
+_TOKEN_PATTERN = re.compile(f"[{_CJK}]|[^\\W_{_CJK}]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+def _map(path: Path, dtype: type, shape: tuple[int, ...]) -> np.ndarray:
+    # mmap cannot map an empty file
+    if not math.prod(shape):
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+def _append(path: Path, size: int, data: bytes) -> None:
+    """Append to a file of a generation, dropping anything an interrupted write left after its expected size."""
+    with open(path, "r+b") as f:
+        f.truncate(size)
+        f.seek(size)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Positions of the top_k highest scores, highest first."""
+    if len(scores) > top_k:
+        best = np.argpartition(-scores, top_k)[:top_k]
+    else:
+        best = np.arange(len(scores))
+    return best[np.argsort(-scores[best], kind="stable")]
+
+
+def _train_centroids(samples: np.ndarray, nlist: int) -> np.ndarray:
+    """Spherical k-means, the centroids are normalized so that they are compared to vectors by cosine similarity."""
+    rng = np.random.default_rng(0)
+    centroids = samples[rng.choice(len(samples), nlist, replace=False)]
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = np.argmax(samples @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, samples)
+        # keep the centroids no sample is assigned to
+        empty = np.bincount(assignments, minlength=nlist) == 0
+        sums[empty] = centroids[empty]
+        centroids = _normalize(sums)
+    return centroids
+
+
+def _retry_deleted_generation(read: Callable[..., T]) -> Callable[..., T]:
+    """
+    Retry a read with a fresh snapshot when the files of its generation are deleted while it reads them.
+
+    A rewrite keeps the previous generation for the readers still using it and deletes the older
+    ones, so a read fails only when the collection is rewritten twice meanwhile. The snapshot is
+    then outdated, and the state of the collection points to the new generation.
+    """
+
+    @functools.wraps(read)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        for _ in range(READ_ATTEMPTS - 1):
+            try:
+                return read(*args, **kwargs)
+            except FileNotFoundError:
+                continue
+        return read(*args, **kwargs)
+
+    return wrapper
+
+
+class _Snapshot:
+    """The rows of a collection in a state, mapped from the files of its generation."""
+
+    def __init__(self, directory: Path, state: dict[str, Any]) -> None:
+        self.state = state
+        self.count: int = state["count"]
+        self.generation_dir = directory / str(state["generation"])
+        self.vectors = _map(self.generation_dir / VECTORS_FILE, np.float32, (self.count, state["dim"]))
+        # code of the document of every row in state["document_ids"], -1 for deleted rows
+        self.documents = _map(self.generation_dir / DOCUMENTS_FILE, np.int32, (self.count,))
+        self.offsets = _map(self.generation_dir / OFFSETS_FILE, np.int64, (self.count,))
+        self.document_codes = {document_id: code for code, document_id in enumerate(state["document_ids"])}
+        self.lists: Optional[np.ndarray] = None
+        self.centroids: Optional[np.ndarray] = None
+        if state["nlist"]:
+            self.lists = _map(self.generation_dir / LISTS_FILE, np.int32, (self.count,))
+            self.centroids = np.fromfile(self.generation_dir / CENTROIDS_FILE, dtype=np.float32).reshape(
+                state["nlist"], state["dim"]
+            )
+
+    def mask(self, document_ids: Optional[list[str]] = None) -> np.ndarray:
+        """The rows which are not deleted, and belong to one of the documents if given."""
+        if document_ids is None:
+            return self.documents >= 0
+        codes = [self.document_codes[id] for id in document_ids if id in self.document_codes]
+        return np.isin(self.documents, codes)
+
+    def read_rows(self, rows: np.ndarray) -> list[dict[str, Any]]:
+        records = []
+        with open(self.generation_dir / ROWS_FILE, "rb") as f:
+            for row in rows:
+                f.seek(int(self.offsets[row]))
+                records.append(json.loads(f.readline()))
+        return records
+
+    def iter_rows(self, start: int = 0) -> Iterator[tuple[int, dict[str, Any]]]:
+        if start >= self.count:
+            return
+        with open(self.generation_dir / ROWS_FILE, "rb") as f:
+            f.seek(int(self.offsets[start]))
+            for row in range(start, self.count):
+                yield row, json.loads(f.readline())
+
+
+class _FullTextIndex:
+    """Term frequencies of the rows of a generation, built in memory on the first full-text search."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.lengths: list[int] = []
+        # Key: term, Value: the rows containing the term and its frequency in each of them
+        self.postings: dict[str, tuple[list[int], list[int]]] = {}
+
+    def update(self, snapshot: _Snapshot) -> None:
+        for row, record in snapshot.iter_rows(self.count):
+            terms = Counter(tokenize(record["text"]))
+            self.lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                rows, frequencies = self.postings.setdefault(term, ([], []))
+                rows.append(row)
+                frequencies.append(frequency)
+        self.count = snapshot.count
+
+
+class LocalCollection:
+    """
+    A collection of the local vector store, kept in memory-mapped files in a directory.
+
+    Rows are only ever appended to the files of the current generation: `vectors.f32` holds the
+    normalized embeddings, `rows.jsonl` the ids, texts and metadata, `offsets.i64` where every
+    row starts in `rows.jsonl`, and `documents.i32` the document of every row, or -1 once it is
+    deleted. `state.json` is replaced after the files are written, so readers, which take no
+    file lock, only see complete rows. It also holds a random incarnation id, so processes tell
+    a collection which was dropped and created again from the one they cached.
+
+    Collections with at least `ivf_threshold` rows get an IVF index: the rows are assigned to the
+    nearest of about sqrt(rows) centroids, and a search only scores, exactly, the rows of the
+    `nprobe` lists nearest to the query. The index is trained while the rows are copied to a new
+    generation, whenever the collection doubles, and the deleted rows are compacted away in the
+    same way once they outnumber the others.
+    """
+
+    def __init__(self, directory: Path, *, ivf_threshold: int, nprobe: int) -> None:
+        self.directory = directory
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._state_key: Optional[tuple[int, ...]] = None
+        self._snapshot: Optional[_Snapshot] = None
+        self._ids: list[str] = []
+        self._ids_bytes = 0
+        # Key: id, Value: the last row with the id
+        self._rows_by_id: dict[str, int] = {}
+        self._full_text: Optional[_FullTextIndex] = None
+
+    def _refresh(self) -> Optional[_Snapshot]:
+        """Reload the state of the collection if it was changed, by this or another process."""
+        try:
+            stat = os.stat(self.directory / STATE_FILE)
+        except FileNotFoundError:
+            self._reset()
+            return None
+        state_key = (stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+        if state_key == self._state_key:
+            return self._snapshot
+        with open(self.directory / STATE_FILE) as f:
+            state = json.load(f)
+        if (
+            self._snapshot is None
+            # a collection dropped and created again restarts at generation 0 with a new incarnation
+            or self._snapshot.state.get("incarnation") != state.get("incarnation")
+            or self._snapshot.state["generation"] != state["generation"]
+            or state["ids_bytes"] < self._ids_bytes
+        ):
+            self._reset()
+        snapshot = _Snapshot(self.directory, state)
+        with open(snapshot.generation_dir / IDS_FILE, "rb") as f:
+            f.seek(self._ids_bytes)
+            ids = f.read(state["ids_bytes"] - self._ids_bytes).decode().splitlines()
+        for id in ids:
+            self._rows_by_id[id] = len(self._ids)
+            self._ids.append(id)
+        self._ids_bytes = state["ids_bytes"]
+        self._snapshot = snapshot
+        self._state_key = state_key
+        return snapshot
+
+    def _read(self) -> Optional[_Snapshot]:
+        with self._lock:
+            return self._refresh()
+
+    @contextmanager
+    def _writing(self) -> Iterator[Optional[_Snapshot]]:
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / LOCK_FILE, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield self._refresh()
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_state(self, state: dict[str, Any]) -> _Snapshot:
+        path = self.directory / STATE_FILE
+        temp_path = path.with_name(f".{STATE_FILE}.tmp")
+        with open(temp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        snapshot = self._refresh()
+        assert snapshot is not None
+        return snapshot
+
+    def _new_generation(self, generation: int, dim: int, incarnation: str) -> dict[str, Any]:
+        generation_dir = self.directory / str(generation)
+        # drop what an interrupted rewrite left
+        shutil.rmtree(generation_dir, ignore_errors=True)
+        generation_dir.mkdir(parents=True)
+        for name in (VECTORS_FILE, DOCUMENTS_FILE, OFFSETS_FILE, LISTS_FILE, ROWS_FILE, IDS_FILE):
+            (generation_dir / name).touch()
+        return {
+            "incarnation": incarnation,
+            "generation": generation,
+            "dim": dim,
+            "count": 0,
+            "deleted": 0,
+            "rows_bytes": 0,
+            "ids_bytes": 0,
+            "document_ids": [],
+            "nlist": 0,
+            "trained_count": 0,
+        }
+
+    def add(
+        self, ids: list[str], embeddings: list[list[float]], texts: list[str], metadatas: list[dict[str, Any]]
+    ) -> None:
+        """Add rows to the collection, replacing the rows with the same ids."""
+        if not ids:
+            return
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        dim = vectors.shape[1]
+        with self._writing() as snapshot:
+            if snapshot is None:
+                snapshot = self._write_state(self._new_generation(0, dim, uuid.uuid4().hex))
+            elif snapshot.state["dim"] != dim:
+                raise ValueError(f"Embeddings have {dim} dimensions, the collection has {snapshot.state['dim']}.")
+            replaced = [self._rows_by_id[id] for id in ids if id in self._rows_by_id]
+            if replaced:
+                snapshot = self._delete_rows(snapshot, np.asarray(replaced))
+
+            state = dict(snapshot.state, document_ids=list(snapshot.state["document_ids"]))
+            document_codes = dict(snapshot.document_codes)
+            codes = []
+            for metadata in metadatas:
+                document_id = metadata.get("document_id")
+                if document_id not in document_codes:
+                    document_codes[document_id] = len(state["document_ids"])
+                    state["document_ids"].append(document_id)
+                codes.append(document_codes[document_id])
+            rows = [
+                json.dumps({"id": id, "text": text, "metadata": metadata}, ensure_ascii=False).encode() + b"\n"
+                for id, text, metadata in zip(ids, texts, metadatas)
+            ]
+            offsets = state["rows_bytes"] + np.cumsum([0] + [len(row) for row in rows[:-1]], dtype=np.int64)
+            ids_data = "".join(f"{id}\n" for id in ids).encode()
+
+            count = state["count"]
+            generation_dir = snapshot.generation_dir
+            _append(generation_dir / VECTORS_FILE, count * dim * 4, vectors.tobytes())
+            _append(generation_dir / DOCUMENTS_FILE, count * 4, np.asarray(codes, dtype=np.int32).tobytes())
+            _append(generation_dir / OFFSETS_FILE, count * 8, offsets.tobytes())
+            _append(generation_dir / ROWS_FILE, state["rows_bytes"], b"".join(rows))
+            _append(generation_dir / IDS_FILE, state["ids_bytes"], ids_data)
+            if snapshot.centroids is not None:
+                lists = np.argmax(vectors @ snapshot.centroids.T, axis=1).astype(np.int32)
+                _append(generation_dir / LISTS_FILE, count * 4, lists.tobytes())
+            state["count"] += len(ids)
+            state["rows_bytes"] += sum(len(row) for row in rows)
+            state["ids_bytes"] += len(ids_data)
+            self._maintain(self._write_state(state))
+
+    def _delete_rows(self, snapshot: _Snapshot, rows: np.ndarray) -> _Snapshot:
+        rows = np.unique(rows)
+        rows = rows[snapshot.documents[rows] >= 0]
+        if not len(rows):
+            return snapshot
+        documents = np.memmap(
+            snapshot.generation_dir / DOCUMENTS_FILE, dtype=np.int32, mode="r+", shape=(snapshot.count,)
+        )
+        documents[rows] = -1
+        documents.flush()
+        del documents
+        return self._write_state(dict(snapshot.state, deleted=snapshot.state["deleted"] + len(rows)))
+
+    def _maintain(self, snapshot: _Snapshot) -> None:
+        """Compact the collection once most of its rows are deleted, and train its index whenever it doubles."""
+        deleted = snapshot.state["deleted"]
+        alive = snapshot.count - deleted
+        if deleted > alive or (alive >= self.ivf_threshold and alive >= 2 * snapshot.state["trained_count"]):
+            self._rewrite(snapshot)
+
+    def _rewrite(self, snapshot: _Snapshot) -> None:
+        """Copy the rows which are not deleted to a new generation, with an IVF index if there are enough of them."""
+        alive_rows = np.flatnonzero(snapshot.mask())
+        state = snapshot.state
+        new_state = self._new_generation(state["generation"] + 1, state["dim"], state.get("incarnation", ""))
+        generation_dir = self.directory / str(new_state["generation"])
+
+        used_codes = np.unique(snapshot.documents[alive_rows])
+        new_state["document_ids"] = [state["document_ids"][code] for code in used_codes]
+        code_map = np.full(len(state["document_ids"]), -1, dtype=np.int32)
+        code_map[used_codes] = np.arange(len(used_codes), dtype=np.int32)
+
+        centroids = None
+        if len(alive_rows) >= self.ivf_threshold:
+            nlist = min(MAX_LISTS, int(math.sqrt(len(alive_rows))))
+            rng = np.random.default_rng(0)
+            samples = np.sort(rng.choice(alive_rows, min(len(alive_rows), nlist * TRAINING_SAMPLES_PER_LIST), False))
+            centroids = _train_centroids(np.asarray(snapshot.vectors[samples]), nlist)
+            centroids.tofile(generation_dir / CENTROIDS_FILE)
+            new_state["nlist"] = nlist
+            new_state["trained_count"] = len(alive_rows)
+
+        with (
+            open(generation_dir / VECTORS_FILE, "wb") as vectors_file,
+            open(generation_dir / DOCUMENTS_FILE, "wb") as documents_file,
+            open(generation_dir / OFFSETS_FILE, "wb") as offsets_file,
+            open(generation_dir / LISTS_FILE, "wb") as lists_file,
+            open(generation_dir / ROWS_FILE, "wb") as rows_file,
+            open(generation_dir / IDS_FILE, "wb") as ids_file,
+            open(snapshot.generation_dir / ROWS_FILE, "rb") as old_rows_file,
+        ):
+            for start in range(0, len(alive_rows), BLOCK_SIZE):
+                block = alive_rows[start : start + BLOCK_SIZE]
+                vectors = np.asarray(snapshot.vectors[block])
+                vectors_file.write(vectors.tobytes())
+                documents_file.write(code_map[snapshot.documents[block]].tobytes())
+                if centroids is not None:
+                    lists_file.write(np.argmax(vectors @ centroids.T, axis=1).astype(np.int32).tobytes())
+                offsets = []
+                for row in block:
+                    old_rows_file.seek(int(snapshot.offsets[row]))
+                    line = old_rows_file.readline()
+                    offsets.append(rows_file.tell())
+                    rows_file.write(line)
+                    ids_file.write(f"{self._ids[row]}\n".encode())
+                offsets_file.write(np.asarray(offsets, dtype=np.int64).tobytes())
+            for f in (vectors_file, documents_file, offsets_file, lists_file, rows_file, ids_file):
+                f.flush()
+                os.fsync(f.fileno())
+            new_state["count"] = len(alive_rows)
+            new_state["rows_bytes"] = rows_file.tell()
+            new_state["ids_bytes"] = ids_file.tell()
+
+        self._write_state(new_state)
+        # readers may still be using the previous generation, the older ones can go, as readers
+        # still using them retry with the new state
+        keep = {str(state["generation"]), str(new_state["generation"])}
+        for path in self.directory.iterdir():
+            if path.is_dir() and path.name not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+    @_retry_deleted_generation
+    def existing_ids(self, ids: list[str]) -> set[str]:
+        with self._lock:
+            snapshot = self._refresh()
+            if snapshot is None:
+                return set()
+            rows = {id: self._rows_by_id[id] for id in set(ids) if id in self._rows_by_id}
+        return {id for id, row in rows.items() if snapshot.documents[row] >= 0}
+
+    def _matching_rows(self, snapshot: _Snapshot, key: str, value: str) -> np.ndarray:
+        if key == "document_id":
+            if value not in snapshot.document_codes:
+                return np.empty(0, dtype=np.int64)
+            return np.flatnonzero(snapshot.documents == snapshot.document_codes[value])
+        return np.asarray(
+            [
+                row
+                for row, record in snapshot.iter_rows()
+                if snapshot.documents[row] >= 0 and record["metadata"].get(key) == value
+            ],
+            dtype=np.int64,
+        )
+
+    @_retry_deleted_generation
+    def ids_by_metadata_field(self, key: str, value: str) -> list[str]:
+        with self._lock:
+            snapshot = self._refresh()
+            if snapshot is None:
+                return []
+            return [self._ids[row] for row in self._matching_rows(snapshot, key, value)]
+
+    def delete_by_ids(self, ids: list[str]) -> None:
+        with self._writing() as snapshot:
+            if snapshot is None:
+                return
+            rows = [self._rows_by_id[id] for id in ids if id in self._rows_by_id]
+            if rows:
+                self._maintain(self._delete_rows(snapshot, np.asarray(rows)))
+
+    def delete_by_metadata_field(self, key: str, value: str) -> None:
+        with self._writing() as snapshot:
+            if snapshot is None:
+                return
+            rows = self._matching_rows(snapshot, key, value)
+            if len(rows):
+                self._maintain(self._delete_rows(snapshot, rows))
+
+    def drop(self) -> None:
+        with self._writing():
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._reset()
+
+    @_retry_deleted_generation
+    def search(
+        self, query: list[float], top_k: int, document_ids: Optional[list[str]] = None
+    ) -> list[tuple[dict[str, Any], float]]:
+        """The top_k rows most similar to the query, with their cosine similarity."""
+        snapshot = self._read()
+        if snapshot is None or not snapshot.count:
+            return []
+        query_vector = _normalize(np.asarray(query, dtype=np.float32))
+        rows = np.flatnonzero(snapshot.mask(document_ids))
+        # small or heavily filtered collections are scanned
+        if snapshot.centroids is not None and snapshot.lists is not None and len(rows) > self.ivf_threshold:
+            probes = np.argsort(snapshot.centroids @ query_vector)[-self.nprobe :]
+            probed_rows = rows[np.isin(snapshot.lists[rows], probes)]
+            if len(probed_rows) >= top_k:
+                rows = probed_rows
+
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), BLOCK_SIZE):
+            block = rows[start : start + BLOCK_SIZE]
+            scores[start : start + len(block)] = snapshot.vectors[block] @ query_vector
+        best = _top_k(scores, top_k)
+        return list(zip(snapshot.read_rows(rows[best]), scores[best].tolist()))
+
+    @_retry_deleted_generation
+    def search_full_text(
+        self, query: str, top_k: int, document_ids: Optional[list[str]] = None
+    ) -> list[tuple[dict[str, Any], float]]:
+        """The top_k rows matching the terms of the query, with their BM25 score."""
+        terms = set(tokenize(query))
+        with self._lock:
+            snapshot = self._refresh()
+            if snapshot is None or not snapshot.count or not terms:
+                return []
+            if self._full_text is None:
+                self._full_text = _FullTextIndex()
+            self._full_text.update(snapshot)
+            postings = [
+                (np.asarray(self._full_text.postings[term][0]), np.asarray(self._full_text.postings[term][1]))
+                for term in terms
+                if term in self._full_text.postings
+            ]
+            lengths = np.asarray(self._full_text.lengths, dtype=np.float32)
+
+        alive = snapshot.mask()
+        total = int(alive.sum())
+        if not total:
+            return []
+        average_length = max(float(lengths[alive].mean()), 1.0)
+        scores = np.zeros(snapshot.count, dtype=np.float32)
+        for rows, frequencies in postings:
+            is_alive = alive[rows]
+            rows, frequencies = rows[is_alive], frequencies[is_alive]
+            if not len(rows):
+                continue
+            idf = math.log(1 + (total - len(rows) + 0.5) / (len(rows) + 0.5))
+            norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths[rows] / average_length)
+            scores[rows] += idf * frequencies * (BM25_K1 + 1) / (frequencies + norms)
+        if document_ids is not None:
+            scores[~snapshot.mask(document_ids)] = 0
+
+        rows = np.flatnonzero(scores > 0)
+        best = rows[_top_k(scores[rows], top_k)]
+        return list(zip(snapshot.read_rows(best), scores[best].tolist()))
+
+
+_collections: dict[Path, LocalCollection] = {}
+_collections_lock = threading.Lock()
+
+
+def _reset_collections() -> None:
+    # a forked worker must not inherit locks held by other threads of its parent
+    global _collections_lock
+    _collections.clear()
+    _collections_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_collections)
+
+
+def get_collection(directory: Path, *, ivf_threshold: int, nprobe: int) -> LocalCollection:
+    """Get the collection in a directory, shared by the vector stores of the process."""
+    directory = directory.resolve()
+    collection = _collections.get(directory)
+    if collection is None:
+        with _collections_lock:
+            collection = _collections.setdefault(
+                directory, LocalCollection(directory, ivf_threshold=ivf_threshold, nprobe=nprobe)
+            )
+    return collection
@@ -0,0 +1,124 @@
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, model_validator
+
+from configs import aiexec_config
+from core.rag.datasource.vdb.local.local_collection import get_collection
+from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
+from core.rag.datasource.vdb.vector_type import VectorType
+from core.rag.embedding.embedding_base import Embeddings
+from core.rag.models.document import Document
+from models.dataset import Dataset
+
+
+class LocalVectorConfig(BaseModel):
+    path: str
+    ivf_threshold: int = 10000
+    nprobe: int = 8
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_config(cls, values: dict) -> dict:
+        if not values.get("path"):
+            raise ValueError("config LOCAL_VECTOR_PATH is required")
+        return values
+
+
+class LocalVector(BaseVector):
+    """
+    Vector store embedded in the process, keeping every collection in memory-mapped files on local disk.
+
+    It needs no external service, for single-node and offline deployments. The collections are
+    shared by the processes of the node through file locks, but not across nodes.
+    """
+
+    def __init__(self, collection_name: str, config: LocalVectorConfig):
+        super().__init__(collection_name)
+        if not re.fullmatch(r"[\w-]+", collection_name):
+            raise ValueError(f"Invalid collection name {collection_name}")
+        self._collection = get_collection(
+            Path(config.path) / collection_name, ivf_threshold=config.ivf_threshold, nprobe=config.nprobe
+        )
+
+    def get_type(self) -> str:
+        return VectorType.LOCAL
+
+    def create(self, texts: list[Document], embeddings: list[list[float]], **kwargs):
+        if texts:
+            self.add_texts(texts, embeddings, **kwargs)
+
+    def add_texts(self, documents: list[Document], embeddings: list[list[float]], **kwargs):
+        self._collection.add(
+            ids=self._get_uuids(documents),
+            embeddings=embeddings,
+            texts=[document.page_content for document in documents],
+            metadatas=[document.metadata or {} for document in documents],
+        )
+
+    def text_exists(self, id: str) -> bool:
+        return id in self._collection.existing_ids([id])
+
+    def existing_ids(self, ids: list[str]) -> set[str]:
+        return self._collection.existing_ids(ids)
+
+    def delete_by_ids(self, ids: list[str]) -> None:
+        if not ids:
+            return
+        self._collection.delete_by_ids(ids)
+
+    def get_ids_by_metadata_field(self, key: str, value: str):
+        return self._collection.ids_by_metadata_field(key, value)
+
+    def delete_by_metadata_field(self, key: str, value: str) -> None:
+        self._collection.delete_by_metadata_field(key, value)
+
+    def search_by_vector(self, query_vector: list[float], **kwargs: Any) -> list[Document]:
+        top_k = kwargs.get("top_k", 4)
+        score_threshold = float(kwargs.get("score_threshold") or 0.0)
+        results = self._collection.search(query_vector, top_k, kwargs.get("document_ids_filter") or None)
+
+        docs = []
+        for record, score in results:
+            if score > score_threshold:
+                metadata = record["metadata"]
+                metadata["score"] = score
+                docs.append(Document(page_content=record["text"], metadata=metadata))
+        return docs
+
+    def search_by_full_text(self, query: str, **kwargs: Any) -> list[Document]:
+        top_k = kwargs.get("top_k", 4)
+        results = self._collection.search_full_text(query, top_k, kwargs.get("document_ids_filter") or None)
+
+        docs = []
+        for record, score in results:
+            metadata = record["metadata"]
+            metadata["score"] = score
+            docs.append(Document(page_content=record["text"], metadata=metadata))
+        return docs
+
+    def delete(self) -> None:
+        self._collection.drop()
+
+
+class LocalVectorFactory(AbstractVectorFactory):
+    def init_vector(self, dataset: Dataset, attributes: list, embeddings: Embeddings) -> LocalVector:
+        if dataset.index_struct_dict:
+            class_prefix: str = dataset.index_struct_dict["vector_store"]["class_prefix"]
+            collection_name = class_prefix
+        else:
+            dataset_id = dataset.id
+            collection_name = Dataset.gen_collection_name_by_id(dataset_id)
+            dataset.index_struct = json.dumps(self.gen_index_struct_dict(VectorType.LOCAL, collection_name))
+
+        return LocalVector(
+            collection_name=collection_name,
+            config=LocalVectorConfig(
+                path=aiexec_config.LOCAL_VECTOR_PATH,
+                ivf_threshold=aiexec_config.LOCAL_VECTOR_IVF_THRESHOLD,
+                nprobe=aiexec_config.LOCAL_VECTOR_NPROBE,
+            ),
+        )
@@ -203,6 +203,23 @@ class MilvusVector(BaseVector):
 
         return len(result) > 0
 
+    def existing_ids(self, ids: list[str]) -> set[str]:
+        """
+        Get the IDs of the texts that exist in the collection.
+        """
+        if not self._client.has_collection(self._collection_name):
+            return set()
+
+        existing_ids = set()
+        for batch in self._batch_ids(ids):
+            result = self._client.query(
+                collection_name=self._collection_name,
+                filter=f'metadata["doc_id"] in {batch}',
+                output_fields=[Field.METADATA_KEY.value],
+            )
+            existing_ids.update(item[Field.METADATA_KEY.value]["doc_id"] for item in result)
+        return existing_ids
+
     def field_exists(self, field: str) -> bool:
         """
         Check if a field exists in the collection.
@@ -169,6 +169,15 @@ class OpenSearchVector(BaseVector):
         except:
             return False
 
+    def existing_ids(self, ids: list[str]) -> set[str]:
+        if not self._client.indices.exists(index=self._collection_name.lower()):
+            return set()
+        existing_ids = set()
+        for batch in self._batch_ids(ids):
+            response = self._client.mget(index=self._collection_name.lower(), body={"ids": batch}, _source=False)
+            existing_ids.update(doc["_id"] for doc in response["docs"] if doc.get("found"))
+        return existing_ids
+
     def search_by_vector(self, query_vector: list[float], **kwargs: Any) -> list[Document]:
         # Make sure query_vector is a list
         if not isinstance(query_vector, list):
@@ -7,11 +7,11 @@ from typing import Any
 
 import psycopg2.errors
 import psycopg2.extras  # type: ignore
-import psycopg2.pool  # type: ignore
 from pydantic import BaseModel, model_validator
 
 from configs import aiexec_config
 from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.datasource.vdb.vector_client_pool import get_connection_pool
 from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
@@ -84,9 +84,10 @@ class PGVector(BaseVector):
         return VectorType.PGVECTOR
 
     def _create_connection_pool(self, config: PGVectorConfig):
-        return psycopg2.pool.SimpleConnectionPool(
-            config.min_connection,
-            config.max_connection,
+        return get_connection_pool(
+            "pgvector",
+            minconn=config.min_connection,
+            maxconn=config.max_connection,
             host=config.host,
             port=config.port,
             user=config.user,
@@ -101,9 +102,11 @@ class PGVector(BaseVector):
         try:
             yield cur
         finally:
-            cur.close()
-            conn.commit()
-            self.pool.putconn(conn)
+            try:
+                cur.close()
+                conn.commit()
+            finally:
+                self.pool.putconn(conn)
 
     def create(self, texts: list[Document], embeddings: list[list[float]], **kwargs):
         dimension = len(embeddings[0])
@@ -136,6 +139,14 @@ class PGVector(BaseVector):
             cur.execute(f"SELECT id FROM {self.table_name} WHERE id = %s", (id,))
             return cur.fetchone() is not None
 
+    def existing_ids(self, ids: list[str]) -> set[str]:
+        existing_ids = set()
+        with self._get_cursor() as cur:
+            for batch in self._batch_ids(ids):
+                cur.execute(f"SELECT id FROM {self.table_name} WHERE id IN %s", (tuple(batch),))
+                existing_ids.update(str(record[0]) for record in cur)
+        return existing_ids
+
     def get_by_ids(self, ids: list[str]) -> list[Document]:
         with self._get_cursor() as cur:
             cur.execute(f"SELECT meta, text FROM {self.table_name} WHERE id IN %s", (tuple(ids),))
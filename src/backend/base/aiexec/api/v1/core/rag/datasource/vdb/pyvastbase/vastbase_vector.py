@@ -4,11 +4,11 @@ from contextlib import contextmanager
 from typing import Any
 
 import psycopg2.extras  # type: ignore
-import psycopg2.pool  # type: ignore
 from pydantic import BaseModel, model_validator
 
 from configs import aiexec_config
 from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.datasource.vdb.vector_client_pool import get_connection_pool
 from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
@@ -73,9 +73,10 @@ class VastbaseVector(BaseVector):
         return VectorType.VASTBASE
 
     def _create_connection_pool(self, config: VastbaseVectorConfig):
-        return psycopg2.pool.SimpleConnectionPool(
-            config.min_connection,
-            config.max_connection,
+        return get_connection_pool(
+            "vastbase",
+            minconn=config.min_connection,
+            maxconn=config.max_connection,
             host=config.host,
             port=config.port,
             user=config.user,
@@ -90,9 +91,11 @@ class VastbaseVector(BaseVector):
         try:
             yield cur
         finally:
-            cur.close()
-            conn.commit()
-            self.pool.putconn(conn)
+            try:
+                cur.close()
+                conn.commit()
+            finally:
+                self.pool.putconn(conn)
 
     def create(self, texts: list[Document], embeddings: list[list[float]], **kwargs):
         dimension = len(embeddings[0])
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Any
 
 from core.rag.models.document import Document
@@ -26,6 +27,15 @@ class BaseVector(ABC):
     def text_exists(self, id: str) -> bool:
         raise NotImplementedError
 
+    def existing_ids(self, ids: list[str]) -> set[str]:
+        """
+        Get the ids of the texts that exist in the collection.
+
+        Vector stores that can look up many ids in a single request override this,
+        the default checks the ids one by one with `text_exists`.
+        """
+        return {id for id in set(ids) if self.text_exists(id)}
+
     @abstractmethod
     def delete_by_ids(self, ids: list[str]) -> None:
         raise NotImplementedError
@@ -50,15 +60,18 @@ class BaseVector(ABC):
         raise NotImplementedError
 
     def _filter_duplicate_texts(self, texts: list[Document]) -> list[Document]:
-        for text in texts.copy():
-            if text.metadata and "doc_id" in text.metadata:
-                doc_id = text.metadata["doc_id"]
-                exists_duplicate_node = self.text_exists(doc_id)
-                if exists_duplicate_node:
-                    texts.remove(text)
+        doc_ids = [text.metadata["doc_id"] for text in texts if text.metadata and text.metadata.get("doc_id")]
+        if doc_ids:
+            existing_ids = self.existing_ids(doc_ids)
+            texts[:] = [text for text in texts if not (text.metadata and text.metadata.get("doc_id") in existing_ids)]
 
         return texts
 
+    @staticmethod
+    def _batch_ids(ids: list[str], batch_size: int = 1000) -> Iterator[list[str]]:
+        for i in range(0, len(ids), batch_size):
+            yield ids[i : i + batch_size]
+
     def _get_uuids(self, texts: list[Document]) -> list[str]:
         return [text.metadata["doc_id"] for text in texts if text.metadata and "doc_id" in text.metadata]
 
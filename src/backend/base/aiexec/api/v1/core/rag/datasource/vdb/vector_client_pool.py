@@ -0,0 +1,248 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+import psycopg2
+import psycopg2.pool  # type: ignore
+from sqlalchemy import Engine, create_engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# seconds to wait for a connection when all the connections of a pool are in use
+CONNECTION_TIMEOUT = 30
+# seconds a connection can stay idle before it is checked with a query when taken from a pool
+HEALTH_CHECK_INTERVAL = 60
+
+
+class SharedConnectionPool:
+    """
+    Thread-safe psycopg2 connection pool shared by all the vector stores connecting with the same config.
+
+    It can be used in place of `psycopg2.pool.SimpleConnectionPool`. Instead of failing when
+    all its connections are in use, `getconn` waits for one to be returned. Closed connections
+    are replaced, and connections idle for longer than `HEALTH_CHECK_INTERVAL` are checked
+    with a query before they are handed out.
+    """
+
+    def __init__(self, name: str, minconn: int, maxconn: int, **connect_kwargs: Any) -> None:
+        self.name = name
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self._pool = psycopg2.pool.ThreadedConnectionPool(minconn, maxconn, **connect_kwargs)
+        self._semaphore = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        # Key: id of an idle connection, Value: when it was returned to the pool
+        self._returned_at: dict[int, float] = {}
+        self.checkouts = 0
+        self.waits = 0
+        self.replaced_connections = 0
+
+    def getconn(self):
+        if not self._semaphore.acquire(blocking=False):
+            with self._lock:
+                self.waits += 1
+            if not self._semaphore.acquire(timeout=CONNECTION_TIMEOUT):
+                raise psycopg2.pool.PoolError(f"connection pool {self.name} exhausted")
+        try:
+            conn = self._pool.getconn()
+            if not self._is_healthy(conn):
+                self._discard(conn)
+                conn = self._pool.getconn()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        with self._lock:
+            self.checkouts += 1
+        return conn
+
+    def putconn(self, conn) -> None:
+        try:
+            if conn.closed:
+                self._discard(conn)
+            else:
+                self._pool.putconn(conn)
+                with self._lock:
+                    self._returned_at[id(conn)] = time.monotonic()
+        finally:
+            self._semaphore.release()
+
+    def closeall(self) -> None:
+        self._pool.closeall()
+        with self._lock:
+            self._returned_at.clear()
+
+    def _is_healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        with self._lock:
+            returned_at = self._returned_at.pop(id(conn), None)
+        if returned_at is None or time.monotonic() - returned_at < HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+        except psycopg2.Error:
+            logger.warning(f"Replacing broken connection of pool {self.name}")
+            return False
+        return True
+
+    def _discard(self, conn) -> None:
+        self._pool.putconn(conn, close=True)
+        with self._lock:
+            self._returned_at.pop(id(conn), None)
+            self.replaced_connections += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            in_use = len(self._pool._used)
+            return {
+                "name": self.name,
+                "min_connections": self.minconn,
+                "max_connections": self.maxconn,
+                "in_use_connections": in_use,
+                "idle_connections": len(self._pool._pool),
+                "utilization": in_use / self.maxconn,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "replaced_connections": self.replaced_connections,
+            }
+
+
+class _VectorClientRegistry:
+    """
+    Vector store clients of the current process, keyed by backend and connection config.
+
+    Vector stores are instantiated for every indexing or retrieval call, so they get their
+    connection pools and clients from here instead of opening new ones each time. A forked
+    worker must not share the sockets of its parent, so the clients are dropped, without
+    closing them, in the child. The clients of the process are closed when it exits.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        # Key: (backend, connection config), Value: (client, close function, stats function)
+        self._clients: dict[tuple, tuple[Any, Callable[[], None], Callable[[], dict[str, Any]]]] = {}
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            self._reset()
+
+    def get(
+        self,
+        backend: str,
+        config: dict[str, Any],
+        factory: Callable[[], T],
+        close: Callable[[T], None],
+        stats: Callable[[T], dict[str, Any]],
+    ) -> T:
+        """
+        Get the client of a backend for a connection config, creating it on first use.
+
+        :param backend: the vector store type
+        :param config: the connection config, every client is created once per config
+        :param factory: creates the client
+        :param close: closes the client when the process exits
+        :param stats: returns the utilization of the client
+        :return: the shared client
+        """
+        self._check_pid()
+        key = (backend, tuple(sorted(config.items())))
+        entry = self._clients.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._clients.get(key)
+                if entry is None:
+                    client = factory()
+                    entry = (client, lambda: close(client), lambda: stats(client))
+                    self._clients[key] = entry
+        return entry[0]
+
+    def close_all(self) -> None:
+        self._check_pid()
+        with self._lock:
+            entries = list(self._clients.values())
+            self._clients.clear()
+        for _, close, _ in entries:
+            try:
+                close()
+            except Exception:
+                logger.warning("Failed to close vector store client", exc_info=True)
+
+    def stats(self) -> dict[str, Any]:
+        self._check_pid()
+        with self._lock:
+            entries = list(self._clients.items())
+        return {
+            "pid": self._pid,
+            "pools": [{"backend": backend, **get_stats()} for (backend, _), (_, _, get_stats) in entries],
+        }
+
+
+_registry = _VectorClientRegistry()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_registry._reset)
+atexit.register(_registry.close_all)
+
+
+def get_connection_pool(
+    backend: str, *, minconn: int, maxconn: int, host: str, port: int, user: str, password: str, database: str
+) -> SharedConnectionPool:
+    """Get the psycopg2 connection pool of a Postgres-family vector store."""
+    config = {
+        "host": host,
+        "port": port,
+        "user": user,
+        "password": password,
+        "database": database,
+        "minconn": minconn,
+        "maxconn": maxconn,
+    }
+    return _registry.get(
+        backend,
+        config,
+        lambda: SharedConnectionPool(
+            f"{backend}://{user}@{host}:{port}/{database}",
+            minconn,
+            maxconn,
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            database=database,
+        ),
+        lambda pool: pool.closeall(),
+        lambda pool: pool.stats(),
+    )
+
+
+def get_engine(backend: str, url: str) -> Engine:
+    """Get the SQLAlchemy engine of a vector store, which pings its connections before using them."""
+    return _registry.get(
+        backend,
+        {"url": url},
+        lambda: create_engine(url, pool_pre_ping=True),
+        lambda engine: engine.dispose(),
+        lambda engine: {
+            "name": engine.url.render_as_string(hide_password=True),
+            "pool_size": engine.pool.size(),  # type: ignore
+            "in_use_connections": engine.pool.checkedout(),  # type: ignore
+            "idle_connections": engine.pool.checkedin(),  # type: ignore
+            "overflow_connections": engine.pool.overflow(),  # type: ignore
+        },
+    )
+
+
+def get_pool_stats() -> dict[str, Any]:
+    """Utilization of the vector store connection pools of the current process."""
+    return _registry.stats()
@@ -164,6 +164,10 @@ class Vector:
                 from core.rag.datasource.vdb.huawei.huawei_cloud_vector import HuaweiCloudVectorFactory
 
                 return HuaweiCloudVectorFactory
+            case VectorType.LOCAL:
+                from core.rag.datasource.vdb.local.local_vector import LocalVectorFactory
+
+                return LocalVectorFactory
             case _:
                 raise ValueError(f"Vector store {vector_type} is not supported.")
 
@@ -182,6 +186,9 @@ class Vector:
     def text_exists(self, id: str) -> bool:
         return self._vector_processor.text_exists(id)
 
+    def existing_ids(self, ids: list[str]) -> set[str]:
+        return self._vector_processor.existing_ids(ids)
+
     def delete_by_ids(self, ids: list[str]) -> None:
         self._vector_processor.delete_by_ids(ids)
 
@@ -214,14 +221,11 @@ class Vector:
         return CacheEmbedding(embedding_model)
 
     def _filter_duplicate_texts(self, texts: list[Document]) -> list[Document]:
-        for text in texts.copy():
-            if text.metadata is None:
-                continue
-            doc_id = text.metadata["doc_id"]
-            if doc_id:
-                exists_duplicate_node = self.text_exists(doc_id)
-                if exists_duplicate_node:
-                    texts.remove(text)
+        doc_ids = [text.metadata["doc_id"] for text in texts if text.metadata and text.metadata.get("doc_id")]
+        if doc_ids:
+            # Look up all the ids in a few batched queries instead of one query per text
+            existing_ids = self.existing_ids(doc_ids)
+            texts[:] = [text for text in texts if not (text.metadata and text.metadata.get("doc_id") in existing_ids)]
 
         return texts
 
@@ -164,6 +164,33 @@ class WeaviateVector(BaseVector):
 
         return True
 
+    def existing_ids(self, ids: list[str]) -> set[str]:
+        collection_name = self._collection_name
+        schema = self._default_schema(self._collection_name)
+
+        # check whether the index already exists
+        if not self._client.schema.contains(schema):
+            return set()
+        existing_ids = set()
+        for batch in self._batch_ids(ids, batch_size=100):
+            operands = [{"path": ["doc_id"], "operator": "Equal", "valueText": id} for id in batch]
+            where_filter = operands[0] if len(operands) == 1 else {"operator": "Or", "operands": operands}
+            # group by doc_id, as several objects can have the same doc_id and would take up the limit
+            result = (
+                self._client.query.aggregate(collection_name)
+                .with_group_by_filter(["doc_id"])
+                .with_fields("groupedBy { value }")
+                .with_where(where_filter)
+                .with_limit(len(batch))
+                .do()
+            )
+
+            if "errors" in result:
+                raise ValueError(f"Error during query: {result['errors']}")
+
+            existing_ids.update(group["groupedBy"]["value"] for group in result["data"]["Aggregate"][collection_name])
+        return existing_ids
+
     def delete_by_ids(self, ids: list[str]) -> None:
         # check whether the index already exists
         schema = self._default_schema(self._collection_name)
@@ -1,8 +1,11 @@
 import base64
 import logging
+import threading
 from typing import Any, Optional, cast
 
 import numpy as np
+from cachetools import LRUCache
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 
 from configs import aiexec_config
@@ -19,32 +22,100 @@ from models.dataset import Embedding
 logger = logging.getLogger(__name__)
 
 
+class EmbeddingMemoryCache:
+    """In-process LRU of encoded document embeddings in front of the embeddings table."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._cache: Optional[LRUCache] = LRUCache(maxsize=maxsize) if maxsize > 0 else None
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: list[tuple[str, str, str]]) -> dict[tuple[str, str, str], bytes]:
+        if self._cache is None:
+            return {}
+        with self._lock:
+            return {key: value for key in keys if (value := self._cache.get(key)) is not None}
+
+    def set_many(self, items: dict[tuple[str, str, str], bytes]) -> None:
+        if self._cache is None:
+            return
+        with self._lock:
+            self._cache.update(items)
+
+    def clear(self) -> None:
+        if self._cache is None:
+            return
+        with self._lock:
+            self._cache.clear()
+
+
+embedding_memory_cache = EmbeddingMemoryCache(aiexec_config.EMBEDDING_CACHE_MEMORY_SIZE)
+
+
 class CacheEmbedding(Embeddings):
     def __init__(self, model_instance: ModelInstance, user: Optional[str] = None) -> None:
         self._model_instance = model_instance
         self._user = user
 
+    def _memory_cache_key(self, hash: str) -> tuple[str, str, str]:
+        return self._model_instance.provider, self._model_instance.model, hash
+
+    def _get_cached_embeddings(self, hashes: list[str]) -> dict[str, list[float]]:
+        """Look up embeddings by text hash, in memory first and then in batched database queries."""
+        cached = {
+            key[2]: Embedding.decode_embedding(data)
+            for key, data in embedding_memory_cache.get_many([self._memory_cache_key(h) for h in hashes]).items()
+        }
+        missing = [h for h in hashes if h not in cached]
+        batch_size = aiexec_config.EMBEDDING_CACHE_BATCH_SIZE
+        for i in range(0, len(missing), batch_size):
+            rows = (
+                db.session.query(Embedding.hash, Embedding.embedding)
+                .filter(
+                    Embedding.model_name == self._model_instance.model,
+                    Embedding.provider_name == self._model_instance.provider,
+                    Embedding.hash.in_(missing[i : i + batch_size]),
+                )
+                .all()
+            )
+            embedding_memory_cache.set_many({self._memory_cache_key(row.hash): row.embedding for row in rows})
+            cached.update({row.hash: Embedding.decode_embedding(row.embedding) for row in rows})
+        return cached
+
+    def _store_embeddings(self, embeddings: dict[str, list[float]]) -> None:
+        """Insert new embeddings in batches, ignoring hashes stored concurrently by another worker."""
+        encoded = {hash: Embedding.encode_embedding(embedding) for hash, embedding in embeddings.items()}
+        values = [
+            {
+                "model_name": self._model_instance.model,
+                "hash": hash,
+                "provider_name": self._model_instance.provider,
+                "embedding": data,
+            }
+            for hash, data in encoded.items()
+        ]
+        batch_size = aiexec_config.EMBEDDING_CACHE_BATCH_SIZE
+        for i in range(0, len(values), batch_size):
+            stmt = insert(Embedding).values(values[i : i + batch_size])
+            db.session.execute(stmt.on_conflict_do_nothing(constraint="embedding_hash_idx"))
+        db.session.commit()
+        embedding_memory_cache.set_many({self._memory_cache_key(hash): data for hash, data in encoded.items()})
+
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         """Embed search docs in batches of 10."""
         # use doc embedding cache or store if not exists
         text_embeddings: list[Any] = [None for _ in range(len(texts))]
-        embedding_queue_indices = []
-        for i, text in enumerate(texts):
-            hash = helper.generate_text_hash(text)
-            embedding = (
-                db.session.query(Embedding)
-                .filter_by(
-                    model_name=self._model_instance.model, hash=hash, provider_name=self._model_instance.provider
-                )
-                .first()
-            )
-            if embedding:
-                text_embeddings[i] = embedding.get_embedding()
+        hashes = [helper.generate_text_hash(text) for text in texts]
+        cached_embeddings = self._get_cached_embeddings(list(dict.fromkeys(hashes)))
+        # texts that are not cached yet, embedded once per distinct hash
+        embedding_queue: dict[str, list[int]] = {}
+        for i, hash in enumerate(hashes):
+            if hash in cached_embeddings:
+                text_embeddings[i] = cached_embeddings[hash]
             else:
-                embedding_queue_indices.append(i)
-        if embedding_queue_indices:
-            embedding_queue_texts = [texts[i] for i in embedding_queue_indices]
-            embedding_queue_embeddings = []
+                embedding_queue.setdefault(hash, []).append(i)
+        if embedding_queue:
+            embedding_queue_hashes = list(embedding_queue)
+            new_embeddings: dict[str, list[float]] = {}
             try:
                 model_type_instance = cast(TextEmbeddingModel, self._model_instance.model_type_instance)
                 model_schema = model_type_instance.get_model_schema(
@@ -55,14 +126,15 @@ class CacheEmbedding(Embeddings):
                     if model_schema and ModelPropertyKey.MAX_CHUNKS in model_schema.model_properties
                     else 1
                 )
-                for i in range(0, len(embedding_queue_texts), max_chunks):
-                    batch_texts = embedding_queue_texts[i : i + max_chunks]
+                for i in range(0, len(embedding_queue_hashes), max_chunks):
+                    batch_hashes = embedding_queue_hashes[i : i + max_chunks]
+                    batch_texts = [texts[embedding_queue[hash][0]] for hash in batch_hashes]
 
                     embedding_result = self._model_instance.invoke_text_embedding(
                         texts=batch_texts, user=self._user, input_type=EmbeddingInputType.DOCUMENT
                     )
 
-                    for vector in embedding_result.embeddings:
+                    for hash, vector in zip(batch_hashes, embedding_result.embeddings):
                         try:
                             # FIXME: type ignore for numpy here
                             normalized_embedding = (vector / np.linalg.norm(vector)).tolist()  # type: ignore
@@ -71,26 +143,14 @@ class CacheEmbedding(Embeddings):
                                 # for issue #11827  float values are not json compliant
                                 logger.warning(f"Normalized embedding is nan: {normalized_embedding}")
                                 continue
-                            embedding_queue_embeddings.append(normalized_embedding)
-                        except IntegrityError:
-                            db.session.rollback()
+                            new_embeddings[hash] = normalized_embedding
                         except Exception:
                             logging.exception("Failed transform embedding")
-                cache_embeddings = []
-                try:
-                    for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
+                for hash, n_embedding in new_embeddings.items():
+                    for i in embedding_queue[hash]:
                         text_embeddings[i] = n_embedding
-                        hash = helper.generate_text_hash(texts[i])
-                        if hash not in cache_embeddings:
-                            embedding_cache = Embedding(
-                                model_name=self._model_instance.model,
-                                hash=hash,
-                                provider_name=self._model_instance.provider,
-                            )
-                            embedding_cache.set_embedding(n_embedding)
-                            db.session.add(embedding_cache)
-                            cache_embeddings.append(hash)
-                    db.session.commit()
+                try:
+                    self._store_embeddings(new_embeddings)
                 except IntegrityError:
                     db.session.rollback()
             except Exception as ex:
@@ -6,6 +6,7 @@ from urllib.parse import unquote
 
 from configs import aiexec_config
 from core.helper import ssrf_proxy
+from core.helper.extracted_text_cache import extracted_text_cache
 from core.rag.extractor.csv_extractor import CSVExtractor
 from core.rag.extractor.entity.datasource_type import DatasourceType
 from core.rag.extractor.entity.extract_setting import ExtractSetting
@@ -37,6 +38,8 @@ USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124"
     " Safari/537.36"
 )
+# Bump whenever a change to an extractor changes the documents extracted from the same file
+EXTRACTOR_VERSION = "1"
 
 
 class ExtractProcessor:
@@ -94,16 +97,31 @@ class ExtractProcessor:
     ) -> list[Document]:
         if extract_setting.datasource_type == DatasourceType.FILE.value:
             with tempfile.TemporaryDirectory() as temp_dir:
+                cache_key = None
                 if not file_path:
                     assert extract_setting.upload_file is not None, "upload_file is required"
                     upload_file: UploadFile = extract_setting.upload_file
                     suffix = Path(upload_file.key).suffix
+                    # Uploaded files carry the hash of their content, a cached file is not downloaded at all
+                    if upload_file.hash:
+                        cache_key = cls._get_cache_key(upload_file.hash, suffix.lower(), is_automatic, upload_file)
+                        documents = cls._get_cached_documents(cache_key)
+                        if documents is not None:
+                            return documents
                     # FIXME mypy: Cannot determine type of 'tempfile._get_candidate_names' better not use it here
                     file_path = f"{temp_dir}/{next(tempfile._get_candidate_names())}{suffix}"  # type: ignore
                     storage.download(upload_file.key, file_path)
                 input_file = Path(file_path)
                 file_extension = input_file.suffix.lower()
                 etl_type = aiexec_config.ETL_TYPE
+                if cache_key is None:
+                    content_hash = extracted_text_cache.hash_file(file_path)
+                    cache_key = cls._get_cache_key(
+                        content_hash, file_extension, is_automatic, extract_setting.upload_file
+                    )
+                    documents = cls._get_cached_documents(cache_key)
+                    if documents is not None:
+                        return documents
                 extractor: Optional[BaseExtractor] = None
                 if etl_type == "Unstructured":
                     unstructured_api_url = aiexec_config.UNSTRUCTURED_API_URL or ""
@@ -162,7 +180,12 @@ class ExtractProcessor:
                     else:
                         # txt
                         extractor = TextExtractor(file_path, autodetect_encoding=True)
-                return extractor.extract()
+                documents = extractor.extract()
+                extracted_text_cache.set(
+                    cache_key,
+                    [{"page_content": document.page_content, "metadata": document.metadata} for document in documents],
+                )
+                return documents
         elif extract_setting.datasource_type == DatasourceType.NOTION.value:
             assert extract_setting.notion_info is not None, "notion_info is required"
             extractor = NotionExtractor(
@@ -206,3 +229,20 @@ class ExtractProcessor:
                 raise ValueError(f"Unsupported website provider: {extract_setting.website_info.provider}")
         else:
             raise ValueError(f"Unsupported datasource type: {extract_setting.datasource_type}")
+
+    @staticmethod
+    def _get_cache_key(
+        content_hash: str, file_extension: str, is_automatic: bool, upload_file: Optional[UploadFile]
+    ) -> str:
+        extractor = [EXTRACTOR_VERSION, aiexec_config.ETL_TYPE, file_extension, str(is_automatic)]
+        if file_extension == ".docx" and upload_file:
+            # The images of a DOCX are saved as files of the workspace and linked from its text
+            extractor.append(upload_file.tenant_id)
+        return extracted_text_cache.make_key(content_hash, "extract_processor", *extractor)
+
+    @staticmethod
+    def _get_cached_documents(cache_key: str) -> Optional[list[Document]]:
+        cached = extracted_text_cache.get(cache_key)
+        if cached is None:
+            return None
+        return [Document(page_content=document["page_content"], metadata=document["metadata"]) for document in cached]
@@ -1,8 +1,16 @@
 """Document loader helpers."""
 
 import concurrent.futures
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import NamedTuple, Optional, cast
+from typing import NamedTuple, Optional, Union, cast
+
+from configs import aiexec_config
 
 
 class FileEncoding(NamedTuple):
@@ -42,3 +50,80 @@ def detect_file_encodings(file_path: str, timeout: int = 5) -> list[FileEncoding
     if all(encoding["encoding"] is None for encoding in encodings):
         raise RuntimeError(f"Could not detect encoding for {file_path}")
     return [FileEncoding(**enc) for enc in encodings if enc["encoding"] is not None]
+
+
+_pdf_executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_pdf_executor_lock = threading.Lock()
+
+
+def _reset_pdf_executor() -> None:
+    global _pdf_executor
+    _pdf_executor = None
+
+
+# The processes of a pool created before a fork belong to the parent
+os.register_at_fork(after_in_child=_reset_pdf_executor)
+
+
+def _get_pdf_executor() -> concurrent.futures.ProcessPoolExecutor:
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is None:
+            # Spawned rather than forked, as the process running the app has threads of its own
+            _pdf_executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=aiexec_config.PDF_EXTRACT_MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pdf_executor
+
+
+def _extract_pdf_page_range(file: Union[str, bytes], start: int, stop: int) -> list[str]:
+    import pypdfium2  # type: ignore
+
+    pdf_document = pypdfium2.PdfDocument(io.BytesIO(file) if isinstance(file, bytes) else file, autoclose=True)
+    try:
+        texts = []
+        for page_number in range(start, stop):
+            page = pdf_document[page_number]
+            text_page = page.get_textpage()
+            texts.append(text_page.get_text_range())
+            text_page.close()
+            page.close()
+        return texts
+    finally:
+        pdf_document.close()
+
+
+def should_extract_pdf_in_parallel(page_count: int) -> bool:
+    return aiexec_config.PDF_EXTRACT_MAX_WORKERS > 1 and page_count >= aiexec_config.PDF_EXTRACT_PARALLEL_MIN_PAGES
+
+
+def extract_pdf_page_texts_in_parallel(file: Union[str, bytes], page_count: int) -> list[str]:
+    """Extract the text of every page of a PDF in a pool of processes.
+
+    pypdfium2 is not thread safe, so the pages are split into one range per worker
+    process and every worker opens the file on its own.
+
+    Args:
+        file: The path to the PDF or its content.
+        page_count: The number of pages of the PDF.
+    """
+    if isinstance(file, bytes):
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as temp_file:
+            temp_file.write(file)
+            temp_file.flush()
+            return extract_pdf_page_texts_in_parallel(temp_file.name, page_count)
+
+    executor = _get_pdf_executor()
+    pages_per_worker = -(-page_count // aiexec_config.PDF_EXTRACT_MAX_WORKERS)
+    futures = [
+        executor.submit(_extract_pdf_page_range, file, start, min(start + pages_per_worker, page_count))
+        for start in range(0, page_count, pages_per_worker)
+    ]
+    try:
+        return [text for future in futures for text in future.result()]
+    except BrokenProcessPool:
+        # A worker died, the next extraction starts a new pool
+        with _pdf_executor_lock:
+            if _pdf_executor is executor:
+                _reset_pdf_executor()
+        raise
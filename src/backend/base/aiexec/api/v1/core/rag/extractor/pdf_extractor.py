@@ -5,6 +5,7 @@ from typing import Optional, cast
 
 from core.rag.extractor.blob.blob import Blob
 from core.rag.extractor.extractor_base import BaseExtractor
+from core.rag.extractor.helpers import extract_pdf_page_texts_in_parallel, should_extract_pdf_in_parallel
 from core.rag.models.document import Document
 from extensions.ext_storage import storage
 
@@ -57,6 +58,13 @@ class PdfExtractor(BaseExtractor):
         with blob.as_bytes_io() as file_path:
             pdf_reader = pypdfium2.PdfDocument(file_path, autoclose=True)
             try:
+                page_count = len(pdf_reader)
+                if should_extract_pdf_in_parallel(page_count):
+                    file = str(blob.path) if blob.data is None and blob.path else blob.as_bytes()
+                    texts = extract_pdf_page_texts_in_parallel(file, page_count)
+                    for page_number, content in enumerate(texts):
+                        yield Document(page_content=content, metadata={"source": blob.source, "page": page_number})
+                    return
                 for page_number, page in enumerate(pdf_reader):
                     text_page = page.get_textpage()
                     content = text_page.get_text_range()
@@ -1,8 +1,8 @@
-import math
-from collections import Counter
+import threading
 from typing import Optional
 
 import numpy as np
+from cachetools import LRUCache
 
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
@@ -12,6 +12,11 @@ from core.rag.models.document import Document
 from core.rag.rerank.entity.weight import VectorSetting, Weights
 from core.rag.rerank.rerank_base import BaseRerankRunner
 
+# Keywords of document contents, retrieval returns the same segments for many queries
+KEYWORDS_CACHE_MAXSIZE = 10000
+_keywords_cache: LRUCache = LRUCache(maxsize=KEYWORDS_CACHE_MAXSIZE)
+_keywords_cache_lock = threading.Lock()
+
 
 class WeightRerankRunner(BaseRerankRunner):
     def __init__(self, tenant_id: str, weights: Weights) -> None:
@@ -65,7 +70,7 @@ class WeightRerankRunner(BaseRerankRunner):
 
     def _calculate_keyword_score(self, query: str, documents: list[Document]) -> list[float]:
         """
-        Calculate BM25 scores
+        Calculate TF-IDF cosine scores
         :param query: search query
         :param documents: documents for reranking
 
@@ -73,72 +78,65 @@ class WeightRerankRunner(BaseRerankRunner):
         """
         keyword_table_handler = JiebaKeywordTableHandler()
         query_keywords = keyword_table_handler.extract_keywords(query, None)
-        documents_keywords = []
-        for document in documents:
-            # get the document keywords
-            document_keywords = keyword_table_handler.extract_keywords(document.page_content, None)
+        documents_keywords = self._extract_documents_keywords(keyword_table_handler, documents)
+        for document, document_keywords in zip(documents, documents_keywords):
             if document.metadata is not None:
                 document.metadata["keywords"] = document_keywords
-                documents_keywords.append(document_keywords)
 
-        # Counter query keywords(TF)
-        query_keyword_counts = Counter(query_keywords)
+        # build the document-keyword matrix in coordinate form, every keyword of a document has TF 1
+        vocabulary: dict[str, int] = {}
+        rows: list[int] = []
+        cols: list[int] = []
+        for row, document_keywords in enumerate(documents_keywords):
+            rows.extend([row] * len(document_keywords))
+            cols.extend(vocabulary.setdefault(keyword, len(vocabulary)) for keyword in document_keywords)
 
-        # total documents
         total_documents = len(documents)
+        if not vocabulary:
+            return [0.0] * total_documents
+
+        row_indices = np.asarray(rows, dtype=np.intp)
+        col_indices = np.asarray(cols, dtype=np.intp)
+
+        # IDF of every keyword from the number of documents containing it
+        document_frequency = np.bincount(col_indices, minlength=len(vocabulary))
+        idf = np.log((1 + total_documents) / (1 + document_frequency)) + 1
+        weights = idf[col_indices]
+
+        # keywords that appear in no document have IDF 0
+        query_tfidf = np.zeros(len(vocabulary))
+        for keyword in query_keywords:
+            index = vocabulary.get(keyword)
+            if index is not None:
+                query_tfidf[index] = idf[index]
+
+        numerators = np.bincount(row_indices, weights=weights * query_tfidf[col_indices], minlength=total_documents)
+        document_norms = np.sqrt(np.bincount(row_indices, weights=weights**2, minlength=total_documents))
+        denominators = document_norms * np.linalg.norm(query_tfidf)
+        similarities = np.divide(numerators, denominators, out=np.zeros(total_documents), where=denominators > 0)
+
+        return similarities.tolist()
+
+    def _extract_documents_keywords(
+        self, keyword_table_handler: JiebaKeywordTableHandler, documents: list[Document]
+    ) -> list[set[str]]:
+        """
+        Extract the keywords of each document, reusing the keywords of contents seen before
+        :param keyword_table_handler: keyword table handler
+        :param documents: documents for reranking
 
-        # calculate all documents' keywords IDF
-        all_keywords = set()
-        for document_keywords in documents_keywords:
-            all_keywords.update(document_keywords)
-
-        keyword_idf = {}
-        for keyword in all_keywords:
-            # calculate include query keywords' documents
-            doc_count_containing_keyword = sum(1 for doc_keywords in documents_keywords if keyword in doc_keywords)
-            # IDF
-            keyword_idf[keyword] = math.log((1 + total_documents) / (1 + doc_count_containing_keyword)) + 1
-
-        query_tfidf = {}
-
-        for keyword, count in query_keyword_counts.items():
-            tf = count
-            idf = keyword_idf.get(keyword, 0)
-            query_tfidf[keyword] = tf * idf
-
-        # calculate all documents' TF-IDF
-        documents_tfidf = []
-        for document_keywords in documents_keywords:
-            document_keyword_counts = Counter(document_keywords)
-            document_tfidf = {}
-            for keyword, count in document_keyword_counts.items():
-                tf = count
-                idf = keyword_idf.get(keyword, 0)
-                document_tfidf[keyword] = tf * idf
-            documents_tfidf.append(document_tfidf)
-
-        def cosine_similarity(vec1, vec2):
-            intersection = set(vec1.keys()) & set(vec2.keys())
-            numerator = sum(vec1[x] * vec2[x] for x in intersection)
-
-            sum1 = sum(vec1[x] ** 2 for x in vec1)
-            sum2 = sum(vec2[x] ** 2 for x in vec2)
-            denominator = math.sqrt(sum1) * math.sqrt(sum2)
-
-            if not denominator:
-                return 0.0
-            else:
-                return float(numerator) / denominator
-
-        similarities = []
-        for document_tfidf in documents_tfidf:
-            similarity = cosine_similarity(query_tfidf, document_tfidf)
-            similarities.append(similarity)
-
-        # for idx, similarity in enumerate(similarities):
-        #     print(f"Document {idx + 1} similarity: {similarity}")
-
-        return similarities
+        :return:
+        """
+        documents_keywords = []
+        for document in documents:
+            with _keywords_cache_lock:
+                keywords = _keywords_cache.get(document.page_content)
+            if keywords is None:
+                keywords = frozenset(keyword_table_handler.extract_keywords(document.page_content, None))
+                with _keywords_cache_lock:
+                    _keywords_cache[document.page_content] = keywords
+            documents_keywords.append(set(keywords))
+        return documents_keywords
 
     def _calculate_cosine(
         self, tenant_id: str, query: str, documents: list[Document], vector_setting: VectorSetting
@@ -150,7 +148,17 @@ class WeightRerankRunner(BaseRerankRunner):
 
         :return:
         """
-        query_vector_scores = []
+        query_vector_scores: list[float] = []
+        unscored_indices = []
+        for index, document in enumerate(documents):
+            if document.metadata and "score" in document.metadata:
+                query_vector_scores.append(document.metadata["score"])
+            else:
+                query_vector_scores.append(0.0)
+                unscored_indices.append(index)
+
+        if not unscored_indices:
+            return query_vector_scores
 
         model_manager = ModelManager()
 
@@ -161,25 +169,14 @@ class WeightRerankRunner(BaseRerankRunner):
             model=vector_setting.embedding_model_name,
         )
         cache_embedding = CacheEmbedding(embedding_model)
-        query_vector = cache_embedding.embed_query(query)
-        for document in documents:
-            # calculate cosine similarity
-            if document.metadata and "score" in document.metadata:
-                query_vector_scores.append(document.metadata["score"])
-            else:
-                # transform to NumPy
-                vec1 = np.array(query_vector)
-                vec2 = np.array(document.vector)
+        query_vector = np.asarray(cache_embedding.embed_query(query), dtype=float)
 
-                # calculate dot product
-                dot_product = np.dot(vec1, vec2)
-
-                # calculate norm
-                norm_vec1 = np.linalg.norm(vec1)
-                norm_vec2 = np.linalg.norm(vec2)
-
-                # calculate cosine similarity
-                cosine_sim = dot_product / (norm_vec1 * norm_vec2)
-                query_vector_scores.append(cosine_sim)
+        # cosine similarity of all documents without a score in one matrix-vector product
+        document_vectors = np.asarray([documents[index].vector for index in unscored_indices], dtype=float)
+        cosine_similarities = (document_vectors @ query_vector) / (
+            np.linalg.norm(document_vectors, axis=1) * np.linalg.norm(query_vector)
+        )
+        for index, cosine_similarity in zip(unscored_indices, cosine_similarities.tolist()):
+            query_vector_scores[index] = cosine_similarity
 
         return query_vector_scores
@@ -5,8 +5,14 @@ This package contains concrete implementations of the repository interfaces
 defined in the core.workflow.repository package.
 """
 
+from core.repositories.buffered_sqlalchemy_workflow_node_execution_repository import (
+    BufferedSQLAlchemyWorkflowNodeExecutionRepository,
+    create_workflow_node_execution_repository,
+)
 from core.repositories.sqlalchemy_workflow_node_execution_repository import SQLAlchemyWorkflowNodeExecutionRepository
 
 __all__ = [
+    "BufferedSQLAlchemyWorkflowNodeExecutionRepository",
     "SQLAlchemyWorkflowNodeExecutionRepository",
+    "create_workflow_node_execution_repository",
 ]
@@ -0,0 +1,185 @@
+"""
+Buffered SQLAlchemy implementation of the WorkflowNodeExecutionRepository.
+"""
+
+import logging
+from collections.abc import Sequence
+from typing import Any, Optional, Union
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from configs import aiexec_config
+from core.repositories.sqlalchemy_workflow_node_execution_repository import SQLAlchemyWorkflowNodeExecutionRepository
+from core.workflow.entities.workflow_node_execution import WorkflowNodeExecution, WorkflowNodeExecutionStatus
+from core.workflow.repositories.workflow_node_execution_repository import OrderConfig
+from models import (
+    Account,
+    EndUser,
+    WorkflowNodeExecutionModel,
+    WorkflowNodeExecutionTriggeredFrom,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedSQLAlchemyWorkflowNodeExecutionRepository(SQLAlchemyWorkflowNodeExecutionRepository):
+    """
+    SQLAlchemy implementation of the WorkflowNodeExecutionRepository that buffers writes in memory.
+
+    Saved executions are kept in memory instead of being committed one by one. Once
+    `flush_size` finished executions are buffered they are written in one batch, and
+    `flush` writes everything that is left, including executions that are still running.
+    Reads of buffered executions, such as the running executions of a workflow run,
+    are served from memory.
+
+    Buffered executions are lost if the process dies before they are flushed, so
+    other readers only see a node execution once its batch or its workflow run ends.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker | Engine,
+        user: Union[Account, EndUser],
+        app_id: Optional[str],
+        triggered_from: Optional[WorkflowNodeExecutionTriggeredFrom],
+        flush_size: Optional[int] = None,
+    ):
+        """
+        Initialize the repository with a SQLAlchemy sessionmaker or engine and context information.
+
+        Args:
+            session_factory: SQLAlchemy sessionmaker or engine for creating sessions
+            user: Account or EndUser object containing tenant_id, user ID, and role information
+            app_id: App ID for filtering by application (can be None)
+            triggered_from: Source of the execution trigger (SINGLE_STEP or WORKFLOW_RUN)
+            flush_size: Number of finished executions that triggers a flush,
+                defaults to WORKFLOW_NODE_EXECUTION_BUFFER_FLUSH_SIZE
+        """
+        super().__init__(session_factory=session_factory, user=user, app_id=app_id, triggered_from=triggered_from)
+        self._flush_size = flush_size or aiexec_config.WORKFLOW_NODE_EXECUTION_BUFFER_FLUSH_SIZE
+
+        # Executions waiting to be written
+        # Key: execution id, Value: WorkflowNodeExecution (DB model)
+        self._buffer: dict[str, WorkflowNodeExecutionModel] = {}
+
+    def save(self, execution: WorkflowNodeExecution) -> None:
+        """
+        Buffer a NodeExecution domain entity, writing the finished executions once there are enough of them.
+
+        Args:
+            execution: The NodeExecution domain entity to persist
+        """
+        db_model = self.to_db_model(execution)
+        self._buffer[db_model.id] = db_model
+        if db_model.node_execution_id:
+            self._node_execution_cache[db_model.node_execution_id] = db_model
+
+        finished = [model for model in self._buffer.values() if model.status != WorkflowNodeExecutionStatus.RUNNING]
+        if len(finished) >= self._flush_size:
+            self._write(finished)
+
+    def flush(self) -> None:
+        """
+        Write every buffered execution to the database.
+        """
+        if self._buffer:
+            self._write(list(self._buffer.values()))
+
+    def get_db_models_by_workflow_run(
+        self,
+        workflow_run_id: str,
+        order_config: Optional[OrderConfig] = None,
+    ) -> Sequence[WorkflowNodeExecutionModel]:
+        """
+        Flush the buffered executions and retrieve all database models for a specific workflow run.
+        """
+        self.flush()
+        return super().get_db_models_by_workflow_run(workflow_run_id, order_config)
+
+    def get_running_executions(self, workflow_run_id: str) -> Sequence[WorkflowNodeExecution]:
+        """
+        Retrieve all running NodeExecution instances for a specific workflow run.
+
+        Running executions that were already written are read from the database,
+        buffered executions take precedence over them.
+
+        Args:
+            workflow_run_id: The workflow run ID
+
+        Returns:
+            A list of running NodeExecution instances
+        """
+        executions = {execution.id: execution for execution in super().get_running_executions(workflow_run_id)}
+        if self._triggered_from != WorkflowNodeExecutionTriggeredFrom.WORKFLOW_RUN:
+            return list(executions.values())
+
+        for db_model in self._buffer.values():
+            if db_model.workflow_run_id != workflow_run_id:
+                continue
+            # The database query refreshed the cache with older versions of buffered executions
+            if db_model.node_execution_id:
+                self._node_execution_cache[db_model.node_execution_id] = db_model
+            if db_model.status == WorkflowNodeExecutionStatus.RUNNING:
+                executions[db_model.id] = self._to_domain_model(db_model)
+            else:
+                executions.pop(db_model.id, None)
+        return list(executions.values())
+
+    def clear(self) -> None:
+        """
+        Drop the buffered executions and clear all WorkflowNodeExecution records for the current tenant_id and app_id.
+        """
+        self._buffer.clear()
+        super().clear()
+
+    def _write(self, db_models: list[WorkflowNodeExecutionModel]) -> None:
+        """
+        Write a batch of executions in one transaction and remove them from the buffer.
+
+        On PostgreSQL the batch is written as a single multi-row upsert,
+        other databases merge the executions one by one.
+        """
+        with self._session_factory() as session:
+            if session.get_bind().dialect.name == "postgresql":
+                table = WorkflowNodeExecutionModel.__table__
+                stmt = insert(table)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[table.c.id],
+                    set_={column.name: stmt.excluded[column.name] for column in table.columns if column.name != "id"},
+                )
+                session.execute(stmt, [self._to_row(db_model) for db_model in db_models])
+            else:
+                for db_model in db_models:
+                    session.merge(db_model)
+            session.commit()
+
+        logger.debug(f"Wrote {len(db_models)} buffered workflow node executions")
+        for db_model in db_models:
+            self._buffer.pop(db_model.id, None)
+
+    @staticmethod
+    def _to_row(db_model: WorkflowNodeExecutionModel) -> dict[str, Any]:
+        row = {column.name: getattr(db_model, column.name) for column in WorkflowNodeExecutionModel.__table__.columns}
+        if row["elapsed_time"] is None:
+            row["elapsed_time"] = 0
+        return row
+
+
+def create_workflow_node_execution_repository(
+    session_factory: sessionmaker | Engine,
+    user: Union[Account, EndUser],
+    app_id: Optional[str],
+    triggered_from: Optional[WorkflowNodeExecutionTriggeredFrom],
+) -> SQLAlchemyWorkflowNodeExecutionRepository:
+    """
+    Create the node execution repository of a workflow run, buffered if WORKFLOW_NODE_EXECUTION_BUFFER_ENABLED is set.
+    """
+    if aiexec_config.WORKFLOW_NODE_EXECUTION_BUFFER_ENABLED:
+        return BufferedSQLAlchemyWorkflowNodeExecutionRepository(
+            session_factory=session_factory, user=user, app_id=app_id, triggered_from=triggered_from
+        )
+    return SQLAlchemyWorkflowNodeExecutionRepository(
+        session_factory=session_factory, user=user, app_id=app_id, triggered_from=triggered_from
+    )
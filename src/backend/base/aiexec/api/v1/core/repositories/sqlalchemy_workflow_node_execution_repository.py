@@ -372,6 +372,11 @@ class SQLAlchemyWorkflowNodeExecutionRepository(WorkflowNodeExecutionRepository)
 
             return domain_models
 
+    def flush(self) -> None:
+        """
+        Every execution is committed when it is saved, so there is nothing to flush.
+        """
+
     def clear(self) -> None:
         """
         Clear all WorkflowNodeExecution records for the current tenant_id and app_id.
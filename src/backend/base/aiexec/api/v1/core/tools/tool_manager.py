@@ -9,7 +9,9 @@ from typing import TYPE_CHECKING, Any, Union, cast
 from yarl import URL
 
 import contexts
-from core.plugin.entities.plugin import ToolProviderID
+from core.plugin.entities.plugin import PluginInstallationSource, ToolProviderID
+from core.plugin.entities.plugin_daemon import PluginToolProviderEntity
+from core.plugin.impl.plugin import PluginInstaller
 from core.plugin.impl.tool import PluginToolManager
 from core.tools.__base.tool_provider import ToolProviderController
 from core.tools.__base.tool_runtime import ToolRuntime
@@ -25,6 +27,7 @@ from configs import aiexec_config
 from core.agent.entities import AgentToolEntity
 from core.app.entities.app_invoke_entities import InvokeFrom
 from core.helper.module_import_helper import load_single_subclass_from_source
+from core.helper.plugin_tool_provider_cache import plugin_tool_provider_cache
 from core.helper.position_helper import is_filtered
 from core.model_runtime.utils.encoders import jsonable_encoder
 from core.tools.__base.tool import Tool
@@ -101,6 +104,9 @@ class ToolManager:
     def get_plugin_provider(cls, provider: str, tenant_id: str) -> PluginToolProviderController:
         """
         get the plugin provider
+
+        providers are fetched from the plugin daemon once per process until the plugins of the
+        workspace change, see `PluginToolProviderCache`
         """
         # check if context is set
         try:
@@ -114,10 +120,15 @@ class ToolManager:
             if provider in plugin_tool_providers:
                 return plugin_tool_providers[provider]
 
-            manager = PluginToolManager()
-            provider_entity = manager.fetch_tool_provider(tenant_id, provider)
-            if not provider_entity:
-                raise ToolProviderNotFoundError(f"plugin provider {provider} not found")
+            provider_entity = plugin_tool_provider_cache.get_provider(tenant_id, provider)
+            if provider_entity is None:
+                generation = plugin_tool_provider_cache.generation(tenant_id)
+                manager = PluginToolManager()
+                provider_entity = manager.fetch_tool_provider(tenant_id, provider)
+                if not provider_entity:
+                    raise ToolProviderNotFoundError(f"plugin provider {provider} not found")
+                if cls._are_plugin_providers_cacheable(tenant_id, [provider_entity]):
+                    plugin_tool_provider_cache.set_provider(tenant_id, provider, provider_entity, generation)
 
             controller = PluginToolProviderController(
                 entity=provider_entity.declaration,
@@ -467,13 +478,37 @@ class ToolManager:
 
             yield from cls._list_hardcoded_providers()
 
+    @staticmethod
+    def _are_plugin_providers_cacheable(tenant_id: str, provider_entities: list[PluginToolProviderEntity]) -> bool:
+        """
+        check if the providers all come from installed plugins, and not from plugins being debugged
+        remotely, which change without going through the plugin service
+        """
+        if not plugin_tool_provider_cache.enabled:
+            return False
+        plugin_ids = list({provider_entity.plugin_id for provider_entity in provider_entities})
+        if not plugin_ids:
+            return True
+        installations = PluginInstaller().fetch_plugin_installation_by_ids(tenant_id, plugin_ids)
+        installed_plugin_ids = {
+            installation.plugin_id
+            for installation in installations
+            if installation.source != PluginInstallationSource.Remote
+        }
+        return all(plugin_id in installed_plugin_ids for plugin_id in plugin_ids)
+
     @classmethod
     def list_plugin_providers(cls, tenant_id: str) -> list[PluginToolProviderController]:
         """
         list all the plugin providers
         """
-        manager = PluginToolManager()
-        provider_entities = manager.fetch_tool_providers(tenant_id)
+        provider_entities = plugin_tool_provider_cache.get_providers(tenant_id)
+        if provider_entities is None:
+            generation = plugin_tool_provider_cache.generation(tenant_id)
+            manager = PluginToolManager()
+            provider_entities = manager.fetch_tool_providers(tenant_id)
+            if cls._are_plugin_providers_cacheable(tenant_id, provider_entities):
+                plugin_tool_provider_cache.set_providers(tenant_id, provider_entities, generation)
         return [
             PluginToolProviderController(
                 entity=provider.declaration,
@@ -1,9 +1,9 @@
 import re
 from collections import defaultdict
 from collections.abc import Mapping, Sequence
-from typing import Any, Union
+from typing import Any, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from core.file import File, FileAttribute, file_manager
 from core.variables import Segment, SegmentGroup, Variable
@@ -42,6 +42,12 @@ class VariablePool(BaseModel):
         description="Conversation variables.",
         default_factory=list,
     )
+    # A child pool only holds its own writes and reads everything else through to its parent,
+    # which must not be changed while the child is in use. Removals are recorded so that they
+    # hide the parent's variables.
+    _parent: Optional["VariablePool"] = PrivateAttr(default=None)
+    _removed_keys: set[tuple[str, int]] = PrivateAttr(default_factory=set)
+    _removed_nodes: set[str] = PrivateAttr(default_factory=set)
 
     def __init__(
         self,
@@ -104,6 +110,7 @@ class VariablePool(BaseModel):
 
         hash_key = hash(tuple(selector[1:]))
         self.variable_dictionary[selector[0]][hash_key] = variable
+        self._removed_keys.discard((selector[0], hash_key))
 
     def get(self, selector: Sequence[str], /) -> Segment | None:
         """
@@ -122,7 +129,7 @@ class VariablePool(BaseModel):
             return None
 
         hash_key = hash(tuple(selector[1:]))
-        value = self.variable_dictionary[selector[0]].get(hash_key)
+        value = self._get_variable(selector[0], hash_key)
 
         if value is None:
             selector, attr = selector[:-1], selector[-1]
@@ -154,9 +161,60 @@ class VariablePool(BaseModel):
             return
         if len(selector) == 1:
             self.variable_dictionary[selector[0]] = {}
+            if self._parent is not None:
+                self._removed_nodes.add(selector[0])
+                self._removed_keys = {key for key in self._removed_keys if key[0] != selector[0]}
             return
         hash_key = hash(tuple(selector[1:]))
         self.variable_dictionary[selector[0]].pop(hash_key, None)
+        if self._parent is not None:
+            self._removed_keys.add((selector[0], hash_key))
+
+    def _get_variable(self, node_id: str, hash_key: int) -> Segment | None:
+        pool: Optional[VariablePool] = self
+        while pool is not None:
+            # avoid the defaultdict here, a parent may be read by several children at once
+            variables = pool.variable_dictionary.get(node_id)
+            if variables is not None and hash_key in variables:
+                return variables[hash_key]
+            if node_id in pool._removed_nodes or (node_id, hash_key) in pool._removed_keys:
+                return None
+            pool = pool._parent
+        return None
+
+    def create_child(self) -> "VariablePool":
+        """
+        Create a child pool that reads through to this pool and only stores its own changes.
+
+        This pool must not be changed while the child is in use.
+        """
+        child = VariablePool.model_construct(
+            variable_dictionary=defaultdict(dict),
+            user_inputs=self.user_inputs,
+            system_variables=self.system_variables,
+            environment_variables=self.environment_variables,
+            conversation_variables=self.conversation_variables,
+        )
+        child._parent = self
+        return child
+
+    def merge_into_parent(self) -> None:
+        """
+        Apply the changes of a child pool to its parent.
+        """
+        if self._parent is None:
+            raise ValueError("Variable pool has no parent")
+        parent = self._parent
+        for node_id in self._removed_nodes:
+            parent.remove([node_id])
+        for node_id, hash_key in self._removed_keys:
+            if node_id in parent.variable_dictionary:
+                parent.variable_dictionary[node_id].pop(hash_key, None)
+            if parent._parent is not None:
+                parent._removed_keys.add((node_id, hash_key))
+        for node_id, variables in self.variable_dictionary.items():
+            parent.variable_dictionary[node_id].update(variables)
+            parent._removed_keys.difference_update((node_id, hash_key) for hash_key in variables)
 
     def convert_template(self, template: str, /):
         parts = VARIABLE_PATTERN.split(template)
@@ -23,6 +23,8 @@ from docx.text.paragraph import Paragraph
 from configs import aiexec_config
 from core.file import File, FileTransferMethod, file_manager
 from core.helper import ssrf_proxy
+from core.helper.extracted_text_cache import extracted_text_cache
+from core.rag.extractor.helpers import extract_pdf_page_texts_in_parallel, should_extract_pdf_in_parallel
 from core.variables import ArrayFileSegment
 from core.variables.segments import FileSegment
 from core.workflow.entities.node_entities import NodeRunResult
@@ -35,6 +37,9 @@ from .exc import DocumentExtractorError, FileDownloadError, TextExtractionError,
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever a change to the extraction changes the text extracted from the same file
+EXTRACTOR_VERSION = "1"
+
 
 class DocumentExtractorNode(BaseNode[DocumentExtractorNodeData]):
     """
@@ -245,6 +250,10 @@ def _extract_text_from_pdf(file_content: bytes) -> str:
     try:
         pdf_file = io.BytesIO(file_content)
         pdf_document = pypdfium2.PdfDocument(pdf_file, autoclose=True)
+        page_count = len(pdf_document)
+        if should_extract_pdf_in_parallel(page_count):
+            pdf_document.close()
+            return "".join(extract_pdf_page_texts_in_parallel(file_content, page_count))
         text = ""
         for page in pdf_document:
             text_page = page.get_textpage()
@@ -367,11 +376,23 @@ def _download_file_content(file: File) -> bytes:
 def _extract_text_from_file(file: File):
     file_content = _download_file_content(file)
     if file.extension:
-        extracted_text = _extract_text_by_file_extension(file_content=file_content, file_extension=file.extension)
+        extractor = ("document_extractor", EXTRACTOR_VERSION, "extension", file.extension)
     elif file.mime_type:
-        extracted_text = _extract_text_by_mime_type(file_content=file_content, mime_type=file.mime_type)
+        extractor = ("document_extractor", EXTRACTOR_VERSION, "mime_type", file.mime_type)
     else:
         raise UnsupportedFileTypeError("Unable to determine file type: MIME type or file extension is missing")
+
+    # The same file is often extracted by many workflow runs
+    cache_key = extracted_text_cache.make_key(extracted_text_cache.hash_content(file_content), *extractor)
+    extracted_text = extracted_text_cache.get(cache_key)
+    if extracted_text is not None:
+        return extracted_text
+
+    if file.extension:
+        extracted_text = _extract_text_by_file_extension(file_content=file_content, file_extension=file.extension)
+    else:
+        extracted_text = _extract_text_by_mime_type(file_content=file_content, mime_type=cast(str, file.mime_type))
+    extracted_text_cache.set(cache_key, extracted_text)
     return extracted_text
 
 
@@ -82,6 +82,15 @@ class WorkflowNodeExecutionRepository(Protocol):
         """
         ...
 
+    def flush(self) -> None:
+        """
+        Persist the changes that are buffered in memory.
+
+        Implementations that write every change through when it is saved have nothing to do.
+        Called when a workflow run ends, so buffered executions are persisted before the run is finished.
+        """
+        ...
+
     def clear(self) -> None:
         """
         Clear all NodeExecution records based on implementation-specific criteria.
@@ -110,6 +110,7 @@ class WorkflowCycleManager:
                 )
             )
 
+        self._workflow_node_execution_repository.flush()
         self._workflow_execution_repository.save(workflow_execution)
         return workflow_execution
 
@@ -144,6 +145,7 @@ class WorkflowCycleManager:
                 )
             )
 
+        self._workflow_node_execution_repository.flush()
         self._workflow_execution_repository.save(execution)
         return execution
 
@@ -196,6 +198,7 @@ class WorkflowCycleManager:
                 )
             )
 
+        self._workflow_node_execution_repository.flush()
         self._workflow_execution_repository.save(workflow_execution)
         return workflow_execution
 
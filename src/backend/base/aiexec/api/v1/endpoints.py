@@ -32,6 +32,7 @@ from aiexec.events.event_manager import create_stream_tokens_event_manager
 from aiexec.exceptions.api import APIException, InvalidChatInputError
 from aiexec.exceptions.serialization import SerializationError
 from aiexec.graph.graph.base import Graph
+from aiexec.graph.graph.template_cache import get_or_create_graph_template
 from aiexec.graph.schema import RunOutputs
 from aiexec.helpers.flow import get_flow_by_id_or_endpoint_name
 from aiexec.helpers.user import get_user_by_flow_id_or_endpoint_name
@@ -122,9 +123,10 @@ async def simple_run_flow(
         if flow.data is None:
             msg = f"Flow {flow_id_str} has no data"
             raise ValueError(msg)
-        graph_data = flow.data.copy()
-        graph_data = process_tweaks(graph_data, input_request.tweaks or {}, stream=stream)
-        graph = Graph.from_payload(graph_data, flow_id=flow_id_str, user_id=str(user_id), flow_name=flow.name)
+        template = get_or_create_graph_template(
+            flow_id_str, flow.updated_at, flow.data, input_request.tweaks or {}, stream=stream
+        )
+        graph = Graph.from_template(template, flow_id=flow_id_str, user_id=str(user_id), flow_name=flow.name)
         inputs = None
         if input_request.input_value is not None:
             inputs = [
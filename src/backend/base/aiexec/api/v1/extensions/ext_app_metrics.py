@@ -65,3 +65,27 @@ def init_app(app: AiexecApp):
             "connection_timeout": engine.pool.timeout(),  # type: ignore
             "recycle_time": db.engine.pool._recycle,  # type: ignore
         }
+
+    @app.route("/ssrf-pool-stat")
+    def ssrf_pool_stat():
+        from core.helper.ssrf_proxy import get_pool_stats
+
+        return get_pool_stats()
+
+    @app.route("/vector-pool-stat")
+    def vector_pool_stat():
+        from core.rag.datasource.vdb.vector_client_pool import get_pool_stats
+
+        return get_pool_stats()
+
+    @app.route("/storage-cache-stat")
+    def storage_cache_stat():
+        from extensions.ext_storage import storage
+
+        return {"pid": os.getpid(), **storage.cache_info()}
+
+    @app.route("/plugin-tool-provider-cache-stat")
+    def plugin_tool_provider_cache_stat():
+        from core.helper.plugin_tool_provider_cache import plugin_tool_provider_cache
+
+        return {"pid": os.getpid(), **plugin_tool_provider_cache.info()}
@@ -17,6 +17,16 @@ class Storage:
         storage_factory = self.get_storage_factory(aiexec_config.STORAGE_TYPE)
         with app.app_context():
             self.storage_runner = storage_factory()
+        if aiexec_config.STORAGE_CACHE_ENABLED:
+            from extensions.storage.cached_storage import CachedStorage
+
+            self.storage_runner = CachedStorage(
+                self.storage_runner,
+                cache_path=aiexec_config.STORAGE_CACHE_PATH,
+                max_size=aiexec_config.STORAGE_CACHE_MAX_SIZE,
+                max_file_size=aiexec_config.STORAGE_CACHE_MAX_FILE_SIZE,
+                key_prefixes=[prefix for prefix in aiexec_config.STORAGE_CACHE_KEY_PREFIXES.split(",") if prefix],
+            )
 
     @staticmethod
     def get_storage_factory(storage_type: str) -> Callable[[], BaseStorage]:
@@ -105,6 +115,13 @@ class Storage:
     def scan(self, path: str, files: bool = True, directories: bool = False) -> list[str]:
         return self.storage_runner.scan(path, files=files, directories=directories)
 
+    def cache_info(self) -> dict:
+        from extensions.storage.cached_storage import CachedStorage
+
+        if not isinstance(self.storage_runner, CachedStorage):
+            return {"enabled": False}
+        return {"enabled": True, **self.storage_runner.info()}
+
 
 storage = Storage()
 
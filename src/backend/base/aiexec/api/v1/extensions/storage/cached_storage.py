@@ -0,0 +1,269 @@
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Generator, Sequence
+from pathlib import Path
+from typing import Optional
+
+from extensions.storage.base_storage import BaseStorage
+
+logger = logging.getLogger(__name__)
+
+_TEMP_SUFFIX = ".tmp"
+# seconds after which a temporary file is no longer being written by another process
+_STALE_TEMP_FILE_AGE = 60 * 60
+
+
+class CachedStorage(BaseStorage):
+    """
+    Read-through cache of another storage on local disk.
+
+    Files whose name starts with one of `key_prefixes` are kept on local disk after they
+    are loaded, saved or downloaded, up to `max_size` bytes in total, evicting the least
+    recently used files first. Deleting a file drops it from the cache.
+
+    The cache directory can be shared by the processes of a host. Every process keeps its
+    own LRU index of the directory, so the size bound is approximate when several processes
+    write to it. Files overwritten or deleted by another host are not invalidated, which is
+    why only files that are never overwritten should be cached.
+    """
+
+    def __init__(
+        self,
+        storage: BaseStorage,
+        cache_path: str,
+        max_size: int,
+        max_file_size: int,
+        key_prefixes: Sequence[str] = (),
+    ):
+        self._storage = storage
+        self._cache_path = Path(cache_path)
+        self._cache_path.mkdir(parents=True, exist_ok=True)
+        self._max_size = max_size
+        self._max_file_size = min(max_file_size, max_size)
+        self._key_prefixes = tuple(key_prefixes)
+        self._lock = threading.Lock()
+        # Key: cache file name, Value: size in bytes, least recently used first
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._load_entries()
+
+    def save(self, filename, data):
+        self._storage.save(filename, data)
+        if self._is_cacheable(filename):
+            if isinstance(data, bytes):
+                self._put(filename, data)
+            else:
+                self._invalidate(filename)
+
+    def load_once(self, filename: str) -> bytes:
+        if not self._is_cacheable(filename):
+            return self._storage.load_once(filename)
+
+        data = self._get(filename)
+        if data is not None:
+            return data
+
+        data = self._storage.load_once(filename)
+        self._put(filename, data)
+        return data
+
+    def load_stream(self, filename: str) -> Generator:
+        if not self._is_cacheable(filename):
+            yield from self._storage.load_stream(filename)
+            return
+
+        try:
+            file = self._cache_file(filename).open("rb")
+        except FileNotFoundError:
+            file = None
+        if file is not None:
+            with file:
+                self._record_hit(self._cache_file(filename).name, os.fstat(file.fileno()).st_size)
+                while chunk := file.read(4096):
+                    yield chunk
+            return
+
+        self._record_miss()
+        # Fill the cache while streaming, the file is only added once the whole stream is read
+        temp_file = self._temp_file(filename)
+        caching = True
+        size = 0
+        try:
+            with temp_file.open("wb") as f:
+                for chunk in self._storage.load_stream(filename):
+                    size += len(chunk)
+                    if caching and size <= self._max_file_size:
+                        try:
+                            f.write(chunk)
+                        except OSError:
+                            logger.warning(f"Failed to cache file {filename}", exc_info=True)
+                            caching = False
+                    yield chunk
+            if caching and size <= self._max_file_size:
+                self._add(filename, temp_file, size)
+        finally:
+            temp_file.unlink(missing_ok=True)
+
+    def download(self, filename, target_filepath):
+        if not self._is_cacheable(filename):
+            self._storage.download(filename, target_filepath)
+            return
+
+        cache_file = self._cache_file(filename)
+        try:
+            shutil.copyfile(cache_file, target_filepath)
+        except FileNotFoundError:
+            pass
+        else:
+            self._record_hit(cache_file.name, os.path.getsize(target_filepath))
+            return
+
+        self._record_miss()
+        self._storage.download(filename, target_filepath)
+        size = os.path.getsize(target_filepath)
+        if size <= self._max_file_size:
+            temp_file = self._temp_file(filename)
+            try:
+                shutil.copyfile(target_filepath, temp_file)
+                self._add(filename, temp_file, size)
+            except OSError:
+                logger.warning(f"Failed to cache file {filename}", exc_info=True)
+            finally:
+                temp_file.unlink(missing_ok=True)
+
+    def exists(self, filename):
+        return self._storage.exists(filename)
+
+    def delete(self, filename):
+        self._invalidate(filename)
+        return self._storage.delete(filename)
+
+    def scan(self, path, files=True, directories=False) -> list[str]:
+        return self._storage.scan(path, files=files, directories=directories)
+
+    def info(self) -> dict[str, float]:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / requests if requests else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "files": len(self._entries),
+                "size": self._size,
+                "max_size": self._max_size,
+            }
+
+    def clear(self) -> None:
+        """
+        Remove every file this process knows of from the cache and reset the statistics.
+        """
+        with self._lock:
+            for name in self._entries:
+                (self._cache_path / name).unlink(missing_ok=True)
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.bytes_saved = 0
+
+    def _is_cacheable(self, filename: str) -> bool:
+        return self._max_file_size > 0 and (not self._key_prefixes or filename.startswith(self._key_prefixes))
+
+    def _cache_file(self, filename: str) -> Path:
+        return self._cache_path / hashlib.sha256(filename.encode("utf-8")).hexdigest()
+
+    def _temp_file(self, filename: str) -> Path:
+        return self._cache_path / f"{self._cache_file(filename).name}.{uuid.uuid4().hex}{_TEMP_SUFFIX}"
+
+    def _load_entries(self) -> None:
+        files = []
+        for path in self._cache_path.iterdir():
+            if not path.is_file():
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.name.endswith(_TEMP_SUFFIX):
+                # left over by a process that died while filling the cache
+                if time.time() - stat.st_mtime > _STALE_TEMP_FILE_AGE:
+                    path.unlink(missing_ok=True)
+                continue
+            files.append((stat.st_mtime, path.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._size += size
+        self._evict()
+
+    def _get(self, filename: str) -> Optional[bytes]:
+        cache_file = self._cache_file(filename)
+        try:
+            data = cache_file.read_bytes()
+        except FileNotFoundError:
+            self._record_miss()
+            return None
+        self._record_hit(cache_file.name, len(data))
+        return data
+
+    def _put(self, filename: str, data: bytes) -> None:
+        if len(data) > self._max_file_size:
+            self._invalidate(filename)
+            return
+        temp_file = self._temp_file(filename)
+        try:
+            temp_file.write_bytes(data)
+            self._add(filename, temp_file, len(data))
+        except OSError:
+            logger.warning(f"Failed to cache file {filename}", exc_info=True)
+        finally:
+            temp_file.unlink(missing_ok=True)
+
+    def _add(self, filename: str, temp_file: Path, size: int) -> None:
+        cache_file = self._cache_file(filename)
+        try:
+            os.replace(temp_file, cache_file)
+        except OSError:
+            logger.warning(f"Failed to cache file {filename}", exc_info=True)
+            return
+        with self._lock:
+            self._size += size - self._entries.pop(cache_file.name, 0)
+            self._entries[cache_file.name] = size
+            self._evict()
+
+    def _invalidate(self, filename: str) -> None:
+        cache_file = self._cache_file(filename)
+        cache_file.unlink(missing_ok=True)
+        with self._lock:
+            self._size -= self._entries.pop(cache_file.name, 0)
+
+    def _evict(self) -> None:
+        while self._size > self._max_size and self._entries:
+            name, size = self._entries.popitem(last=False)
+            self._size -= size
+            (self._cache_path / name).unlink(missing_ok=True)
+
+    def _record_hit(self, name: str, size: int) -> None:
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += size
+            if name in self._entries:
+                self._entries.move_to_end(name)
+            else:
+                # added by another process sharing the cache directory
+                self._entries[name] = size
+                self._size += size
+                self._evict()
+
+    def _record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
@@ -6,16 +6,16 @@ from pathlib import Path
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, Header, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
 
-from aiexec.api.utils import CurrentActiveUser, DbSession
+from aiexec.api.utils import CurrentActiveUser, DbSession, build_file_stream_response
 from aiexec.api.v1.schemas import UploadFileResponse
 from aiexec.services.database.models.flow import Flow
 from aiexec.services.deps import get_settings_service, get_storage_service
 from aiexec.services.settings.service import SettingsService
 from aiexec.services.storage.service import StorageService
-from aiexec.services.storage.utils import build_content_type_from_extension
+from aiexec.services.storage.utils import build_content_type_from_extension, iter_upload_file
 
 router = APIRouter(tags=["Files"], prefix="/files")
 
@@ -60,12 +60,17 @@ async def upload_file(
         raise HTTPException(status_code=403, detail="You don't have access to this flow")
 
     try:
-        file_content = await file.read()
         timestamp = datetime.now(tz=timezone.utc).astimezone().strftime("%Y-%m-%d_%H-%M-%S")
-        file_name = file.filename or hashlib.sha256(file_content).hexdigest()
+        file_name = file.filename
+        if not file_name:
+            file_hash = hashlib.sha256()
+            async for chunk in iter_upload_file(file):
+                file_hash.update(chunk)
+            await file.seek(0)
+            file_name = file_hash.hexdigest()
         full_file_name = f"{timestamp}_{file_name}"
         folder = str(flow.id)
-        await storage_service.save_file(flow_id=folder, file_name=full_file_name, data=file_content)
+        await storage_service.save_file_stream(flow_id=folder, file_name=full_file_name, stream=iter_upload_file(file))
         return UploadFileResponse(flow_id=str(flow.id), file_path=f"{folder}/{full_file_name}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -73,7 +78,10 @@ async def upload_file(
 
 @router.get("/download/{flow_id}/{file_name}")
 async def download_file(
-    file_name: str, flow_id: UUID, storage_service: Annotated[StorageService, Depends(get_storage_service)]
+    file_name: str,
+    flow_id: UUID,
+    storage_service: Annotated[StorageService, Depends(get_storage_service)],
+    range_header: Annotated[str | None, Header(alias="Range")] = None,
 ):
     flow_id_str = str(flow_id)
     extension = file_name.split(".")[-1]
@@ -89,13 +97,20 @@ async def download_file(
         raise HTTPException(status_code=500, detail=f"Content type not found for extension {extension}")
 
     try:
-        file_content = await storage_service.get_file(flow_id=flow_id_str, file_name=file_name)
         headers = {
             "Content-Disposition": f"attachment; filename={file_name} filename*=UTF-8''{file_name}",
             "Content-Type": "application/octet-stream",
-            "Content-Length": str(len(file_content)),
         }
-        return StreamingResponse(BytesIO(file_content), media_type=content_type, headers=headers)
+        return await build_file_stream_response(
+            storage_service,
+            flow_id=flow_id_str,
+            file_name=file_name,
+            media_type=content_type,
+            headers=headers,
+            range_header=range_header,
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
@@ -119,8 +134,9 @@ async def download_image(file_name: str, flow_id: UUID):
         raise HTTPException(status_code=500, detail=f"Content type {content_type} is not an image")
 
     try:
-        file_content = await storage_service.get_file(flow_id=flow_id_str, file_name=file_name)
-        return StreamingResponse(BytesIO(file_content), media_type=content_type)
+        return await build_file_stream_response(
+            storage_service, flow_id=flow_id_str, file_name=file_name, media_type=content_type
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
@@ -21,6 +21,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from aiexec.api.utils import CurrentActiveUser, DbSession, cascade_delete_flow, remove_api_keys, validate_is_component
 from aiexec.api.v1.schemas import FlowListCreate
+from aiexec.graph.graph.template_cache import graph_template_cache
 from aiexec.helpers.user import get_user_by_flow_id_or_endpoint_name
 from aiexec.initial_setup.constants import STARTER_FOLDER_NAME
 from aiexec.logging import logger
@@ -353,6 +354,7 @@ async def update_flow(
         session.add(db_flow)
         await session.commit()
         await session.refresh(db_flow)
+        graph_template_cache.invalidate(str(flow_id))
 
         await _save_flow_to_fs(db_flow)
 
@@ -393,6 +395,7 @@ async def delete_flow(
         raise HTTPException(status_code=404, detail="Flow not found")
     await cascade_delete_flow(session, flow.id)
     await session.commit()
+    graph_template_cache.invalidate(str(flow.id))
     return {"message": "Flow deleted successfully"}
 
 
@@ -486,6 +489,8 @@ async def delete_multiple_flows(
             await cascade_delete_flow(db, flow.id)
 
         await db.commit()
+        for flow in flows_to_delete:
+            graph_template_cache.invalidate(str(flow.id))
         return {"deleted": len(flows_to_delete)}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
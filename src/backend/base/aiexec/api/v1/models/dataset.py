@@ -11,6 +11,7 @@ import time
 from json import JSONDecodeError
 from typing import Any, cast
 
+import numpy as np
 from sqlalchemy import func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped
@@ -900,6 +901,14 @@ class DatasetKeywordTable(Base):
             return None
         if self.data_source_type == "database":
             return json.loads(self.keyword_table, cls=SetDecoder) if self.keyword_table else None
+        elif self.data_source_type == "segmented":
+            from core.rag.datasource.keyword.jieba.segmented_keyword_table import SegmentedKeywordTable
+
+            table = SegmentedKeywordTable(dataset.tenant_id, self.dataset_id).table()
+            return {
+                "__type__": "keyword_table",
+                "__data__": {"index_id": self.dataset_id, "summary": None, "table": table},
+            }
         else:
             file_key = "keyword_files/" + dataset.tenant_id + "/" + self.dataset_id + ".txt"
             try:
@@ -929,11 +938,24 @@ class Embedding(Base):
     created_at = db.Column(db.DateTime, nullable=False, server_default=func.current_timestamp())
     provider_name = db.Column(db.String(255), nullable=False, server_default=db.text("''::character varying"))
 
+    # Marks embeddings stored as little-endian float32 bytes; older rows hold pickled lists
+    FLOAT32_PREFIX = b"F32:"
+
+    @classmethod
+    def encode_embedding(cls, embedding_data: list[float]) -> bytes:
+        return cls.FLOAT32_PREFIX + np.asarray(embedding_data, dtype="<f4").tobytes()
+
+    @classmethod
+    def decode_embedding(cls, data: bytes) -> list[float]:
+        if data.startswith(cls.FLOAT32_PREFIX):
+            return cast(list[float], np.frombuffer(data, dtype="<f4", offset=len(cls.FLOAT32_PREFIX)).tolist())
+        return cast(list[float], pickle.loads(data))  # noqa: S301
+
     def set_embedding(self, embedding_data: list[float]):
-        self.embedding = pickle.dumps(embedding_data, protocol=pickle.HIGHEST_PROTOCOL)
+        self.embedding = self.encode_embedding(embedding_data)
 
     def get_embedding(self) -> list[float]:
-        return cast(list[float], pickle.loads(self.embedding))  # noqa: S301
+        return self.decode_embedding(self.embedding)
 
 
 class DatasetCollectionBinding(Base):
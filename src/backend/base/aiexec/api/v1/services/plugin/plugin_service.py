@@ -9,6 +9,8 @@ from configs import aiexec_config
 from core.helper import marketplace
 from core.helper.download import download_with_size_limit
 from core.helper.marketplace import download_plugin_pkg
+from core.helper.plugin_tool_provider_cache import plugin_tool_provider_cache
+from core.helper.provider_configurations_cache import provider_configurations_cache
 from core.plugin.entities.bundle import PluginBundleDependency
 from core.plugin.entities.plugin import (
     GenericProviderID,
@@ -17,7 +19,12 @@ from core.plugin.entities.plugin import (
     PluginInstallation,
     PluginInstallationSource,
 )
-from core.plugin.entities.plugin_daemon import PluginInstallTask, PluginListResponse, PluginUploadResponse
+from core.plugin.entities.plugin_daemon import (
+    PluginInstallTask,
+    PluginInstallTaskStatus,
+    PluginListResponse,
+    PluginUploadResponse,
+)
 from core.plugin.impl.asset import PluginAssetManager
 from core.plugin.impl.debugging import PluginDebuggingClient
 from core.plugin.impl.plugin import PluginInstaller
@@ -164,7 +171,12 @@ class PluginService:
     @staticmethod
     def fetch_install_task(tenant_id: str, task_id: str) -> PluginInstallTask:
         manager = PluginInstaller()
-        return manager.fetch_plugin_installation_task(tenant_id, task_id)
+        task = manager.fetch_plugin_installation_task(tenant_id, task_id)
+        if task.status in (PluginInstallTaskStatus.Success, PluginInstallTaskStatus.Failed):
+            # installs and upgrades run in the plugin daemon, drop the providers fetched while the task was running
+            plugin_tool_provider_cache.invalidate(tenant_id)
+            provider_configurations_cache.invalidate(tenant_id)
+        return task
 
     @staticmethod
     def delete_install_task(tenant_id: str, task_id: str) -> bool:
@@ -217,7 +229,7 @@ class PluginService:
             pkg = download_plugin_pkg(new_plugin_unique_identifier)
             manager.upload_pkg(tenant_id, pkg, verify_signature=False)
 
-        return manager.upgrade_plugin(
+        response = manager.upgrade_plugin(
             tenant_id,
             original_plugin_unique_identifier,
             new_plugin_unique_identifier,
@@ -226,6 +238,9 @@ class PluginService:
                 "plugin_unique_identifier": new_plugin_unique_identifier,
             },
         )
+        plugin_tool_provider_cache.invalidate(tenant_id)
+        provider_configurations_cache.invalidate(tenant_id)
+        return response
 
     @staticmethod
     def upgrade_plugin_with_github(
@@ -240,7 +255,7 @@ class PluginService:
         Upgrade plugin with github
         """
         manager = PluginInstaller()
-        return manager.upgrade_plugin(
+        response = manager.upgrade_plugin(
             tenant_id,
             original_plugin_unique_identifier,
             new_plugin_unique_identifier,
@@ -251,6 +266,9 @@ class PluginService:
                 "package": package,
             },
         )
+        plugin_tool_provider_cache.invalidate(tenant_id)
+        provider_configurations_cache.invalidate(tenant_id)
+        return response
 
     @staticmethod
     def upload_pkg(tenant_id: str, pkg: bytes, verify_signature: bool = False) -> PluginUploadResponse:
@@ -294,12 +312,15 @@ class PluginService:
     @staticmethod
     def install_from_local_pkg(tenant_id: str, plugin_unique_identifiers: Sequence[str]):
         manager = PluginInstaller()
-        return manager.install_from_identifiers(
+        response = manager.install_from_identifiers(
             tenant_id,
             plugin_unique_identifiers,
             PluginInstallationSource.Package,
             [{}],
         )
+        plugin_tool_provider_cache.invalidate(tenant_id)
+        provider_configurations_cache.invalidate(tenant_id)
+        return response
 
     @staticmethod
     def install_from_github(tenant_id: str, plugin_unique_identifier: str, repo: str, version: str, package: str):
@@ -308,7 +329,7 @@ class PluginService:
         returns plugin_unique_identifier
         """
         manager = PluginInstaller()
-        return manager.install_from_identifiers(
+        response = manager.install_from_identifiers(
             tenant_id,
             [plugin_unique_identifier],
             PluginInstallationSource.Github,
@@ -320,6 +341,9 @@ class PluginService:
                 }
             ],
         )
+        plugin_tool_provider_cache.invalidate(tenant_id)
+        provider_configurations_cache.invalidate(tenant_id)
+        return response
 
     @staticmethod
     def fetch_marketplace_pkg(
@@ -363,7 +387,7 @@ class PluginService:
                 pkg = download_plugin_pkg(plugin_unique_identifier)
                 manager.upload_pkg(tenant_id, pkg, verify_signature)
 
-        return manager.install_from_identifiers(
+        response = manager.install_from_identifiers(
             tenant_id,
             plugin_unique_identifiers,
             PluginInstallationSource.Marketplace,
@@ -374,11 +398,17 @@ class PluginService:
                 for plugin_unique_identifier in plugin_unique_identifiers
             ],
         )
+        plugin_tool_provider_cache.invalidate(tenant_id)
+        provider_configurations_cache.invalidate(tenant_id)
+        return response
 
     @staticmethod
     def uninstall(tenant_id: str, plugin_installation_id: str) -> bool:
         manager = PluginInstaller()
-        return manager.uninstall(tenant_id, plugin_installation_id)
+        response = manager.uninstall(tenant_id, plugin_installation_id)
+        plugin_tool_provider_cache.invalidate(tenant_id)
+        provider_configurations_cache.invalidate(tenant_id)
+        return response
 
     @staticmethod
     def check_tools_existence(tenant_id: str, provider_ids: Sequence[GenericProviderID]) -> Sequence[bool]:
@@ -4,6 +4,7 @@ import time
 import click
 from celery import shared_task  # type: ignore
 
+from core.helper.extracted_text_cache import extracted_text_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from core.tools.utils.web_reader_tool import get_image_upload_file_ids
 from extensions.ext_database import db
@@ -51,6 +52,8 @@ def batch_clean_document_task(document_ids: list[str], dataset_id: str, doc_form
                             "Delete image_files failed when storage deleted, \
                                           image_upload_file_is: {}".format(upload_file_id)
                         )
+                    if image_file and image_file.hash:
+                        extracted_text_cache.delete(image_file.hash)
                     db.session.delete(image_file)
                 db.session.delete(segment)
 
@@ -62,6 +65,8 @@ def batch_clean_document_task(document_ids: list[str], dataset_id: str, doc_form
                     storage.delete(file.key)
                 except Exception:
                     logging.exception("Delete file failed when document deleted, file_id: {}".format(file.id))
+                if file.hash:
+                    extracted_text_cache.delete(file.hash)
                 db.session.delete(file)
             db.session.commit()
 
@@ -4,6 +4,7 @@ import time
 import click
 from celery import shared_task  # type: ignore
 
+from core.helper.extracted_text_cache import extracted_text_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from core.tools.utils.rag_web_reader import get_image_upload_file_ids
 from extensions.ext_database import db
@@ -82,6 +83,8 @@ def clean_dataset_task(
                             "Delete image_files failed when storage deleted, \
                                           image_upload_file_is: {}".format(upload_file_id)
                         )
+                    if image_file.hash:
+                        extracted_text_cache.delete(image_file.hash)
                     db.session.delete(image_file)
                 db.session.delete(segment)
 
@@ -108,6 +111,8 @@ def clean_dataset_task(
                                 if not file:
                                     continue
                                 storage.delete(file.key)
+                                if file.hash:
+                                    extracted_text_cache.delete(file.hash)
                                 db.session.delete(file)
                 except Exception:
                     continue
@@ -5,6 +5,7 @@ from typing import Optional
 import click
 from celery import shared_task  # type: ignore
 
+from core.helper.extracted_text_cache import extracted_text_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from core.tools.utils.rag_web_reader import get_image_upload_file_ids
 from extensions.ext_database import db
@@ -53,6 +54,8 @@ def clean_document_task(document_id: str, dataset_id: str, doc_form: str, file_i
                             "Delete image_files failed when storage deleted, \
                                           image_upload_file_is: {}".format(upload_file_id)
                         )
+                    if image_file.hash:
+                        extracted_text_cache.delete(image_file.hash)
                     db.session.delete(image_file)
                 db.session.delete(segment)
 
@@ -64,6 +67,8 @@ def clean_document_task(document_id: str, dataset_id: str, doc_form: str, file_i
                     storage.delete(file.key)
                 except Exception:
                     logging.exception("Delete file failed when document deleted, file_id: {}".format(file_id))
+                if file.hash:
+                    extracted_text_cache.delete(file.hash)
                 db.session.delete(file)
                 db.session.commit()
 
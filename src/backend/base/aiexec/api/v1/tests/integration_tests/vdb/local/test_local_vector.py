@@ -0,0 +1,22 @@
+from core.rag.datasource.vdb.local.local_vector import LocalVector, LocalVectorConfig
+from tests.integration_tests.vdb.test_vector_store import (
+    AbstractVectorTest,
+    setup_mock_redis,
+)
+
+
+class LocalVectorTest(AbstractVectorTest):
+    def __init__(self, path: str):
+        super().__init__()
+        self.vector = LocalVector(
+            collection_name=self.collection_name,
+            config=LocalVectorConfig(path=path),
+        )
+
+    def get_ids_by_metadata_field(self):
+        ids = self.vector.get_ids_by_metadata_field(key="document_id", value=self.example_doc_id)
+        assert ids == [self.example_doc_id]
+
+
+def test_local_vector(setup_mock_redis, tmp_path):
+    LocalVectorTest(str(tmp_path)).run_all_tests()
@@ -0,0 +1,37 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.app.apps.base_app_queue_manager import AppQueueManager, PublishFrom
+from core.app.entities.app_invoke_entities import InvokeFrom
+
+
+class DummyQueueManager(AppQueueManager):
+    def _publish(self, event, pub_from: PublishFrom) -> None:
+        pass
+
+
+@pytest.fixture
+def mock_redis():
+    with patch("core.app.apps.base_app_queue_manager.redis_client", MagicMock()) as redis_client:
+        redis_client.get.return_value = None
+        yield redis_client
+
+
+def test_is_stopped_throttles_redis_checks(mock_redis):
+    queue_manager = DummyQueueManager("task-id", "user-id", InvokeFrom.SERVICE_API)
+
+    for _ in range(100):
+        assert not queue_manager._is_stopped()
+
+    assert mock_redis.get.call_count == 1
+
+
+def test_is_stopped_sees_stop_requested_in_process(mock_redis):
+    queue_manager = DummyQueueManager("task-id", "user-id", InvokeFrom.SERVICE_API)
+    assert not queue_manager._is_stopped()
+    mock_redis.get.return_value = b"end-user-user-id"
+
+    AppQueueManager.set_stop_flag("task-id", InvokeFrom.SERVICE_API, "user-id")
+
+    assert queue_manager._is_stopped()
@@ -0,0 +1,143 @@
+import pytest
+
+from core.helper import extracted_text_cache as extracted_text_cache_module
+from core.helper.extracted_text_cache import ExtractedTextCache
+
+
+class FakeStorage:
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+
+    def save(self, filename, data):
+        self.files[filename] = data
+
+    def load_once(self, filename):
+        if filename not in self.files:
+            raise FileNotFoundError(filename)
+        return self.files[filename]
+
+    def exists(self, filename):
+        return filename in self.files
+
+    def delete(self, filename):
+        del self.files[filename]
+
+    def scan(self, path, files=True, directories=False):
+        return [filename for filename in self.files if filename.startswith(path)]
+
+
+@pytest.fixture
+def fake_storage(monkeypatch):
+    fake = FakeStorage()
+    monkeypatch.setattr(extracted_text_cache_module, "storage", fake)
+    monkeypatch.setattr(extracted_text_cache_module.aiexec_config, "EXTRACTED_TEXT_CACHE_STORAGE_ENABLED", True)
+    return fake
+
+
+def test_make_key_depends_on_content_and_extractor():
+    content_hash = ExtractedTextCache.hash_content(b"content")
+
+    key = ExtractedTextCache.make_key(content_hash, "document_extractor", "1", ".pdf")
+
+    assert key.startswith(content_hash)
+    assert key == ExtractedTextCache.make_key(content_hash, "document_extractor", "1", ".pdf")
+    assert key != ExtractedTextCache.make_key(content_hash, "document_extractor", "2", ".pdf")
+    other_hash = ExtractedTextCache.hash_content(b"other")
+    assert key != ExtractedTextCache.make_key(other_hash, "document_extractor", "1", ".pdf")
+
+
+def test_cache_reads_local_then_storage(fake_storage):
+    cache = ExtractedTextCache(max_size=1024)
+    key = ExtractedTextCache.make_key(ExtractedTextCache.hash_content(b"content"), "test")
+
+    assert cache.get(key) is None
+    cache.set(key, [{"page_content": "text", "metadata": {"page": 0}}])
+
+    assert cache.get(key) == [{"page_content": "text", "metadata": {"page": 0}}]
+    assert len(fake_storage.files) == 1
+
+    # Another process only finds the text in the storage
+    other_cache = ExtractedTextCache(max_size=1024)
+    assert other_cache.get(key) == [{"page_content": "text", "metadata": {"page": 0}}]
+    assert other_cache.get(key) == [{"page_content": "text", "metadata": {"page": 0}}]
+    assert other_cache.info()["storage_hits"] == 1
+    assert other_cache.info()["local_hits"] == 1
+    assert cache.info() == {"local_hits": 1, "storage_hits": 0, "misses": 1, "local_size": 51, "local_max_size": 1024}
+
+
+def test_cache_bounds_local_size(fake_storage):
+    cache = ExtractedTextCache(max_size=100)
+
+    for i in range(10):
+        cache.set(f"key-{i}", "x" * 30)
+    cache.set("large", "x" * 200)
+
+    assert cache.info()["local_size"] <= 100
+    assert len(fake_storage.files) == 11
+    assert cache.get("large") == "x" * 200
+    assert cache.info()["storage_hits"] == 1
+
+
+def test_cache_without_storage(fake_storage, monkeypatch):
+    monkeypatch.setattr(extracted_text_cache_module.aiexec_config, "EXTRACTED_TEXT_CACHE_STORAGE_ENABLED", False)
+    cache = ExtractedTextCache(max_size=0)
+
+    cache.set("key", "text")
+
+    assert fake_storage.files == {}
+    assert cache.get("key") is None
+
+
+def test_cache_misses_do_not_load_from_storage(fake_storage, monkeypatch, caplog):
+    monkeypatch.setattr(fake_storage, "load_once", pytest.fail)
+    cache = ExtractedTextCache(max_size=1024)
+
+    assert cache.get(ExtractedTextCache.make_key(ExtractedTextCache.hash_content(b"content"), "test")) is None
+    assert cache.info()["misses"] == 1
+    assert not caplog.records
+
+
+def test_delete_drops_every_extractor_of_the_content(fake_storage):
+    cache = ExtractedTextCache(max_size=1024)
+    content_hash = ExtractedTextCache.hash_content(b"content")
+    other_hash = ExtractedTextCache.hash_content(b"other")
+    keys = [ExtractedTextCache.make_key(content_hash, "document_extractor", ext) for ext in (".pdf", ".txt")]
+    other_key = ExtractedTextCache.make_key(other_hash, "document_extractor", ".pdf")
+    for key in [*keys, other_key]:
+        cache.set(key, "text")
+
+    cache.delete(content_hash)
+
+    assert list(fake_storage.files) == [f"extracted_text/{other_hash}/{other_key}.json"]
+    assert [cache.get(key) for key in keys] == [None, None]
+    assert cache.get(other_key) == "text"
+    cache.delete(content_hash)
+
+
+def test_delete_without_scan_drops_the_keys_cached_in_the_process(fake_storage, monkeypatch):
+    def scan(path, files=True, directories=False):
+        raise NotImplementedError
+
+    monkeypatch.setattr(fake_storage, "scan", scan)
+    content_hash = ExtractedTextCache.hash_content(b"content")
+    key = ExtractedTextCache.make_key(content_hash, "document_extractor", ".pdf")
+    cache = ExtractedTextCache(max_size=1024)
+    cache.set(key, "text")
+
+    cache.delete(content_hash)
+
+    assert fake_storage.files == {}
+
+
+def test_writers_of_the_same_content_do_not_overwrite_each_other(fake_storage):
+    content_hash = ExtractedTextCache.hash_content(b"content")
+    keys = [ExtractedTextCache.make_key(content_hash, "document_extractor", ext) for ext in (".pdf", ".txt")]
+    # processes caching the text of different extractors at the same time
+    for key in keys:
+        ExtractedTextCache(max_size=1024).set(key, key)
+    saved = dict(fake_storage.files)
+
+    ExtractedTextCache(max_size=1024).set(keys[0], keys[0])
+
+    assert [ExtractedTextCache(max_size=1024).get(key) for key in keys] == keys
+    assert fake_storage.files == saved
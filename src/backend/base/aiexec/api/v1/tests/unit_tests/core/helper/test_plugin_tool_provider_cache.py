@@ -0,0 +1,175 @@
+import os
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+import contexts
+from core.helper import plugin_tool_provider_cache as cache_module
+from core.helper.plugin_tool_provider_cache import INVALIDATION_CHANNEL, PluginToolProviderCache
+from core.plugin.entities.plugin import PluginInstallationSource
+from core.plugin.entities.plugin_daemon import PluginToolProviderEntity
+from core.tools.entities.common_entities import I18nObject
+from core.tools.entities.tool_entities import ToolProviderEntityWithPlugin, ToolProviderIdentity
+from core.tools.tool_manager import ToolManager
+
+
+def make_provider(name: str = "provider") -> PluginToolProviderEntity:
+    return PluginToolProviderEntity(
+        provider=name,
+        plugin_unique_identifier=f"org/plugin:0.0.1@{name}",
+        plugin_id="org/plugin",
+        declaration=ToolProviderEntityWithPlugin(
+            identity=ToolProviderIdentity(
+                author="org",
+                name=f"org/plugin/{name}",
+                description=I18nObject(en_US=name),
+                icon="icon.svg",
+                label=I18nObject(en_US=name),
+            )
+        ),
+    )
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = messages
+        self.listening = threading.Event()
+        self.release = threading.Event()
+        self.drained = threading.Event()
+
+    def subscribe(self, channel):
+        self.channel = channel
+
+    def listen(self):
+        self.listening.set()
+        self.release.wait()
+        yield from self.messages
+        self.drained.set()
+        threading.Event().wait()
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = MagicMock()
+    monkeypatch.setattr(cache_module, "redis_client", redis)
+    return redis
+
+
+@pytest.fixture
+def cache(redis):
+    cache = PluginToolProviderCache()
+    # do not start the invalidation listener
+    cache._listener_pid = os.getpid()
+    return cache
+
+
+def test_get_provider_returns_copies(cache):
+    provider = make_provider()
+
+    assert cache.get_provider("tenant", "org/plugin/provider") is None
+    cache.set_provider("tenant", "org/plugin/provider", provider, cache.generation("tenant"))
+    provider.declaration.identity.author = "changed"
+
+    cached = cache.get_provider("tenant", "org/plugin/provider")
+    assert cached is not None
+    assert cached.declaration.identity.author == "org"
+    cached.declaration.identity.author = "changed"
+    assert cache.get_provider("tenant", "org/plugin/provider").declaration.identity.author == "org"
+    assert cache.info()["hits"] == 2
+    assert cache.info()["misses"] == 1
+
+
+def test_set_providers_caches_each_provider(cache):
+    cache.set_providers("tenant", [make_provider("a"), make_provider("b")], cache.generation("tenant"))
+
+    assert [provider.provider for provider in cache.get_providers("tenant")] == ["a", "b"]
+    assert cache.get_provider("tenant", "org/plugin/b").provider == "b"
+    assert cache.get_providers("other-tenant") is None
+
+
+def test_invalidate_evicts_and_publishes(cache, redis):
+    cache.set_providers("tenant", [make_provider()], cache.generation("tenant"))
+
+    cache.invalidate("tenant")
+
+    assert cache.get_providers("tenant") is None
+    assert cache.get_provider("tenant", "org/plugin/provider") is None
+    redis.publish.assert_called_once_with(INVALIDATION_CHANNEL, "tenant")
+
+
+def test_providers_fetched_before_an_invalidation_are_not_cached(cache):
+    generation = cache.generation("tenant")
+    other_generation = cache.generation("other-tenant")
+    cache.invalidate("tenant")
+
+    cache.set_provider("tenant", "org/plugin/provider", make_provider(), generation)
+    cache.set_provider("other-tenant", "org/plugin/provider", make_provider(), other_generation)
+
+    assert cache.get_provider("tenant", "org/plugin/provider") is None
+    # invalidations of a workspace do not drop the providers fetched for the others
+    assert cache.get_provider("other-tenant", "org/plugin/provider") is not None
+
+
+def test_listener_evicts_invalidated_tenants(redis):
+    pubsub = FakePubSub([{"type": "message", "data": b"tenant"}])
+    redis.pubsub.return_value = pubsub
+    cache = PluginToolProviderCache()
+    assert cache.get_providers("tenant") is None
+    assert pubsub.listening.wait(5)
+    cache.set_providers("tenant", [make_provider()], cache.generation("tenant"))
+    cache.set_providers("other-tenant", [make_provider()], cache.generation("other-tenant"))
+
+    pubsub.release.set()
+
+    assert pubsub.drained.wait(5)
+    assert pubsub.channel == INVALIDATION_CHANNEL
+    assert cache.get_providers("tenant") is None
+    assert cache.get_providers("other-tenant") is not None
+
+
+@pytest.fixture
+def tool_manager(monkeypatch, cache):
+    monkeypatch.setattr("core.tools.tool_manager.plugin_tool_provider_cache", cache)
+    manager = MagicMock()
+    manager.fetch_tool_provider.side_effect = lambda tenant_id, provider: make_provider()
+    manager.fetch_tool_providers.side_effect = lambda tenant_id: [make_provider()]
+    monkeypatch.setattr("core.tools.tool_manager.PluginToolManager", lambda: manager)
+    installer = MagicMock()
+    installer.fetch_plugin_installation_by_ids.side_effect = lambda tenant_id, plugin_ids: [
+        SimpleNamespace(plugin_id=plugin_id, source=PluginInstallationSource.Marketplace) for plugin_id in plugin_ids
+    ]
+    monkeypatch.setattr("core.tools.tool_manager.PluginInstaller", lambda: installer)
+    return SimpleNamespace(manager=manager, installer=installer)
+
+
+def get_and_list_plugin_providers():
+    # every request starts with empty request-scoped providers
+    contexts.plugin_tool_providers.set({})
+    contexts.plugin_tool_providers_lock.set(threading.Lock())
+    controller = ToolManager.get_plugin_provider("org/plugin/provider", "tenant")
+    assert controller.plugin_unique_identifier == "org/plugin:0.0.1@provider"
+    assert [provider.plugin_id for provider in ToolManager.list_plugin_providers("tenant")] == ["org/plugin"]
+
+
+def test_tool_manager_fetches_providers_once(tool_manager):
+    manager = tool_manager.manager
+
+    for _ in range(2):
+        get_and_list_plugin_providers()
+
+    manager.fetch_tool_provider.assert_called_once_with("tenant", "org/plugin/provider")
+    manager.fetch_tool_providers.assert_called_once_with("tenant")
+
+
+def test_tool_manager_does_not_cache_providers_of_debugging_plugins(tool_manager):
+    tool_manager.installer.fetch_plugin_installation_by_ids.side_effect = lambda tenant_id, plugin_ids: [
+        SimpleNamespace(plugin_id=plugin_id, source=PluginInstallationSource.Remote) for plugin_id in plugin_ids
+    ]
+
+    for _ in range(2):
+        get_and_list_plugin_providers()
+
+    assert tool_manager.manager.fetch_tool_provider.call_count == 2
+    assert tool_manager.manager.fetch_tool_providers.call_count == 2
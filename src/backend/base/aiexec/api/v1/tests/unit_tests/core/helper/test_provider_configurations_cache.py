@@ -0,0 +1,100 @@
+import os
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.helper import provider_configurations_cache as cache_module
+from core.helper.provider_configurations_cache import INVALIDATION_CHANNEL, ProviderConfigurationsCache
+from core.provider_manager import ProviderManager
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = messages
+        self.listening = threading.Event()
+        self.release = threading.Event()
+        self.drained = threading.Event()
+
+    def subscribe(self, channel):
+        self.channel = channel
+
+    def listen(self):
+        self.listening.set()
+        self.release.wait()
+        yield from self.messages
+        self.drained.set()
+        threading.Event().wait()
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = MagicMock()
+    monkeypatch.setattr(cache_module, "redis_client", redis)
+    return redis
+
+
+@pytest.fixture
+def cache(redis):
+    cache = ProviderConfigurationsCache()
+    # do not start the invalidation listener
+    cache._listener_pid = os.getpid()
+    return cache
+
+
+def test_get_returns_cached_configurations(cache):
+    configurations = MagicMock()
+
+    assert cache.get("tenant") is None
+    cache.set("tenant", configurations, cache.generation)
+
+    assert cache.get("tenant") is configurations
+    assert cache.info()["hits"] == 1
+    assert cache.info()["misses"] == 1
+
+
+def test_invalidate_evicts_and_publishes(cache, redis):
+    cache.set("tenant", MagicMock(), cache.generation)
+
+    cache.invalidate("tenant")
+
+    assert cache.get("tenant") is None
+    redis.publish.assert_called_once_with(INVALIDATION_CHANNEL, "tenant")
+
+
+def test_configurations_built_before_an_invalidation_are_not_cached(cache):
+    generation = cache.generation
+    cache.invalidate("other-tenant")
+
+    cache.set("tenant", MagicMock(), generation)
+
+    assert cache.get("tenant") is None
+
+
+def test_listener_evicts_invalidated_tenants(redis):
+    pubsub = FakePubSub([{"type": "message", "data": b"tenant"}])
+    redis.pubsub.return_value = pubsub
+    cache = ProviderConfigurationsCache()
+    assert cache.get("tenant") is None
+    assert pubsub.listening.wait(5)
+    cache.set("tenant", MagicMock(), cache.generation)
+    cache.set("other-tenant", MagicMock(), cache.generation)
+
+    pubsub.release.set()
+
+    assert pubsub.drained.wait(5)
+    assert pubsub.channel == INVALIDATION_CHANNEL
+    assert cache.get("tenant") is None
+    assert cache.get("other-tenant") is not None
+
+
+def test_provider_manager_builds_configurations_once(monkeypatch, cache):
+    monkeypatch.setattr("core.provider_manager.provider_configurations_cache", cache)
+    build = MagicMock(return_value=MagicMock())
+    monkeypatch.setattr(ProviderManager, "_build_configurations", build)
+
+    first = ProviderManager().get_configurations("tenant")
+    second = ProviderManager().get_configurations("tenant")
+
+    assert first is second
+    build.assert_called_once_with("tenant")
@@ -1,9 +1,20 @@
+import asyncio
 import random
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
-from core.helper.ssrf_proxy import SSRF_DEFAULT_MAX_RETRIES, STATUS_FORCELIST, make_request
+from core.helper import ssrf_proxy
+from core.helper.ssrf_proxy import (
+    SSRF_DEFAULT_MAX_RETRIES,
+    STATUS_FORCELIST,
+    _client_pool,
+    _ClientPool,
+    get_pool_stats,
+    make_request,
+    make_request_async,
+)
 
 
 @patch("httpx.Client.request")
@@ -50,3 +61,102 @@ def test_retry_logic_success(mock_request):
     assert response.status_code == 200
     assert mock_request.call_count == SSRF_DEFAULT_MAX_RETRIES + 1
     assert mock_request.call_args_list[0][1].get("method") == "GET"
+
+
+@patch("httpx.Client.request")
+def test_requests_reuse_pooled_client(mock_request):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_request.return_value = mock_response
+
+    make_request("GET", "http://example.com")
+    clients_created = get_pool_stats()["clients"]
+    make_request("POST", "http://example.com")
+
+    assert get_pool_stats()["clients"] == clients_created
+    assert _client_pool.get_client(True) is _client_pool.get_client(True)
+    assert _client_pool.get_client(True) is not _client_pool.get_client(False)
+
+
+def test_pooled_client_is_recreated_after_fork(monkeypatch):
+    client = _client_pool.get_client(True)
+    monkeypatch.setattr("os.getpid", lambda: -1)
+
+    assert _client_pool.get_client(True) is not client
+    assert get_pool_stats()["pid"] == -1
+
+
+@patch("httpx.AsyncClient.request")
+def test_async_request_retries(mock_request):
+    mock_response_500 = MagicMock()
+    mock_response_500.status_code = 500
+    mock_response_200 = MagicMock()
+    mock_response_200.status_code = 200
+    mock_request.side_effect = [mock_response_500, mock_response_200]
+
+    with patch("core.helper.ssrf_proxy.BACKOFF_FACTOR", 0):
+        response = asyncio.run(make_request_async("GET", "http://example.com", max_retries=1))
+
+    assert response.status_code == 200
+    assert mock_request.call_count == 2
+
+
+def _cookie_setting_transport(seen_cookies: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_cookies.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "session=tenant-a; Path=/"})
+
+    return httpx.MockTransport(handler)
+
+
+def test_pooled_client_does_not_keep_cookies(monkeypatch):
+    seen_cookies: list = []
+    client_kwargs = ssrf_proxy._client_kwargs
+    monkeypatch.setattr(ssrf_proxy, "_client_pool", _ClientPool())
+    monkeypatch.setattr(
+        ssrf_proxy,
+        "_client_kwargs",
+        lambda *args: {**client_kwargs(*args), "transport": _cookie_setting_transport(seen_cookies)},
+    )
+
+    make_request("GET", "http://example.com/a")
+    make_request("GET", "http://example.com/b")
+    make_request("GET", "http://example.com/c", cookies={"explicit": "1"})
+
+    assert seen_cookies == [None, None, "explicit=1"]
+    assert not ssrf_proxy._client_pool.get_client(True).cookies
+
+
+def test_pooled_async_client_does_not_keep_cookies(monkeypatch):
+    seen_cookies: list = []
+    client_kwargs = ssrf_proxy._client_kwargs
+    monkeypatch.setattr(ssrf_proxy, "_client_pool", _ClientPool())
+    monkeypatch.setattr(
+        ssrf_proxy,
+        "_client_kwargs",
+        lambda *args: {**client_kwargs(*args), "transport": _cookie_setting_transport(seen_cookies)},
+    )
+
+    async def run():
+        await make_request_async("GET", "http://example.com/a")
+        await make_request_async("GET", "http://example.com/b")
+
+    asyncio.run(run())
+
+    assert seen_cookies == [None, None]
+
+
+def test_pooled_async_client_is_closed_with_its_loop(monkeypatch):
+    monkeypatch.setattr(ssrf_proxy, "_client_pool", _ClientPool())
+
+    async def get_client():
+        client = ssrf_proxy._client_pool.get_async_client(True)
+        await asyncio.sleep(0)
+        assert not client.is_closed
+        assert ssrf_proxy._client_pool.get_async_client(True) is client
+        return client
+
+    client = asyncio.run(get_client())
+
+    assert client.is_closed
+    assert asyncio.run(get_client()) is not client
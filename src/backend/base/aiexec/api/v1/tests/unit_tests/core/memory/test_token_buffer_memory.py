@@ -0,0 +1,136 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from core.memory import token_buffer_memory
+from core.memory.token_buffer_memory import TokenBufferMemory
+from core.model_runtime.entities import AssistantPromptMessage, UserPromptMessage
+from models.model import AppMode
+
+# tokens added once per counted list, like the reply priming of chat models
+LIST_OVERHEAD = 3
+
+
+class FakeModelInstance:
+    provider = "provider"
+    model = "model"
+
+    def __init__(self):
+        self.calls = []
+
+    def get_llm_num_tokens(self, prompt_messages):
+        self.calls.append(len(prompt_messages))
+        return sum(len(m.content) for m in prompt_messages) + LIST_OVERHEAD
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *criteria):
+        return self
+
+    def order_by(self, *clauses):
+        return self
+
+    def limit(self, limit):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Returns the given rows for each query, in order, and records the queried entities."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = []
+
+    def query(self, *entities):
+        self.queries.append(entities)
+        return FakeQuery(self.results.pop(0))
+
+
+def make_history(sizes):
+    prompt_messages = []
+    keys = []
+    for i, size in enumerate(sizes):
+        message_cls = UserPromptMessage if i % 2 == 0 else AssistantPromptMessage
+        prompt_messages.append(message_cls(content="x" * size))
+        keys.append((f"message-{i // 2}", i % 2))
+    return prompt_messages, keys
+
+
+def prune_one_by_one(model_instance, prompt_messages, max_token_limit):
+    prompt_messages = list(prompt_messages)
+    while model_instance.get_llm_num_tokens(prompt_messages) > max_token_limit and len(prompt_messages) > 1:
+        prompt_messages.pop(0)
+    return prompt_messages
+
+
+@pytest.fixture(autouse=True)
+def clear_message_tokens_cache():
+    token_buffer_memory._message_tokens_cache.clear()
+
+
+@pytest.mark.parametrize("max_token_limit", [1, 10, 50, 120, 400])
+def test_prune_keeps_the_same_messages_as_pruning_one_by_one(max_token_limit):
+    model_instance = FakeModelInstance()
+    memory = TokenBufferMemory(conversation=MagicMock(), model_instance=model_instance)
+    prompt_messages, keys = make_history([5, 40, 7, 12, 30, 3, 25, 60, 8, 15])
+
+    start = memory._get_prune_index(prompt_messages, keys, max_token_limit)
+
+    assert prompt_messages[start:] == prune_one_by_one(model_instance, prompt_messages, max_token_limit)
+
+
+def test_prune_counts_each_message_once():
+    model_instance = FakeModelInstance()
+    memory = TokenBufferMemory(conversation=MagicMock(), model_instance=model_instance)
+    prompt_messages, keys = make_history([10] * 200)
+
+    memory._get_prune_index(prompt_messages, keys, 100)
+    first_calls = len(model_instance.calls)
+    model_instance.calls.clear()
+    memory._get_prune_index(prompt_messages, keys, 100)
+
+    assert first_calls < 20
+    # per-message counts come from the cache, only the kept messages are counted again
+    assert all(count > 1 for count in model_instance.calls)
+
+
+def test_workflow_file_configs_are_loaded_once_per_workflow(monkeypatch):
+    workflow_runs = {"run-1": "workflow-1", "run-2": "workflow-1", "run-3": "workflow-2"}
+    messages = [
+        SimpleNamespace(
+            id=f"message-{i}",
+            query="query",
+            answer="answer",
+            created_at=None,
+            workflow_run_id=f"run-{i}",
+            parent_message_id=f"message-{i - 1}" if i > 1 else None,
+            answer_tokens=1,
+        )
+        for i in (3, 2, 1)
+    ]
+    session = FakeSession(
+        messages,
+        [SimpleNamespace(message_id=message.id) for message in messages],
+        list(workflow_runs.items()),
+        [SimpleNamespace(id=f"workflow-{i}", features_dict={"workflow": i}) for i in (1, 2)],
+    )
+    monkeypatch.setattr(token_buffer_memory, "db", SimpleNamespace(session=session))
+    convert = MagicMock(return_value=None)
+    monkeypatch.setattr(token_buffer_memory.FileUploadConfigManager, "convert", convert)
+    memory = TokenBufferMemory(conversation=MagicMock(mode=AppMode.ADVANCED_CHAT), model_instance=FakeModelInstance())
+
+    prompt_messages = memory.get_history_prompt_messages()
+
+    assert len(prompt_messages) == 6
+    assert len(session.queries) == 4
+    assert convert.call_args_list == [
+        call({"workflow": 1}, is_vision=False),
+        call({"workflow": 2}, is_vision=False),
+    ]
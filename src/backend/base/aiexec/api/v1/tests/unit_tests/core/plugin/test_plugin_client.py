@@ -0,0 +1,146 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from yarl import URL
+
+from core.plugin.impl import base
+from core.plugin.impl.base import BasePluginClient
+
+STREAM_CHUNKS = 50
+
+
+class StubDaemonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # send the body of a response right after its headers on kept-alive connections
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.cookies.append(self.headers.get("Cookie"))
+        self._send(json.dumps({"code": 0, "message": "", "data": True}).encode(), {"Set-Cookie": "session=tenant-a"})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        lines = [
+            f"data: {json.dumps({'code': 0, 'message': '', 'data': {'index': i}})}\n\n" for i in range(STREAM_CHUNKS)
+        ]
+        self._send("".join(lines).encode())
+
+    def _send(self, body: bytes, headers: dict | None = None):
+        self.send_response(200)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_daemon(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubDaemonHandler)
+    server.connections = 0
+    server.cookies = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(base, "plugin_daemon_inner_api_baseurl", URL(f"http://127.0.0.1:{server.server_port}"))
+    monkeypatch.setattr(base, "_clients", base._PluginDaemonClients())
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_reuse_connection(stub_daemon):
+    client = BasePluginClient()
+
+    for _ in range(20):
+        assert client._request_with_plugin_daemon_response("GET", "ping", bool) is True
+
+    assert stub_daemon.connections == 1
+
+
+def test_stream_request_yields_models(stub_daemon):
+    client = BasePluginClient()
+
+    chunks = list(client._request_with_plugin_daemon_response_stream("POST", "stream", dict, data={"query": "q"}))
+
+    assert chunks == [{"index": i} for i in range(STREAM_CHUNKS)]
+
+
+def test_async_stream_request_yields_models(stub_daemon):
+    client = BasePluginClient()
+
+    async def collect():
+        stream = client._arequest_with_plugin_daemon_response_stream("POST", "stream", dict, data=b"")
+        return [chunk async for chunk in stream]
+
+    assert asyncio.run(collect()) == [{"index": i} for i in range(STREAM_CHUNKS)]
+
+
+def test_async_client_is_closed_with_its_loop(stub_daemon):
+    async def get_client():
+        return base._clients.get_async_client()
+
+    client = asyncio.run(get_client())
+
+    assert client.is_closed
+
+
+def test_stream_line_errors_are_decoded():
+    client = BasePluginClient()
+    response_type = base.PluginDaemonBasicResponse[dict]
+
+    with pytest.raises(ValueError, match="boom"):
+        client._parse_plugin_daemon_stream_line(response_type, b'{"error": "boom"}')
+
+
+def test_pooled_transport_reuses_connections(stub_daemon, monkeypatch):
+    requests_count = 50
+    client = BasePluginClient()
+
+    for _ in range(requests_count):
+        client._request_with_plugin_daemon_response("GET", "ping", bool)
+    pooled_connections = stub_daemon.connections
+
+    monkeypatch.setattr(base._clients, "get_session", lambda: requests)
+    for _ in range(requests_count):
+        client._request_with_plugin_daemon_response("GET", "ping", bool)
+
+    assert pooled_connections == 1
+    assert stub_daemon.connections == requests_count + 1
+
+
+def test_pooled_session_does_not_keep_cookies(stub_daemon):
+    client = BasePluginClient()
+
+    for _ in range(3):
+        client._request_with_plugin_daemon_response("GET", "ping", bool)
+
+    assert stub_daemon.cookies == [None, None, None]
+    assert not base._clients.get_session().cookies
+
+
+@pytest.mark.benchmark(group="plugin-daemon-transport")
+def test_pooled_transport_benchmark(stub_daemon, benchmark):
+    client = BasePluginClient()
+
+    assert benchmark(client._request_with_plugin_daemon_response, "GET", "ping", bool) is True
+    assert stub_daemon.connections == 1
+
+
+@pytest.mark.benchmark(group="plugin-daemon-transport")
+def test_connection_per_request_benchmark(stub_daemon, benchmark, monkeypatch):
+    client = BasePluginClient()
+    monkeypatch.setattr(base._clients, "get_session", lambda: requests)
+
+    assert benchmark(client._request_with_plugin_daemon_response, "GET", "ping", bool) is True
@@ -0,0 +1,111 @@
+import pytest
+
+from core.rag.datasource.keyword.jieba import segmented_keyword_table
+from core.rag.datasource.keyword.jieba.segmented_keyword_table import (
+    KeywordSegment,
+    KeywordTableState,
+    SegmentedKeywordTable,
+)
+
+
+class FakeStorage:
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+
+    def save(self, filename, data):
+        self.files[filename] = data
+
+    def load_once(self, filename):
+        return self.files[filename]
+
+    def exists(self, filename):
+        return filename in self.files
+
+    def delete(self, filename):
+        del self.files[filename]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value):
+        self.values[key] = str(value).encode()
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+@pytest.fixture
+def fake_storage(monkeypatch):
+    fake = FakeStorage()
+    monkeypatch.setattr(segmented_keyword_table, "storage", fake)
+    monkeypatch.setattr(segmented_keyword_table, "redis_client", FakeRedis())
+    segmented_keyword_table._states.clear()
+    yield fake
+    segmented_keyword_table._states.clear()
+
+
+def test_merged_segments_describe_the_same_table():
+    segments = [
+        KeywordSegment(postings={"apple": {"a", "b"}, "pear": {"b"}}),
+        KeywordSegment(deleted={"b"}),
+        KeywordSegment(postings={"pear": {"b", "c"}}),
+    ]
+    state = KeywordTableState()
+    for segment in segments:
+        state.apply(segment)
+
+    merged_tail = KeywordSegment.merge(segments[1:])
+    merged_state = KeywordTableState()
+    merged_state.apply(segments[0])
+    merged_state.apply(merged_tail)
+
+    assert merged_state.postings == state.postings == {"apple": {"a"}, "pear": {"b", "c"}}
+    assert KeywordSegment.merge(segments, full=True).deleted == set()
+
+
+def test_segmented_keyword_table_adds_and_deletes(fake_storage):
+    table = SegmentedKeywordTable("tenant", "dataset")
+
+    table.add({"a": {"apple", "pear"}, "b": {"pear"}})
+    table.delete(["a"])
+
+    assert table.get(["apple", "pear", "plum"]) == {"pear": {"b"}}
+    assert table.contains("b")
+    assert not table.contains("a")
+
+
+def test_segmented_keyword_table_reads_only_new_segments(fake_storage, monkeypatch):
+    table = SegmentedKeywordTable("tenant", "dataset")
+    table.add({"a": {"apple"}})
+    assert table.get(["apple"]) == {"apple": {"a"}}
+
+    loaded = []
+    read_segment = SegmentedKeywordTable._read_segment
+    monkeypatch.setattr(
+        SegmentedKeywordTable, "_read_segment", lambda self, name: loaded.append(name) or read_segment(self, name)
+    )
+    table.add({"b": {"apple"}})
+
+    assert table.get(["apple"]) == {"apple": {"a", "b"}}
+    assert len(loaded) == 1
+
+
+def test_segmented_keyword_table_merges_segments(fake_storage, monkeypatch):
+    monkeypatch.setattr(segmented_keyword_table.aiexec_config, "KEYWORD_TABLE_MAX_SEGMENTS", 3)
+    table = SegmentedKeywordTable("tenant", "dataset")
+
+    for i in range(10):
+        table.add({str(i): {"apple"}})
+    table.delete(["0"])
+
+    segments = [name for name in fake_storage.files if not name.endswith("manifest.json")]
+    assert len(segments) <= 3
+    assert table.get(["apple"]) == {"apple": {str(i) for i in range(1, 10)}}
+
+    table.drop()
+    assert fake_storage.files == {}
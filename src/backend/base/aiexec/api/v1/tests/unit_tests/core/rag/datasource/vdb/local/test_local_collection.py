@@ -0,0 +1,182 @@
+import json
+
+import numpy as np
+import pytest
+
+from core.rag.datasource.vdb.local import local_collection
+from core.rag.datasource.vdb.local.local_collection import LocalCollection, tokenize
+
+
+def make_collection(path, ivf_threshold=10000, nprobe=8) -> LocalCollection:
+    return LocalCollection(path / "collection", ivf_threshold=ivf_threshold, nprobe=nprobe)
+
+
+def add_rows(collection: LocalCollection, vectors: np.ndarray, texts=None, document_id=lambda i: f"document-{i % 4}"):
+    ids = [f"id-{i}" for i in range(len(vectors))]
+    texts = texts or [f"text {i}" for i in range(len(vectors))]
+    metadatas = [{"doc_id": id, "document_id": document_id(i)} for i, id in enumerate(ids)]
+    collection.add(ids, vectors.tolist(), texts, metadatas)
+    return ids
+
+
+def state(collection: LocalCollection) -> dict:
+    return json.loads((collection.directory / "state.json").read_text())
+
+
+def test_tokenize():
+    assert tokenize("Hello, World_2 知识库") == ["hello", "world", "2", "知", "识", "库"]
+
+
+def test_search_is_exact_for_small_collections(tmp_path):
+    collection = make_collection(tmp_path)
+    vectors = np.random.default_rng(0).normal(size=(100, 16))
+    add_rows(collection, vectors)
+
+    results = collection.search(vectors[42].tolist(), 3)
+
+    assert [record["id"] for record, _ in results][0] == "id-42"
+    assert results[0][1] == pytest.approx(1.0)
+    assert results[0][1] >= results[1][1] >= results[2][1]
+    assert state(collection)["nlist"] == 0
+
+
+def test_search_with_ivf_index(tmp_path):
+    collection = make_collection(tmp_path, ivf_threshold=200, nprobe=2)
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(8, 32))
+    vectors = centers[np.arange(1000) % 8] + rng.normal(scale=0.05, size=(1000, 32))
+    add_rows(collection, vectors)
+
+    assert state(collection)["nlist"] == 31
+    assert state(collection)["trained_count"] == 1000
+    for row in (3, 500, 999):
+        results = collection.search(vectors[row].tolist(), 5)
+        assert results[0][0]["id"] == f"id-{row}"
+        assert len(results) == 5
+
+    # rows added after training are assigned to their lists
+    add_rows_vectors = centers[:1] + rng.normal(scale=0.05, size=(1, 32))
+    collection.add(["new"], add_rows_vectors.tolist(), ["new"], [{"document_id": "document-new"}])
+    assert collection.search(add_rows_vectors[0].tolist(), 1)[0][0]["id"] == "new"
+
+
+def test_search_filters_documents(tmp_path):
+    collection = make_collection(tmp_path, ivf_threshold=50, nprobe=1)
+    vectors = np.random.default_rng(0).normal(size=(200, 16))
+    add_rows(collection, vectors)
+
+    results = collection.search(vectors[1].tolist(), 10, ["document-2", "document-3", "unknown"])
+
+    assert len(results) == 10
+    assert {record["metadata"]["document_id"] for record, _ in results} <= {"document-2", "document-3"}
+    assert collection.search(vectors[1].tolist(), 10, ["unknown"]) == []
+
+
+def test_search_full_text(tmp_path):
+    collection = make_collection(tmp_path)
+    texts = [
+        "the cat sat on the mat",
+        "a cat and another cat",
+        "dogs chase cats",
+        "nothing to see here",
+    ]
+    add_rows(collection, np.eye(4), texts, document_id=lambda i: f"document-{i}")
+
+    results = collection.search_full_text("Cat", 10)
+    assert [record["id"] for record, _ in results] == ["id-1", "id-0"]
+
+    assert [record["id"] for record, _ in collection.search_full_text("cat", 10, ["document-0"])] == ["id-0"]
+
+    collection.delete_by_ids(["id-1"])
+    collection.add(["id-4"], [[1.0, 0, 0, 0]], ["cat"], [{"document_id": "document-4"}])
+    assert [record["id"] for record, _ in collection.search_full_text("cat", 10)] == ["id-4", "id-0"]
+
+
+def test_add_replaces_rows_with_the_same_ids(tmp_path):
+    collection = make_collection(tmp_path)
+    add_rows(collection, np.eye(4))
+
+    collection.add(["id-0"], [[0, 1.0, 0, 0]], ["replaced"], [{"document_id": "document-0"}])
+
+    results = collection.search([0, 1.0, 0, 0], 10)
+    assert sorted(record["text"] for record, _ in results) == ["replaced", "text 1", "text 2", "text 3"]
+    assert [score for _, score in results][:2] == [pytest.approx(1.0), pytest.approx(1.0)]
+
+
+def test_delete_and_compaction(tmp_path):
+    collection = make_collection(tmp_path)
+    ids = add_rows(collection, np.random.default_rng(0).normal(size=(40, 8)))
+
+    collection.delete_by_metadata_field("document_id", "document-0")
+    assert collection.existing_ids(ids[:2]) == {"id-1"}
+    assert state(collection)["generation"] == 0
+    assert collection.ids_by_metadata_field("doc_id", "id-1") == ["id-1"]
+
+    collection.delete_by_ids(ids[:30])
+    assert state(collection)["generation"] == 1
+    assert state(collection)["count"] == 8
+    assert collection.existing_ids(ids) == set(ids[30:]) - {"id-32", "id-36"}
+    assert len(collection.search([1.0] * 8, 100)) == 8
+    assert collection.ids_by_metadata_field("document_id", "document-1") == ["id-33", "id-37"]
+
+    collection.drop()
+    assert not collection.directory.exists()
+    assert collection.search([1.0] * 8, 10) == []
+
+
+def test_collection_is_shared_through_files(tmp_path):
+    collection = make_collection(tmp_path)
+    other = make_collection(tmp_path)
+    add_rows(collection, np.eye(4))
+
+    assert other.existing_ids(["id-0", "id-9"]) == {"id-0"}
+    other.delete_by_ids(["id-0"])
+    assert collection.existing_ids(["id-0", "id-1"]) == {"id-1"}
+
+    with pytest.raises(ValueError):
+        other.add(["id-9"], [[1.0, 0.0]], ["text"], [{}])
+
+
+def test_collection_dropped_and_created_again_by_another_instance(tmp_path):
+    collection = make_collection(tmp_path)
+    other = make_collection(tmp_path)
+    add_rows(collection, np.eye(4))
+    assert other.existing_ids(["id-0", "id-3"]) == {"id-0", "id-3"}
+
+    collection.drop()
+    collection.add(["new-0", "new-1"], np.eye(4)[:2].tolist(), ["new 0", "new 1"], [{}, {}])
+
+    assert other.existing_ids(["id-0", "id-1", "new-0", "new-1"]) == {"new-0", "new-1"}
+    other.delete_by_ids(["id-1"])
+    assert collection.existing_ids(["new-0", "new-1"]) == {"new-0", "new-1"}
+    assert other.ids_by_metadata_field("document_id", "document-0") == []
+    other.delete_by_ids(["new-1"])
+    assert [record["id"] for record, _ in collection.search([1.0, 1.0, 0, 0], 10)] == ["new-0"]
+
+    # the new collection has more ids than the one cached
+    collection.drop()
+    ids = add_rows(collection, np.eye(4))
+    assert other.existing_ids(["new-0", *ids]) == set(ids)
+
+
+def test_reads_retry_when_another_instance_deletes_their_generation(tmp_path, monkeypatch):
+    reader = make_collection(tmp_path)
+    writer = make_collection(tmp_path)
+    ids = add_rows(writer, np.random.default_rng(0).normal(size=(40, 8)))
+    assert len(reader.search([1.0] * 8, 100)) == 40
+    read_rows = local_collection._Snapshot.read_rows
+
+    def read_rows_during_rewrites(snapshot, rows):
+        if snapshot.state["generation"] == 0:
+            # compacted twice, so the generation of the snapshot is deleted
+            writer.delete_by_ids(ids[:30])
+            writer.delete_by_ids(ids[30:36])
+            assert not snapshot.generation_dir.exists()
+        return read_rows(snapshot, rows)
+
+    monkeypatch.setattr(local_collection._Snapshot, "read_rows", read_rows_during_rewrites)
+
+    results = reader.search([1.0] * 8, 100)
+
+    assert state(reader)["generation"] == 2
+    assert sorted(record["id"] for record, _ in results) == ids[36:]
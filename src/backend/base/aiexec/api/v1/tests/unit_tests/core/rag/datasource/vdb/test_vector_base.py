@@ -0,0 +1,82 @@
+from typing import Any
+
+from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.models.document import Document
+
+
+class FakeVector(BaseVector):
+    def __init__(self, ids: set[str]):
+        super().__init__("collection")
+        self.ids = ids
+        self.text_exists_calls = 0
+
+    def get_type(self) -> str:
+        return "fake"
+
+    def create(self, texts: list[Document], embeddings: list[list[float]], **kwargs):
+        pass
+
+    def add_texts(self, documents: list[Document], embeddings: list[list[float]], **kwargs):
+        pass
+
+    def text_exists(self, id: str) -> bool:
+        self.text_exists_calls += 1
+        return id in self.ids
+
+    def delete_by_ids(self, ids: list[str]) -> None:
+        pass
+
+    def delete_by_metadata_field(self, key: str, value: str) -> None:
+        pass
+
+    def search_by_vector(self, query_vector: list[float], **kwargs: Any) -> list[Document]:
+        return []
+
+    def search_by_full_text(self, query: str, **kwargs: Any) -> list[Document]:
+        return []
+
+    def delete(self) -> None:
+        pass
+
+
+class BatchedFakeVector(FakeVector):
+    def __init__(self, ids: set[str]):
+        super().__init__(ids)
+        self.batches: list[list[str]] = []
+
+    def existing_ids(self, ids: list[str]) -> set[str]:
+        existing_ids = set()
+        for batch in self._batch_ids(ids, batch_size=2):
+            self.batches.append(batch)
+            existing_ids.update(id for id in batch if id in self.ids)
+        return existing_ids
+
+
+def make_documents() -> list[Document]:
+    return [
+        Document(page_content="a", metadata={"doc_id": "a"}),
+        Document(page_content="b", metadata={"doc_id": "b"}),
+        Document(page_content="c", metadata={"doc_id": "c"}),
+        Document(page_content="no id", metadata={}),
+    ]
+
+
+def test_filter_duplicate_texts_with_default_existing_ids():
+    vector = FakeVector({"a", "c"})
+    documents = make_documents()
+
+    filtered = vector._filter_duplicate_texts(documents)
+
+    assert [document.page_content for document in filtered] == ["b", "no id"]
+    assert filtered is documents
+    assert vector.text_exists_calls == 3
+
+
+def test_filter_duplicate_texts_with_batched_existing_ids():
+    vector = BatchedFakeVector({"b"})
+
+    filtered = vector._filter_duplicate_texts(make_documents())
+
+    assert [document.page_content for document in filtered] == ["a", "c", "no id"]
+    assert vector.batches == [["a", "b"], ["c"]]
+    assert vector.text_exists_calls == 0
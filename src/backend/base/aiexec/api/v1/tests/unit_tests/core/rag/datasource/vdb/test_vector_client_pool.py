@@ -0,0 +1,103 @@
+import threading
+from unittest.mock import MagicMock
+
+import psycopg2.pool
+import pytest
+
+from core.rag.datasource.vdb import vector_client_pool
+from core.rag.datasource.vdb.vector_client_pool import SharedConnectionPool, _VectorClientRegistry
+
+
+class FakeThreadedConnectionPool:
+    """Mimics psycopg2.pool.ThreadedConnectionPool without connecting to a database."""
+
+    def __init__(self, minconn, maxconn, **kwargs):
+        self.maxconn = maxconn
+        self._pool = []
+        self._used = {}
+
+    def getconn(self):
+        if len(self._used) == self.maxconn:
+            raise psycopg2.pool.PoolError("connection pool exhausted")
+        conn = self._pool.pop() if self._pool else MagicMock(closed=0)
+        self._used[id(conn)] = conn
+        return conn
+
+    def putconn(self, conn, close=False):
+        del self._used[id(conn)]
+        if not close:
+            self._pool.append(conn)
+
+    def closeall(self):
+        self._pool.clear()
+
+
+@pytest.fixture(autouse=True)
+def fake_pool(monkeypatch):
+    monkeypatch.setattr(psycopg2.pool, "ThreadedConnectionPool", FakeThreadedConnectionPool)
+
+
+def test_pool_reuses_connections():
+    pool = SharedConnectionPool("test", 1, 2)
+
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    assert pool.getconn() is conn
+    stats = pool.stats()
+    assert stats["checkouts"] == 2
+    assert stats["in_use_connections"] == 1
+    assert stats["utilization"] == 0.5
+
+
+def test_pool_replaces_closed_connections():
+    pool = SharedConnectionPool("test", 1, 2)
+
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.closed = 1
+
+    assert pool.getconn() is not conn
+    assert pool.stats()["replaced_connections"] == 1
+
+
+def test_pool_checks_idle_connections(monkeypatch):
+    monkeypatch.setattr(vector_client_pool, "HEALTH_CHECK_INTERVAL", 0)
+    pool = SharedConnectionPool("test", 1, 2)
+
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError
+
+    assert pool.getconn() is not conn
+    assert pool.stats()["replaced_connections"] == 1
+
+
+def test_pool_waits_for_a_connection(monkeypatch):
+    monkeypatch.setattr(vector_client_pool, "CONNECTION_TIMEOUT", 0.01)
+    pool = SharedConnectionPool("test", 1, 1)
+
+    conn = pool.getconn()
+    with pytest.raises(psycopg2.pool.PoolError):
+        pool.getconn()
+
+    threading.Timer(0.001, pool.putconn, args=[conn]).start()
+    monkeypatch.setattr(vector_client_pool, "CONNECTION_TIMEOUT", 5)
+    assert pool.getconn() is conn
+    assert pool.stats()["waits"] == 2
+
+
+def test_registry_shares_clients_by_config():
+    registry = _VectorClientRegistry()
+    close = MagicMock()
+
+    first = registry.get("test", {"host": "a"}, object, close, lambda client: {})
+
+    assert registry.get("test", {"host": "a"}, object, close, lambda client: {}) is first
+    assert registry.get("test", {"host": "b"}, object, close, lambda client: {}) is not first
+    assert registry.get("other", {"host": "a"}, object, close, lambda client: {}) is not first
+    assert len(registry.stats()["pools"]) == 3
+
+    registry.close_all()
+    assert close.call_count == 3
+    assert registry.stats()["pools"] == []
@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from core.rag.embedding import cached_embedding
+from core.rag.embedding.cached_embedding import CacheEmbedding, EmbeddingMemoryCache, embedding_memory_cache
+from libs import helper
+from models.dataset import Embedding
+
+
+@pytest.fixture
+def session(monkeypatch):
+    embedding_memory_cache.clear()
+    db = MagicMock()
+    monkeypatch.setattr(cached_embedding, "db", db)
+    monkeypatch.setattr(cached_embedding.aiexec_config, "EMBEDDING_CACHE_BATCH_SIZE", 2)
+    yield db.session
+    embedding_memory_cache.clear()
+
+
+def make_model_instance():
+    model_instance = MagicMock()
+    model_instance.provider = "provider"
+    model_instance.model = "model"
+    model_instance.model_type_instance.get_model_schema.return_value = None
+    model_instance.invoke_text_embedding.side_effect = lambda texts, **kwargs: SimpleNamespace(
+        embeddings=[[float(len(text)), 0.0] for text in texts]
+    )
+    return model_instance
+
+
+def test_embedding_memory_cache_evicts_least_recently_used():
+    cache = EmbeddingMemoryCache(maxsize=2)
+    cache.set_many({("p", "m", "a"): b"a", ("p", "m", "b"): b"b"})
+    cache.get_many([("p", "m", "a")])
+    cache.set_many({("p", "m", "c"): b"c"})
+
+    assert cache.get_many([("p", "m", "a"), ("p", "m", "b"), ("p", "m", "c")]) == {
+        ("p", "m", "a"): b"a",
+        ("p", "m", "c"): b"c",
+    }
+
+
+def test_embedding_memory_cache_can_be_disabled():
+    cache = EmbeddingMemoryCache(maxsize=0)
+    cache.set_many({("p", "m", "a"): b"a"})
+
+    assert cache.get_many([("p", "m", "a")]) == {}
+
+
+def test_embed_documents_looks_up_hashes_in_batches_and_stores_only_misses(session):
+    texts = ["a", "bb", "ccc", "bb"]
+    hashes = [helper.generate_text_hash(text) for text in texts]
+    stored_row = SimpleNamespace(hash=hashes[0], embedding=Embedding.encode_embedding([0.0, 1.0]))
+    session.query.return_value.filter.return_value.all.side_effect = [[stored_row], []]
+    model_instance = make_model_instance()
+
+    embeddings = CacheEmbedding(model_instance).embed_documents(texts)
+
+    # the 3 distinct hashes are looked up with one IN query per batch of 2
+    lookups = [call.args[-1].right.value for call in session.query.return_value.filter.call_args_list]
+    assert lookups == [hashes[:2], hashes[2:3]]
+    # only the texts missing from the table are embedded, once per distinct text
+    assert [call.kwargs["texts"] for call in model_instance.invoke_text_embedding.call_args_list] == [["bb"], ["ccc"]]
+    assert embeddings == [[0.0, 1.0], [1.0, 0.0], [1.0, 0.0], [1.0, 0.0]]
+
+    session.execute.assert_called_once()
+    statement = session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+    assert "ON CONFLICT ON CONSTRAINT embedding_hash_idx DO NOTHING" in str(statement)
+    assert sorted(value for key, value in statement.params.items() if key.startswith("hash")) == sorted(hashes[1:3])
+    session.commit.assert_called_once()
+
+
+def test_embed_documents_serves_stored_embeddings_from_memory(session):
+    texts = ["a", "bb"]
+    session.query.return_value.filter.return_value.all.return_value = []
+    model_instance = make_model_instance()
+    CacheEmbedding(model_instance).embed_documents(texts)
+    session.reset_mock()
+    model_instance.invoke_text_embedding.reset_mock()
+
+    embeddings = CacheEmbedding(model_instance).embed_documents([*texts, "ccc"])
+
+    assert [call.args[-1].right.value for call in session.query.return_value.filter.call_args_list] == [
+        [helper.generate_text_hash("ccc")]
+    ]
+    assert [call.kwargs["texts"] for call in model_instance.invoke_text_embedding.call_args_list] == [["ccc"]]
+    assert embeddings == [[1.0, 0.0], [1.0, 0.0], [1.0, 0.0]]
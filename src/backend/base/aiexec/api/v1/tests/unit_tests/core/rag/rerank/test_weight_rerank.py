@@ -0,0 +1,130 @@
+import math
+import random
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from core.rag.models.document import Document
+from core.rag.rerank import weight_rerank
+from core.rag.rerank.entity.weight import KeywordSetting, VectorSetting, Weights
+from core.rag.rerank.weight_rerank import WeightRerankRunner
+
+VOCABULARY = [f"word{i}" for i in range(2000)]
+DIMENSIONS = 256
+
+
+class FakeKeywordTableHandler:
+    def extract_keywords(self, text, max_keywords_per_chunk=10):
+        return set(text.split())
+
+
+@pytest.fixture(autouse=True)
+def fake_models(monkeypatch):
+    monkeypatch.setattr(weight_rerank, "JiebaKeywordTableHandler", FakeKeywordTableHandler)
+    monkeypatch.setattr(weight_rerank, "ModelManager", MagicMock())
+    cache_embedding = MagicMock()
+    cache_embedding.return_value.embed_query.return_value = np.random.default_rng(0).random(DIMENSIONS).tolist()
+    monkeypatch.setattr(weight_rerank, "CacheEmbedding", cache_embedding)
+    weight_rerank._keywords_cache.clear()
+
+
+def make_runner():
+    return WeightRerankRunner(
+        tenant_id="tenant",
+        weights=Weights(
+            vector_setting=VectorSetting(vector_weight=0.7, embedding_provider_name="p", embedding_model_name="m"),
+            keyword_setting=KeywordSetting(keyword_weight=0.3),
+        ),
+    )
+
+
+def make_documents(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        Document(
+            page_content=" ".join(rng.sample(VOCABULARY, rng.randint(0, 12))),
+            vector=[rng.random() for _ in range(DIMENSIONS)],
+            metadata={"doc_id": str(i)},
+        )
+        for i in range(count)
+    ]
+
+
+def reference_keyword_scores(query_keywords, documents_keywords):
+    total_documents = len(documents_keywords)
+    idf = {}
+    for keyword in set().union(*documents_keywords):
+        count = sum(1 for keywords in documents_keywords if keyword in keywords)
+        idf[keyword] = math.log((1 + total_documents) / (1 + count)) + 1
+    query = {keyword: idf.get(keyword, 0) for keyword in query_keywords}
+    scores = []
+    for keywords in documents_keywords:
+        document = {keyword: idf[keyword] for keyword in keywords}
+        numerator = sum(query[k] * document[k] for k in set(query) & set(document))
+        denominator = math.sqrt(sum(v**2 for v in query.values())) * math.sqrt(sum(v**2 for v in document.values()))
+        scores.append(numerator / denominator if denominator else 0.0)
+    return scores
+
+
+def test_keyword_scores_match_reference():
+    documents = make_documents(200)
+    query = " ".join(VOCABULARY[:300:7])
+
+    scores = make_runner()._calculate_keyword_score(query, documents)
+
+    expected = reference_keyword_scores(set(query.split()), [set(d.page_content.split()) for d in documents])
+    assert scores == pytest.approx(expected)
+    assert documents[0].metadata["keywords"] == set(documents[0].page_content.split())
+
+
+def test_keyword_scores_without_keywords():
+    documents = [Document(page_content="", metadata={"doc_id": "1"})]
+
+    assert make_runner()._calculate_keyword_score("word1", documents) == [0.0]
+
+
+def test_cosine_scores_keep_existing_scores():
+    documents = make_documents(3)
+    documents[1].metadata["score"] = 0.42
+
+    scores = make_runner()._calculate_cosine("tenant", "query", documents, make_runner().weights.vector_setting)
+
+    query_vector = np.random.default_rng(0).random(DIMENSIONS)
+    for i in (0, 2):
+        vector = np.array(documents[i].vector)
+        expected = vector @ query_vector / (np.linalg.norm(vector) * np.linalg.norm(query_vector))
+        assert scores[i] == pytest.approx(expected)
+    assert scores[1] == 0.42
+
+
+@pytest.mark.parametrize("candidates", [50, 500])
+def test_rerank_keeps_top_documents_by_weighted_score(candidates):
+    documents = make_documents(candidates, seed=candidates)
+    query = " ".join(VOCABULARY[:50])
+    keyword_scores = reference_keyword_scores(set(query.split()), [set(d.page_content.split()) for d in documents])
+    query_vector = np.random.default_rng(0).random(DIMENSIONS)
+    vectors = np.array([d.vector for d in documents])
+    cosine_scores = vectors @ query_vector / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query_vector))
+    scores = 0.7 * cosine_scores + 0.3 * np.array(keyword_scores)
+    expected = np.argsort(-scores, kind="stable")[:10]
+
+    reranked = make_runner().run(query, documents, top_n=10)
+
+    assert [d.metadata["doc_id"] for d in reranked] == [str(i) for i in expected]
+    assert [d.metadata["score"] for d in reranked] == pytest.approx(scores[expected].tolist())
+
+
+@pytest.mark.benchmark(group="weight-rerank")
+@pytest.mark.parametrize("candidates", [50, 500, 5000])
+def test_rerank_benchmark(candidates, benchmark):
+    runner = make_runner()
+    query = " ".join(VOCABULARY[:50])
+
+    def setup():
+        weight_rerank._keywords_cache.clear()
+        return (query, make_documents(candidates, seed=candidates)), {"top_n": 10}
+
+    reranked = benchmark.pedantic(runner.run, setup=setup, rounds=5)
+
+    assert len(reranked) == 10
@@ -0,0 +1,103 @@
+import json
+import operator
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from core import indexing_runner
+from core.indexing_runner import IndexingRunner
+
+
+def test_ordered_map_yields_results_in_order():
+    def slow_square(i):
+        time.sleep(0.01 * (5 - i % 5))
+        return i * i
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(IndexingRunner._ordered_map(executor, slow_square, range(20), max_pending=3))
+
+    assert results == [i * i for i in range(20)]
+
+
+def test_ordered_map_bounds_items_in_flight():
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    consumed = 0
+
+    def items():
+        for i in range(10):
+            # the producer never runs further ahead than max_pending items
+            assert i - consumed <= 2
+            yield i
+
+    def work(i):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.005)
+        with lock:
+            in_flight -= 1
+        return i
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in IndexingRunner._ordered_map(executor, work, items(), max_pending=2):
+            consumed += 1
+
+    assert consumed == 10
+    assert max_in_flight <= 2
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values: dict[str, str] = {}
+
+    def setex(self, key, expiry, value):
+        self.values[key] = value
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+def test_commit_batch_saves_checkpoint(monkeypatch):
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(indexing_runner, "redis_client", fake_redis)
+    runner = IndexingRunner.__new__(IndexingRunner)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(lambda: 3), executor.submit(lambda: None), executor.submit(lambda: 4)]
+        tokens = runner._commit_batch("document", 40, 120, futures, tokens=10)
+
+    assert tokens == 17
+    assert IndexingRunner._get_checkpoint("document") == {"text_docs": 40, "position": 120, "tokens": 17}
+    assert json.loads(fake_redis.values["document_document_indexing_checkpoint"])["text_docs"] == 40
+
+    IndexingRunner._delete_checkpoint("document")
+    assert IndexingRunner._get_checkpoint("document") is None
+
+
+def test_resume_deletes_segments_after_the_committed_batches(monkeypatch):
+    monkeypatch.setattr(indexing_runner, "db", MagicMock())
+    monkeypatch.setattr(indexing_runner, "IndexProcessorFactory", MagicMock())
+    monkeypatch.setattr(
+        IndexingRunner, "_get_checkpoint", staticmethod(lambda _: {"text_docs": 40, "position": 120, "tokens": 17})
+    )
+    segments_query = indexing_runner.db.session.query.return_value.filter_by.return_value
+    segments_query.filter.return_value.all.return_value = [MagicMock(index_node_id="node-121")]
+    index_processor = indexing_runner.IndexProcessorFactory.return_value.init_index_processor.return_value
+    runner = IndexingRunner.__new__(IndexingRunner)
+    monkeypatch.setattr(runner, "_extract", MagicMock(side_effect=RuntimeError("stop")))
+
+    runner.run_in_splitting_status(MagicMock(id="document"))
+
+    # completed segments of batches committed after the checkpoint are not kept either
+    (criterion,) = segments_query.filter.call_args.args
+    assert criterion.left.key == "position"
+    assert criterion.operator is operator.gt
+    assert criterion.right.value == 120
+    assert index_processor.clean.call_args.args[1] == ["node-121"]
@@ -12,6 +12,7 @@ from core.workflow.nodes.document_extractor import DocumentExtractorNode, Docume
 from core.workflow.nodes.document_extractor.node import (
     _extract_text_from_docx,
     _extract_text_from_excel,
+    _extract_text_from_file,
     _extract_text_from_pdf,
     _extract_text_from_plain_text,
 )
@@ -137,6 +138,21 @@ def test_run_extract_text(
         mock_download.assert_called_once_with(mock_file)
 
 
+def test_extract_text_from_file_is_cached_by_content(monkeypatch):
+    monkeypatch.setattr("configs.aiexec_config.EXTRACTED_TEXT_CACHE_STORAGE_ENABLED", False)
+    mock_file = Mock(spec=File)
+    mock_file.transfer_method = FileTransferMethod.LOCAL_FILE
+    mock_file.extension = ".csv"
+    mock_file.mime_type = "text/csv"
+    monkeypatch.setattr("core.file.file_manager.download", Mock(return_value=b"name,age\ncached,1"))
+    mock_csv_extract = Mock(return_value="| name | age |")
+    monkeypatch.setattr("core.workflow.nodes.document_extractor.node._extract_text_from_csv", mock_csv_extract)
+
+    assert _extract_text_from_file(mock_file) == "| name | age |"
+    assert _extract_text_from_file(mock_file) == "| name | age |"
+    mock_csv_extract.assert_called_once()
+
+
 def test_extract_text_from_plain_text():
     text = _extract_text_from_plain_text(b"Hello, world!")
     assert text == "Hello, world!"
@@ -44,3 +44,47 @@ def test_use_long_selector(pool):
     result = pool.get(("node_1", "part_1", "part_2"))
     assert result is not None
     assert result.value == "test_value"
+
+
+def test_child_pool_reads_through_to_parent(pool):
+    pool.add(("node_1", "var"), StringSegment(value="parent"))
+    child = pool.create_child()
+
+    assert child.get(("node_1", "var")).value == "parent"
+
+    child.add(("node_1", "var"), StringSegment(value="child"))
+    child.add(("node_2", "var"), StringSegment(value="child"))
+
+    assert child.get(("node_1", "var")).value == "child"
+    assert pool.get(("node_1", "var")).value == "parent"
+    assert pool.get(("node_2", "var")) is None
+    assert "node_2" not in child._parent.variable_dictionary
+
+
+def test_child_pool_removals_hide_parent_variables(pool):
+    pool.add(("node_1", "var"), StringSegment(value="parent"))
+    pool.add(("node_2", "var"), StringSegment(value="parent"))
+    child = pool.create_child()
+
+    child.remove(("node_1", "var"))
+    child.remove(("node_2",))
+
+    assert child.get(("node_1", "var")) is None
+    assert child.get(("node_2", "var")) is None
+    assert pool.get(("node_1", "var")).value == "parent"
+    assert pool.get(("node_2", "var")).value == "parent"
+
+
+def test_merge_child_pool_into_parent(pool):
+    pool.add(("node_1", "var"), StringSegment(value="parent"))
+    pool.add(("node_2", "var"), StringSegment(value="parent"))
+    child = pool.create_child()
+    child.remove(("node_1",))
+    child.add(("node_2", "var"), StringSegment(value="child"))
+    child.add(("node_3", "var"), StringSegment(value="child"))
+
+    child.merge_into_parent()
+
+    assert pool.get(("node_1", "var")) is None
+    assert pool.get(("node_2", "var")).value == "child"
+    assert pool.get(("node_3", "var")).value == "child"
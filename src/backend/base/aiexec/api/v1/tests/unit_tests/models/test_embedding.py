@@ -0,0 +1,23 @@
+import pickle
+
+import numpy as np
+
+from models.dataset import Embedding
+
+
+def test_embedding_is_stored_as_float32_bytes():
+    vector = [0.1, -0.2, 0.3]
+    embedding = Embedding()
+
+    embedding.set_embedding(vector)
+
+    assert embedding.embedding == Embedding.FLOAT32_PREFIX + np.asarray(vector, dtype="<f4").tobytes()
+    assert np.allclose(embedding.get_embedding(), vector)
+
+
+def test_embedding_reads_pickled_vectors():
+    vector = [0.1, -0.2, 0.3]
+    embedding = Embedding()
+    embedding.embedding = pickle.dumps(vector, protocol=pickle.HIGHEST_PROTOCOL)
+
+    assert embedding.get_embedding() == vector
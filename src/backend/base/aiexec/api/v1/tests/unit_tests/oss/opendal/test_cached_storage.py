@@ -0,0 +1,118 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from extensions.storage.cached_storage import CachedStorage
+from extensions.storage.opendal_storage import OpenDALStorage
+
+
+@pytest.fixture
+def remote(tmp_path):
+    storage = OpenDALStorage(scheme="fs", root=str(tmp_path / "bucket"))
+    # Record the calls that reach the remote storage
+    return MagicMock(wraps=storage)
+
+
+@pytest.fixture
+def storage(remote, tmp_path):
+    return CachedStorage(
+        remote,
+        cache_path=str(tmp_path / "cache"),
+        max_size=100,
+        max_file_size=40,
+        key_prefixes=["upload_files/"],
+    )
+
+
+def test_load_once_reads_through(storage, remote):
+    remote.save("upload_files/a.txt", b"a" * 10)
+
+    assert storage.load_once("upload_files/a.txt") == b"a" * 10
+    assert storage.load_once("upload_files/a.txt") == b"a" * 10
+
+    assert remote.load_once.call_count == 1
+    info = storage.info()
+    assert info["hits"] == 1
+    assert info["misses"] == 1
+    assert info["hit_ratio"] == 0.5
+    assert info["bytes_saved"] == 10
+
+
+def test_save_writes_through_and_delete_invalidates(storage, remote):
+    storage.save("upload_files/a.txt", b"data")
+
+    assert storage.load_once("upload_files/a.txt") == b"data"
+    remote.load_once.assert_not_called()
+
+    storage.delete("upload_files/a.txt")
+    assert not storage.exists("upload_files/a.txt")
+    with pytest.raises(FileNotFoundError):
+        storage.load_once("upload_files/a.txt")
+    assert storage.info()["files"] == 0
+
+
+def test_files_outside_prefixes_are_not_cached(storage, remote):
+    storage.save("keyword_files/a.txt", b"data")
+
+    assert storage.load_once("keyword_files/a.txt") == b"data"
+    assert storage.load_once("keyword_files/a.txt") == b"data"
+
+    assert remote.load_once.call_count == 2
+    assert storage.info()["files"] == 0
+
+
+def test_load_stream_fills_cache(storage, remote):
+    remote.save("upload_files/a.txt", b"stream" * 5)
+
+    assert b"".join(storage.load_stream("upload_files/a.txt")) == b"stream" * 5
+    assert b"".join(storage.load_stream("upload_files/a.txt")) == b"stream" * 5
+
+    assert remote.load_stream.call_count == 1
+    assert storage.load_once("upload_files/a.txt") == b"stream" * 5
+    remote.load_once.assert_not_called()
+
+
+def test_partially_read_stream_is_not_cached(storage, remote):
+    remote.save("upload_files/a.txt", b"stream")
+
+    stream = storage.load_stream("upload_files/a.txt")
+    next(stream)
+    stream.close()
+
+    assert storage.info()["files"] == 0
+    assert storage.load_once("upload_files/a.txt") == b"stream"
+
+
+def test_download_uses_cache(storage, remote, tmp_path):
+    remote.save("upload_files/a.txt", b"download")
+
+    storage.download("upload_files/a.txt", str(tmp_path / "first"))
+    storage.download("upload_files/a.txt", str(tmp_path / "second"))
+
+    assert remote.download.call_count == 1
+    assert (tmp_path / "second").read_bytes() == b"download"
+
+
+def test_cache_evicts_least_recently_used_files(storage, remote):
+    for i in range(4):
+        storage.save(f"upload_files/{i}.txt", bytes([i]) * 30)
+    storage.save("upload_files/large.txt", b"x" * 50)
+
+    info = storage.info()
+    assert info["size"] <= 100
+    assert info["files"] == 3
+
+    # the oldest file and the file larger than max_file_size are read from the remote storage
+    assert storage.load_once("upload_files/0.txt") == bytes([0]) * 30
+    assert storage.load_once("upload_files/large.txt") == b"x" * 50
+    assert remote.load_once.call_count == 2
+
+
+def test_cache_is_shared_by_processes(storage, remote, tmp_path):
+    storage.save("upload_files/a.txt", b"shared")
+
+    other = CachedStorage(remote, cache_path=str(tmp_path / "cache"), max_size=100, max_file_size=40)
+
+    assert other.info()["files"] == 1
+    assert other.load_once("upload_files/a.txt") == b"shared"
+    remote.load_once.assert_not_called()
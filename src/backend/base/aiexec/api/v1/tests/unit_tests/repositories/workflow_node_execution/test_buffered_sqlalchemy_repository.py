@@ -0,0 +1,106 @@
+"""
+Unit tests for the buffered SQLAlchemy implementation of WorkflowNodeExecutionRepository.
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from core.repositories import BufferedSQLAlchemyWorkflowNodeExecutionRepository
+from core.workflow.entities.workflow_node_execution import WorkflowNodeExecution, WorkflowNodeExecutionStatus
+from core.workflow.nodes.enums import NodeType
+from models.account import Account
+from models.workflow import WorkflowNodeExecutionTriggeredFrom
+
+
+@pytest.fixture
+def session():
+    """Create a mock SQLAlchemy session backed by a non-PostgreSQL database."""
+    session = MagicMock(spec=Session)
+    session.__enter__ = MagicMock(return_value=session)
+    session.__exit__ = MagicMock(return_value=None)
+    session.get_bind.return_value.dialect.name = "sqlite"
+    session.scalars.return_value.all.return_value = []
+
+    session_factory = MagicMock(spec=sessionmaker)
+    session_factory.return_value = session
+    return session, session_factory
+
+
+@pytest.fixture
+def repository(session):
+    _, session_factory = session
+    user = Account()
+    user.id = "test-user-id"
+    user._current_tenant = MagicMock()
+    user._current_tenant.id = "test-tenant"
+    return BufferedSQLAlchemyWorkflowNodeExecutionRepository(
+        session_factory=session_factory,
+        user=user,
+        app_id="test-app",
+        triggered_from=WorkflowNodeExecutionTriggeredFrom.WORKFLOW_RUN,
+        flush_size=2,
+    )
+
+
+def make_execution(i: int, status=WorkflowNodeExecutionStatus.RUNNING) -> WorkflowNodeExecution:
+    return WorkflowNodeExecution(
+        id=f"execution-{i}",
+        node_execution_id=f"node-execution-{i}",
+        workflow_id="test-workflow-id",
+        workflow_execution_id="test-workflow-run-id",
+        index=i,
+        node_id=f"node-{i}",
+        node_type=NodeType.START,
+        title=f"Node {i}",
+        status=status,
+        created_at=datetime.now(),
+    )
+
+
+def test_save_buffers_running_executions(repository, session):
+    session_obj, _ = session
+    for i in range(3):
+        repository.save(make_execution(i))
+
+    session_obj.merge.assert_not_called()
+    session_obj.commit.assert_not_called()
+    assert repository.get_by_node_execution_id("node-execution-1").status == WorkflowNodeExecutionStatus.RUNNING
+    assert {execution.id for execution in repository.get_running_executions("test-workflow-run-id")} == {
+        "execution-0",
+        "execution-1",
+        "execution-2",
+    }
+
+
+def test_save_writes_finished_executions_in_batches(repository, session):
+    session_obj, _ = session
+    for i in range(3):
+        repository.save(make_execution(i))
+
+    repository.save(make_execution(0, WorkflowNodeExecutionStatus.SUCCEEDED))
+    session_obj.commit.assert_not_called()
+
+    repository.save(make_execution(1, WorkflowNodeExecutionStatus.FAILED))
+    assert session_obj.merge.call_count == 2
+    session_obj.commit.assert_called_once()
+    assert [execution.id for execution in repository.get_running_executions("test-workflow-run-id")] == ["execution-2"]
+
+    repository.flush()
+    assert session_obj.merge.call_count == 3
+    assert session_obj.commit.call_count == 2
+
+    repository.flush()
+    assert session_obj.commit.call_count == 2
+
+
+def test_clear_drops_buffered_executions(repository, session):
+    session_obj, _ = session
+    repository.save(make_execution(0))
+    repository.clear()
+    repository.flush()
+
+    session_obj.merge.assert_not_called()
+    assert repository.get_running_executions("test-workflow-run-id") == []
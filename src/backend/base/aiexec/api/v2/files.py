@@ -2,32 +2,26 @@ import io
 import re
 import uuid
 import zipfile
-from collections.abc import AsyncGenerator
 from datetime import datetime
 from http import HTTPStatus
 from pathlib import Path
 from typing import Annotated
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
 from sqlmodel import String, cast, col, select
 
 from aiexec.api.schemas import UploadFileResponse
-from aiexec.api.utils import CurrentActiveUser, DbSession
+from aiexec.api.utils import CurrentActiveUser, DbSession, build_file_stream_response
 from aiexec.services.database.models.file import File as UserFile
 from aiexec.services.deps import get_settings_service, get_storage_service
 from aiexec.services.storage.service import StorageService
+from aiexec.services.storage.utils import iter_upload_file
 
 router = APIRouter(tags=["Files"], prefix="/files")
 
 
-async def byte_stream_generator(file_bytes: bytes, chunk_size: int = 8192) -> AsyncGenerator[bytes, None]:
-    """Convert bytes object into an async generator that yields chunks."""
-    for i in range(0, len(file_bytes), chunk_size):
-        yield file_bytes[i : i + chunk_size]
-
-
 async def fetch_file_object(file_id: uuid.UUID, current_user: CurrentActiveUser, session: DbSession):
     # Fetch the file from the DB
     stmt = select(UserFile).where(UserFile.id == file_id)
@@ -76,7 +70,6 @@ async def upload_user_file(
     try:
         # Create a unique file name
         file_id = uuid.uuid4()
-        file_content = await file.read()
 
         # Get file extension of the file
         file_extension = "." + file.filename.split(".")[-1] if file.filename and "." in file.filename else ""
@@ -85,7 +78,9 @@ async def upload_user_file(
         # Here we use the current user's id as the folder name
         folder = str(current_user.id)
         # Save the file using the storage service.
-        await storage_service.save_file(flow_id=folder, file_name=anonymized_file_name, data=file_content)
+        await storage_service.save_file_stream(
+            flow_id=folder, file_name=anonymized_file_name, stream=iter_upload_file(file)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error saving file: {e}") from e
 
@@ -219,18 +214,17 @@ async def download_files_batch(
         # Create a ZIP file
         with zipfile.ZipFile(zip_stream, "w") as zip_file:
             for file in files:
-                # Get the file content from storage
-                file_content = await storage_service.get_file(
-                    flow_id=str(current_user.id), file_name=file.path.split("/")[-1]
-                )
-
                 # Get the file extension from the original filename
                 file_extension = Path(file.path).suffix
                 # Create the filename with extension
                 filename_with_extension = f"{file.name}{file_extension}"
 
-                # Write the file to the ZIP with the proper extension
-                zip_file.writestr(filename_with_extension, file_content)
+                # Copy the file from storage to the ZIP with the proper extension, chunk by chunk
+                with zip_file.open(filename_with_extension, "w") as zip_entry:
+                    async for chunk in storage_service.get_file_stream(
+                        flow_id=str(current_user.id), file_name=file.path.split("/")[-1]
+                    ):
+                        zip_entry.write(chunk)
 
         # Seek to the beginning of the byte stream
         zip_stream.seek(0)
@@ -255,34 +249,34 @@ async def download_file(
     current_user: CurrentActiveUser,
     session: DbSession,
     storage_service: Annotated[StorageService, Depends(get_storage_service)],
+    range_header: Annotated[str | None, Header(alias="Range")] = None,
 ):
-    """Download a file by its ID."""
-    try:
-        # Fetch the file from the DB
-        file = await fetch_file_object(file_id, current_user, session)
-
-        # Get the basename of the file path
-        file_name = file.path.split("/")[-1]
+    """Download a file by its ID, or the byte range the Range header asks for."""
+    # Fetch the file from the DB
+    file = await fetch_file_object(file_id, current_user, session)
 
-        # Get file stream
-        file_stream = await storage_service.get_file(flow_id=str(current_user.id), file_name=file_name)
+    # Get the basename of the file path
+    file_name = file.path.split("/")[-1]
 
-        file_extension = Path(file.path).suffix
-        # Create the filename with extension
-        filename_with_extension = f"{file.name}{file_extension}"
+    file_extension = Path(file.path).suffix
+    # Create the filename with extension
+    filename_with_extension = f"{file.name}{file_extension}"
 
-        # Ensure file_stream is an async iterator returning bytes
-        byte_stream = byte_stream_generator(file_stream)
+    try:
+        # Stream the file from the storage instead of loading it in memory
+        return await build_file_stream_response(
+            storage_service,
+            flow_id=str(current_user.id),
+            file_name=file_name,
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{filename_with_extension}"'},
+            range_header=range_header,
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error downloading file: {e}") from e
 
-    # Return the file as a streaming response
-    return StreamingResponse(
-        byte_stream,
-        media_type="application/octet-stream",
-        headers={"Content-Disposition": f'attachment; filename="{filename_with_extension}"'},
-    )
-
 
 @router.put("/{file_id}")
 async def edit_file_name(
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 from typing import TYPE_CHECKING, Any, cast
 
 import toml  # type: ignore[import-untyped]
 from loguru import logger
 
-from aiexec.custom import Component
-from aiexec.io import BoolInput, DataFrameInput, HandleInput, MessageTextInput, MultilineInput, Output
+from aiexec.custom.custom_component.component_with_cache import ComponentWithCache
+from aiexec.io import BoolInput, DataFrameInput, HandleInput, IntInput, MessageTextInput, MultilineInput, Output
 from aiexec.schema import DataFrame
+from aiexec.services.cache.utils import CacheMiss
 
 if TYPE_CHECKING:
     from langchain_core.runnables import Runnable
 
+# Delay before the first retry of a failed row, doubled on every further attempt
+RETRY_BACKOFF_SECONDS = 1.0
+# Rows of each finished chunk shown in the partial results log
+PARTIAL_RESULTS_PREVIEW_ROWS = 3
 
-class BatchRunComponent(Component):
+
+class BatchRunComponent(ComponentWithCache):
     display_name = "Batch Run"
     description = "Runs an LLM on each row of a DataFrame column. If no column is specified, all columns are used."
     icon = "List"
@@ -64,6 +73,33 @@ class BatchRunComponent(Component):
             required=False,
             advanced=True,
         ),
+        IntInput(
+            name="max_concurrency",
+            display_name="Max Concurrency",
+            info="Maximum number of rows sent to the model at the same time.",
+            value=8,
+            required=False,
+            advanced=True,
+        ),
+        IntInput(
+            name="chunk_size",
+            display_name="Chunk Size",
+            info=(
+                "Number of rows processed together. Finished chunks are checkpointed, "
+                "so running the component again with the same input resumes after the last finished chunk."
+            ),
+            value=100,
+            required=False,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_retries",
+            display_name="Max Retries",
+            info="Number of times a failed row is retried, waiting exponentially longer between attempts.",
+            value=2,
+            required=False,
+            advanced=True,
+        ),
     ]
 
     outputs = [
@@ -109,6 +145,59 @@ class BatchRunComponent(Component):
                 "processing_status": "failed",
             }
 
+    def _checkpoint_key(self, model: Runnable, conversations: list[list[dict[str, str]]]) -> str:
+        """Build the key under which finished chunks of this batch are checkpointed."""
+        model_name = getattr(model, "model_name", None) or getattr(model, "model", None)
+        payload = [type(model).__name__, model_name, self.output_column_name, self.chunk_size, conversations]
+        digest = hashlib.sha256(json.dumps(payload, default=str).encode()).hexdigest()
+        return f"batch_run_checkpoint:{digest}"
+
+    async def _retry_row(
+        self, model: Runnable, conversation: list[dict[str, str]], semaphore: asyncio.Semaphore, error: Exception
+    ) -> Any:
+        """Retry a failed conversation with exponential backoff.
+
+        Returns the exception of the last attempt if every retry failed.
+        """
+        for attempt in range(self.max_retries):
+            logger.warning(f"Row failed on attempt {attempt + 1}, retrying: {error!s}")
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2**attempt)
+            async with semaphore:
+                response = (await model.abatch([conversation], return_exceptions=True))[0]
+            if isinstance(response, KeyError | AttributeError):
+                raise response
+            if not isinstance(response, Exception):
+                return response
+            error = response
+        return error
+
+    async def _run_chunk(
+        self, model: Runnable, conversations: list[list[dict[str, str]]], semaphore: asyncio.Semaphore
+    ) -> list[Any]:
+        """Run a chunk of conversations, retrying only the rows that failed."""
+        try:
+            responses = list(await model.abatch(conversations, return_exceptions=True))
+        except (KeyError, AttributeError):
+            raise
+        except Exception as e:  # noqa: BLE001
+            # The whole call failed, e.g. the model could not be reached, so every row is retried
+            responses = [e] * len(conversations)
+
+        failed = []
+        for idx, response in enumerate(responses):
+            if isinstance(response, KeyError | AttributeError):
+                raise response
+            if isinstance(response, Exception):
+                failed.append(idx)
+        if failed:
+            logger.warning(f"{len(failed)} of {len(conversations)} rows failed, retrying them")
+            retried = await asyncio.gather(
+                *(self._retry_row(model, conversations[idx], semaphore, responses[idx]) for idx in failed)
+            )
+            for idx, response in zip(failed, retried, strict=True):
+                responses[idx] = response
+        return responses
+
     async def run_batch(self) -> DataFrame:
         """Process each row in df[column_name] with the language model asynchronously.
 
@@ -157,43 +246,72 @@ class BatchRunComponent(Component):
                 for text in user_texts
             ]
 
-            # Configure the model with project info and callbacks
+            # Resume from the chunks a previous run of the same batch finished
+            checkpoint_key = self._checkpoint_key(model, conversations)
+            checkpoint = self._shared_component_cache.get(checkpoint_key)
+            if isinstance(checkpoint, CacheMiss):
+                checkpoint = {}
+
+            # Configure the model with project info, callbacks and the concurrency cap
+            max_concurrency = max(1, self.max_concurrency)
             model = model.with_config(
                 {
                     "run_name": self.display_name,
                     "project_name": self.get_project_name(),
                     "callbacks": self.get_langchain_callbacks(),
+                    "max_concurrency": max_concurrency,
                 }
             )
-            # Process batches and track progress
-            responses_with_idx = list(
-                zip(
-                    range(len(conversations)),
-                    await model.abatch(list(conversations)),
-                    strict=True,
-                )
-            )
+            semaphore = asyncio.Semaphore(max_concurrency)
+            records = df.to_dict(orient="records")
+            chunk_size = max(1, self.chunk_size)
 
-            # Sort by index to maintain order
-            responses_with_idx.sort(key=lambda x: x[0])
-
-            # Build the final data with enhanced metadata
+            # Process chunks one after the other and build the final data with enhanced metadata
             rows: list[dict[str, Any]] = []
-            for idx, (original_row, response) in enumerate(
-                zip(df.to_dict(orient="records"), responses_with_idx, strict=False)
-            ):
-                response_text = response[1].content if hasattr(response[1], "content") else str(response[1])
-                row = self._create_base_row(
-                    cast(dict[str, Any], original_row), model_response=response_text, batch_index=idx
-                )
-                self._add_metadata(row, success=True, system_msg=system_msg)
-                rows.append(row)
+            failed_rows = 0
+            for chunk_start in range(0, total_rows, chunk_size):
+                chunk_rows = checkpoint.get(chunk_start)
+                if chunk_rows is None:
+                    chunk_end = chunk_start + chunk_size
+                    responses = await self._run_chunk(model, conversations[chunk_start:chunk_end], semaphore)
+                    chunk_rows = []
+                    chunk_failed = 0
+                    for idx, (original_row, response) in enumerate(
+                        zip(records[chunk_start:chunk_end], responses, strict=False), start=chunk_start
+                    ):
+                        if isinstance(response, Exception):
+                            row = self._create_base_row(cast(dict[str, Any], original_row), batch_index=idx)
+                            self._add_metadata(row, success=False, error=str(response))
+                            chunk_failed += 1
+                        else:
+                            response_text = response.content if hasattr(response, "content") else str(response)
+                            row = self._create_base_row(
+                                cast(dict[str, Any], original_row), model_response=response_text, batch_index=idx
+                            )
+                            self._add_metadata(row, success=True, system_msg=system_msg)
+                        chunk_rows.append(row)
 
-                # Log progress
-                if (idx + 1) % max(1, total_rows // 10) == 0:
-                    logger.info(f"Processed {idx + 1}/{total_rows} rows")
+                    # Only fully successful chunks are checkpointed, so failed rows are run again on resume
+                    if chunk_failed:
+                        failed_rows += chunk_failed
+                    else:
+                        checkpoint[chunk_start] = chunk_rows
+                        self._shared_component_cache.set(checkpoint_key, checkpoint)
+                rows.extend(chunk_rows)
 
-            logger.info("Batch processing completed successfully")
+                # Stream a preview of the rows and the progress as chunks finish
+                self.log(
+                    {"rows": len(chunk_rows), "first_rows": chunk_rows[:PARTIAL_RESULTS_PREVIEW_ROWS]},
+                    name="Partial Results",
+                )
+                self.log(f"Processed {len(rows)}/{total_rows} rows ({failed_rows} failed)", name="Progress")
+                logger.info(f"Processed {len(rows)}/{total_rows} rows")
+
+            if failed_rows:
+                logger.warning(f"Batch processing completed with {failed_rows} failed rows")
+            else:
+                self._shared_component_cache.delete(checkpoint_key)
+                logger.info("Batch processing completed successfully")
             return DataFrame(rows)
 
         except (KeyError, AttributeError) as e:
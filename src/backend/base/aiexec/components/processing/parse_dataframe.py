@@ -11,6 +11,7 @@ class ParseDataFrameComponent(Component):
     )
     icon = "braces"
     name = "ParseDataFrame"
+    cacheable = True
     legacy = True
 
     inputs = [
@@ -16,6 +16,7 @@ class ParserComponent(Component):
     display_name = "Parser"
     description = "Extracts text using a template."
     icon = "braces"
+    cacheable = True
 
     inputs = [
         HandleInput(
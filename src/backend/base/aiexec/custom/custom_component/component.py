@@ -3,6 +3,7 @@ from __future__ import annotations
 import ast
 import asyncio
 import inspect
+import time
 from collections.abc import AsyncIterator, Iterator
 from copy import deepcopy
 from textwrap import dedent
@@ -32,10 +33,11 @@ from aiexec.schema.artifact import get_artifact_type, post_process_raw
 from aiexec.schema.data import Data
 from aiexec.schema.message import ErrorMessage, Message
 from aiexec.schema.properties import Source
+from aiexec.services.deps import get_settings_service
 from aiexec.services.tracing.schema import Log
 from aiexec.template.field.base import UNDEFINED, Input, Output
 from aiexec.template.frontend_node.custom_components import ComponentFrontendNode
-from aiexec.utils.async_helpers import run_until_complete
+from aiexec.utils.async_helpers import iterate_in_thread, run_until_complete
 from aiexec.utils.util import find_closest_match
 
 from .custom_component import CustomComponent
@@ -91,10 +93,53 @@ class PlaceholderGraph(NamedTuple):
     flow_name: str | None
 
 
+class _TokenBuffer:
+    """Coalesces streamed tokens so fewer, larger token events are sent.
+
+    Pending tokens are sent once they add up to `flush_size` characters or once the oldest of them
+    is `flush_interval` seconds old, both checked when a token arrives. When neither is set every
+    token is sent as it arrives.
+    """
+
+    def __init__(self, flush_interval: float, flush_size: int) -> None:
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._pending: list[str] = []
+        self._pending_size = 0
+        self._pending_since = 0.0
+
+    def add(self, chunk: str) -> str | None:
+        """Add a token and return the text to send now, if any."""
+        if not self.flush_interval and not self.flush_size:
+            return chunk
+        now = time.monotonic()
+        if not self._pending:
+            self._pending_since = now
+        self._pending.append(chunk)
+        self._pending_size += len(chunk)
+        if (self.flush_size and self._pending_size >= self.flush_size) or (
+            self.flush_interval and now - self._pending_since >= self.flush_interval
+        ):
+            return self.flush()
+        return None
+
+    def flush(self) -> str | None:
+        """Return the pending text, if any."""
+        if not self._pending:
+            return None
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._pending_size = 0
+        return text
+
+
 class Component(CustomComponent):
     inputs: list[InputTypes] = []
     outputs: list[Output] = []
     code_class_base_inheritance: ClassVar[str] = "Component"
+    # Deterministic components can opt into having their results memoized across runs
+    # when their code, parameters and upstream results are unchanged.
+    cacheable: ClassVar[bool] = False
 
     def __init__(self, **kwargs) -> None:
         # Initialize instance-specific attributes first
@@ -1442,38 +1487,49 @@ class Component(CustomComponent):
         if isinstance(iterator, AsyncIterator):
             return await self._handle_async_iterator(iterator, message.id, message)
         try:
-            complete_message = ""
-            first_chunk = True
-            for chunk in iterator:
-                complete_message = await self._process_chunk(
-                    chunk.content, complete_message, message.id, message, first_chunk=first_chunk
-                )
-                first_chunk = False
+            # Drain the synchronous iterator in a worker thread so it does not block the event loop
+            return await self._handle_async_iterator(iterate_in_thread(iterator), message.id, message)
         except Exception as e:
             raise StreamingError(cause=e, source=message.properties.source) from e
-        else:
-            return complete_message
 
     async def _handle_async_iterator(self, iterator: AsyncIterator, message_id: str, message: Message) -> str:
-        complete_message = ""
+        chunks: list[str] = []
+        settings = get_settings_service().settings
+        token_buffer = _TokenBuffer(settings.stream_token_flush_interval / 1000, settings.stream_token_flush_size)
         first_chunk = True
         async for chunk in iterator:
-            complete_message = await self._process_chunk(
-                chunk.content, complete_message, message_id, message, first_chunk=first_chunk
-            )
+            await self._process_chunk(chunk.content, chunks, message_id, message, token_buffer, first_chunk=first_chunk)
             first_chunk = False
-        return complete_message
+        if (text := token_buffer.flush()) is not None:
+            await self._send_token(text, message_id)
+        return "".join(chunks)
 
     async def _process_chunk(
-        self, chunk: str, complete_message: str, message_id: str, message: Message, *, first_chunk: bool = False
-    ) -> str:
-        complete_message += chunk
+        self,
+        chunk: str,
+        chunks: list[str],
+        message_id: str,
+        message: Message,
+        token_buffer: _TokenBuffer,
+        *,
+        first_chunk: bool = False,
+    ) -> None:
+        chunks.append(chunk)
         if self._event_manager:
             if first_chunk:
                 # Send the initial message only on the first chunk
                 msg_copy = message.model_copy()
-                msg_copy.text = complete_message
+                msg_copy.text = chunk
                 await self._send_message_event(msg_copy, id_=message_id)
+            if (text := token_buffer.add(chunk)) is not None:
+                await self._send_token(text, message_id)
+
+    async def _send_token(self, chunk: str, message_id: str) -> None:
+        if self._event_manager.sends_tokens_directly:
+            # Token events are sent at a high rate, skip the thread hop and generic event encoding
+            self._event_manager.send_token(chunk=chunk, id_=str(message_id))
+        else:
+            # Custom callbacks may block, keep them off the event loop
             await asyncio.to_thread(
                 self._event_manager.on_token,
                 data={
@@ -1481,7 +1537,6 @@ class Component(CustomComponent):
                     "id": str(message_id),
                 },
             )
-        return complete_message
 
     async def send_error(
         self,
@@ -1,12 +1,80 @@
+import hashlib
+import threading
 from typing import TYPE_CHECKING
 
+from cachetools import LRUCache
+
 from aiexec.utils import validate
+from aiexec.utils.version import get_version_info
 
 if TYPE_CHECKING:
     from aiexec.custom import CustomComponent
 
+COMPILED_CLASS_CACHE_MAXSIZE = 512
+
+
+class CompiledClassCache:
+    """A process-wide LRU cache of classes compiled from custom component code.
+
+    Entries are keyed by a hash of the component source and the aiexec version, so
+    unchanged components are parsed and executed only once per worker.
+    """
+
+    def __init__(self, maxsize: int = COMPILED_CLASS_CACHE_MAXSIZE) -> None:
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(code: str) -> str:
+        version = get_version_info()["version"]
+        return hashlib.sha256(f"{version}\x00{code}".encode()).hexdigest()
+
+    def get_or_create(self, code: str) -> type["CustomComponent"]:
+        key = self.make_key(code)
+        with self._lock:
+            cached_class = self._cache.get(key)
+            if cached_class is not None:
+                self.hits += 1
+                return cached_class
+            self.misses += 1
+
+        class_name = validate.extract_class_name(code)
+        compiled_class = validate.create_class(code, class_name)
+        with self._lock:
+            self._cache[key] = compiled_class
+        return compiled_class
+
+    def info(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._cache),
+                "maxsize": int(self._cache.maxsize),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+compiled_class_cache = CompiledClassCache()
+
 
 def eval_custom_component_code(code: str) -> type["CustomComponent"]:
     """Evaluate custom component code."""
-    class_name = validate.extract_class_name(code)
-    return validate.create_class(code, class_name)
+    return compiled_class_cache.get_or_create(code)
+
+
+def get_compiled_class_cache_info() -> dict[str, int]:
+    """Return hit/miss counters and the current size of the compiled class cache."""
+    return compiled_class_cache.info()
+
+
+def clear_compiled_class_cache() -> None:
+    """Drop every cached class and reset the counters."""
+    compiled_class_cache.clear()
@@ -35,6 +35,7 @@ from aiexec.graph.graph.utils import (
 from aiexec.graph.schema import InterfaceComponentTypes, RunOutputs
 from aiexec.graph.utils import log_vertex_build
 from aiexec.graph.vertex.base import Vertex, VertexStates
+from aiexec.graph.vertex.result_cache import vertex_result_cache
 from aiexec.graph.vertex.schema import NodeData, NodeTypeEnum
 from aiexec.graph.vertex.vertex_types import ComponentVertex, InterfaceVertex, StateVertex
 from aiexec.logging.logger import LogConfig, configure
@@ -51,6 +52,7 @@ if TYPE_CHECKING:
     from aiexec.custom.custom_component.component import Component
     from aiexec.events.event_manager import EventManager
     from aiexec.graph.edge.schema import EdgeData
+    from aiexec.graph.graph.template_cache import GraphTemplate
     from aiexec.graph.schema import ResultData
     from aiexec.schema import Data
     from aiexec.services.chat.schema import GetCache, SetCache
@@ -133,6 +135,8 @@ class Graph:
         self._call_order: list[str] = []
         self._snapshots: list[dict[str, Any]] = []
         self._end_trace_tasks: set[asyncio.Task] = set()
+        # Sorted layers by (stop, start) component, shared by the graphs created from a template
+        self._sorted_layers_cache: dict[tuple[str | None, str | None], list[list[str]]] | None = None
 
         if context and not isinstance(context, dict):
             msg = "Context must be a dictionary"
@@ -488,6 +492,7 @@ class Graph:
         if edge in self._edges:
             return
         self._edges.append(edge)
+        self._sorted_layers_cache = None
 
     def initialize(self) -> None:
         self._build_graph()
@@ -778,7 +783,7 @@ class Graph:
         try:
             cache_service = get_chat_service()
             if self.flow_id:
-                await cache_service.set_cache(self.flow_id, self)
+                await cache_service.set_graph(self.flow_id, self)
         except Exception:  # noqa: BLE001
             logger.exception("Error setting cache")
 
@@ -1097,6 +1102,71 @@ class Graph:
         else:
             return graph
 
+    @classmethod
+    def from_template(
+        cls,
+        template: GraphTemplate,
+        flow_id: str | None = None,
+        flow_name: str | None = None,
+        user_id: str | None = None,
+    ) -> Graph:
+        """Creates a graph from a prepared template.
+
+        The vertices and edges of the template graph are copied with a fresh per-run state
+        and new component instances, so the returned graph can be run without affecting
+        other graphs created from the same template. The node data is shared with them.
+
+        Args:
+            template: The prepared graph template.
+            flow_id: The ID of the flow.
+            flow_name: The flow name.
+            user_id: The user ID.
+
+        Returns:
+            Graph: The created graph.
+        """
+        graph = cls(flow_id=flow_id, flow_name=flow_name, user_id=user_id)
+        graph._copy_structure(template.graph)
+        return graph
+
+    def _copy_structure(self, other: Graph) -> None:
+        """Copies the vertices, edges and maps of an unbuilt graph, without building them again."""
+        self.raw_graph_data = other.raw_graph_data
+        self.top_level_vertices = list(other.top_level_vertices)
+        self._graph_data = other._graph_data
+        self._vertices = list(other._vertices)
+        self._edges = list(other._edges)
+        self._cycle_vertices = set(other.cycle_vertices)
+        self._is_cyclic = other.is_cyclic
+        self._sorted_layers_cache = other._sorted_layers_cache
+        self.run_manager.cycle_vertices = set(other.run_manager.cycle_vertices)
+
+        # Maps each vertex of the other graph to its copy, so that the params of the copies point at the copies
+        memo: dict[int, Any] = {id(vertex): copy.copy(vertex) for vertex in other.vertices}
+        self.vertices = [memo[id(vertex)] for vertex in other.vertices]
+        for vertex in self.vertices:
+            vertex.reset_copy(self, memo)
+        self.vertex_map = {vertex.id: vertex for vertex in self.vertices}
+        self.edges = [copy.copy(edge) for edge in other.edges]
+
+        self.predecessor_map = defaultdict(list, {key: list(value) for key, value in other.predecessor_map.items()})
+        self.successor_map = defaultdict(list, {key: list(value) for key, value in other.successor_map.items()})
+        self.in_degree_map = defaultdict(int, other.in_degree_map)
+        self.parent_child_map = defaultdict(list, {key: list(value) for key, value in other.parent_child_map.items()})
+        self._is_input_vertices = list(other._is_input_vertices)
+        self._is_output_vertices = list(other._is_output_vertices)
+        self._is_state_vertices = list(other._is_state_vertices)
+        self.has_session_id_vertices = list(other.has_session_id_vertices)
+
+        self._instantiate_components_in_vertices()
+        for vertex in self.vertices:
+            if vertex.id in self.cycle_vertices:
+                vertex.apply_on_outputs(lambda output_object: setattr(output_object, "cache", False))
+
+    def enable_sort_cache(self) -> None:
+        """Caches the sorted layers of the graph, for graphs whose structure does not change."""
+        self._sorted_layers_cache = {}
+
     def __eq__(self, /, other: object) -> bool:
         if not isinstance(other, Graph):
             return False
@@ -1215,6 +1285,7 @@ class Graph:
         """Adds a vertex to the graph."""
         self.vertices.append(vertex)
         self.vertex_map[vertex.id] = vertex
+        self._sorted_layers_cache = None
 
     def add_vertex(self, vertex: Vertex) -> None:
         """Adds a new vertex to the graph."""
@@ -1230,6 +1301,7 @@ class Graph:
 
     def _build_graph(self) -> None:
         """Builds the graph from the vertices and edges."""
+        self._sorted_layers_cache = None
         self.vertices = self._build_vertices()
         self.vertex_map = {vertex.id: vertex for vertex in self.vertices}
         self.edges = self._build_edges()
@@ -1269,6 +1341,7 @@ class Graph:
             return
         self.vertices.remove(vertex)
         self.vertex_map.pop(vertex_id)
+        self._sorted_layers_cache = None
         self.edges = [edge for edge in self.edges if vertex_id not in {edge.source_id, edge.target_id}]
 
     def _build_vertex_params(self) -> None:
@@ -1346,7 +1419,7 @@ class Graph:
         self.reset_inactivated_vertices()
         self.reset_activated_vertices()
 
-        await chat_service.set_cache(str(self.flow_id or self._run_id), self)
+        await chat_service.update_graph(str(self.flow_id or self._run_id), self, vertex_id=vertex_id)
         self._record_snapshot(vertex_id)
         return vertex_build_result
 
@@ -1362,6 +1435,63 @@ class Graph:
             }
         )
 
+    def get_run_state(self) -> dict[str, Any]:
+        """Returns the state that changes while the graph is being built.
+
+        Together with the graph template and the results of the built vertices,
+        this is enough to resume building the graph with `restore_run_state`.
+        """
+        return {
+            "run_id": self._run_id,
+            "session_id": self._session_id,
+            "prepared": self._prepared,
+            "run_manager": self.run_manager.to_dict(),
+            "run_queue": list(self._run_queue),
+            "first_layer": self._first_layer,
+            "vertices_layers": self.vertices_layers,
+            "sorted_vertices_layers": self._sorted_vertices_layers,
+            "vertices_to_run": self.vertices_to_run,
+            "stop_vertex": self.stop_vertex,
+            "inactivated_vertices": self.inactivated_vertices,
+            "inactive_vertices": self.inactive_vertices,
+            "activated_vertices": self.activated_vertices,
+            "vertex_states": {vertex.id: vertex.state for vertex in self.vertices},
+            "built_vertices": [vertex.id for vertex in self.vertices if vertex.built],
+            "context": dict(self.context),
+            "states": self.state_manager.get_run_states(self._run_id),
+        }
+
+    def restore_run_state(self, state: dict[str, Any], vertex_builds: dict[str, dict[str, Any]]) -> None:
+        """Restores the state returned by `get_run_state` on a graph built from the same template.
+
+        Args:
+            state: The run state.
+            vertex_builds: The cached build of each built vertex, keyed by vertex id.
+        """
+        cycle_vertices = self.run_manager.cycle_vertices
+        self.run_manager = RunnableVerticesManager.from_dict(state["run_manager"])
+        self.run_manager.cycle_vertices = cycle_vertices
+        self.set_run_id(state["run_id"])
+        self._session_id = state["session_id"]
+        self._prepared = state["prepared"]
+        self._run_queue = deque(state["run_queue"])
+        self._first_layer = state["first_layer"]
+        self.vertices_layers = state["vertices_layers"]
+        self._sorted_vertices_layers = state["sorted_vertices_layers"]
+        self.vertices_to_run = state["vertices_to_run"]
+        self.stop_vertex = state["stop_vertex"]
+        self.inactivated_vertices = state["inactivated_vertices"]
+        self.inactive_vertices = state["inactive_vertices"]
+        self.activated_vertices = state["activated_vertices"]
+        self.context = state.get("context", {})
+        self.state_manager.set_run_states(self._run_id, state.get("states", {}))
+        for vertex_id, vertex_state in state["vertex_states"].items():
+            if vertex_id in self.vertex_map:
+                self.vertex_map[vertex_id].state = vertex_state
+        for vertex_id, vertex_dict in vertex_builds.items():
+            if vertex_id in self.vertex_map:
+                self._apply_cached_vertex_dict(self.vertex_map[vertex_id], vertex_dict, used_frozen_result=False)
+
     def _record_snapshot(self, vertex_id: str | None = None) -> None:
         self._snapshots.append(self.get_snapshot())
         if vertex_id:
@@ -1435,24 +1565,18 @@ class Graph:
                 else:
                     try:
                         cached_vertex_dict = cached_result["result"]
-                        # Now set update the vertex with the cached vertex
-                        vertex.built = cached_vertex_dict["built"]
-                        vertex.artifacts = cached_vertex_dict["artifacts"]
-                        vertex.built_object = cached_vertex_dict["built_object"]
-                        vertex.built_result = cached_vertex_dict["built_result"]
-                        vertex.full_data = cached_vertex_dict["full_data"]
-                        vertex.results = cached_vertex_dict["results"]
-                        try:
-                            vertex.finalize_build()
-
-                            if vertex.result is not None:
-                                vertex.result.used_frozen_result = True
-                        except Exception:  # noqa: BLE001
-                            logger.opt(exception=True).debug("Error finalizing build")
-                            should_build = True
+                        should_build = not self._apply_cached_vertex_dict(vertex, cached_vertex_dict)
                     except KeyError:
                         should_build = True
 
+            result_cache_key = None
+            if should_build:
+                result_cache_key = vertex_result_cache.make_key(
+                    vertex, inputs=inputs_dict, files=files, user_id=user_id
+                )
+            if result_cache_key is not None and (cached_vertex_dict := vertex_result_cache.get(result_cache_key)):
+                should_build = not self._apply_cached_vertex_dict(vertex, cached_vertex_dict, restore_full_data=False)
+
             if should_build:
                 await vertex.build(
                     user_id=user_id,
@@ -1461,16 +1585,10 @@ class Graph:
                     files=files,
                     event_manager=event_manager,
                 )
+                vertex_dict = self.get_vertex_build(vertex)
+                if result_cache_key is not None:
+                    vertex_result_cache.set(result_cache_key, vertex_dict)
                 if set_cache is not None:
-                    vertex_dict = {
-                        "built": vertex.built,
-                        "results": vertex.results,
-                        "artifacts": vertex.artifacts,
-                        "built_object": vertex.built_object,
-                        "built_result": vertex.built_result,
-                        "full_data": vertex.full_data,
-                    }
-
                     await set_cache(key=vertex.id, data=vertex_dict)
 
         except Exception as exc:
@@ -1491,6 +1609,48 @@ class Graph:
             result_dict=result_dict, params=params, valid=valid, artifacts=artifacts, vertex=vertex
         )
 
+    @staticmethod
+    def get_vertex_build(vertex: Vertex) -> dict[str, Any]:
+        """Returns the cacheable build results of a vertex."""
+        return {
+            "built": vertex.built,
+            "results": vertex.results,
+            "artifacts": vertex.artifacts,
+            "built_object": vertex.built_object,
+            "built_result": vertex.built_result,
+            "full_data": vertex.full_data,
+        }
+
+    @staticmethod
+    def _apply_cached_vertex_dict(
+        vertex: Vertex,
+        cached_vertex_dict: dict[str, Any],
+        *,
+        restore_full_data: bool = True,
+        used_frozen_result: bool = True,
+    ) -> bool:
+        """Restores a built vertex from a cached vertex dict.
+
+        Returns:
+            bool: True if the vertex was restored, False if it has to be built.
+        """
+        vertex.built = cached_vertex_dict["built"]
+        vertex.artifacts = cached_vertex_dict["artifacts"]
+        vertex.built_object = cached_vertex_dict["built_object"]
+        vertex.built_result = cached_vertex_dict["built_result"]
+        if restore_full_data:
+            vertex.full_data = cached_vertex_dict["full_data"]
+        vertex.results = cached_vertex_dict["results"]
+        try:
+            vertex.finalize_build()
+
+            if vertex.result is not None and used_frozen_result:
+                vertex.result.used_frozen_result = True
+        except Exception:  # noqa: BLE001
+            logger.opt(exception=True).debug("Error finalizing build")
+            return False
+        return True
+
     def get_vertex_edges(
         self,
         vertex_id: str,
@@ -1990,20 +2150,26 @@ class Graph:
         """Sorts the vertices in the graph."""
         self.mark_all_vertices("ACTIVE")
 
-        first_layer, remaining_layers = get_sorted_vertices(
-            vertices_ids=self.get_vertex_ids(),
-            cycle_vertices=self.cycle_vertices,
-            stop_component_id=stop_component_id,
-            start_component_id=start_component_id,
-            graph_dict=self.__to_dict(),
-            in_degree_map=self.in_degree_map,
-            successor_map=self.successor_map,
-            predecessor_map=self.predecessor_map,
-            is_input_vertex=self.get_vertex_input_status,
-            get_vertex_predecessors=self.get_vertex_predecessors_ids,
-            get_vertex_successors=self.get_vertex_successors_ids,
-            is_cyclic=self.is_cyclic,
-        )
+        cache_key = (stop_component_id, start_component_id)
+        if self._sorted_layers_cache is not None and cache_key in self._sorted_layers_cache:
+            first_layer, *remaining_layers = [list(layer) for layer in self._sorted_layers_cache[cache_key]]
+        else:
+            first_layer, remaining_layers = get_sorted_vertices(
+                vertices_ids=self.get_vertex_ids(),
+                cycle_vertices=self.cycle_vertices,
+                stop_component_id=stop_component_id,
+                start_component_id=start_component_id,
+                graph_dict=self.__to_dict(),
+                in_degree_map=self.in_degree_map,
+                successor_map=self.successor_map,
+                predecessor_map=self.predecessor_map,
+                is_input_vertex=self.get_vertex_input_status,
+                get_vertex_predecessors=self.get_vertex_predecessors_ids,
+                get_vertex_successors=self.get_vertex_successors_ids,
+                is_cyclic=self.is_cyclic,
+            )
+            if self._sorted_layers_cache is not None:
+                self._sorted_layers_cache[cache_key] = [list(layer) for layer in [first_layer, *remaining_layers]]
 
         self.increment_run_count()
         self._sorted_vertices_layers = [first_layer, *remaining_layers]
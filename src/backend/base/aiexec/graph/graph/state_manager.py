@@ -31,6 +31,12 @@ class GraphStateManager:
     def get_state(self, key, run_id: str):
         return self.state_service.get_state(key, run_id)
 
+    def get_run_states(self, run_id: str) -> dict:
+        return self.state_service.get_run_states(run_id)
+
+    def set_run_states(self, run_id: str, states: dict) -> None:
+        self.state_service.set_run_states(run_id, states)
+
     def subscribe(self, key, observer: Callable) -> None:
         self.state_service.subscribe(key, observer)
 
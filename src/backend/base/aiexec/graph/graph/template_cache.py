@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+from typing import TYPE_CHECKING, Any
+
+from cachetools import LRUCache
+
+from aiexec.graph.graph.base import Graph
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from aiexec.graph.edge.schema import EdgeData
+    from aiexec.graph.vertex.schema import NodeData
+
+GRAPH_TEMPLATE_CACHE_MAXSIZE = 256
+
+
+class GraphTemplate:
+    """A prepared, immutable description of a graph.
+
+    Holds the tweaked flow payload and, once the first graph is created from it, a
+    built prototype graph: its vertices with their params, edges, adjacency maps and
+    sorted layers. `Graph.from_template` copies only the per-run state of the prototype,
+    so the payload is processed and the graph built once per template. Only the payload
+    is pickled, the prototype is built again where the template is loaded.
+    """
+
+    def __init__(self, nodes: list[NodeData], edges: list[EdgeData]) -> None:
+        self.nodes = nodes
+        self.edges = edges
+        self._graph: Graph | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> GraphTemplate:
+        if "data" in payload:
+            payload = payload["data"]
+        try:
+            return cls(nodes=payload["nodes"], edges=payload["edges"])
+        except KeyError as exc:
+            msg = f"Invalid payload. Expected keys 'nodes' and 'edges'. Found {list(payload.keys())}"
+            raise ValueError(msg) from exc
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> GraphTemplate:
+        """Creates a template from the payload a graph was built from."""
+        return cls(
+            nodes=copy.deepcopy(graph.raw_graph_data["nodes"]),
+            edges=copy.deepcopy(graph.raw_graph_data["edges"]),
+        )
+
+    @property
+    def graph(self) -> Graph:
+        """The prototype graph, which must not be run or modified."""
+        if self._graph is None:
+            with self._lock:
+                if self._graph is None:
+                    graph = Graph.from_payload({"nodes": self.nodes, "edges": self.edges})
+                    graph.enable_sort_cache()
+                    self._graph = graph
+        return self._graph
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"nodes": self.nodes, "edges": self.edges}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["nodes"], state["edges"])  # type: ignore[misc]
+
+
+def hash_tweaks(tweaks: dict[str, Any] | None, *, stream: bool = False) -> str:
+    """Returns a stable hash of the tweaks applied to a flow."""
+    serialized = json.dumps({"tweaks": tweaks or {}, "stream": stream}, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class GraphTemplateCache:
+    """A process-wide LRU cache of prepared graph templates.
+
+    Templates are keyed by flow id, the flow's `updated_at` timestamp and a hash of the
+    tweaks, so an edited flow never reuses a stale template even without explicit
+    invalidation. `invalidate` drops every template of a flow when it is saved.
+    """
+
+    def __init__(self, maxsize: int = GRAPH_TEMPLATE_CACHE_MAXSIZE) -> None:
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(flow_id: str, updated_at: datetime | None, tweaks_hash: str) -> tuple[str, str | None, str]:
+        return str(flow_id), updated_at.isoformat() if updated_at else None, tweaks_hash
+
+    def get(self, key: tuple[str, str | None, str]) -> GraphTemplate | None:
+        with self._lock:
+            template = self._cache.get(key)
+            if template is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return template
+
+    def set(self, key: tuple[str, str | None, str], template: GraphTemplate) -> None:
+        with self._lock:
+            self._cache[key] = template
+
+    def invalidate(self, flow_id: str) -> None:
+        flow_id = str(flow_id)
+        with self._lock:
+            for key in [key for key in self._cache if key[0] == flow_id]:
+                del self._cache[key]
+
+    def info(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._cache),
+                "maxsize": int(self._cache.maxsize),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+graph_template_cache = GraphTemplateCache()
+
+
+def get_or_create_graph_template(
+    flow_id: str,
+    updated_at: datetime | None,
+    flow_data: dict,
+    tweaks: dict[str, Any] | None = None,
+    *,
+    stream: bool = False,
+) -> GraphTemplate:
+    """Returns the cached template for a flow, preparing and caching it on a miss."""
+    # Imported here to avoid a circular import through aiexec.processing
+    from aiexec.processing.process import process_tweaks
+
+    if tweaks is not None and not isinstance(tweaks, dict):
+        tweaks = tweaks.model_dump()
+    key = graph_template_cache.make_key(flow_id, updated_at, hash_tweaks(tweaks, stream=stream))
+    if (template := graph_template_cache.get(key)) is not None:
+        return template
+
+    graph_data = process_tweaks(copy.deepcopy(flow_data), tweaks or {}, stream=stream)
+    template = GraphTemplate.from_payload(graph_data)
+    graph_template_cache.set(key, template)
+    return template
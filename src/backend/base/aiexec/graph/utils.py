@@ -19,6 +19,7 @@ from aiexec.services.database.models.vertex_builds.crud import log_vertex_build
 from aiexec.services.database.models.vertex_builds.model import VertexBuildBase
 from aiexec.services.database.utils import session_getter
 from aiexec.services.deps import get_db_service, get_settings_service
+from aiexec.services.task.build_log_writer import build_log_writer
 
 if TYPE_CHECKING:
     from aiexec.api.v1.schemas import ResultDataResponse
@@ -149,6 +150,8 @@ async def log_transaction(
             error=error,
             flow_id=flow_id if isinstance(flow_id, UUID) else UUID(flow_id),
         )
+        if build_log_writer.enqueue(transaction):
+            return
         async with session_getter(get_db_service()) as session:
             with session.no_autoflush:
                 inserted = await crud_log_transaction(session, transaction)
@@ -179,6 +182,8 @@ async def log_vertex_build(
             data=serialize(data, max_length=MAX_TEXT_LENGTH, max_items=MAX_ITEMS_LENGTH),
             artifacts=serialize(artifacts, max_length=MAX_TEXT_LENGTH, max_items=MAX_ITEMS_LENGTH),
         )
+        if build_log_writer.enqueue(vertex_build):
+            return
         async with session_getter(get_db_service()) as session:
             inserted = await crud_log_vertex_build(session, vertex_build)
             logger.debug(f"Logged vertex build: {inserted.build_id}")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import inspect
 import traceback
 import types
@@ -230,6 +231,38 @@ class Vertex:
         self.built_object = state.get("built_object") or UnbuiltObject()
         self.built_result = state.get("built_result") or UnbuiltResult()
 
+    def reset_copy(self, graph: Graph, memo: dict[int, Any]) -> None:
+        """Turns a shallow copy of an unbuilt vertex into a vertex of another graph.
+
+        The node data stays shared with the copied vertex. The params are deep-copied with
+        `memo`, which maps the vertices of the copied graph to their copies, so that the
+        vertices they hold are those of `graph`.
+
+        Args:
+            graph: The graph the copy belongs to.
+            memo: The copies of the vertices of the copied graph, keyed by the id of the originals.
+        """
+        self._lock = asyncio.Lock()
+        self.graph = graph
+        self.custom_component = None
+        self.params = copy.deepcopy(self.params, memo)
+        if hasattr(self, "raw_params"):
+            self.raw_params = copy.deepcopy(self.raw_params, memo)
+        self.load_from_db_fields = list(self.load_from_db_fields)
+        self.steps = [getattr(self, step.__name__) for step in self.steps]
+        self.steps_ran = []
+        self.artifacts = {}
+        self.artifacts_raw = {}
+        self.artifacts_type = {}
+        self.results = {}
+        self.outputs_logs = {}
+        self.logs = {}
+        self.build_times = []
+        self.log_transaction_tasks = set()
+        self._successors_ids = None
+        self._incoming_edges = None
+        self._outgoing_edges = None
+
     def set_top_level(self, top_level_vertices: list[str]) -> None:
         self.parent_is_top_level = self.parent_node_id in top_level_vertices
 
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections.abc import AsyncIterator, Iterator
+from typing import TYPE_CHECKING, Any
+
+from cachetools import TTLCache
+from loguru import logger
+from pydantic import BaseModel
+
+from aiexec.schema.data import Data
+
+if TYPE_CHECKING:
+    from aiexec.graph.vertex.base import Vertex
+
+VERTEX_RESULT_CACHE_MAXSIZE = 1024
+VERTEX_RESULT_CACHE_TTL = 60 * 60
+
+# Keys that change on every run without changing what a component computes from a value
+VOLATILE_DATA_KEYS = frozenset({"timestamp"})
+
+
+class UnfingerprintableValueError(TypeError):
+    """Raised when a value cannot be reduced to a stable fingerprint."""
+
+
+def _fingerprint_default(value: Any) -> Any:
+    from aiexec.graph.vertex.base import Vertex
+
+    if isinstance(value, Vertex):
+        if not value.built:
+            msg = f"Vertex {value.id} has not been built"
+            raise UnfingerprintableValueError(msg)
+        return {"vertex_results": value.results}
+    if isinstance(value, Data):
+        return {key: item for key, item in value.data.items() if key not in VOLATILE_DATA_KEYS}
+    if isinstance(value, Iterator | AsyncIterator):
+        msg = "Streams cannot be fingerprinted"
+        raise UnfingerprintableValueError(msg)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, bytes):
+        return hashlib.sha256(value).hexdigest()
+    if isinstance(value, set | frozenset):
+        return sorted(value, key=repr)
+    if hasattr(value, "to_json"):
+        return value.to_json()
+    msg = f"Cannot fingerprint value of type {type(value).__name__}"
+    raise UnfingerprintableValueError(msg)
+
+
+def fingerprint(value: Any) -> str:
+    """Returns a stable hash of a value, resolving vertices to the results they produced."""
+    serialized = json.dumps(value, sort_keys=True, default=_fingerprint_default)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def is_cacheable(vertex: Vertex) -> bool:
+    """Whether the component of a vertex opted into result memoization."""
+    return vertex.custom_component is not None and getattr(vertex.custom_component, "cacheable", False) is True
+
+
+class VertexResultCache:
+    """A process-wide, content-addressed cache of vertex build results.
+
+    Only vertices whose component sets `cacheable = True` are memoized. Results are
+    keyed by the component code, the resolved parameters and the results of every
+    upstream vertex, so the cache is shared across runs and flows and a hit is only
+    possible when the component would receive exactly the same inputs.
+
+    Cached results are shared between runs, so cacheable components must return
+    values that downstream components do not mutate in place.
+    """
+
+    def __init__(self, maxsize: int = VERTEX_RESULT_CACHE_MAXSIZE, ttl: float = VERTEX_RESULT_CACHE_TTL) -> None:
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        vertex: Vertex,
+        *,
+        inputs: dict[str, Any] | None = None,
+        files: list[str] | None = None,
+        user_id: str | None = None,
+    ) -> str | None:
+        """Builds the cache key of a vertex, or returns None if it cannot be memoized."""
+        if not is_cacheable(vertex):
+            return None
+        code = vertex.data["node"]["template"].get("code", {}).get("value") or vertex.vertex_type
+        try:
+            return fingerprint(
+                {
+                    "code": hashlib.sha256(code.encode()).hexdigest(),
+                    "params": vertex.params,
+                    "inputs": inputs or {},
+                    "files": files or [],
+                    # Fields loaded from the database are resolved per user
+                    "user_id": str(user_id) if vertex.load_from_db_fields else None,
+                }
+            )
+        except (UnfingerprintableValueError, TypeError, ValueError) as exc:
+            logger.debug(f"Vertex {vertex.id} cannot be memoized: {exc}")
+            return None
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return cached
+
+    def set(self, key: str, vertex_dict: dict[str, Any]) -> None:
+        with self._lock:
+            self._cache[key] = vertex_dict
+
+    def info(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._cache),
+                "maxsize": int(self._cache.maxsize),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+vertex_result_cache = VertexResultCache()
@@ -40,6 +40,7 @@ from aiexec.services.deps import (
     get_settings_service,
     get_telemetry_service,
 )
+from aiexec.services.task.build_log_writer import build_log_writer
 from aiexec.services.utils import initialize_services, teardown_services
 
 if TYPE_CHECKING:
@@ -162,6 +163,11 @@ def get_lifespan(*, fix_migration=False, version=None):
             telemetry_service.start()
             logger.debug(f"started telemetry service in {asyncio.get_event_loop().time() - current_time:.2f}s")
 
+            current_time = asyncio.get_event_loop().time()
+            logger.debug("Starting build log writer")
+            await build_log_writer.start()
+            logger.debug(f"Build log writer started in {asyncio.get_event_loop().time() - current_time:.2f}s")
+
             current_time = asyncio.get_event_loop().time()
             logger.debug("Loading flows")
             await load_flows_from_directory()
@@ -190,6 +196,7 @@ def get_lifespan(*, fix_migration=False, version=None):
             if sync_flows_from_fs_task:
                 sync_flows_from_fs_task.cancel()
                 await asyncio.wait([sync_flows_from_fs_task])
+            await build_log_writer.stop()
             await teardown_services()
 
             await asyncio.sleep(0.1)  # let logger flush async logs
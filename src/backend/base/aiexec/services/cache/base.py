@@ -26,6 +26,18 @@ class CacheService(Service, Generic[LockType]):
             The value associated with the key, or CACHE_MISS if the key is not found.
         """
 
+    def get_many(self, keys, lock: LockType | None = None) -> list:
+        """Retrieve several items from the cache.
+
+        Args:
+            keys: The keys of the items to retrieve.
+            lock: A lock to use for the operation.
+
+        Returns:
+            The values associated with the keys, in order, with CACHE_MISS for the keys that are not found.
+        """
+        return [self.get(key, lock=lock) for key in keys]
+
     @abc.abstractmethod
     def set(self, key, value, lock: LockType | None = None):
         """Add an item to the cache.
@@ -55,6 +67,15 @@ class CacheService(Service, Generic[LockType]):
             lock: A lock to use for the operation.
         """
 
+    @abc.abstractmethod
+    def delete_prefix(self, prefix: str, lock: LockType | None = None):
+        """Remove the items whose key starts with a prefix from the cache.
+
+        Args:
+            prefix: The prefix of the keys of the items to remove.
+            lock: A lock to use for the operation.
+        """
+
     @abc.abstractmethod
     def clear(self, lock: LockType | None = None):
         """Clear all items from the cache."""
@@ -124,6 +145,18 @@ class AsyncBaseCacheService(Service, Generic[AsyncLockType]):
             The value associated with the key, or CACHE_MISS if the key is not found.
         """
 
+    async def get_many(self, keys, lock: AsyncLockType | None = None) -> list:
+        """Retrieve several items from the cache.
+
+        Args:
+            keys: The keys of the items to retrieve.
+            lock: A lock to use for the operation.
+
+        Returns:
+            The values associated with the keys, in order, with CACHE_MISS for the keys that are not found.
+        """
+        return [await self.get(key, lock=lock) for key in keys]
+
     @abc.abstractmethod
     async def set(self, key, value, lock: AsyncLockType | None = None):
         """Add an item to the cache.
@@ -153,6 +186,15 @@ class AsyncBaseCacheService(Service, Generic[AsyncLockType]):
             lock: A lock to use for the operation.
         """
 
+    @abc.abstractmethod
+    async def delete_prefix(self, prefix: str, lock: AsyncLockType | None = None):
+        """Remove the items whose key starts with a prefix from the cache.
+
+        Args:
+            prefix: The prefix of the keys of the items to remove.
+            lock: A lock to use for the operation.
+        """
+
     @abc.abstractmethod
     async def clear(self, lock: AsyncLockType | None = None):
         """Clear all items from the cache."""
@@ -63,6 +63,17 @@ class AsyncDiskCache(AsyncBaseCacheService, Generic[AsyncLockType]):
     async def _delete(self, key) -> None:
         await asyncio.to_thread(self.cache.delete, key)
 
+    async def delete_prefix(self, prefix: str, lock: asyncio.Lock | None = None) -> None:
+        if not lock:
+            async with self.lock:
+                await asyncio.to_thread(self._delete_prefix, prefix)
+        else:
+            await asyncio.to_thread(self._delete_prefix, prefix)
+
+    def _delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self.cache if str(key).startswith(prefix)]:
+            self.cache.delete(key)
+
     async def clear(self, lock: asyncio.Lock | None = None) -> None:
         if not lock:
             async with self.lock:
@@ -1,5 +1,6 @@
 import asyncio
 import pickle
+import re
 import threading
 import time
 from collections import OrderedDict
@@ -68,6 +69,10 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
         with lock or self._lock:
             return self._get_without_lock(key)
 
+    def get_many(self, keys, lock: Union[threading.Lock, None] = None) -> list:  # noqa: UP007
+        with lock or self._lock:
+            return [self._get_without_lock(key) for key in keys]
+
     def _get_without_lock(self, key):
         """Retrieve an item from the cache without acquiring the lock."""
         if item := self._cache.get(key):
@@ -141,6 +146,11 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
         with lock or self._lock:
             self._cache.pop(key, None)
 
+    def delete_prefix(self, prefix: str, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
+        with lock or self._lock:
+            for key in [key for key in self._cache if str(key).startswith(prefix)]:
+                del self._cache[key]
+
     def clear(self, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
         """Clear all items from the cache."""
         with lock or self._lock:
@@ -244,6 +254,13 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
         value = await self._client.get(str(key))
         return dill.loads(value) if value else CACHE_MISS
 
+    @override
+    async def get_many(self, keys, lock=None) -> list:
+        if not keys:
+            return []
+        values = await self._client.mget([str(key) for key in keys])
+        return [dill.loads(value) if value else CACHE_MISS for value in values]
+
     @override
     async def set(self, key, value, lock=None) -> None:
         try:
@@ -280,6 +297,14 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
     async def delete(self, key, lock=None) -> None:
         await self._client.delete(key)
 
+    @override
+    async def delete_prefix(self, prefix: str, lock=None) -> None:
+        # escape the glob special characters of the prefix
+        pattern = re.sub(r"([*?\[\]\\])", r"\\\1", prefix) + "*"
+        keys = [key async for key in self._client.scan_iter(match=pattern)]
+        if keys:
+            await self._client.delete(*keys)
+
     @override
     async def clear(self, lock=None) -> None:
         """Clear all items from the cache."""
@@ -308,6 +333,10 @@ class AsyncInMemoryCache(AsyncBaseCacheService, Generic[AsyncLockType]):
         async with lock or self.lock:
             return await self._get(key)
 
+    async def get_many(self, keys, lock: asyncio.Lock | None = None) -> list:
+        async with lock or self.lock:
+            return [await self._get(key) for key in keys]
+
     async def _get(self, key):
         item = self.cache.get(key, None)
         if item:
@@ -339,6 +368,11 @@ class AsyncInMemoryCache(AsyncBaseCacheService, Generic[AsyncLockType]):
         if key in self.cache:
             del self.cache[key]
 
+    async def delete_prefix(self, prefix: str, lock: asyncio.Lock | None = None) -> None:
+        async with lock or self.lock:
+            for key in [key for key in self.cache if str(key).startswith(prefix)]:
+                del self.cache[key]
+
     async def clear(self, lock: asyncio.Lock | None = None) -> None:
         async with lock or self.lock:
             await self._clear()
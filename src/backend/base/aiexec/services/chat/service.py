@@ -1,11 +1,20 @@
+from __future__ import annotations
+
 import asyncio
 from collections import defaultdict
 from threading import RLock
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from aiexec.services.base import Service
 from aiexec.services.cache.base import AsyncBaseCacheService, CacheService
-from aiexec.services.deps import get_cache_service
+from aiexec.services.cache.utils import CacheMiss
+from aiexec.services.deps import get_cache_service, get_settings_service
+
+if TYPE_CHECKING:
+    from aiexec.graph.graph.base import Graph
+
+GRAPH_TEMPLATE_KEY_SUFFIX = ":graph_template"
+VERTEX_BUILD_KEY_SUFFIX = ":vertex_build:"
 
 
 class ChatService(Service):
@@ -55,13 +64,131 @@ class ChatService(Service):
             return await self.cache_service.get(key, lock=lock or self.async_cache_locks[key])
         return await asyncio.to_thread(self.cache_service.get, key, lock=lock or self._sync_cache_locks[key])
 
+    async def get_cache_many(self, keys: list[str]) -> list[Any]:
+        """Get the cache of several keys in a single read.
+
+        Args:
+            keys (list[str]): The cache keys.
+
+        Returns:
+            list[Any]: The cached data of each key, in order.
+        """
+        if isinstance(self.cache_service, AsyncBaseCacheService):
+            return await self.cache_service.get_many(keys)
+        return await asyncio.to_thread(self.cache_service.get_many, keys)
+
     async def clear_cache(self, key: str, lock: asyncio.Lock | None = None) -> None:
-        """Clear the cache for a client.
+        """Clear the cache for a client, with the graph template and vertex builds cached in `delta` mode.
 
         Args:
             key (str): The cache key.
             lock (Optional[asyncio.Lock], optional): The lock to use for the cache operation. Defaults to None.
         """
+        template_key = f"{key}{GRAPH_TEMPLATE_KEY_SUFFIX}"
+        vertex_build_prefix = f"{key}{VERTEX_BUILD_KEY_SUFFIX}"
+        if isinstance(self.cache_service, AsyncBaseCacheService):
+            await self.cache_service.delete(key, lock=lock or self.async_cache_locks[key])
+            await self.cache_service.delete(template_key)
+            await self.cache_service.delete_prefix(vertex_build_prefix)
+            return
+        await asyncio.to_thread(self.cache_service.delete, key, lock=lock or self._sync_cache_locks[key])
+        await asyncio.to_thread(self.cache_service.delete, template_key)
+        await asyncio.to_thread(self.cache_service.delete_prefix, vertex_build_prefix)
+
+    async def _contains(self, key: str) -> bool:
         if isinstance(self.cache_service, AsyncBaseCacheService):
-            return await self.cache_service.delete(key, lock=lock or self.async_cache_locks[key])
-        return await asyncio.to_thread(self.cache_service.delete, key, lock=lock or self._sync_cache_locks[key])
+            return await self.cache_service.contains(key)
+        return key in self.cache_service
+
+    def _persists_graph_deltas(self, graph: Graph) -> bool:
+        # Graphs assembled from components have no payload to rebuild them from
+        return get_settings_service().settings.graph_cache_mode == "delta" and bool(graph.raw_graph_data.get("nodes"))
+
+    async def set_graph(self, key: str, graph: Graph) -> bool:
+        """Cache a graph so that later requests can resume building it.
+
+        In `delta` mode the graph template is stored once under its own key and `key`
+        only holds the run state, so `update_graph` never has to serialize the whole graph.
+
+        Args:
+            key (str): The cache key.
+            graph (Graph): The graph to cache.
+
+        Returns:
+            bool: True if the cache was set successfully, False otherwise.
+        """
+        if not self._persists_graph_deltas(graph):
+            return await self.set_cache(key, graph)
+        from aiexec.graph.graph.template_cache import GraphTemplate
+
+        template = {
+            "template": GraphTemplate.from_graph(graph),
+            "flow_id": graph.flow_id,
+            "flow_name": graph.flow_name,
+            "user_id": graph.user_id,
+        }
+        await self.set_cache(f"{key}{GRAPH_TEMPLATE_KEY_SUFFIX}", template)
+        for vertex in graph.vertices:
+            if vertex.built:
+                await self.set_cache(f"{key}{VERTEX_BUILD_KEY_SUFFIX}{vertex.id}", graph.get_vertex_build(vertex))
+        return await self.set_cache(key, graph.get_run_state())
+
+    async def update_graph(self, key: str, graph: Graph, vertex_id: str | None = None) -> bool:
+        """Update a cached graph after a vertex was built.
+
+        Args:
+            key (str): The cache key.
+            graph (Graph): The graph being built.
+            vertex_id (Optional[str], optional): The vertex that was just built. Defaults to None.
+
+        Returns:
+            bool: True if the cache was set successfully, False otherwise.
+        """
+        if not self._persists_graph_deltas(graph):
+            return await self.set_cache(key, graph)
+        if not await self._contains(f"{key}{GRAPH_TEMPLATE_KEY_SUFFIX}"):
+            return await self.set_graph(key, graph)
+        if vertex_id is not None:
+            vertex = graph.get_vertex(vertex_id)
+            await self.set_cache(f"{key}{VERTEX_BUILD_KEY_SUFFIX}{vertex_id}", graph.get_vertex_build(vertex))
+        return await self.set_cache(key, graph.get_run_state())
+
+    async def get_graph(self, key: str) -> Graph | CacheMiss:
+        """Get a cached graph, rebuilding it from its template and run state in `delta` mode.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Graph | CacheMiss: The cached graph, or a CacheMiss if there is none.
+        """
+        from aiexec.graph.graph.base import Graph
+
+        cached = await self.get_cache(key)
+        if not cached:
+            return CacheMiss()
+        result = cached["result"]
+        if isinstance(result, Graph):
+            return result
+
+        cached_template = await self.get_cache(f"{key}{GRAPH_TEMPLATE_KEY_SUFFIX}")
+        if not cached_template:
+            return CacheMiss()
+        template = cached_template["result"]
+        graph = Graph.from_template(
+            template["template"],
+            flow_id=template["flow_id"],
+            flow_name=template["flow_name"],
+            user_id=template["user_id"],
+        )
+        vertex_ids = result["built_vertices"]
+        cached_builds = await self.get_cache_many(
+            [f"{key}{VERTEX_BUILD_KEY_SUFFIX}{vertex_id}" for vertex_id in vertex_ids]
+        )
+        vertex_builds = {
+            vertex_id: vertex_build["result"]
+            for vertex_id, vertex_build in zip(vertex_ids, cached_builds, strict=True)
+            if vertex_build
+        }
+        graph.restore_run_state(result, vertex_builds)
+        return graph
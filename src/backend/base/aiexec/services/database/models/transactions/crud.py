@@ -1,3 +1,4 @@
+from collections.abc import Iterable, Sequence
 from uuid import UUID
 
 from loguru import logger
@@ -74,6 +75,57 @@ async def log_transaction(db: AsyncSession, transaction: TransactionBase) -> Tra
     return table
 
 
+async def log_transactions(db: AsyncSession, transactions: Sequence[TransactionBase]) -> list[TransactionTable]:
+    """Insert several transactions in a single database transaction.
+
+    Unlike `log_transaction`, this does not enforce the maximum number of transactions;
+    callers are expected to run `prune_transactions` for the affected flows afterwards.
+    Transactions without a flow_id are skipped.
+
+    Args:
+        db: Database session
+        transactions: Transaction data to log
+
+    Returns:
+        The created TransactionTable entries
+    """
+    tables = [TransactionTable(**transaction.model_dump()) for transaction in transactions if transaction.flow_id]
+    try:
+        db.add_all(tables)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return tables
+
+
+async def prune_transactions(db: AsyncSession, flow_ids: Iterable[UUID], max_entries: int | None = None) -> None:
+    """Delete the oldest transactions of each flow, keeping the newest `max_entries`.
+
+    Args:
+        db: Database session
+        flow_ids: The flows whose transactions should be pruned
+        max_entries: Maximum number of transactions to keep per flow. If None, uses system settings.
+    """
+    max_entries = max_entries or get_settings_service().settings.max_transactions_to_keep
+    try:
+        for flow_id in flow_ids:
+            delete_older = delete(TransactionTable).where(
+                TransactionTable.flow_id == flow_id,
+                col(TransactionTable.id).in_(
+                    select(TransactionTable.id)
+                    .where(TransactionTable.flow_id == flow_id)
+                    .order_by(col(TransactionTable.timestamp).desc())
+                    .offset(max_entries)
+                ),
+            )
+            await db.exec(delete_older)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+
 def transform_transaction_table(
     transaction: list[TransactionTable] | TransactionTable,
 ) -> list[TransactionReadResponse]:
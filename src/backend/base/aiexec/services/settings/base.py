@@ -126,6 +126,10 @@ class Settings(BaseSettings):
     """The cache type can be 'async' or 'redis'."""
     cache_expire: int = 3600
     """The cache expire in seconds."""
+    graph_cache_mode: Literal["snapshot", "delta"] = "snapshot"
+    """How graphs built step by step are kept in the chat cache. 'snapshot' stores the whole graph after every
+    step. 'delta' stores the graph template once and, after each step, only the run state and the result of the
+    vertex just built."""
     variable_store: str = "db"
     """The store can be 'db' or 'kubernetes'."""
 
@@ -220,6 +224,18 @@ class Settings(BaseSettings):
     """The maximum number of vertex builds to keep in the database."""
     max_vertex_builds_per_vertex: int = 2
     """The maximum number of builds to keep per vertex. Older builds will be deleted."""
+    build_log_batch_size: int = 100
+    """The maximum number of transactions and vertex builds written to the database in a single insert."""
+    build_log_flush_interval: int = 500
+    """How long to wait in ms for a batch of transactions and vertex builds to fill up before writing it."""
+    build_log_queue_size: int = 10000
+    """The maximum number of transactions and vertex builds waiting to be written. Further records are dropped."""
+    build_log_prune_interval: int = 60
+    """The interval in seconds at which old transactions and vertex builds are deleted."""
+    stream_token_flush_interval: int = 0
+    """How long in ms to coalesce streamed tokens into a single token event. If 0, tokens are not held back by time."""
+    stream_token_flush_size: int = 0
+    """The number of characters at which coalesced tokens are sent. If 0, tokens are not held back by size."""
     webhook_polling_interval: int = 5000
     """The polling interval for the webhook in ms."""
     fs_flows_polling_interval: int = 10000
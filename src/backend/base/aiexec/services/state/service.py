@@ -20,6 +20,12 @@ class StateService(Service):
     def get_state(self, key, run_id: str):
         raise NotImplementedError
 
+    def get_run_states(self, run_id: str) -> dict:
+        raise NotImplementedError
+
+    def set_run_states(self, run_id: str, states: dict) -> None:
+        raise NotImplementedError
+
     def subscribe(self, key, observer: Callable) -> None:
         raise NotImplementedError
 
@@ -59,6 +65,19 @@ class InMemoryStateService(StateService):
         with self.lock:
             return self.states.get(run_id, {}).get(key, "")
 
+    def get_run_states(self, run_id: str) -> dict:
+        with self.lock:
+            return {
+                key: list(value) if isinstance(value, list) else value
+                for key, value in self.states.get(run_id, {}).items()
+            }
+
+    def set_run_states(self, run_id: str, states: dict) -> None:
+        with self.lock:
+            self.states[run_id] = {
+                key: list(value) if isinstance(value, list) else value for key, value in states.items()
+            }
+
     def subscribe(self, key, observer: Callable) -> None:
         with self.lock:
             if observer not in self.observers[key]:
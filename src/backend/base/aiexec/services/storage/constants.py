@@ -26,3 +26,6 @@ EXTENSION_TO_CONTENT_TYPE = {
     "yaml": "application/x-yaml",
     "yml": "application/x-yaml",
 }
+
+# Size of the chunks files are streamed in
+STREAM_CHUNK_SIZE = 64 * 1024
@@ -1,9 +1,18 @@
+from __future__ import annotations
+
+import uuid
+from typing import TYPE_CHECKING
+
 import anyio
 from aiofile import async_open
 from loguru import logger
 
+from .constants import STREAM_CHUNK_SIZE
 from .service import StorageService
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
 
 class LocalStorageService(StorageService):
     """A service class for handling local storage operations without aiofiles."""
@@ -67,6 +76,71 @@ class LocalStorageService(StorageService):
         logger.debug(f"File {file_name} retrieved successfully from flow {flow_id}.")
         return content
 
+    async def save_file_stream(self, flow_id: str, file_name: str, stream: AsyncIterator[bytes]) -> None:
+        """Save a file in the local storage from a stream of chunks.
+
+        The chunks are written to a temporary file that replaces the file once the stream is
+        exhausted, so readers never see a partially written file.
+
+        Args:
+            flow_id: The identifier for the flow.
+            file_name: The name of the file to be saved.
+            stream: The byte content of the file in chunks.
+        """
+        folder_path = self.data_dir / flow_id
+        await folder_path.mkdir(parents=True, exist_ok=True)
+        file_path = folder_path / file_name
+        temp_path = folder_path / f".{file_name}.{uuid.uuid4().hex}.tmp"
+
+        try:
+            async with async_open(str(temp_path), "wb") as f:
+                async for chunk in stream:
+                    await f.write(chunk)
+            await temp_path.replace(file_path)
+            logger.info(f"File {file_name} saved successfully in flow {flow_id}.")
+        except Exception:
+            logger.exception(f"Error saving file {file_name} in flow {flow_id}")
+            await temp_path.unlink(missing_ok=True)
+            raise
+
+    async def get_file_stream(
+        self,
+        flow_id: str,
+        file_name: str,
+        *,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream a file, or the byte range [start, end) of it, from the local storage.
+
+        Args:
+            flow_id: The identifier for the flow.
+            file_name: The name of the file to be retrieved.
+            start: The offset of the first byte to read.
+            end: The offset after the last byte to read, the end of the file if None.
+            chunk_size: The maximum size of the chunks.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        file_path = self.data_dir / flow_id / file_name
+        if not await file_path.exists():
+            logger.warning(f"File {file_name} not found in flow {flow_id}.")
+            msg = f"File {file_name} not found in flow {flow_id}"
+            raise FileNotFoundError(msg)
+
+        async with async_open(str(file_path), "rb") as f:
+            f.seek(start)
+            remaining = None if end is None else max(end - start, 0)
+            while remaining is None or remaining > 0:
+                chunk = await f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
     async def list_files(self, flow_id: str):
         """List all files in a specified flow.
 
@@ -113,7 +187,7 @@ class LocalStorageService(StorageService):
         """Perform any cleanup operations when the service is being torn down."""
         # No specific teardown actions required for local
 
-    async def get_file_size(self, flow_id: str, file_name: str) -> None:
+    async def get_file_size(self, flow_id: str, file_name: str) -> int:
         """Get the size of a file in the local storage."""
         # Get the file size from the file path
         file_path = self.data_dir / flow_id / file_name
@@ -1,12 +1,27 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 from loguru import logger
 
+from .constants import STREAM_CHUNK_SIZE
 from .service import StorageService
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+# Size of the parts of multipart uploads, S3 requires at least 5 MiB for every part but the last
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 class S3StorageService(StorageService):
-    """A service class for handling operations with AWS S3 storage."""
+    """A service class for handling operations with AWS S3 storage.
+
+    boto3 is synchronous, so every request runs in a worker thread to keep the event loop free.
+    """
 
     def __init__(self, session_service, settings_service) -> None:
         """Initialize the S3 storage service with session and settings services."""
@@ -15,11 +30,11 @@ class S3StorageService(StorageService):
         self.s3_client = boto3.client("s3")
         self.set_ready()
 
-    async def save_file(self, folder: str, file_name: str, data) -> None:
+    async def save_file(self, flow_id: str, file_name: str, data) -> None:
         """Save a file to the S3 bucket.
 
         Args:
-            folder: The folder in the bucket to save the file.
+            flow_id: The folder in the bucket to save the file.
             file_name: The name of the file to be saved.
             data: The byte content of the file.
 
@@ -27,20 +42,87 @@ class S3StorageService(StorageService):
             Exception: If an error occurs during file saving.
         """
         try:
-            self.s3_client.put_object(Bucket=self.bucket, Key=f"{folder}/{file_name}", Body=data)
-            logger.info(f"File {file_name} saved successfully in folder {folder}.")
+            await asyncio.to_thread(
+                self.s3_client.put_object, Bucket=self.bucket, Key=f"{flow_id}/{file_name}", Body=data
+            )
+            logger.info(f"File {file_name} saved successfully in folder {flow_id}.")
         except NoCredentialsError:
             logger.exception("Credentials not available for AWS S3.")
             raise
         except ClientError:
-            logger.exception(f"Error saving file {file_name} in folder {folder}")
+            logger.exception(f"Error saving file {file_name} in folder {flow_id}")
+            raise
+
+    async def save_file_stream(self, flow_id: str, file_name: str, stream: AsyncIterator[bytes]) -> None:
+        """Save a file to the S3 bucket from a stream of chunks.
+
+        Files smaller than a part are saved with a single request, larger files with a multipart
+        upload that is aborted if the stream or an upload fails.
+
+        Args:
+            flow_id: The folder in the bucket to save the file.
+            file_name: The name of the file to be saved.
+            stream: The byte content of the file in chunks.
+
+        Raises:
+            Exception: If an error occurs during file saving.
+        """
+        key = f"{flow_id}/{file_name}"
+        buffer = bytearray()
+        upload_id = None
+        parts: list[dict] = []
+        try:
+            async for chunk in stream:
+                buffer.extend(chunk)
+                while len(buffer) >= MULTIPART_CHUNK_SIZE:
+                    if upload_id is None:
+                        response = await asyncio.to_thread(
+                            self.s3_client.create_multipart_upload, Bucket=self.bucket, Key=key
+                        )
+                        upload_id = response["UploadId"]
+                    parts.append(await self._upload_part(key, upload_id, len(parts) + 1, buffer[:MULTIPART_CHUNK_SIZE]))
+                    del buffer[:MULTIPART_CHUNK_SIZE]
+
+            if upload_id is None:
+                await asyncio.to_thread(self.s3_client.put_object, Bucket=self.bucket, Key=key, Body=bytes(buffer))
+            else:
+                if buffer:
+                    parts.append(await self._upload_part(key, upload_id, len(parts) + 1, buffer))
+                await asyncio.to_thread(
+                    self.s3_client.complete_multipart_upload,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+            logger.info(f"File {file_name} saved successfully in folder {flow_id}.")
+        except Exception:
+            logger.exception(f"Error saving file {file_name} in folder {flow_id}")
+            if upload_id is not None:
+                try:
+                    await asyncio.to_thread(
+                        self.s3_client.abort_multipart_upload, Bucket=self.bucket, Key=key, UploadId=upload_id
+                    )
+                except ClientError:
+                    logger.exception(f"Error aborting the upload of file {file_name} in folder {flow_id}")
             raise
 
-    async def get_file(self, folder: str, file_name: str):
+    async def _upload_part(self, key: str, upload_id: str, part_number: int, data: bytearray) -> dict:
+        response = await asyncio.to_thread(
+            self.s3_client.upload_part,
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=bytes(data),
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    async def get_file(self, flow_id: str, file_name: str):
         """Retrieve a file from the S3 bucket.
 
         Args:
-            folder: The folder in the bucket where the file is stored.
+            flow_id: The folder in the bucket where the file is stored.
             file_name: The name of the file to be retrieved.
 
         Returns:
@@ -50,18 +132,71 @@ class S3StorageService(StorageService):
             Exception: If an error occurs during file retrieval.
         """
         try:
-            response = self.s3_client.get_object(Bucket=self.bucket, Key=f"{folder}/{file_name}")
-            logger.info(f"File {file_name} retrieved successfully from folder {folder}.")
-            return response["Body"].read()
+            response = await asyncio.to_thread(
+                self.s3_client.get_object, Bucket=self.bucket, Key=f"{flow_id}/{file_name}"
+            )
+            content = await asyncio.to_thread(response["Body"].read)
+            logger.info(f"File {file_name} retrieved successfully from folder {flow_id}.")
+        except ClientError:
+            logger.exception(f"Error retrieving file {file_name} from folder {flow_id}")
+            raise
+        return content
+
+    async def get_file_stream(
+        self,
+        flow_id: str,
+        file_name: str,
+        *,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream a file, or the byte range [start, end) of it, from the S3 bucket.
+
+        Args:
+            flow_id: The folder in the bucket where the file is stored.
+            file_name: The name of the file to be retrieved.
+            start: The offset of the first byte to read.
+            end: The offset after the last byte to read, the end of the file if None.
+            chunk_size: The maximum size of the chunks.
+
+        Raises:
+            Exception: If an error occurs during file retrieval.
+        """
+        if end is not None and end <= start:
+            return
+        request = {"Bucket": self.bucket, "Key": f"{flow_id}/{file_name}"}
+        if start or end is not None:
+            request["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+        try:
+            response = await asyncio.to_thread(self.s3_client.get_object, **request)
+        except ClientError:
+            logger.exception(f"Error retrieving file {file_name} from folder {flow_id}")
+            raise
+
+        body = response["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    async def get_file_size(self, flow_id: str, file_name: str) -> int:
+        """Get the size of a file in the S3 bucket."""
+        try:
+            response = await asyncio.to_thread(
+                self.s3_client.head_object, Bucket=self.bucket, Key=f"{flow_id}/{file_name}"
+            )
         except ClientError:
-            logger.exception(f"Error retrieving file {file_name} from folder {folder}")
+            logger.exception(f"Error retrieving the size of file {file_name} from folder {flow_id}")
             raise
+        return response["ContentLength"]
 
-    async def list_files(self, folder: str):
+    async def list_files(self, flow_id: str):
         """List all files in a specified folder of the S3 bucket.
 
         Args:
-            folder: The folder in the bucket to list files from.
+            flow_id: The folder in the bucket to list files from.
 
         Returns:
             A list of file names.
@@ -70,30 +205,30 @@ class S3StorageService(StorageService):
             Exception: If an error occurs during file listing.
         """
         try:
-            response = self.s3_client.list_objects_v2(Bucket=self.bucket, Prefix=folder)
+            response = await asyncio.to_thread(self.s3_client.list_objects_v2, Bucket=self.bucket, Prefix=flow_id)
         except ClientError:
-            logger.exception(f"Error listing files in folder {folder}")
+            logger.exception(f"Error listing files in folder {flow_id}")
             raise
 
-        files = [item["Key"] for item in response.get("Contents", []) if "/" not in item["Key"][len(folder) :]]
-        logger.info(f"{len(files)} files listed in folder {folder}.")
+        files = [item["Key"] for item in response.get("Contents", []) if "/" not in item["Key"][len(flow_id) :]]
+        logger.info(f"{len(files)} files listed in folder {flow_id}.")
         return files
 
-    async def delete_file(self, folder: str, file_name: str) -> None:
+    async def delete_file(self, flow_id: str, file_name: str) -> None:
         """Delete a file from the S3 bucket.
 
         Args:
-            folder: The folder in the bucket where the file is stored.
+            flow_id: The folder in the bucket where the file is stored.
             file_name: The name of the file to be deleted.
 
         Raises:
             Exception: If an error occurs during file deletion.
         """
         try:
-            self.s3_client.delete_object(Bucket=self.bucket, Key=f"{folder}/{file_name}")
-            logger.info(f"File {file_name} deleted successfully from folder {folder}.")
+            await asyncio.to_thread(self.s3_client.delete_object, Bucket=self.bucket, Key=f"{flow_id}/{file_name}")
+            logger.info(f"File {file_name} deleted successfully from folder {flow_id}.")
         except ClientError:
-            logger.exception(f"Error deleting file {file_name} from folder {folder}")
+            logger.exception(f"Error deleting file {file_name} from folder {flow_id}")
             raise
 
     async def teardown(self) -> None:
@@ -6,8 +6,11 @@ from typing import TYPE_CHECKING
 import anyio
 
 from aiexec.services.base import Service
+from aiexec.services.storage.constants import STREAM_CHUNK_SIZE
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
     from aiexec.services.session.service import SessionService
     from aiexec.services.settings.service import SettingsService
 
@@ -35,6 +38,35 @@ class StorageService(Service):
     async def get_file(self, flow_id: str, file_name: str) -> bytes:
         raise NotImplementedError
 
+    async def get_file_stream(
+        self,
+        flow_id: str,
+        file_name: str,
+        *,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream a file, or the byte range [start, end) of it, in chunks.
+
+        Storages that can read a file in parts override this, the default loads the whole file.
+        """
+        content = await self.get_file(flow_id, file_name)
+        content = content[start:end]
+        for i in range(0, len(content), chunk_size):
+            yield content[i : i + chunk_size]
+
+    async def save_file_stream(self, flow_id: str, file_name: str, stream: AsyncIterator[bytes]) -> None:
+        """Save a file from a stream of chunks.
+
+        Storages that can write a file in parts override this, the default buffers the whole file.
+        """
+        data = b"".join([chunk async for chunk in stream])
+        await self.save_file(flow_id, file_name, data)
+
+    async def get_file_size(self, flow_id: str, file_name: str) -> int:
+        raise NotImplementedError
+
     @abstractmethod
     async def list_files(self, flow_id: str) -> list[str]:
         raise NotImplementedError
@@ -1,5 +1,53 @@
-from aiexec.services.storage.constants import EXTENSION_TO_CONTENT_TYPE
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from aiexec.services.storage.constants import EXTENSION_TO_CONTENT_TYPE, STREAM_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
 
 
 def build_content_type_from_extension(extension: str):
     return EXTENSION_TO_CONTENT_TYPE.get(extension.lower(), "application/octet-stream")
+
+
+async def iter_upload_file(file, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read an uploaded file in chunks instead of loading it in memory at once."""
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+def parse_range_header(range_header: str | None, file_size: int) -> tuple[int, int] | None:
+    """Parse the HTTP Range header of a request for a single byte range.
+
+    Returns:
+        The byte range [start, end) to send, or None to send the whole file when the header is
+        missing, malformed or asks for several ranges.
+
+    Raises:
+        ValueError: If the range starts after the end of the file.
+    """
+    if not range_header:
+        return None
+    unit, _, byte_range = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in byte_range:
+        return None
+    first, _, last = byte_range.strip().partition("-")
+    if not (first or last) or (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+    msg = f"Range {range_header} not satisfiable for a file of {file_size} bytes"
+
+    if not first:
+        # Suffix range, the last bytes of the file
+        suffix = int(last)
+        if suffix == 0 or file_size == 0:
+            raise ValueError(msg)
+        return max(file_size - suffix, 0), file_size
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= file_size:
+        raise ValueError(msg)
+    return start, min(int(last) + 1, file_size) if last else file_size
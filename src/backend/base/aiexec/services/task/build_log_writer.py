@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from aiexec.services.database.models.transactions.crud import log_transactions, prune_transactions
+from aiexec.services.database.models.transactions.model import TransactionBase
+from aiexec.services.database.models.vertex_builds.crud import log_vertex_builds, prune_vertex_builds
+from aiexec.services.database.models.vertex_builds.model import VertexBuildBase
+from aiexec.services.deps import get_settings_service, session_scope
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from uuid import UUID
+
+# Sentinel put on the queue by `stop` so the writer drains everything enqueued before it
+_STOP = object()
+
+
+class BuildLogWriter:
+    """Writes transactions and vertex builds to the database in the background.
+
+    Records are put on a bounded queue and written as multi-row inserts once
+    `build_log_batch_size` records are waiting or `build_log_flush_interval` ms have
+    passed, whichever comes first. When the queue is full new records are dropped
+    instead of slowing down the flow that produced them.
+
+    The history limits (`max_transactions_to_keep`, `max_vertex_builds_per_vertex`
+    and `max_vertex_builds_to_keep`) are enforced every `build_log_prune_interval`
+    seconds for the flows and vertices written since the previous run, rather than
+    on every insert.
+
+    A batch that fails to insert is written again one record at a time, so a bad record
+    only loses itself. The queued records of deleted flows are dropped, see `forget_flows`.
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
+        self._prune_task: asyncio.Task | None = None
+        self._stop_event = asyncio.Event()
+        self._pending_flow_ids: set[UUID] = set()
+        self._pending_vertices: set[tuple[UUID, str]] = set()
+        # Flows deleted while records for them may still be queued
+        self._deleted_flow_ids: set[UUID] = set()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._writer_task is not None and not self._stop_event.is_set()
+
+    def enqueue(self, record: TransactionBase | VertexBuildBase) -> bool:
+        """Queue a record for writing.
+
+        Returns False if the writer is not running, in which case the caller should
+        write the record itself. A record dropped because the queue is full counts
+        as handled.
+        """
+        if not self.running or self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.debug("Build log queue is full, dropping record")
+        else:
+            self.enqueued += 1
+        return True
+
+    def forget_flows(self, flow_ids: Iterable[UUID]) -> None:
+        """Drop the queued records of deleted flows, so they are not written after the flows are gone."""
+        if not self.running:
+            return
+        flow_ids = set(flow_ids)
+        self._deleted_flow_ids.update(flow_ids)
+        self._pending_flow_ids.difference_update(flow_ids)
+        self._pending_vertices = {vertex for vertex in self._pending_vertices if vertex[0] not in flow_ids}
+
+    def info(self) -> dict[str, int]:
+        return {
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "queue_size": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def start(self) -> None:
+        """Start the writer and the prune worker."""
+        if self._writer_task is not None:
+            logger.warning("Build log writer is already running")
+            return
+
+        self._stop_event.clear()
+        self._queue = asyncio.Queue(maxsize=get_settings_service().settings.build_log_queue_size)
+        self._writer_task = asyncio.create_task(self._write_loop())
+        self._prune_task = asyncio.create_task(self._prune_loop())
+        logger.debug("Started build log writer")
+
+    async def stop(self) -> None:
+        """Write every queued record, prune once more and stop."""
+        if self._writer_task is None or self._queue is None:
+            return
+
+        logger.debug("Stopping build log writer...")
+        self._stop_event.set()
+        await self._queue.put(_STOP)
+        await self._writer_task
+        self._writer_task = None
+        if self._prune_task is not None:
+            await self._prune_task
+            self._prune_task = None
+        await self.prune()
+        logger.debug(f"Build log writer stopped: {self.info()}")
+
+    async def _next_batch(self) -> tuple[list[TransactionBase | VertexBuildBase], bool]:
+        """Wait for the next batch of records and whether the writer was asked to stop."""
+        settings = get_settings_service().settings
+        loop = asyncio.get_running_loop()
+        batch: list[TransactionBase | VertexBuildBase] = []
+
+        record = await self._queue.get()
+        deadline = loop.time() + settings.build_log_flush_interval / 1000
+        while record is not _STOP:
+            batch.append(record)
+            if len(batch) >= settings.build_log_batch_size:
+                break
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                record = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+        return batch, record is _STOP
+
+    async def _write_loop(self) -> None:
+        """Write batches until the stop sentinel is reached."""
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if batch:
+                await self.write(batch)
+            if self._queue.empty():
+                # Every record queued before the flows were deleted has been handled
+                self._deleted_flow_ids.clear()
+
+    async def write(self, batch: list[TransactionBase | VertexBuildBase]) -> None:
+        """Insert a batch of records, one multi-row insert per table."""
+        if self._deleted_flow_ids:
+            kept = [record for record in batch if record.flow_id not in self._deleted_flow_ids]
+            self.dropped += len(batch) - len(kept)
+            batch = kept
+            if not batch:
+                return
+        transactions = [record for record in batch if isinstance(record, TransactionBase)]
+        vertex_builds = [record for record in batch if isinstance(record, VertexBuildBase)]
+        try:
+            await self._insert(transactions, vertex_builds)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Error writing {len(batch)} build log records, writing them one by one: {exc!s}")
+            for record in batch:
+                await self._write_record(record)
+            return
+
+        self.batches += 1
+        self._mark_written(transactions, vertex_builds)
+
+    async def _write_record(self, record: TransactionBase | VertexBuildBase) -> None:
+        transactions = [record] if isinstance(record, TransactionBase) else []
+        vertex_builds = [record] if isinstance(record, VertexBuildBase) else []
+        try:
+            await self._insert(transactions, vertex_builds)
+        except Exception as exc:  # noqa: BLE001
+            self.failed += 1
+            logger.error(f"Error writing build log record of flow {record.flow_id}: {exc!s}")
+            return
+        self._mark_written(transactions, vertex_builds)
+
+    @staticmethod
+    async def _insert(transactions: list[TransactionBase], vertex_builds: list[VertexBuildBase]) -> None:
+        async with session_scope() as session:
+            if transactions:
+                await log_transactions(session, transactions)
+            if vertex_builds:
+                await log_vertex_builds(session, vertex_builds)
+
+    def _mark_written(self, transactions: list[TransactionBase], vertex_builds: list[VertexBuildBase]) -> None:
+        self.written += len(transactions) + len(vertex_builds)
+        self._pending_flow_ids.update(transaction.flow_id for transaction in transactions if transaction.flow_id)
+        self._pending_vertices.update((vertex_build.flow_id, vertex_build.id) for vertex_build in vertex_builds)
+
+    async def prune(self) -> None:
+        """Enforce the history limits for the flows and vertices written since the last prune."""
+        flow_ids, self._pending_flow_ids = self._pending_flow_ids, set()
+        vertices, self._pending_vertices = self._pending_vertices, set()
+        if not flow_ids and not vertices:
+            return
+        try:
+            async with session_scope() as session:
+                if flow_ids:
+                    await prune_transactions(session, flow_ids)
+                if vertices:
+                    await prune_vertex_builds(session, vertices)
+        except Exception as exc:  # noqa: BLE001
+            logger.error(f"Error pruning build logs: {exc!s}")
+
+    async def _prune_loop(self) -> None:
+        """Prune periodically until stopped."""
+        settings = get_settings_service().settings
+        while not self._stop_event.is_set():
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop_event.wait(), settings.build_log_prune_interval)
+            if not self._stop_event.is_set():
+                await self.prune()
+
+
+# Create a global instance of the writer
+build_log_writer = BuildLogWriter()
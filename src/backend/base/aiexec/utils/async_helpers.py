@@ -1,5 +1,11 @@
 import asyncio
+import contextvars
+import threading
+from collections.abc import AsyncIterator, Iterator
 from contextlib import asynccontextmanager
+from typing import TypeVar
+
+T = TypeVar("T")
 
 if hasattr(asyncio, "timeout"):
 
@@ -26,3 +32,50 @@ def run_until_complete(coro):
         # If there's no event loop, create a new one and run the coroutine
         return asyncio.run(coro)
     return loop.run_until_complete(coro)
+
+
+_DONE = object()
+
+
+async def iterate_in_thread(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """Iterate a synchronous iterator off the event loop.
+
+    A single worker thread drains the whole iterator and hands the items over to the event loop,
+    instead of hopping to a thread for every item. The iterator runs in a copy of the current
+    context, like `asyncio.to_thread`, and the thread stops at the next item once the async
+    iteration is closed.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    closed = threading.Event()
+
+    def put(entry: tuple) -> bool:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, entry)
+        except RuntimeError:
+            # The event loop is closed
+            return False
+        return True
+
+    def drain() -> None:
+        try:
+            for item in iterator:
+                if closed.is_set() or not put((item, None)):
+                    return
+        except Exception as e:  # noqa: BLE001
+            put((_DONE, e))
+        else:
+            put((_DONE, None))
+
+    future = loop.run_in_executor(None, contextvars.copy_context().run, drain)
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                break
+            yield item
+        await future
+    finally:
+        closed.set()
@@ -156,6 +156,27 @@ async def test_download_file(files_client, files_created_api_key):
     assert response.content == b"test content"
 
 
+async def test_download_file_range(files_client, files_created_api_key):
+    headers = {"x-api-key": files_created_api_key.api_key}
+
+    response = await files_client.post(
+        "api/v2/files",
+        files={"file": ("test.txt", b"test content")},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    upload_response = response.json()
+
+    url = f"api/v2/files/{upload_response['id']}"
+    response = await files_client.get(url, headers={**headers, "Range": "bytes=5-11"})
+    assert response.status_code == 206
+    assert response.content == b"content"
+    assert response.headers["content-range"] == "bytes 5-11/12"
+
+    response = await files_client.get(url, headers={**headers, "Range": "bytes=20-"})
+    assert response.status_code == 416
+
+
 async def test_list_files(files_client, files_created_api_key):
     headers = {"x-api-key": files_created_api_key.api_key}
 
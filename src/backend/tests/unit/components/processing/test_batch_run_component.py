@@ -1,6 +1,8 @@
 import re
+from types import SimpleNamespace
 
 import pytest
+from aiexec.components.processing import batch_run
 from aiexec.components.processing.batch_run import BatchRunComponent
 from aiexec.schema import DataFrame
 
@@ -102,7 +104,7 @@ class TestBatchRunComponent(ComponentTestBaseWithoutClient):
             def with_config(self, *_, **__):
                 return self
 
-            async def abatch(self, *_):
+            async def abatch(self, *_, **__):
                 msg = "Mock error during batch processing"
                 raise AttributeError(msg)
 
@@ -131,7 +133,7 @@ class TestBatchRunComponent(ComponentTestBaseWithoutClient):
             def with_config(self, *_, **__):
                 return self
 
-            async def abatch(self, *_):
+            async def abatch(self, *_, **__):
                 msg = "Mock error during batch processing"
                 raise AttributeError(msg)
 
@@ -256,3 +258,124 @@ class TestBatchRunComponent(ComponentTestBaseWithoutClient):
         )
         result_dicts = result.to_dict("records")
         assert all(row["metadata"]["processing_status"] == "success" for row in result_dicts)
+
+    async def test_batch_run_processes_rows_in_chunks(self):
+        class RecordingModel:
+            def __init__(self):
+                self.batch_sizes = []
+
+            def with_config(self, *_, **__):
+                return self
+
+            async def abatch(self, conversations, *_, **__):
+                self.batch_sizes.append(len(conversations))
+                return [SimpleNamespace(content=conversation[-1]["content"].upper()) for conversation in conversations]
+
+        model = RecordingModel()
+        component = BatchRunComponent(
+            model=model,
+            df=DataFrame({"text": ["a", "b", "c", "d", "e"]}),
+            column_name="text",
+            chunk_size=2,
+        )
+
+        result = await component.run_batch()
+
+        assert model.batch_sizes == [2, 2, 1]
+        assert list(result["model_response"]) == ["A", "B", "C", "D", "E"]
+        assert list(result["batch_index"]) == [0, 1, 2, 3, 4]
+
+    async def test_batch_run_retries_failed_rows(self, monkeypatch):
+        monkeypatch.setattr(batch_run, "RETRY_BACKOFF_SECONDS", 0)
+
+        class FlakyModel:
+            def __init__(self):
+                self.failures = {"b": 2}
+                self.seen: list[list[str]] = []
+
+            def with_config(self, *_, **__):
+                return self
+
+            async def abatch(self, conversations, *_, return_exceptions=False):
+                texts = [conversation[-1]["content"] for conversation in conversations]
+                self.seen.append(texts)
+                responses = []
+                for text in texts:
+                    if self.failures.get(text):
+                        self.failures[text] -= 1
+                        msg = "Rate limited"
+                        responses.append(RuntimeError(msg))
+                    else:
+                        responses.append(SimpleNamespace(content=text))
+                assert return_exceptions
+                return responses
+
+        model = FlakyModel()
+        component = BatchRunComponent(
+            model=model,
+            df=DataFrame({"text": ["a", "b", "c"]}),
+            column_name="text",
+            max_retries=2,
+        )
+
+        result = await component.run_batch()
+
+        assert list(result["model_response"]) == ["a", "b", "c"]
+        # Only the failed row is run again
+        assert model.seen == [["a", "b", "c"], ["b"], ["b"]]
+
+    async def test_batch_run_streams_partial_results(self, monkeypatch):
+        monkeypatch.setattr(batch_run, "PARTIAL_RESULTS_PREVIEW_ROWS", 2)
+        component = BatchRunComponent(
+            model=MockLanguageModel(),
+            df=DataFrame({"text": ["a", "b", "c", "d", "e"]}),
+            column_name="text",
+            chunk_size=3,
+        )
+
+        await component.run_batch()
+
+        partial_results = [log.message for log in component._logs if log.name == "Partial Results"]
+        # only a preview of the rows of each chunk is logged
+        assert [(summary["rows"], [row["text"] for row in summary["first_rows"]]) for summary in partial_results] == [
+            (3, ["a", "b"]),
+            (2, ["d", "e"]),
+        ]
+
+    async def test_batch_run_resumes_from_checkpoint(self, monkeypatch):
+        monkeypatch.setattr(batch_run, "RETRY_BACKOFF_SECONDS", 0)
+
+        class Model:
+            def __init__(self, failing: set[str]):
+                self.failing = failing
+                self.seen: list[str] = []
+
+            def with_config(self, *_, **__):
+                return self
+
+            async def abatch(self, conversations, *_, **__):
+                texts = [conversation[-1]["content"] for conversation in conversations]
+                self.seen.extend(texts)
+                return [
+                    RuntimeError("Model unavailable") if text in self.failing else SimpleNamespace(content=text)
+                    for text in texts
+                ]
+
+        input_df = DataFrame({"text": ["a", "b", "c", "d"]})
+        failing_model = Model(failing={"d"})
+        component = BatchRunComponent(
+            model=failing_model, df=input_df, column_name="text", chunk_size=2, max_retries=0, enable_metadata=True
+        )
+
+        result = await component.run_batch()
+
+        statuses = [row["metadata"]["processing_status"] for row in result.to_dict("records")]
+        assert statuses == ["success", "success", "success", "failed"]
+
+        model = Model(failing=set())
+        component = BatchRunComponent(model=model, df=input_df, column_name="text", chunk_size=2, enable_metadata=True)
+
+        result = await component.run_batch()
+
+        assert model.seen == ["c", "d"]
+        assert list(result["model_response"]) == ["a", "b", "c", "d"]
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import time
 from typing import Any
 from unittest.mock import MagicMock
@@ -6,11 +7,12 @@ from uuid import uuid4
 
 import pytest
 from aiexec.custom.custom_component.component import Component
-from aiexec.events.event_manager import EventManager
+from aiexec.events.event_manager import EventManager, create_default_event_manager
 from aiexec.schema.content_block import ContentBlock
 from aiexec.schema.content_types import TextContent, ToolContent
 from aiexec.schema.message import Message
 from aiexec.schema.properties import Properties, Source
+from aiexec.services.deps import get_settings_service
 from aiexec.template.field.base import Output
 
 
@@ -261,3 +263,68 @@ async def test_component_streaming_message():
             tokens.append(event)
 
     assert len(tokens) > 0
+
+
+class StreamChunk:
+    def __init__(self, content: str):
+        self.content = content
+
+
+def make_streaming_component():
+    vertex = MagicMock()
+    vertex.graph.flow_id = str(uuid4())
+    component = ComponentForTesting(_vertex=vertex)
+    queue = asyncio.Queue()
+    component.set_event_manager(create_default_event_manager(queue))
+    return component, queue
+
+
+def get_token_chunks(queue: asyncio.Queue) -> list[str]:
+    chunks = []
+    while not queue.empty():
+        _, event_data, _ = queue.get_nowait()
+        event = json.loads(event_data)
+        if event["event"] == "token":
+            chunks.append(event["data"]["chunk"])
+    return chunks
+
+
+@pytest.mark.usefixtures("client")
+async def test_component_streaming_sync_iterator():
+    """Test that synchronous iterators are streamed through the token fast path."""
+    component, queue = make_streaming_component()
+
+    message = Message(
+        sender="test_sender",
+        session_id="test_session",
+        sender_name="test_sender_name",
+        text=iter([StreamChunk(chunk) for chunk in ["Hello", " ", "World", "!"]]),
+        properties=Properties(),
+    )
+    sent_message = await component.send_message(message)
+
+    assert sent_message.text == "Hello World!"
+    assert get_token_chunks(queue) == ["Hello", " ", "World", "!"]
+
+
+@pytest.mark.usefixtures("client")
+async def test_component_streaming_coalesces_tokens(monkeypatch):
+    """Test that streamed tokens are coalesced by size."""
+    monkeypatch.setattr(get_settings_service().settings, "stream_token_flush_size", 5)
+    component, queue = make_streaming_component()
+
+    async def text_generator():
+        for chunk in ["He", "llo", " ", "Wor", "ld", "!"]:
+            yield StreamChunk(chunk)
+
+    message = Message(
+        sender="test_sender",
+        session_id="test_session",
+        sender_name="test_sender_name",
+        text=text_generator(),
+        properties=Properties(),
+    )
+    sent_message = await component.send_message(message)
+
+    assert sent_message.text == "Hello World!"
+    assert get_token_chunks(queue) == ["Hello", " World", "!"]
@@ -0,0 +1,63 @@
+import pytest
+from aiexec.custom.eval import (
+    CompiledClassCache,
+    clear_compiled_class_cache,
+    eval_custom_component_code,
+    get_compiled_class_cache_info,
+)
+
+COMPONENT_CODE = """
+from aiexec.custom import Component
+
+
+class CachedComponent(Component):
+    display_name = "Cached"
+"""
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_compiled_class_cache()
+    yield
+    clear_compiled_class_cache()
+
+
+def test_eval_custom_component_code_reuses_compiled_class():
+    first = eval_custom_component_code(COMPONENT_CODE)
+    second = eval_custom_component_code(COMPONENT_CODE)
+
+    assert first is second
+    info = get_compiled_class_cache_info()
+    assert info["hits"] == 1
+    assert info["misses"] == 1
+    assert info["size"] == 1
+
+
+def test_eval_custom_component_code_compiles_changed_code():
+    first = eval_custom_component_code(COMPONENT_CODE)
+    second = eval_custom_component_code(COMPONENT_CODE.replace('"Cached"', '"Changed"'))
+
+    assert first is not second
+    assert second.display_name == "Changed"
+    assert get_compiled_class_cache_info()["misses"] == 2
+
+
+def test_compiled_class_cache_evicts_least_recently_used():
+    cache = CompiledClassCache(maxsize=2)
+    codes = [COMPONENT_CODE.replace('"Cached"', f'"Cached {i}"') for i in range(3)]
+
+    first = cache.get_or_create(codes[0])
+    cache.get_or_create(codes[1])
+    cache.get_or_create(codes[0])
+    cache.get_or_create(codes[2])
+
+    assert cache.info()["size"] == 2
+    assert cache.get_or_create(codes[0]) is first
+    cache.get_or_create(codes[1])
+    assert cache.info()["misses"] == 4
+
+
+def test_eval_custom_component_code_does_not_cache_errors():
+    with pytest.raises(ValueError, match="Name error"):
+        eval_custom_component_code("class Broken(Component):\n    x = undefined_name\n")
+    assert get_compiled_class_cache_info()["size"] == 0
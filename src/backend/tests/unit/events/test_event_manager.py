@@ -210,3 +210,30 @@ class TestEventManager:
         # Accessing a non-registered event callback should return the 'noop' function
         callback = event_manager.on_non_existing_event
         assert callback.__name__ == "noop"
+
+    # Sending a token through the fast path produces the same frame as on_token
+    def test_send_token_matches_on_token(self):
+        queue = asyncio.Queue()
+        manager = EventManager(queue)
+        manager.register_event("on_token", "token")
+        assert manager.sends_tokens_directly
+
+        for chunk in ["Hello", ' "quoted"\n', "ünïcode ✓", ""]:
+            manager.on_token(data={"chunk": chunk, "id": "message-id"})
+            manager.send_token(chunk=chunk, id_="message-id")
+            _, expected, _ = queue.get_nowait()
+            event_id, str_data, _ = queue.get_nowait()
+            assert event_id.startswith("token-")
+            assert json.loads(str_data) == json.loads(expected)
+            assert str_data.endswith(b"\n\n")
+
+    # The fast path is disabled when on_token has a custom callback
+    def test_sends_tokens_directly_with_custom_callback(self):
+        def mock_callback(manager, event_type: str, data: LoggableType):
+            pass
+
+        queue = asyncio.Queue()
+        manager = EventManager(queue)
+        assert not manager.sends_tokens_directly
+        manager.register_event("on_token", "token", mock_callback)
+        assert not manager.sends_tokens_directly
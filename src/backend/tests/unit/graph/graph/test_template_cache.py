@@ -0,0 +1,128 @@
+import json
+import pickle
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from aiexec.graph import Graph
+from aiexec.graph.graph import base as graph_base
+from aiexec.graph.graph.template_cache import (
+    GraphTemplate,
+    GraphTemplateCache,
+    get_or_create_graph_template,
+    graph_template_cache,
+)
+from aiexec.graph.vertex.base import Vertex
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    graph_template_cache.clear()
+    yield
+    graph_template_cache.clear()
+
+
+def test_graph_from_template_matches_graph_from_payload(basic_graph_data):
+    template = GraphTemplate.from_payload(basic_graph_data)
+
+    graph = Graph.from_template(template, flow_id="flow")
+    expected = Graph.from_payload(basic_graph_data, flow_id="flow")
+
+    assert sorted(graph.vertex_map) == sorted(expected.vertex_map)
+    assert len(graph.edges) == len(expected.edges)
+
+
+def test_graphs_from_template_are_independent(basic_graph_data):
+    template = GraphTemplate.from_payload(basic_graph_data)
+
+    first = Graph.from_template(template)
+    second = Graph.from_template(template)
+
+    for vertex in first.vertices:
+        other = second.get_vertex(vertex.id)
+        assert vertex is not other
+        assert vertex.graph is first
+        assert vertex.custom_component is not other.custom_component
+        assert vertex.params is not other.params
+        for param in vertex.params.values():
+            if isinstance(param, Vertex):
+                assert first.get_vertex(param.id) is param
+    first.vertices[0].results["text"] = "built"
+    assert not second.vertices[0].results
+
+
+def test_graphs_from_template_share_the_built_structure(basic_graph_data, monkeypatch):
+    template = GraphTemplate.from_payload(basic_graph_data)
+    first = Graph.from_template(template)
+    build_vertices = MagicMock(side_effect=AssertionError("vertices built again"))
+    monkeypatch.setattr(Graph, "_build_vertices", build_vertices)
+    sort_calls = []
+    original_get_sorted_vertices = graph_base.get_sorted_vertices
+    monkeypatch.setattr(
+        graph_base,
+        "get_sorted_vertices",
+        lambda **kwargs: sort_calls.append(kwargs) or original_get_sorted_vertices(**kwargs),
+    )
+
+    first_layer = first.sort_vertices()
+    second = Graph.from_template(template)
+
+    assert second.sort_vertices() == first_layer
+    assert second.vertices_layers == first.vertices_layers
+    assert len(sort_calls) == 1
+
+
+def test_template_keeps_group_nodes_top_level(grouped_chat_json_flow):
+    grouped_chat_data = json.loads(grouped_chat_json_flow)
+
+    graph = Graph.from_template(GraphTemplate.from_payload(grouped_chat_data))
+    expected = Graph.from_payload(grouped_chat_data)
+
+    assert graph.top_level_vertices == expected.top_level_vertices
+    assert graph.raw_graph_data == expected.raw_graph_data
+    assert {vertex.id: vertex.parent_is_top_level for vertex in graph.vertices} == {
+        vertex.id: vertex.parent_is_top_level for vertex in expected.vertices
+    }
+
+
+def test_pickled_template_drops_the_built_graph(basic_graph_data):
+    template = GraphTemplate.from_payload(basic_graph_data)
+    Graph.from_template(template)
+
+    restored = pickle.loads(pickle.dumps(template))  # noqa: S301
+
+    assert restored.nodes == template.nodes
+    assert restored._graph is None
+    assert sorted(Graph.from_template(restored).vertex_map) == sorted(template.graph.vertex_map)
+
+
+def test_get_or_create_graph_template_reuses_template(basic_graph_data):
+    updated_at = datetime.now(timezone.utc)
+
+    first = get_or_create_graph_template("flow", updated_at, basic_graph_data)
+    second = get_or_create_graph_template("flow", updated_at, basic_graph_data)
+
+    assert first is second
+    assert graph_template_cache.info()["hits"] == 1
+
+
+def test_get_or_create_graph_template_keys_on_updated_at_and_tweaks(basic_graph_data):
+    updated_at = datetime.now(timezone.utc)
+    first = get_or_create_graph_template("flow", updated_at, basic_graph_data)
+
+    assert get_or_create_graph_template("flow", datetime.now(timezone.utc), basic_graph_data) is not first
+    assert get_or_create_graph_template("flow", updated_at, basic_graph_data, {"x": {"y": "z"}}) is not first
+    assert get_or_create_graph_template("flow", updated_at, basic_graph_data, stream=True) is not first
+
+
+def test_invalidate_drops_only_the_flow_templates():
+    cache = GraphTemplateCache()
+    template = GraphTemplate(nodes=[], edges=[])
+    cache.set(("a", None, "1"), template)
+    cache.set(("a", None, "2"), template)
+    cache.set(("b", None, "1"), template)
+
+    cache.invalidate("a")
+
+    assert cache.info()["size"] == 1
+    assert cache.get(("b", None, "1")) is template
@@ -0,0 +1,100 @@
+from unittest.mock import Mock
+
+import pytest
+from aiexec.components.processing import ParserComponent, SplitTextComponent
+from aiexec.graph import Graph
+from aiexec.graph.graph import base as graph_base
+from aiexec.graph.vertex.base import Vertex
+from aiexec.graph.vertex.result_cache import VertexResultCache, fingerprint
+from aiexec.schema.data import Data
+from aiexec.schema.message import Message
+
+
+def make_vertex(params: dict, *, cacheable: bool = True, code: str = "class A: pass") -> Mock:
+    vertex = Mock(spec=Vertex)
+    vertex.id = "vertex-id"
+    vertex.vertex_type = "A"
+    vertex.params = params
+    vertex.load_from_db_fields = []
+    vertex.custom_component = Mock(cacheable=cacheable)
+    vertex.data = {"node": {"template": {"code": {"value": code}}}}
+    return vertex
+
+
+def make_upstream(results: dict, *, built: bool = True) -> Mock:
+    upstream = Mock(spec=Vertex)
+    upstream.id = "upstream-id"
+    upstream.built = built
+    upstream.results = results
+    return upstream
+
+
+def test_fingerprint_ignores_message_timestamps():
+    first = Message(text="hello", timestamp="2024-01-01 00:00:00 UTC")
+    second = Message(text="hello", timestamp="2024-01-02 00:00:00 UTC")
+
+    assert fingerprint(first) == fingerprint(second)
+    assert fingerprint(first) != fingerprint(Message(text="bye"))
+
+
+def test_make_key_depends_on_params_code_and_upstream_results():
+    upstream = make_upstream({"text": "a"})
+    key = VertexResultCache.make_key(make_vertex({"input": upstream, "size": 10}))
+
+    assert key is not None
+    assert key == VertexResultCache.make_key(make_vertex({"input": make_upstream({"text": "a"}), "size": 10}))
+    assert key != VertexResultCache.make_key(make_vertex({"input": make_upstream({"text": "b"}), "size": 10}))
+    assert key != VertexResultCache.make_key(make_vertex({"input": upstream, "size": 11}))
+    assert key != VertexResultCache.make_key(make_vertex({"input": upstream, "size": 10}, code="class B: pass"))
+
+
+@pytest.mark.parametrize(
+    "vertex",
+    [
+        make_vertex({"size": 10}, cacheable=False),
+        make_vertex({"input": make_upstream({}, built=False)}),
+        make_vertex({"input": iter(["a", "b"])}),
+        make_vertex({"input": object()}),
+    ],
+)
+def test_make_key_returns_none_when_vertex_cannot_be_memoized(vertex):
+    assert VertexResultCache.make_key(vertex) is None
+
+
+def test_vertex_result_cache_counts_hits_and_misses():
+    cache = VertexResultCache(maxsize=2, ttl=60)
+
+    assert cache.get("key") is None
+    cache.set("key", {"built": True})
+    assert cache.get("key") == {"built": True}
+    assert cache.info() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+
+async def test_cacheable_components_are_served_from_the_cache_on_the_next_run(monkeypatch):
+    cache = VertexResultCache()
+    monkeypatch.setattr(graph_base, "vertex_result_cache", cache)
+    split_text_base = SplitTextComponent.split_text_base
+    splits = []
+
+    def counting_split_text_base(self):
+        splits.append(self)
+        return split_text_base(self)
+
+    monkeypatch.setattr(SplitTextComponent, "split_text_base", counting_split_text_base)
+
+    async def run_flow() -> str:
+        split_text = SplitTextComponent(_id="split_text")
+        split_text.set(data_inputs=[Data(text="first\nsecond")], chunk_size=5, chunk_overlap=0)
+        parser = ParserComponent(_id="parser")
+        parser.set(input_data=split_text.as_dataframe, pattern="{text}", sep="|")
+        graph = Graph(split_text, parser)
+        async for _ in graph.async_start():
+            pass
+        return graph.get_vertex("parser").results["parsed_text"].text
+
+    assert await run_flow() == "first|second"
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    assert await run_flow() == "first|second"
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert len(splits) == 1
@@ -0,0 +1,105 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from aiexec.graph import Graph
+from aiexec.services.cache.service import AsyncInMemoryCache
+from aiexec.services.cache.utils import CacheMiss
+from aiexec.services.chat import service as chat_service_module
+from aiexec.services.chat.service import GRAPH_TEMPLATE_KEY_SUFFIX, VERTEX_BUILD_KEY_SUFFIX, ChatService
+
+
+@pytest.fixture
+def delta_chat_service(monkeypatch):
+    settings_service = MagicMock()
+    settings_service.settings.graph_cache_mode = "delta"
+    monkeypatch.setattr(chat_service_module, "get_settings_service", lambda: settings_service)
+    monkeypatch.setattr(chat_service_module, "get_cache_service", AsyncInMemoryCache)
+    return ChatService()
+
+
+async def test_set_graph_in_delta_mode_stores_run_state_instead_of_graph(delta_chat_service, basic_graph_data):
+    graph = Graph.from_payload(basic_graph_data, flow_id="flow")
+    graph.prepare()
+
+    await delta_chat_service.set_graph("flow", graph)
+
+    cached = await delta_chat_service.get_cache("flow")
+    assert isinstance(cached["result"], dict)
+    assert await delta_chat_service.cache_service.contains(f"flow{GRAPH_TEMPLATE_KEY_SUFFIX}")
+
+
+async def test_get_graph_in_delta_mode_restores_run_state(delta_chat_service, basic_graph_data):
+    graph = Graph.from_payload(basic_graph_data, flow_id="flow")
+    graph.prepare()
+    graph.set_run_id()
+    await delta_chat_service.set_graph("flow", graph)
+    graph.get_next_in_queue()
+    await delta_chat_service.update_graph("flow", graph)
+
+    restored = await delta_chat_service.get_graph("flow")
+
+    assert restored is not graph
+    assert sorted(restored.vertex_map) == sorted(graph.vertex_map)
+    assert list(restored._run_queue) == list(graph._run_queue)
+    assert restored.run_manager.vertices_being_run == graph.run_manager.vertices_being_run
+    assert restored.run_id == graph.run_id
+
+
+async def test_get_graph_returns_cache_miss_when_cleared(delta_chat_service, basic_graph_data):
+    graph = Graph.from_payload(basic_graph_data, flow_id="flow")
+    graph.prepare()
+    for vertex in graph.vertices:
+        vertex.built = True
+    await delta_chat_service.set_graph("flow", graph)
+    await delta_chat_service.set_cache("other-flow", "other")
+
+    await delta_chat_service.clear_cache("flow")
+
+    assert isinstance(await delta_chat_service.get_graph("flow"), CacheMiss)
+    # the template and vertex builds of the graph are cleared with it
+    assert list(delta_chat_service.cache_service.cache) == ["other-flow"]
+
+
+async def test_get_graph_in_delta_mode_keeps_group_nodes_top_level(delta_chat_service, grouped_chat_json_flow):
+    graph = Graph.from_payload(json.loads(grouped_chat_json_flow), flow_id="flow")
+    graph.prepare()
+    await delta_chat_service.set_graph("flow", graph)
+
+    restored = await delta_chat_service.get_graph("flow")
+
+    assert restored.top_level_vertices == graph.top_level_vertices
+    assert restored.raw_graph_data == graph.raw_graph_data
+
+
+async def test_get_graph_in_delta_mode_restores_context_and_states(delta_chat_service, basic_graph_data):
+    graph = Graph.from_payload(basic_graph_data, flow_id="flow")
+    graph.prepare()
+    graph.set_run_id()
+    graph.context["key"] = "value"
+    graph.update_state("name", "state")
+    await delta_chat_service.set_graph("flow", graph)
+    graph.state_manager.set_run_states(graph.run_id, {})
+
+    restored = await delta_chat_service.get_graph("flow")
+
+    assert restored.context == {"key": "value"}
+    assert restored.get_state("name") == "state"
+
+
+async def test_get_graph_in_delta_mode_reads_vertex_builds_at_once(delta_chat_service, basic_graph_data):
+    graph = Graph.from_payload(basic_graph_data, flow_id="flow")
+    graph.prepare()
+    for vertex in graph.vertices:
+        vertex.built = True
+    await delta_chat_service.set_graph("flow", graph)
+    get_cache = MagicMock(wraps=delta_chat_service.get_cache)
+    get_cache_many = MagicMock(wraps=delta_chat_service.get_cache_many)
+    delta_chat_service.get_cache = get_cache
+    delta_chat_service.get_cache_many = get_cache_many
+
+    await delta_chat_service.get_graph("flow")
+
+    assert all(VERTEX_BUILD_KEY_SUFFIX not in call.args[0] for call in get_cache.call_args_list)
+    get_cache_many.assert_called_once()
+    assert len(get_cache_many.call_args.args[0]) == len(graph.vertices)
@@ -0,0 +1,54 @@
+from unittest.mock import MagicMock
+
+import pytest
+from aiexec.services.storage.local import LocalStorageService
+
+CONTENT = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def storage_service(tmp_path):
+    settings_service = MagicMock()
+    settings_service.settings.config_dir = str(tmp_path)
+    return LocalStorageService(MagicMock(), settings_service)
+
+
+async def chunks(data: bytes, chunk_size: int):
+    for i in range(0, len(data), chunk_size):
+        yield data[i : i + chunk_size]
+
+
+async def read_stream(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+async def test_save_file_stream_and_get_file_stream(storage_service):
+    await storage_service.save_file_stream("flow", "file.bin", chunks(CONTENT, 1000))
+
+    assert await storage_service.get_file("flow", "file.bin") == CONTENT
+    assert await storage_service.get_file_size("flow", "file.bin") == len(CONTENT)
+    assert await read_stream(storage_service.get_file_stream("flow", "file.bin", chunk_size=333)) == CONTENT
+
+
+async def test_get_file_stream_reads_a_range(storage_service):
+    await storage_service.save_file("flow", "file.bin", CONTENT)
+
+    stream = storage_service.get_file_stream("flow", "file.bin", start=1000, end=5000, chunk_size=512)
+    assert await read_stream(stream) == CONTENT[1000:5000]
+    assert await read_stream(storage_service.get_file_stream("flow", "file.bin", start=10000)) == CONTENT[10000:]
+
+
+async def test_get_file_stream_missing_file(storage_service):
+    with pytest.raises(FileNotFoundError):
+        await read_stream(storage_service.get_file_stream("flow", "missing.bin"))
+
+
+async def test_failed_save_file_stream_leaves_no_file(storage_service):
+    async def failing_stream():
+        yield b"partial"
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        await storage_service.save_file_stream("flow", "file.bin", failing_stream())
+
+    assert await storage_service.list_files("flow") == []
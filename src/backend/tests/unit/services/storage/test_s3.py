@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from aiexec.services.storage.s3 import MULTIPART_CHUNK_SIZE, S3StorageService
+
+
+@pytest.fixture
+def s3_client():
+    client = MagicMock()
+    client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+    client.upload_part.side_effect = lambda **kwargs: {"ETag": f"etag-{kwargs['PartNumber']}"}
+    return client
+
+
+@pytest.fixture
+def storage_service(s3_client):
+    with patch("aiexec.services.storage.s3.boto3.client", return_value=s3_client):
+        return S3StorageService(MagicMock(), MagicMock())
+
+
+async def chunks(*sizes: int):
+    for size in sizes:
+        yield b"x" * size
+
+
+async def test_save_file_stream_small_file_uses_a_single_request(storage_service, s3_client):
+    await storage_service.save_file_stream("flow", "file.bin", chunks(10, 20))
+
+    s3_client.put_object.assert_called_once_with(Bucket="aiexec", Key="flow/file.bin", Body=b"x" * 30)
+    s3_client.create_multipart_upload.assert_not_called()
+
+
+async def test_save_file_stream_uploads_parts(storage_service, s3_client):
+    stream = chunks(MULTIPART_CHUNK_SIZE - 1, MULTIPART_CHUNK_SIZE, 5)
+    await storage_service.save_file_stream("flow", "file.bin", stream)
+
+    part_sizes = [len(call.kwargs["Body"]) for call in s3_client.upload_part.call_args_list]
+    assert part_sizes == [MULTIPART_CHUNK_SIZE, MULTIPART_CHUNK_SIZE, 4]
+    s3_client.complete_multipart_upload.assert_called_once_with(
+        Bucket="aiexec",
+        Key="flow/file.bin",
+        UploadId="upload-id",
+        MultipartUpload={"Parts": [{"ETag": f"etag-{i}", "PartNumber": i} for i in (1, 2, 3)]},
+    )
+    s3_client.put_object.assert_not_called()
+
+
+async def test_failed_save_file_stream_aborts_the_upload(storage_service, s3_client):
+    async def failing_stream():
+        yield b"x" * MULTIPART_CHUNK_SIZE
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        await storage_service.save_file_stream("flow", "file.bin", failing_stream())
+
+    s3_client.abort_multipart_upload.assert_called_once_with(Bucket="aiexec", Key="flow/file.bin", UploadId="upload-id")
+    s3_client.complete_multipart_upload.assert_not_called()
+
+
+async def test_get_file_stream_reads_a_range(storage_service, s3_client):
+    body = MagicMock()
+    body.read.side_effect = [b"abc", b"de", b""]
+    s3_client.get_object.return_value = {"Body": body}
+
+    content = b"".join([chunk async for chunk in storage_service.get_file_stream("flow", "file.bin", start=2, end=7)])
+
+    assert content == b"abcde"
+    s3_client.get_object.assert_called_once_with(Bucket="aiexec", Key="flow/file.bin", Range="bytes=2-6")
+    body.close.assert_called_once()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from aiexec.services.database.models.transactions.model import TransactionBase, TransactionTable
+from aiexec.services.database.models.vertex_builds.model import VertexBuildBase, VertexBuildTable
+from aiexec.services.deps import get_settings_service, session_scope
+from aiexec.services.task import build_log_writer
+from aiexec.services.task.build_log_writer import BuildLogWriter
+from sqlmodel import func, select
+
+
+async def count_rows(table, flow_id) -> int:
+    async with session_scope() as session:
+        return await session.scalar(select(func.count()).select_from(table).where(table.flow_id == flow_id))
+
+
+@pytest.mark.usefixtures("client")
+async def test_build_log_writer_writes_queued_records_on_stop():
+    writer = BuildLogWriter()
+    flow_id = uuid4()
+    await writer.start()
+
+    for i in range(3):
+        assert writer.enqueue(VertexBuildBase(id=f"vertex-{i}", flow_id=flow_id, valid=True))
+    for _ in range(2):
+        assert writer.enqueue(TransactionBase(vertex_id="vertex-0", status="success", flow_id=flow_id))
+    await writer.stop()
+
+    assert await count_rows(VertexBuildTable, flow_id) == 3
+    assert await count_rows(TransactionTable, flow_id) == 2
+    info = writer.info()
+    assert info["written"] == 5
+    assert info["dropped"] == 0
+    assert info["queue_size"] == 0
+
+
+@pytest.mark.usefixtures("client")
+async def test_build_log_writer_drops_records_when_queue_is_full(monkeypatch):
+    monkeypatch.setattr(get_settings_service().settings, "build_log_queue_size", 1)
+    writer = BuildLogWriter()
+    flow_id = uuid4()
+    await writer.start()
+
+    for _ in range(3):
+        assert writer.enqueue(TransactionBase(vertex_id="vertex", status="success", flow_id=flow_id))
+    await writer.stop()
+
+    assert writer.info()["dropped"] == 2
+    assert await count_rows(TransactionTable, flow_id) == 1
+
+
+@pytest.mark.usefixtures("client")
+async def test_build_log_writer_prunes_old_vertex_builds(monkeypatch):
+    monkeypatch.setattr(get_settings_service().settings, "max_vertex_builds_per_vertex", 1)
+    writer = BuildLogWriter()
+    flow_id = uuid4()
+    await writer.start()
+
+    for _ in range(3):
+        writer.enqueue(VertexBuildBase(id="vertex", flow_id=flow_id, valid=True))
+    await writer.stop()
+
+    assert await count_rows(VertexBuildTable, flow_id) == 1
+
+
+def test_build_log_writer_rejects_records_when_not_running():
+    writer = BuildLogWriter()
+
+    assert not writer.enqueue(TransactionBase(vertex_id="vertex", status="success", flow_id=uuid4()))
+    assert writer.info()["enqueued"] == 0
+
+
+@pytest.mark.usefixtures("client")
+async def test_build_log_writer_writes_records_one_by_one_when_batch_fails(monkeypatch):
+    log_transactions = build_log_writer.log_transactions
+
+    async def failing_log_transactions(session, transactions):
+        if any(transaction.vertex_id == "bad" for transaction in transactions):
+            msg = "Bad record"
+            raise ValueError(msg)
+        return await log_transactions(session, transactions)
+
+    monkeypatch.setattr(build_log_writer, "log_transactions", failing_log_transactions)
+    writer = BuildLogWriter()
+    flow_id = uuid4()
+    await writer.start()
+
+    for vertex_id in ("vertex-0", "bad", "vertex-1"):
+        writer.enqueue(TransactionBase(vertex_id=vertex_id, status="success", flow_id=flow_id))
+    writer.enqueue(VertexBuildBase(id="vertex-0", flow_id=flow_id, valid=True))
+    await writer.stop()
+
+    assert await count_rows(TransactionTable, flow_id) == 2
+    assert await count_rows(VertexBuildTable, flow_id) == 1
+    assert writer.info()["written"] == 3
+    assert writer.info()["failed"] == 1
+
+
+@pytest.mark.usefixtures("client")
+async def test_build_log_writer_drops_queued_records_of_deleted_flows():
+    writer = BuildLogWriter()
+    deleted_flow_id = uuid4()
+    flow_id = uuid4()
+    await writer.start()
+
+    for record_flow_id in (deleted_flow_id, flow_id):
+        writer.enqueue(TransactionBase(vertex_id="vertex", status="success", flow_id=record_flow_id))
+        writer.enqueue(VertexBuildBase(id="vertex", flow_id=record_flow_id, valid=True))
+    writer.forget_flows([deleted_flow_id])
+    await writer.stop()
+
+    assert await count_rows(TransactionTable, deleted_flow_id) == 0
+    assert await count_rows(VertexBuildTable, deleted_flow_id) == 0
+    assert await count_rows(TransactionTable, flow_id) == 1
+    assert await count_rows(VertexBuildTable, flow_id) == 1
+    assert writer.info()["dropped"] == 2
@@ -0,0 +1,23 @@
+import contextvars
+
+from aiexec.utils.async_helpers import iterate_in_thread
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="unset")
+
+
+async def test_iterate_in_thread_yields_items():
+    items = [item async for item in iterate_in_thread(iter(range(5)))]
+
+    assert items == [0, 1, 2, 3, 4]
+
+
+async def test_iterate_in_thread_keeps_context_variables():
+    def read_request_id():
+        for _ in range(2):
+            yield request_id.get()
+
+    request_id.set("request-1")
+
+    items = [item async for item in iterate_in_thread(read_request_id())]
+
+    assert items == ["request-1", "request-1"]